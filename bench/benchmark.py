@@ -204,6 +204,63 @@ def bench_put_item():
     ).save()
 
 
+# =============================================================================
+# (De)serialization
+# =============================================================================
+
+RAW_USER = UserModel(
+    "some_user",
+    email="some_user@gmail.com",
+    first_name="John",
+    last_name="Doe",
+    phone_number="4155551111",
+    country="USA",
+    preferences=UserPreferences(
+        timezone="America/New_York",
+        allows_notifications=True,
+        date_of_birth=datetime(2022, 10, 26, 20),
+    ),
+    last_login=datetime(2022, 10, 27, 20),
+).serialize()
+
+
+@register_benchmark("from_raw_data")
+def bench_from_raw_data():
+    UserModel.from_raw_data(RAW_USER)
+
+
+@register_benchmark("serialize")
+def bench_serialize():
+    UserModel.from_raw_data(RAW_USER).serialize()
+
+
+# =============================================================================
+# In-memory transport (no botocore overhead)
+# =============================================================================
+
+from pynamodb.connection.memory import InMemoryTransport
+
+
+class InMemoryUserModel(UserModel):
+    class Meta:
+        table_name = 'User'
+        transport = InMemoryTransport()
+
+
+InMemoryUserModel.create_table(read_capacity_units=1, write_capacity_units=1)
+InMemoryUserModel.from_raw_data(RAW_USER).save()
+
+
+@register_benchmark("get_item_in_memory")
+def bench_get_item_in_memory():
+    InMemoryUserModel.get("some_user")
+
+
+@register_benchmark("put_item_in_memory")
+def bench_put_item_in_memory():
+    InMemoryUserModel.from_raw_data(RAW_USER).save()
+
+
 # =============================================================================
 # Benchmarks.
 # =============================================================================
@@ -213,6 +270,10 @@ def main():
 
     results_record_result(benchmark_registry["get_item"], COUNT)
     results_record_result(benchmark_registry["put_item"], COUNT)
+    results_record_result(benchmark_registry["from_raw_data"], COUNT)
+    results_record_result(benchmark_registry["serialize"], COUNT)
+    results_record_result(benchmark_registry["get_item_in_memory"], COUNT)
+    results_record_result(benchmark_registry["put_item_in_memory"], COUNT)
 
     print()
     print("Above metrics are in call/sec, larger is better.")
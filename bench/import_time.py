@@ -0,0 +1,69 @@
+"""
+Measures the cold-start costs of pynamodb: importing it, defining models and creating the first client.
+
+Run from this directory: PYTHONPATH=.. python import_time.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 10
+MODELS = 200
+
+DEFINE_MODELS = f"""
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
+from pynamodb.models import Model
+
+
+class BaseModel(Model):
+    class Meta:
+        table_name = 'Base'
+        region = 'us-east-1'
+
+
+for i in range({MODELS}):
+    class ViewIndex(GlobalSecondaryIndex):
+        class Meta:
+            index_name = 'view_index'
+            projection = AllProjection()
+        view = NumberAttribute(hash_key=True)
+
+    type('Model{{}}'.format(i), (BaseModel,), {{
+        'Meta': type('Meta', (), {{'table_name': 'Table{{}}'.format(i)}}),
+        'id': UnicodeAttribute(hash_key=True),
+        'name': UnicodeAttribute(range_key=True),
+        'view': NumberAttribute(),
+        'view_index': ViewIndex(),
+    }})
+"""
+
+
+def run_timed(code: str) -> float:
+    """
+    Runs `code` in a fresh interpreter and returns how long it took to run (in seconds)
+    """
+    script = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)\n"
+    output = subprocess.check_output([sys.executable, '-c', script], env={**os.environ, 'AWS_ACCESS_KEY_ID': '1',
+                                                                          'AWS_SECRET_ACCESS_KEY': '1'})
+    return float(output.decode().splitlines()[-1])
+
+
+def record(name: str, code: str) -> None:
+    result = statistics.median(run_timed(code) for _ in range(RUNS))
+    print(f"{name}: {result * 1000:,.01f} ms")
+
+
+def main():
+    start = time.perf_counter()
+    record("import_pynamodb_models", "import pynamodb.models")
+    record(f"define_{MODELS}_models", DEFINE_MODELS)
+    record("first_client", "from pynamodb.connection import Connection\nConnection(region='us-east-1').client")
+    print()
+    print(f"Medians of {RUNS} runs in fresh interpreters, smaller is better ({time.perf_counter() - start:.01f}s total).")
+
+
+if __name__ == "__main__":
+    main()
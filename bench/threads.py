@@ -0,0 +1,75 @@
+"""
+Compares per-thread botocore sessions and clients with the shared session and client of a Connection,
+for a pool of threads each sending GetItem requests.
+
+Run from this directory: PYTHONPATH=.. python threads.py
+"""
+import threading
+import time
+from typing import Callable
+
+import botocore.client
+import botocore.session
+
+from benchmark import patch_urllib3
+from pynamodb.connection import Connection
+from pynamodb.connection.registry import client_registry
+from pynamodb.constants import SERVICE_NAME
+
+THREADS = 32
+REQUESTS_PER_THREAD = 200
+GET_ITEM_KWARGS = {'TableName': 'User', 'Key': {'user_name': {'S': 'some_user'}}}
+
+
+def per_thread_client(conn: Connection) -> Callable[[], object]:
+    # what each thread did when connections kept a botocore session per thread
+    def get_client():
+        session = botocore.session.get_session()
+        config = botocore.client.Config(**conn._get_client_config_kwargs())
+        return session.create_client(SERVICE_NAME, conn.region, endpoint_url=conn.host, config=config)
+    return get_client
+
+
+def shared_client(conn: Connection) -> Callable[[], object]:
+    return lambda: conn.client
+
+
+def run(name: str, make_get_client: Callable[[Connection], Callable[[], object]]) -> None:
+    client_registry.clear()
+    conn = Connection(max_retry_attempts=0, max_pool_connections=THREADS)
+    get_client = make_get_client(conn)
+    ready = threading.Barrier(THREADS + 1)
+    go = threading.Event()
+
+    def worker():
+        client = get_client()
+        ready.wait()
+        go.wait()
+        for _ in range(REQUESTS_PER_THREAD):
+            client._make_api_call('GetItem', GET_ITEM_KWARGS)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    go.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{name}: startup {startup * 1000:,.01f} ms, {THREADS * REQUESTS_PER_THREAD / elapsed:,.02f} calls/sec")
+
+
+def main():
+    patch_urllib3()
+    print(f"{THREADS} threads, {REQUESTS_PER_THREAD} GetItem requests each")
+    run("per_thread_session", per_thread_client)
+    run("shared_session", shared_client)
+
+
+if __name__ == "__main__":
+    main()
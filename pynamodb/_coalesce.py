@@ -0,0 +1,143 @@
+"""
+Coalescing of concurrent single-item gets into BatchGetItem requests
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from pynamodb._util import key_value_id
+from pynamodb.constants import BATCH_GET_PAGE_LIMIT
+from pynamodb.exceptions import GetError
+from pynamodb.retries import RetryPolicy
+
+_BatchGetPage = Callable[..., Tuple[Optional[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]]
+
+
+class _PendingBatch:
+    def __init__(self, consistent_read: bool) -> None:
+        self.consistent_read = consistent_read
+        self.keys: List[Dict[str, Any]] = []
+        self.futures: Dict[Hashable, 'Future[Optional[Dict[str, Any]]]'] = {}
+        self.full = threading.Event()
+
+
+class GetCoalescer:
+    """
+    Merges single-item gets issued concurrently from several threads into BatchGetItem requests,
+    in the style of a DataLoader.
+
+    The first caller of a batch waits up to `window_seconds` (or until `max_keys` distinct keys have been
+    requested) before sending it; all callers block until the batch has been loaded.
+    Requests for a key that is already pending or in flight share its result.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        batch_get_page: _BatchGetPage,
+        key_attributes: Sequence[Tuple[str, str]],
+        window_seconds: float,
+        max_keys: int = BATCH_GET_PAGE_LIMIT,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_retry_attempts: Optional[int] = None,
+    ) -> None:
+        """
+        :param table_name: The table the keys belong to
+        :param batch_get_page: Loads a list of keys, returning the items found and any unprocessed keys
+        :param key_attributes: The (name, type) of the hash key and, if any, the range key
+        :param window_seconds: How long to collect keys before sending a batch
+        :param max_keys: The maximum number of keys per batch
+        :param retry_policy: Backs off before resending unprocessed keys or throttled batches, if set
+        :param max_retry_attempts: The attempts after which a batch that makes no progress gives up, if set
+        """
+        if window_seconds < 0:
+            raise ValueError("window_seconds must not be negative")
+        if not 0 < max_keys <= BATCH_GET_PAGE_LIMIT:
+            raise ValueError("max_keys must be between 1 and {}".format(BATCH_GET_PAGE_LIMIT))
+        self.table_name = table_name
+        self._batch_get_page = batch_get_page
+        self._key_attributes = key_attributes
+        self._window_seconds = window_seconds
+        self._max_keys = max_keys
+        self._retry_policy = retry_policy
+        self._max_retry_attempts = max_retry_attempts
+        self._lock = threading.Lock()
+        self._pending: Dict[bool, _PendingBatch] = {}
+        self._in_flight: Dict[Tuple[bool, Hashable], 'Future[Optional[Dict[str, Any]]]'] = {}
+
+    def get(self, key: Dict[str, Any], consistent_read: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Returns the raw item for `key`, or None if it does not exist
+
+        :param key: The serialized key values, by attribute name
+        :param consistent_read: Whether the read needs to be strongly consistent.
+            Consistent and eventually consistent reads are batched separately.
+        """
+        consistent_read = bool(consistent_read)
+        key_id = self._get_key_id(key)
+        leader: Optional[_PendingBatch] = None
+        with self._lock:
+            future = self._in_flight.get((consistent_read, key_id))
+            if future is None:
+                batch = self._pending.get(consistent_read)
+                if batch is None:
+                    batch = leader = self._pending[consistent_read] = _PendingBatch(consistent_read)
+                future = batch.futures[key_id] = Future()
+                self._in_flight[(consistent_read, key_id)] = future
+                batch.keys.append(key)
+                if len(batch.keys) >= self._max_keys:
+                    del self._pending[consistent_read]
+                    batch.full.set()
+
+        if leader is not None:
+            leader.full.wait(self._window_seconds)
+            with self._lock:
+                if self._pending.get(consistent_read) is leader:
+                    del self._pending[consistent_read]
+            self._load(leader)
+        return future.result()
+
+    def _load(self, batch: _PendingBatch) -> None:
+        items: Dict[Hashable, Dict[str, Any]] = {}
+        error: Optional[BaseException] = None
+        backoff = self._retry_policy.backoff(self._max_retry_attempts) if self._retry_policy is not None else None
+        try:
+            keys_to_get: Optional[List[Dict[str, Any]]] = batch.keys
+            while keys_to_get:
+                try:
+                    page, unprocessed_keys = self._batch_get_page(
+                        keys_to_get,
+                        consistent_read=batch.consistent_read,
+                        attributes_to_get=None,
+                    )
+                except GetError as e:
+                    if backoff is None or not backoff.retry(e):
+                        raise
+                    continue
+                for item in page or ():
+                    items[self._get_item_key_id(item)] = item
+                keys_to_get = unprocessed_keys
+                if backoff is None or not keys_to_get:
+                    continue
+                if page:
+                    # resent at once, since the response was likely cut short by its size limit
+                    backoff.reset()
+                elif not backoff.retry():
+                    raise GetError("Failed to batch get items: max_retry_attempts exceeded")
+        except BaseException as e:
+            error = e
+
+        with self._lock:
+            for key_id in batch.futures:
+                del self._in_flight[(batch.consistent_read, key_id)]
+        for key_id, future in batch.futures.items():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(items.get(key_id))
+
+    def _get_key_id(self, key: Dict[str, Any]) -> Hashable:
+        return tuple(key_value_id(attr_type, key[name]) for name, attr_type in self._key_attributes)
+
+    def _get_item_key_id(self, item: Dict[str, Dict[str, Any]]) -> Hashable:
+        return tuple(key_value_id(attr_type, item[name][attr_type]) for name, attr_type in self._key_attributes)
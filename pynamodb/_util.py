@@ -1,8 +1,13 @@
 import json
 from base64 import b64decode
 from base64 import b64encode
+from decimal import Decimal
+from decimal import InvalidOperation
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import List
+from typing import Tuple
 
 from pynamodb.constants import BINARY
 from pynamodb.constants import BINARY_SET
@@ -16,6 +21,18 @@ from pynamodb.constants import STRING
 from pynamodb.constants import STRING_SET
 
 
+def get_class_members(cls: type, predicate: Callable[[Any], bool]) -> List[Tuple[str, Any]]:
+    """
+    Returns the (name, value) of the attributes of `cls` (including inherited ones) that satisfy `predicate`,
+    sorted by name like :func:`inspect.getmembers`.
+    Unlike `getmembers`, it reads the class dictionaries instead of getting every attribute of the class.
+    """
+    members: Dict[str, Any] = {}
+    for klass in reversed(cls.__mro__):
+        members.update(vars(klass))
+    return sorted(((name, value) for name, value in members.items() if predicate(value)), key=lambda m: m[0])
+
+
 def attr_value_to_simple_dict(attribute_value: Dict[str, Any], force: bool) -> Any:
     attr_type, attr_value = next(iter(attribute_value.items()))
     if attr_type == LIST:
@@ -93,3 +110,17 @@ def bin_decode_attr(attr: Dict[str, Any]) -> None:
     elif LIST in attr:
         for sub_attr in attr[LIST]:
             bin_decode_attr(sub_attr)
+
+
+def key_value_id(attr_type: str, value: Any) -> Any:
+    """
+    Returns a hashable identity for a serialized key value.
+    Numbers are compared by value, since DynamoDB returns them in canonical form (e.g. '1' for '1.0').
+    Invalid numbers are left for DynamoDB to reject.
+    """
+    if attr_type == NUMBER:
+        try:
+            return Decimal(value)
+        except (InvalidOperation, TypeError):
+            return value
+    return value
@@ -13,13 +13,13 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from inspect import getfullargspec
-from inspect import getmembers
-from typing import Any, Callable, Dict, Generic, List, Mapping, Optional, TypeVar, Type, Union, Set, overload, Iterable
+from typing import Any, Callable, Dict, Generic, List, Mapping, Optional, TypeVar, Type, Union, Set, overload, Iterable, Tuple
 from typing import TYPE_CHECKING
 
 from pynamodb._util import attr_value_to_simple_dict
 from pynamodb._util import bin_decode_attr
 from pynamodb._util import bin_encode_attr
+from pynamodb._util import get_class_members
 from pynamodb._util import simple_dict_to_attr_value
 from pynamodb.constants import BINARY
 from pynamodb.constants import BINARY_SET
@@ -146,6 +146,9 @@ class Attribute(Generic[_T]):
         if instance and not self._is_map_attribute_class_object(instance):
             attr_name = instance._dynamo_to_python_attrs.get(self.attr_name, self.attr_name)
             instance.attribute_values[attr_name] = value
+            changed_attributes = instance._changed_attributes
+            if changed_attributes is not None:
+                changed_attributes.add(attr_name)
 
     @overload
     def __get__(self: _A, instance: None, owner: Any) -> _A: ...
@@ -300,7 +303,7 @@ class AttributeContainerMeta(type):
         cls._attributes = {}
         cls._dynamo_to_python_attrs = {}
 
-        for name, attribute in getmembers(cls, lambda o: isinstance(o, Attribute)):
+        for name, attribute in get_class_members(cls, lambda o: isinstance(o, Attribute)):
             cls._attributes[name] = attribute
             if attribute.attr_name != name:
                 cls._dynamo_to_python_attrs[attribute.attr_name] = name
@@ -316,11 +319,144 @@ class AttributeContainerMeta(type):
                 raise ValueError("{} does not have a discriminator attribute".format(cls.__name__))
             cls._attributes[cls._discriminator].register_class(cls, discriminator_value)
 
+        AttributeContainerMeta._compile_plans(cls)
+
+    @staticmethod
+    def _compile_plans(cls):
+        """
+        Resolve, once per class, how each attribute is defaulted, serialized and deserialized.
+
+        The per-instance code paths (`_set_defaults`, `_container_serialize` and `_container_deserialize`)
+        then walk these plans instead of re-inspecting the attributes on every call.
+        Attributes that use the plain `Attribute` descriptors are read from and written to
+        `attribute_values` directly; the others (e.g. VersionAttribute, TTLAttribute) still go through
+        their descriptors.
+        """
+        defaults_plan = []
+        serialize_plan = []
+        deserialize_plan = []
+        for name, attr in cls._attributes.items():
+            if attr.default is not None or attr.default_for_new is not None:
+                defaults_plan.append((name, attr.default_for_new, attr.default))
+            attr_cls = type(attr)
+            direct_get = attr_cls.__get__ in (Attribute.__get__, MapAttribute.__get__)
+            direct_set = attr_cls.__set__ is Attribute.__set__
+            is_map = isinstance(attr, MapAttribute)
+            is_container = is_map or isinstance(attr, ListAttribute)
+            direct_get_value = attr_cls.get_value is Attribute.get_value
+            serialize_plan.append((name, attr, attr.attr_name, attr.attr_type, attr.null, direct_get, is_container, is_map))
+            deserialize_plan.append((name, attr, attr.attr_name, attr.attr_type, direct_get_value, direct_set, is_container))
+        cls._defaults_plan = tuple(defaults_plan)
+        cls._serialize_plan = tuple(serialize_plan)
+        cls._deserialize_plan = tuple(deserialize_plan)
+
+
+class _LazyAttributeValues(Dict[str, Any]):
+    """
+    The `attribute_values` of a container that was deserialized lazily.
+
+    The raw (serialized) values of attributes that have not been read yet are kept in `raw`;
+    each of them is deserialized and set on the container the first time it is looked up.
+    Assigning an attribute discards its raw value.
+    """
+    __slots__ = ('_container', 'raw')
+
+    def __init__(self, container: 'AttributeContainer') -> None:
+        super().__init__()
+        self._container = container
+        self.raw: Dict[str, Dict[str, Any]] = {}
+
+    def _decode(self, name: str) -> None:
+        attr = self._container.get_attributes()[name]
+        setattr(self._container, name, attr.deserialize(attr.get_value(self.raw[name])))
+        # deserializing is not a change
+        changed_attributes = self._container._changed_attributes
+        if changed_attributes is not None:
+            changed_attributes.discard(name)
+
+    def _decode_all(self) -> None:
+        for name in list(self.raw):
+            self._decode(name)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.raw:
+            self._decode(key)
+        return super().get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.raw:
+            self._decode(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.raw or super().__contains__(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.raw.pop(key, None)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key in self.raw:
+            del self.raw[key]
+            super().pop(key, None)
+        else:
+            super().__delitem__(key)
+
+    def pop(self, key: str, *args: Any) -> Any:
+        if key in self.raw:
+            self._decode(key)
+        return super().pop(key, *args)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __iter__(self):
+        self._decode_all()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._decode_all()
+        return super().__len__()
+
+    def keys(self):
+        self._decode_all()
+        return super().keys()
+
+    def values(self):
+        self._decode_all()
+        return super().values()
+
+    def items(self):
+        self._decode_all()
+        return super().items()
+
+    def copy(self) -> Dict[str, Any]:
+        self._decode_all()
+        return dict(super().items())
+
+    def __eq__(self, other: Any) -> bool:
+        self._decode_all()
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        self._decode_all()
+        return super().__repr__()
+
+    def __reduce__(self):
+        # copies and pickles are plain (fully deserialized) dictionaries
+        return dict, (self.copy(),)
+
 
 class AttributeContainer(metaclass=AttributeContainerMeta):
     """
     Base class for models and maps.
     """
+    # The names of the attributes set since the container was loaded, if changes are being tracked
+    _changed_attributes: Optional[Set[str]] = None
+    _defaults_plan: Tuple[Tuple[str, Any, Any], ...]
+    _serialize_plan: Tuple[Tuple[str, Any, str, str, bool, bool, bool, bool], ...]
+    _deserialize_plan: Tuple[Tuple[str, Attribute, str, str, bool, bool, bool], ...]
 
     def __init__(self, _user_instantiated: bool = True, **attributes: Attribute) -> None:
         # The `attribute_values` dictionary is used by the Attribute data descriptors in cls._attributes
@@ -370,11 +506,9 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
         """
         Sets and fields that provide a default value
         """
-        for name, attr in self.get_attributes().items():
-            if _user_instantiated and attr.default_for_new is not None:
-                default = attr.default_for_new
-            else:
-                default = attr.default
+        for name, default_for_new, default in self._defaults_plan:
+            if _user_instantiated and default_for_new is not None:
+                default = default_for_new
             if callable(default):
                 value = default()
             else:
@@ -391,47 +525,101 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
                 raise ValueError("Attribute {} specified does not exist".format(attr_name))
             setattr(self, attr_name, attr_value)
 
-    def _container_serialize(self, null_check: bool = True) -> Dict[str, Dict[str, Any]]:
+    def _container_serialize(self, null_check: bool = True, raw_passthrough: bool = True) -> Dict[str, Dict[str, Any]]:
         """
         Serialize attribute values for DynamoDB
+
+        :param raw_passthrough: If True, attributes of a lazily deserialized container that were never read
+            are returned as the raw values they were deserialized from, which are shared with the container.
         """
         attribute_values: Dict[str, Dict[str, Any]] = {}
-        for name, attr in self.get_attributes().items():
-            value = getattr(self, name)
-            try:
-                if isinstance(value, MapAttribute) and not value.validate(null_check=null_check):
-                    raise ValueError("Attribute '{}' is not correctly typed".format(name))
-
-                if value is not None:
-                    if isinstance(attr, (ListAttribute, MapAttribute)):
+        values = self.attribute_values
+        raw = values.raw if raw_passthrough and isinstance(values, _LazyAttributeValues) else None
+        for name, attr, attr_name, attr_type, null, direct_get, is_container, is_map in self._serialize_plan:
+            if raw and name in raw:
+                attribute_values[attr_name] = raw[name]
+                continue
+            value = values.get(name) if direct_get else getattr(self, name)
+            if value is not None:
+                try:
+                    if is_map and isinstance(value, MapAttribute) and not value.validate(null_check=null_check):
+                        raise ValueError("Attribute '{}' is not correctly typed".format(name))
+                    if is_container:
                         attr_value = attr.serialize(value, null_check=null_check)
                     else:
                         attr_value = attr.serialize(value)
-                else:
-                    attr_value = None
-            except AttributeNullError as e:
-                e.prepend_path(name)
-                raise
-
-            if null_check and attr_value is None and not attr.null:
-                raise AttributeNullError(name)
+                except AttributeNullError as e:
+                    e.prepend_path(name)
+                    raise
+            else:
+                attr_value = None
 
             if attr_value is not None:
-                attribute_values[attr.attr_name] = {attr.attr_type: attr_value}
+                attribute_values[attr_name] = {attr_type: attr_value}
+            elif null_check and not null:
+                raise AttributeNullError(name)
         return attribute_values
 
-    def _container_deserialize(self, attribute_values: Dict[str, Dict[str, Any]]) -> None:
+    def _container_deserialize(self, attribute_values: Dict[str, Dict[str, Any]], lazy: bool = False) -> None:
         """
         Sets attributes sent back from DynamoDB on this object
+
+        :param lazy: If True, each attribute is only deserialized when it is first accessed
         """
+        if lazy:
+            lazy_values = self.attribute_values = _LazyAttributeValues(self)
+            self._set_discriminator()
+            self._set_defaults(_user_instantiated=False)
+            for name, attr, attr_name, attr_type, direct_get_value, direct_set, is_container in self._deserialize_plan:
+                attribute_value = attribute_values.get(attr_name)
+                if attribute_value and NULL not in attribute_value:
+                    lazy_values.raw[name] = attribute_value
+            return
+
         self.attribute_values = {}
         self._set_discriminator()
         self._set_defaults(_user_instantiated=False)
-        for name, attr in self.get_attributes().items():
-            attribute_value = attribute_values.get(attr.attr_name)
+        values = self.attribute_values
+        for name, attr, attr_name, attr_type, direct_get_value, direct_set, is_container in self._deserialize_plan:
+            attribute_value = attribute_values.get(attr_name)
             if attribute_value and NULL not in attribute_value:
-                value = attr.deserialize(attr.get_value(attribute_value))
-                setattr(self, name, value)
+                if not direct_get_value:
+                    value = attr.deserialize(attr.get_value(attribute_value))
+                elif attr_type in attribute_value:
+                    value = attr.deserialize(attribute_value[attr_type])
+                else:
+                    raise AttributeDeserializationError(attr_name, attr_type)
+                if direct_set:
+                    values[name] = value
+                else:
+                    setattr(self, name, value)
+
+    @classmethod
+    def _deserialize_to_dict(cls, attribute_values: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Deserializes attributes sent back from DynamoDB into a simple dict keyed by `python_attr_name`,
+        without instantiating this class. Nested maps are returned as dicts,
+        and attributes that are missing or null are None (defaults are not applied).
+        """
+        result: Dict[str, Any] = {}
+        for name, attr, attr_name, attr_type, direct_get_value, direct_set, is_container in cls._deserialize_plan:
+            attribute_value = attribute_values.get(attr_name)
+            if attribute_value and NULL not in attribute_value:
+                if not direct_get_value:
+                    value = attr.deserialize(attr.get_value(attribute_value))
+                elif attr_type not in attribute_value:
+                    raise AttributeDeserializationError(attr_name, attr_type)
+                elif is_container and isinstance(attr, MapAttribute) and not attr.is_raw() and not attr._discriminator:
+                    # typed maps are deserialized straight into dicts, too
+                    value = attr._deserialize_to_dict(attribute_value[attr_type])
+                else:
+                    value = attr.deserialize(attribute_value[attr_type])
+                    if is_container:
+                        value = _to_simple_value(value)
+                result[name] = value
+            else:
+                result[name] = None
+        return result
 
     @classmethod
     def _update_attribute_types(cls, attribute_values: Dict[str, Dict[str, Any]]):
@@ -476,13 +664,13 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
         return None
 
     @classmethod
-    def _instantiate(cls: Type[_ACT], attribute_values: Dict[str, Dict[str, Any]]) -> _ACT:
+    def _instantiate(cls: Type[_ACT], attribute_values: Dict[str, Dict[str, Any]], lazy: bool = False) -> _ACT:
         stored_cls = cls._get_discriminator_class(attribute_values)
         if stored_cls and not issubclass(stored_cls, cls):
             raise ValueError("Cannot instantiate a {} from the returned class: {}".format(
                 cls.__name__, stored_cls.__name__))
         instance = (stored_cls or cls)(_user_instantiated=False)
-        AttributeContainer._container_deserialize(instance, attribute_values)
+        AttributeContainer._container_deserialize(instance, attribute_values, lazy=lazy)
         return instance
 
     def to_dynamodb_dict(self) -> Dict[str, Dict[str, Any]]:
@@ -504,7 +692,8 @@ class AttributeContainer(metaclass=AttributeContainerMeta):
 
         This matches the structure of the "DynamoDB" JSON mapping in the AWS Console.
         """
-        attr_values = self._container_serialize(null_check=False)
+        # bin_encode_attr encodes in place, so raw values must not be shared
+        attr_values = self._container_serialize(null_check=False, raw_passthrough=False)
         for v in attr_values.values():
             bin_encode_attr(v)
         return attr_values
@@ -1266,6 +1455,14 @@ class DynamicMapAttribute(MapAttribute):
         return True
 
 
+def _to_simple_value(value: Any) -> Any:
+    if isinstance(value, MapAttribute):
+        return {k: _to_simple_value(v) for k, v in value.attribute_values.items()}
+    if isinstance(value, list):
+        return [_to_simple_value(v) for v in value]
+    return value
+
+
 def _get_class_for_serialize(value: Any) -> Attribute:
     if value is None:
         return NullAttribute()
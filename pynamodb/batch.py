@@ -0,0 +1,244 @@
+"""
+Batch operations across several models, sharing BatchGetItem and BatchWriteItem requests
+"""
+import logging
+from operator import itemgetter
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Type, TypeVar
+
+from pynamodb.connection.base import BOTOCORE_EXCEPTIONS
+from pynamodb.constants import (
+    BATCH_GET_ITEM, BATCH_GET_PAGE_LIMIT, BATCH_WRITE_ITEM, BATCH_WRITE_MAX_BYTES, BATCH_WRITE_PAGE_LIMIT,
+    CONSISTENT_READ, DELETE_REQUEST, ITEM, KEY, KEYS, MAX_ITEM_SIZE_BYTES, PUT_REQUEST, REQUEST_ITEMS, RESPONSES,
+    UNPROCESSED_ITEMS, UNPROCESSED_KEYS,
+)
+from pynamodb.exceptions import GetError, PutError
+from pynamodb.models import Model, _KeyType, _ModelFuture
+from pynamodb.retries import Backoff
+from pynamodb.sizing import item_size, pack
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+_M = TypeVar('_M', bound=Model)
+
+
+class _MultiBatch:
+    """
+    Base class for batch operations across models
+    """
+
+    def __init__(self) -> None:
+        self._model_cls: Optional[Type[Model]] = None
+        # table name -> a model of the table, to identify its items
+        self._table_models: Dict[str, Type[Model]] = {}
+
+    def _add_model(self, model_cls: Type[Model]) -> str:
+        if self._model_cls is None:
+            self._model_cls = model_cls
+        elif model_cls._get_connection_kwargs() != self._model_cls._get_connection_kwargs():
+            raise ValueError(
+                "{} and {} cannot share batch requests: their connection settings differ".format(
+                    self._model_cls.__name__, model_cls.__name__,
+                )
+            )
+        table_name = model_cls.Meta.table_name
+        self._table_models.setdefault(table_name, model_cls)
+        return table_name
+
+    def _backoff(self) -> Backoff:
+        assert self._model_cls is not None
+        return self._model_cls._get_retry_policy().backoff(max_attempts=self._model_cls.Meta.max_retry_attempts)
+
+    def _dispatch(self, operation_name: str, operation_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        assert self._model_cls is not None
+        return self._model_cls._get_connection().connection.dispatch(operation_name, operation_kwargs)
+
+    def _get_key_id(self, table_name: str, item: Dict[str, Dict[str, Any]]) -> Hashable:
+        return self._table_models[table_name]._get_cache_key(item, serialized=True)
+
+
+class MultiBatchGet(_MultiBatch):
+    """
+    Gets items of several models (of one or more tables) with shared BatchGetItem requests of up to 100 keys.
+
+    Example:
+        with MultiBatchGet() as batch:
+            user = batch.get(User, 'user-1')
+            org = batch.get(Organization, 'org-1')
+        print(user.get(), org.get())
+    """
+
+    def __init__(self, consistent_read: Optional[bool] = None) -> None:
+        """
+        :param consistent_read: If True, strongly consistent reads are used
+        """
+        super().__init__()
+        self.consistent_read = consistent_read
+        # (table name, key) -> futures of the key, in the order the keys were requested
+        self._pending: Dict[Tuple[str, Hashable], Tuple[Dict[str, Dict[str, Any]], List[_ModelFuture]]] = {}
+
+    def get(self, model_cls: Type[_M], hash_key: _KeyType, range_key: Optional[_KeyType] = None) -> _ModelFuture[_M]:
+        """
+        Adds an item to get, returning a placeholder for the item, resolved by :meth:`commit`
+        """
+        table_name = self._add_model(model_cls)
+        key = model_cls._get_batch_get_key(hash_key if range_key is None else (hash_key, range_key))
+        typed_key = model_cls._get_typed_key(key)
+        future: _ModelFuture[_M] = _ModelFuture(model_cls)
+        key_id = (table_name, self._get_key_id(table_name, typed_key))
+        self._pending.setdefault(key_id, (typed_key, []))[1].append(future)
+        return future
+
+    def commit(self) -> None:
+        """
+        Gets all the items added since the last commit
+        """
+        pending, self._pending = self._pending, {}
+        keys = list(pending)
+        for start in range(0, len(keys), BATCH_GET_PAGE_LIMIT):
+            self._get_page({key_id: pending[key_id] for key_id in keys[start:start + BATCH_GET_PAGE_LIMIT]})
+        # whatever was not returned does not exist
+        for _, futures in pending.values():
+            for future in futures:
+                if not future._resolved:
+                    future.update_with_raw_data({})
+
+    def _get_page(self, pending: Dict[Tuple[str, Hashable], Tuple[Dict[str, Dict[str, Any]], List[_ModelFuture]]]) -> None:
+        request_items: Dict[str, Any] = {}
+        for (table_name, _), (typed_key, _) in pending.items():
+            table_request = request_items.setdefault(table_name, {KEYS: []})
+            table_request[KEYS].append(typed_key)
+            if self.consistent_read:
+                table_request[CONSISTENT_READ] = True
+
+        backoff = self._backoff()
+        while request_items:
+            try:
+                data = self._dispatch(BATCH_GET_ITEM, {REQUEST_ITEMS: request_items})
+            except BOTOCORE_EXCEPTIONS as e:
+                error = GetError("Failed to batch get items: {}".format(e), e)
+                if not backoff.retry(error):
+                    raise error
+                continue
+            for table_name, items in (data.get(RESPONSES) or {}).items():
+                for item in items:
+                    for future in pending[(table_name, self._get_key_id(table_name, item))][1]:
+                        future.update_with_raw_data(item)
+            request_items = data.get(UNPROCESSED_KEYS) or {}
+            if request_items and any(data.get(RESPONSES, {}).values()):
+                # resent at once, since the response was likely cut short by its size limit
+                backoff.reset()
+            elif request_items and not backoff.retry():
+                raise GetError("Failed to batch get items: max_retry_attempts exceeded")
+
+    def __enter__(self) -> 'MultiBatchGet':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+
+
+class MultiBatchWrite(_MultiBatch):
+    """
+    Writes (puts and deletes) items of several models (of one or more tables) with shared BatchWriteItem requests
+    of up to 25 items.
+
+    Operations on the same key are collapsed into the last one. The requests that could not be written are left in
+    `failed_operations`, by table name, and a :class:`~pynamodb.exceptions.PutError` is raised.
+
+    Example:
+        with MultiBatchWrite() as batch:
+            batch.save(User('user-1'))
+            batch.delete(Organization('org-1'))
+    """
+
+    def __init__(self, auto_commit: bool = True) -> None:
+        """
+        :param auto_commit: If True, each batch of 25 operations is written as soon as it is complete
+            (otherwise :meth:`save` and :meth:`delete` raise ValueError), and the rest are written on exit
+        """
+        super().__init__()
+        self.auto_commit = auto_commit
+        self.max_operations = BATCH_WRITE_PAGE_LIMIT
+        # (table name, key) -> (request, model)
+        self.pending_operations: Dict[Tuple[str, Hashable], Tuple[Dict[str, Any], Model]] = {}
+        self.failed_operations: Dict[str, List[Any]] = {}
+
+    def save(self, model: Model) -> None:
+        """
+        Adds `model` to the items to put
+        """
+        self._add_operation(model, {PUT_REQUEST: {ITEM: model.serialize()}})
+
+    def delete(self, model: Model) -> None:
+        """
+        Adds `model` to the items to delete
+        """
+        self._add_operation(model, {DELETE_REQUEST: {KEY: model._get_typed_key(model._get_keys())}})
+
+    def _add_operation(self, model: Model, request: Dict[str, Any]) -> None:
+        table_name = self._add_model(type(model))
+        key_id = (table_name, self._get_key_id(table_name, model._get_typed_key(model._get_keys())))
+        if key_id not in self.pending_operations and len(self.pending_operations) == self.max_operations:
+            if not self.auto_commit:
+                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
+            self.commit()
+        # the last operation on a key wins, since DynamoDB rejects batches with duplicate keys
+        self.pending_operations.pop(key_id, None)
+        self.pending_operations[key_id] = (request, model)
+
+    def commit(self) -> None:
+        """
+        Writes all the pending operations
+        """
+        pending, self.pending_operations = self.pending_operations, {}
+        requests: List[Tuple[str, Dict[str, Any], int]] = []
+        oversized: Dict[str, List[Any]] = {}
+        for (table_name, _), (request, _) in pending.items():
+            size = item_size(request[PUT_REQUEST][ITEM] if PUT_REQUEST in request else request[DELETE_REQUEST][KEY])
+            if size > MAX_ITEM_SIZE_BYTES:
+                oversized.setdefault(table_name, []).append(request)
+            else:
+                requests.append((table_name, request, size))
+        try:
+            for request_pack in pack(requests, itemgetter(2), self.max_operations, BATCH_WRITE_MAX_BYTES):
+                request_items: Dict[str, List[Any]] = {}
+                for table_name, request, _ in request_pack:
+                    request_items.setdefault(table_name, []).append(request)
+                self._write(request_items)
+        finally:
+            for _, model in pending.values():
+                model._invalidate_cached_item()
+                model._stop_tracking_changes()
+        if oversized:
+            self._fail(oversized, "{} items exceed the maximum item size".format(sum(map(len, oversized.values()))))
+
+    def _write(self, request_items: Dict[str, List[Any]]) -> None:
+        backoff = self._backoff()
+        while request_items:
+            try:
+                data = self._dispatch(BATCH_WRITE_ITEM, {REQUEST_ITEMS: request_items})
+            except BOTOCORE_EXCEPTIONS as e:
+                error = PutError("Failed to batch write items: {}".format(e), e)
+                if not backoff.retry(error):
+                    raise error
+                continue
+            request_items = data.get(UNPROCESSED_ITEMS) or {}
+            if not request_items:
+                return
+            if not backoff.retry():
+                self._fail(request_items, "max_retry_attempts exceeded")
+            log.info("Resending %d unprocessed items for batch operation (retry %d)",
+                     sum(map(len, request_items.values())), backoff.retries)
+
+    def _fail(self, failed_operations: Dict[str, List[Any]], reason: str) -> None:
+        for table_name, requests in failed_operations.items():
+            self.failed_operations.setdefault(table_name, []).extend(requests)
+        raise PutError("Failed to batch write items: {}".format(reason))
+
+    def __enter__(self) -> 'MultiBatchWrite':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self.commit()
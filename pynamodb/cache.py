@@ -0,0 +1,169 @@
+"""
+In-process item cache for PynamoDB models
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_RawItem = Optional[Dict[str, Any]]
+
+
+class ItemCache:
+    """
+    A thread-safe LRU cache of raw items with a time-to-live, consulted by :meth:`~pynamodb.models.Model.get`
+    and :meth:`~pynamodb.models.Model.batch_get` of models that set it as ``Meta.item_cache``.
+
+    Entries are keyed by table name and serialized key, so one cache can be shared by several models.
+    Items known not to exist are cached as well (negative caching), for `negative_ttl_seconds`.
+    Concurrent misses on the same key result in a single load.
+
+    Example:
+        class Config(Model):
+            class Meta:
+                table_name = 'Config'
+                item_cache = ItemCache(max_size=1000, ttl_seconds=30)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 60,
+        negative_ttl_seconds: Optional[float] = None,
+        time_module: Optional[Any] = None,
+    ) -> None:
+        """
+        :param max_size: The maximum number of entries, beyond which the least recently used ones are evicted
+        :param ttl_seconds: How long an item is cached for
+        :param negative_ttl_seconds: How long the absence of an item is cached for. Defaults to `ttl_seconds`;
+            set to zero to disable negative caching.
+        :param time_module: Optional: the module responsible for calculating time. Intended to be used for testing purposes.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than zero")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than zero")
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        self._time_module: Any = time_module or time
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Tuple[float, _RawItem]]' = OrderedDict()
+        self._loading: Dict[Hashable, 'Future[_RawItem]'] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of lookups answered from the cache, including cached misses
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of lookups that had to go to DynamoDB
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        The number of entries evicted to stay within `max_size`
+        """
+        return self._evictions
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> Tuple[bool, _RawItem]:
+        """
+        Returns whether `key` is cached and, if so, its raw item (None if the item is known not to exist).
+        Counts as a hit or a miss.
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], _RawItem]) -> _RawItem:
+        """
+        Returns the raw item for `key`, calling `load` on a miss and caching its result.
+        Concurrent misses on the same key wait for a single call to `load`.
+        """
+        with self._lock:
+            found, item = self._lookup(key)
+            if found:
+                return item
+            future = self._loading.get(key)
+            loader = future is None
+            if future is None:
+                future = self._loading[key] = Future()
+
+        if not loader:
+            return future.result()
+
+        try:
+            item = load()
+        except BaseException as e:
+            with self._lock:
+                if self._loading.get(key) is future:
+                    del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # if the key was invalidated while loading, the loaded item may already be stale
+            if self._loading.get(key) is future:
+                del self._loading[key]
+                self._store(key, item)
+        future.set_result(item)
+        return item
+
+    def set(self, key: Hashable, item: _RawItem) -> None:
+        """
+        Caches the raw item for `key`, or its absence if `item` is None
+        """
+        with self._lock:
+            self._loading.pop(key, None)
+            self._store(key, item)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Removes `key` from the cache
+        """
+        with self._lock:
+            self._loading.pop(key, None)
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache
+        """
+        with self._lock:
+            self._loading.clear()
+            self._entries.clear()
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, _RawItem]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, item = entry
+            if expires_at > self._time_module.time():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, item
+            del self._entries[key]
+        self._misses += 1
+        return False, None
+
+    def _store(self, key: Hashable, item: _RawItem) -> None:
+        ttl_seconds = self._ttl_seconds if item is not None else self._negative_ttl_seconds
+        if ttl_seconds <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (self._time_module.time() + ttl_seconds, item)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
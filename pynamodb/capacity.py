@@ -0,0 +1,355 @@
+"""
+Accounting of the capacity consumed by requests
+"""
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, cast
+
+from pynamodb.constants import (
+    CAPACITY_UNITS, GLOBAL_SECONDARY_INDEXES, LOCAL_SECONDARY_INDEXES, READ_CAPACITY_UNITS, READ_OPERATIONS,
+    TABLE_KEY, TABLE_NAME, WRITE_CAPACITY_UNITS,
+)
+from pynamodb.hooks import RequestContext, request_hooks
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+#: The dimensions capacity is aggregated by
+DIMENSIONS = ('table_name', 'index_name', 'operation', 'tag')
+
+#: The enabled meter, if any (see :meth:`CapacityMeter.enable`)
+meter: Optional['CapacityMeter'] = None
+
+#: The tag the capacity consumed in the current context is attributed to (see :func:`capacity_tag`)
+current_tag: ContextVar[Optional[str]] = ContextVar('current_tag', default=None)
+
+_Key = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+@contextmanager
+def capacity_tag(tag: str) -> Iterator[None]:
+    """
+    Attributes the capacity consumed by the requests sent within the block
+    (in the current thread or task) to `tag`
+
+    Example:
+        with capacity_tag('GET /threads'):
+            Thread.query('forum')
+    """
+    token = current_tag.set(tag)
+    try:
+        yield
+    finally:
+        current_tag.reset(token)
+
+
+class CapacityUsage(NamedTuple):
+    """
+    The capacity consumed over a window of time. Dimensions that were not grouped by are ``None``.
+    """
+    table_name: Optional[str]
+    #: ``None`` for the capacity consumed by the table itself
+    index_name: Optional[str]
+    operation: Optional[str]
+    tag: Optional[str]
+    read_capacity_units: float
+    write_capacity_units: float
+    requests: int
+    #: The length of the window, in seconds
+    seconds: float
+
+    @property
+    def read_capacity_units_per_second(self) -> float:
+        return self.read_capacity_units / self.seconds if self.seconds else 0.0
+
+    @property
+    def write_capacity_units_per_second(self) -> float:
+        return self.write_capacity_units / self.seconds if self.seconds else 0.0
+
+
+class CapacityMeter:
+    """
+    Aggregates the read and write capacity units consumed by requests per table, index, operation and tag,
+    in a rolling window.
+
+    While a meter is enabled, requests ask DynamoDB for the capacity consumed by each index
+    (``ReturnConsumedCapacity=INDEXES``), so that the capacity consumed by global and local secondary indexes
+    is accounted for separately from the table's. Capacity is attributed to the tag set with :func:`capacity_tag`.
+
+    Example:
+        meter = CapacityMeter(window_seconds=60)
+        meter.enable()
+        ...
+        for usage in meter.usage(group_by=('table_name', 'tag')):
+            print(usage.table_name, usage.tag, usage.write_capacity_units_per_second)
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300,
+        resolution_seconds: float = 1,
+        time_module: Optional[Any] = None,
+    ) -> None:
+        """
+        :param window_seconds: How long consumed capacity is kept for
+        :param resolution_seconds: The granularity of the window: capacity is aggregated in buckets of this length
+        :param time_module: Optional: the module responsible for calculating time. Intended to be used for testing purposes.
+        """
+        if resolution_seconds <= 0:
+            raise ValueError("resolution_seconds must be greater than zero")
+        if window_seconds < resolution_seconds:
+            raise ValueError("window_seconds must be at least resolution_seconds")
+        self._window_seconds = window_seconds
+        self._resolution_seconds = resolution_seconds
+        self._time_module: Any = time_module or time
+        self._lock = threading.Lock()
+        self._start_time = self._time_module.time()
+        # (bucket number, {key: [read units, write units, requests]}), oldest first
+        self._buckets: Deque[Tuple[int, Dict[_Key, List[float]]]] = deque()
+
+    def enable(self) -> None:
+        """
+        Starts metering all requests, replacing the enabled meter (if any)
+        """
+        global meter
+        if meter is not None:
+            meter.disable()
+        request_hooks.register(after=self._after_request)
+        meter = self
+
+    def disable(self) -> None:
+        """
+        Stops metering
+        """
+        global meter
+        request_hooks.unregister(after=self._after_request)
+        if meter is self:
+            meter = None
+
+    def __enter__(self) -> 'CapacityMeter':
+        self.enable()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.disable()
+
+    def record(
+        self,
+        table_name: Optional[str],
+        index_name: Optional[str],
+        operation: Optional[str],
+        read_capacity_units: float,
+        write_capacity_units: float,
+        tag: Optional[str] = None,
+        requests: int = 1,
+    ) -> None:
+        """
+        Records capacity consumed on a table (or one of its indexes)
+        """
+        key = (table_name, index_name, operation, tag)
+        bucket = int(self._time_module.time() // self._resolution_seconds)
+        with self._lock:
+            if not self._buckets or self._buckets[-1][0] != bucket:
+                self._buckets.append((bucket, {}))
+                self._expire(bucket)
+            totals = self._buckets[-1][1].get(key)
+            if totals is None:
+                totals = self._buckets[-1][1][key] = [0.0, 0.0, 0]
+            totals[0] += read_capacity_units
+            totals[1] += write_capacity_units
+            totals[2] += requests
+
+    def _expire(self, bucket: int) -> None:
+        oldest = bucket - math.ceil(self._window_seconds / self._resolution_seconds)
+        while self._buckets and self._buckets[0][0] <= oldest:
+            self._buckets.popleft()
+
+    def _after_request(self, context: RequestContext) -> None:
+        consumed_capacity = context.consumed_capacity
+        if not consumed_capacity:
+            return
+        tag = current_tag.get()
+        for entry in consumed_capacity if isinstance(consumed_capacity, list) else [consumed_capacity]:
+            parts = [
+                (index_name, split_capacity_units(context.operation, capacity))
+                for index_name, capacity in _split_indexes(entry, context.index_name)
+            ]
+            consumed = [part for part in parts if part[1] != (0.0, 0.0)] or parts[:1]
+            for index_name, (read_units, write_units) in consumed:
+                self.record(entry.get(TABLE_NAME), index_name, context.operation, read_units, write_units, tag=tag)
+
+    def usage(
+        self,
+        window_seconds: Optional[float] = None,
+        group_by: Sequence[str] = DIMENSIONS,
+    ) -> List[CapacityUsage]:
+        """
+        Returns the capacity consumed over the last `window_seconds` (by default, the whole window of the meter),
+        sorted by dimension
+
+        :param window_seconds: The length of the window, at most the window of the meter
+        :param group_by: The dimensions to aggregate by, among :data:`DIMENSIONS`
+        """
+        unknown = set(group_by) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError("Cannot group by {}, must be among {}".format(sorted(unknown), DIMENSIONS))
+        window_seconds = min(window_seconds or self._window_seconds, self._window_seconds)
+        now = self._time_module.time()
+        # the current bucket is always included, even in windows shorter than the resolution
+        oldest = int(now // self._resolution_seconds) - max(math.ceil(window_seconds / self._resolution_seconds), 1)
+        grouped = [dimension in group_by for dimension in DIMENSIONS]
+
+        totals: Dict[_Key, List[float]] = {}
+        with self._lock:
+            for bucket, bucket_totals in self._buckets:
+                if bucket <= oldest:
+                    continue
+                for key, (read_units, write_units, requests) in bucket_totals.items():
+                    group = cast(_Key, tuple(value if keep else None for value, keep in zip(key, grouped)))
+                    group_totals = totals.get(group)
+                    if group_totals is None:
+                        group_totals = totals[group] = [0.0, 0.0, 0]
+                    group_totals[0] += read_units
+                    group_totals[1] += write_units
+                    group_totals[2] += requests
+
+        seconds = min(window_seconds, now - self._start_time)
+        return [
+            CapacityUsage(
+                table_name=table_name,
+                index_name=index_name,
+                operation=operation,
+                tag=tag,
+                read_capacity_units=read_units,
+                write_capacity_units=write_units,
+                requests=int(requests),
+                seconds=seconds,
+            )
+            for (table_name, index_name, operation, tag), (read_units, write_units, requests)
+            in sorted(totals.items(), key=lambda item: tuple(value or '' for value in item[0]))
+        ]
+
+    def reset(self) -> None:
+        """
+        Discards all recorded capacity
+        """
+        with self._lock:
+            self._buckets.clear()
+            self._start_time = self._time_module.time()
+
+
+def split_capacity_units(operation: str, capacity: Dict[str, Any]) -> Tuple[float, float]:
+    """
+    Returns the read and write capacity units of a ``ConsumedCapacity`` entry (or of one of its tables or indexes).
+    Unless DynamoDB breaks them down, the capacity units are read or write units depending on the operation.
+    """
+    read_units = capacity.get(READ_CAPACITY_UNITS)
+    write_units = capacity.get(WRITE_CAPACITY_UNITS)
+    if read_units is None and write_units is None:
+        units = capacity.get(CAPACITY_UNITS) or 0.0
+        return (units, 0.0) if operation in READ_OPERATIONS else (0.0, units)
+    return read_units or 0.0, write_units or 0.0
+
+
+def _split_indexes(entry: Dict[str, Any], index_name: Optional[str]) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+    """
+    Splits a ``ConsumedCapacity`` entry by index, with the table itself as the ``None`` index.
+    Without a per-index breakdown, all the capacity is attributed to the index the request was sent to.
+    """
+    if TABLE_KEY not in entry and GLOBAL_SECONDARY_INDEXES not in entry and LOCAL_SECONDARY_INDEXES not in entry:
+        return [(index_name, entry)]
+    parts: List[Tuple[Optional[str], Dict[str, Any]]] = []
+    if TABLE_KEY in entry:
+        parts.append((None, entry[TABLE_KEY]))
+    for indexes_key in (GLOBAL_SECONDARY_INDEXES, LOCAL_SECONDARY_INDEXES):
+        parts.extend((entry.get(indexes_key) or {}).items())
+    return parts
+
+
+class CapacityReporter:
+    """
+    Periodically reports the capacity consumed, as measured by a :class:`CapacityMeter`, on a daemon thread.
+
+    By default, the capacity consumed since the previous report is logged (at ``INFO`` level,
+    to the ``pynamodb.capacity`` logger).
+
+    Example:
+        with CapacityMeter() as meter, CapacityReporter(meter, interval_seconds=60):
+            serve_forever()
+    """
+
+    def __init__(
+        self,
+        meter: CapacityMeter,
+        interval_seconds: float = 60,
+        callback: Optional[Callable[[List[CapacityUsage]], None]] = None,
+        group_by: Sequence[str] = DIMENSIONS,
+    ) -> None:
+        """
+        :param meter: The meter to report the capacity of
+        :param interval_seconds: How often to report, and the window reported
+        :param callback: Called with the capacity consumed over the last interval
+        :param group_by: The dimensions to aggregate by (see :meth:`CapacityMeter.usage`)
+        """
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be greater than zero")
+        self._meter = meter
+        self._interval_seconds = interval_seconds
+        self._callback = callback or _log_usage
+        self._group_by = group_by
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Starts reporting
+        """
+        if self._thread is not None:
+            raise RuntimeError("The reporter was already started")
+        self._thread = threading.Thread(target=self._run, name='pynamodb-capacity-reporter', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops reporting, after a final report
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'CapacityReporter':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def report(self) -> None:
+        """
+        Reports the capacity consumed over the last interval
+        """
+        try:
+            self._callback(self._meter.usage(self._interval_seconds, group_by=self._group_by))
+        except Exception:
+            log.exception("Capacity report failed.")
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval_seconds):
+            self.report()
+        self.report()
+
+
+def _log_usage(usages: List[CapacityUsage]) -> None:
+    for usage in usages:
+        log.info(
+            "table=%s index=%s operation=%s tag=%s read_capacity_units=%.1f (%.2f/s) "
+            "write_capacity_units=%.1f (%.2f/s) requests=%d",
+            usage.table_name, usage.index_name, usage.operation, usage.tag,
+            usage.read_capacity_units, usage.read_capacity_units_per_second,
+            usage.write_capacity_units, usage.write_capacity_units_per_second, usage.requests,
+        )
@@ -2,11 +2,16 @@
 PynamoDB lowest level connection
 """
 
+from pynamodb.connection.aio import AsyncConnection, AsyncTableConnection
 from pynamodb.connection.base import Connection
 from pynamodb.connection.table import TableConnection
+from pynamodb.connection.transport import Transport
 
 
 __all__ = [
+    "AsyncConnection",
+    "AsyncTableConnection",
     "Connection",
     "TableConnection",
+    "Transport",
 ]
@@ -1,18 +1,34 @@
 """
 Type-annotates the private botocore APIs that we're currently relying on.
 """
-from typing import Dict
+from typing import Any, Dict, Optional
 
 import botocore.client
 import botocore.credentials
 import botocore.endpoint
 import botocore.hooks
+import botocore.httpsession
 import botocore.model
 import botocore.signers
+import urllib3
+
+
+class BotocoreHTTPSessionPrivate(botocore.httpsession.URLLib3Session):
+    _manager: urllib3.PoolManager
+    _proxy_managers: Dict[str, urllib3.PoolManager]
+    _proxy_config: Any
+    _verify: Any
+
+    def _get_connection_manager(self, url: str, proxy_url: Optional[str] = None) -> urllib3.PoolManager:
+        raise NotImplementedError
+
+    def _setup_ssl_cert(self, conn: Any, url: str, verify: Any) -> None:
+        raise NotImplementedError
 
 
 class BotocoreEndpointPrivate(botocore.endpoint.Endpoint):
     _event_emitter: botocore.hooks.HierarchicalEmitter
+    http_session: BotocoreHTTPSessionPrivate
 
 
 class BotocoreRequestSignerPrivate(botocore.signers.RequestSigner):
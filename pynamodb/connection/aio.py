@@ -0,0 +1,693 @@
+"""
+PynamoDB asyncio connection classes
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+import logging
+from typing import Any, Dict, Mapping, Optional, Sequence
+from typing import TYPE_CHECKING
+
+from botocore.exceptions import ClientError
+
+from pynamodb import throughput
+from pynamodb.connection.base import BOTOCORE_EXCEPTIONS, Connection, MetaTable
+from pynamodb.connection.transport import Transport
+from pynamodb.constants import (
+    BATCH_GET_ITEM, BATCH_WRITE_ITEM, DELETE_ITEM, GET_ITEM, ITEM, KEY, PUT_ITEM, QUERY, SCAN, SERVICE_NAME,
+    TRANSACT_GET_ITEMS, TRANSACT_WRITE_ITEMS, UPDATE_ITEM,
+)
+from pynamodb.exceptions import (
+    DeleteError, GetError, PutError, QueryError, ScanError, TransactGetError, TransactWriteError, UpdateError,
+)
+from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.update import Action
+
+if TYPE_CHECKING:
+    import asyncio
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class AsyncConnection:
+    """
+    An asyncio counterpart to :class:`~pynamodb.connection.Connection`
+
+    Requests are built by a regular :class:`~pynamodb.connection.Connection` (available as
+    :attr:`connection`) and sent through an `aiobotocore`_ client, so only the transport differs.
+    Data plane operations are coroutines; table management operations are available
+    synchronously on :attr:`connection`.
+
+    .. _aiobotocore: https://pypi.org/project/aiobotocore/
+    """
+
+    def __init__(self,
+                 region: Optional[str] = None,
+                 host: Optional[str] = None,
+                 read_timeout_seconds: Optional[float] = None,
+                 connect_timeout_seconds: Optional[float] = None,
+                 max_retry_attempts: Optional[int] = None,
+                 max_pool_connections: Optional[int] = None,
+                 extra_headers: Optional[Mapping[str, str]] = None,
+                 aws_access_key_id: Optional[str] = None,
+                 aws_secret_access_key: Optional[str] = None,
+                 aws_session_token: Optional[str] = None,
+                 transport: Optional[Transport] = None):
+        self.connection = Connection(region=region,
+                                     host=host,
+                                     read_timeout_seconds=read_timeout_seconds,
+                                     connect_timeout_seconds=connect_timeout_seconds,
+                                     max_retry_attempts=max_retry_attempts,
+                                     max_pool_connections=max_pool_connections,
+                                     extra_headers=extra_headers,
+                                     aws_access_key_id=aws_access_key_id,
+                                     aws_secret_access_key=aws_secret_access_key,
+                                     aws_session_token=aws_session_token,
+                                     transport=transport)
+        self._client: Any = None
+        self._client_context: Any = None
+        self._client_loop: Optional['asyncio.AbstractEventLoop'] = None
+        self._client_lock: Optional['asyncio.Lock'] = None
+
+    def __repr__(self) -> str:
+        return "AsyncConnection<{}>".format(self.connection.host or self.connection.region)
+
+    async def __aenter__(self) -> 'AsyncConnection':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the underlying aiobotocore client and its connection pool
+        """
+        client_context = self._client_context
+        self._client = None
+        self._client_context = None
+        if client_context is not None:
+            await client_context.__aexit__(None, None, None)
+
+    @staticmethod
+    async def _close_stale_client(client_context: Any) -> None:
+        """
+        Closes the client of a previous event loop, so that its aiohttp session is not leaked
+        """
+        try:
+            await client_context.__aexit__(None, None, None)
+        except Exception:
+            # connections bound to a closed event loop cannot be closed from another one
+            log.debug("Failed to close the client of a previous event loop", exc_info=True)
+
+    async def _get_client(self) -> Any:
+        """
+        Returns an aiobotocore dynamodb client bound to the running event loop
+        """
+        import asyncio  # already imported by the running event loop
+
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop is loop:
+            return self._client
+        if self._client_loop is not loop:
+            # aiobotocore clients (and their aiohttp sessions) cannot be shared across event loops
+            stale_client_context = self._client_context
+            self._client = None
+            self._client_context = None
+            self._client_loop = loop
+            self._client_lock = asyncio.Lock()
+            if stale_client_context is not None:
+                await self._close_stale_client(stale_client_context)
+        assert self._client_lock is not None
+        async with self._client_lock:
+            if self._client is None:
+                try:
+                    from aiobotocore.config import AioConfig
+                    from aiobotocore.session import get_session
+                except ImportError:
+                    raise ImportError(
+                        "AsyncConnection requires the aiobotocore package: pip install pynamodb[asyncio]"
+                    ) from None
+                session = get_session()
+                connection = self.connection
+                if connection._aws_access_key_id and connection._aws_secret_access_key:
+                    session.set_credentials(connection._aws_access_key_id,
+                                            connection._aws_secret_access_key,
+                                            connection._aws_session_token)
+                config = AioConfig(**connection._get_client_config_kwargs())
+                client_context = session.create_client(SERVICE_NAME, connection.region,
+                                                       endpoint_url=connection.host, config=config)
+                client = await client_context.__aenter__()
+                client.meta.events.register_first('before-send.*.*', connection._before_send)
+                self._client_context = client_context
+                self._client = client
+        return self._client
+
+    async def _make_api_call(self, operation_name: str, operation_kwargs: Dict) -> Dict:
+        if self.connection._transport is not None:
+            return self.connection._make_api_call(operation_name, operation_kwargs)
+        client = await self._get_client()
+        try:
+            return await client._make_api_call(operation_name, operation_kwargs)
+        except ClientError as e:
+            raise self.connection._get_verbose_client_error(e, operation_name, operation_kwargs) from e
+
+    async def dispatch(self, operation_name: str, operation_kwargs: Dict) -> Dict:
+        """
+        Dispatches `operation_name` with arguments `operation_kwargs`
+        """
+        self.connection._prepare_dispatch(operation_name, operation_kwargs)
+        if throughput.governor is not None:
+            await throughput.governor.acquire_async(operation_name, operation_kwargs)
+        if not self.connection._has_hooks():
+            data = await self._make_api_call(operation_name, operation_kwargs)
+            self.connection._log_consumed_capacity(operation_name, data)
+            return data
+
+        context = self.connection._start_request(operation_name, operation_kwargs)
+        try:
+            data = await self._make_api_call(operation_name, operation_kwargs)
+        except Exception as e:
+            self.connection._finish_request(context, error=e)
+            raise
+        self.connection._finish_request(context, data)
+
+        self.connection._log_consumed_capacity(operation_name, data)
+        return data
+
+    def add_meta_table(self, meta_table: MetaTable) -> None:
+        """
+        Adds information about the table's schema.
+        """
+        self.connection.add_meta_table(meta_table)
+
+    def get_meta_table(self, table_name: str) -> MetaTable:
+        """
+        Returns information about the table's schema.
+        """
+        return self.connection.get_meta_table(table_name)
+
+    async def delete_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the DeleteItem operation and returns the result
+        """
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name,
+            hash_key,
+            range_key=range_key,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics
+        )
+        try:
+            return await self.dispatch(DELETE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise DeleteError("Failed to delete item: {}".format(e), e)
+
+    async def update_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        actions: Optional[Sequence[Action]] = None,
+        condition: Optional[Condition] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+        return_values: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the UpdateItem operation
+        """
+        if not actions:
+            raise ValueError("'actions' cannot be empty")
+
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name=table_name,
+            hash_key=hash_key,
+            range_key=range_key,
+            actions=actions,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return await self.dispatch(UPDATE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise UpdateError("Failed to update item: {}".format(e), e)
+
+    async def put_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        attributes: Optional[Any] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the PutItem operation and returns the result
+        """
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name=table_name,
+            hash_key=hash_key,
+            range_key=range_key,
+            key=ITEM,
+            attributes=attributes,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics
+        )
+        try:
+            return await self.dispatch(PUT_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise PutError("Failed to put item: {}".format(e), e)
+
+    async def transact_write_items(
+        self,
+        condition_check_items: Sequence[Dict],
+        delete_items: Sequence[Dict],
+        put_items: Sequence[Dict],
+        update_items: Sequence[Dict],
+        client_request_token: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the TransactWrite operation and returns the result
+        """
+        operation_kwargs = self.connection._get_transact_write_items_operation_kwargs(
+            condition_check_items,
+            delete_items,
+            put_items,
+            update_items,
+            client_request_token=client_request_token,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return await self.dispatch(TRANSACT_WRITE_ITEMS, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise TransactWriteError("Failed to write transaction items", e)
+
+    async def transact_get_items(
+        self,
+        get_items: Sequence[Dict],
+        return_consumed_capacity: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the TransactGet operation and returns the result
+        """
+        operation_kwargs = self.connection._get_transact_get_items_operation_kwargs(
+            get_items,
+            return_consumed_capacity=return_consumed_capacity,
+        )
+        try:
+            return await self.dispatch(TRANSACT_GET_ITEMS, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise TransactGetError("Failed to get transaction items", e)
+
+    async def batch_write_item(
+        self,
+        table_name: str,
+        put_items: Optional[Any] = None,
+        delete_items: Optional[Any] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the batch_write_item operation
+        """
+        operation_kwargs = self.connection._get_batch_write_item_operation_kwargs(
+            table_name,
+            put_items=put_items,
+            delete_items=delete_items,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return await self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise PutError("Failed to batch write items: {}".format(e), e)
+
+    async def batch_get_item(
+        self,
+        table_name: str,
+        keys: Sequence[str],
+        consistent_read: Optional[bool] = None,
+        return_consumed_capacity: Optional[str] = None,
+        attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
+        """
+        Performs the batch get item operation
+        """
+        operation_kwargs = self.connection._get_batch_get_item_operation_kwargs(
+            table_name,
+            keys,
+            consistent_read=consistent_read,
+            return_consumed_capacity=return_consumed_capacity,
+            attributes_to_get=attributes_to_get,
+        )
+        try:
+            return await self.dispatch(BATCH_GET_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise GetError("Failed to batch get items: {}".format(e), e)
+
+    async def get_item(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
+        """
+        Performs the GetItem operation and returns the result
+        """
+        operation_kwargs = self.connection.get_operation_kwargs(
+            table_name=table_name,
+            hash_key=hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get
+        )
+        try:
+            return await self.dispatch(GET_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise GetError("Failed to get item: {}".format(e), e)
+
+    async def scan(
+        self,
+        table_name: str,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        exclusive_start_key: Optional[str] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the scan operation
+        """
+        operation_kwargs = self.connection._get_scan_operation_kwargs(
+            table_name,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            exclusive_start_key=exclusive_start_key,
+            segment=segment,
+            total_segments=total_segments,
+            consistent_read=consistent_read,
+            index_name=index_name,
+        )
+        try:
+            return await self.dispatch(SCAN, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise ScanError("Failed to scan table: {}".format(e), e)
+
+    async def query(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        consistent_read: bool = False,
+        exclusive_start_key: Optional[Any] = None,
+        index_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        select: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the Query operation and returns the result
+        """
+        operation_kwargs = self.connection._get_query_operation_kwargs(
+            table_name,
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            consistent_read=consistent_read,
+            exclusive_start_key=exclusive_start_key,
+            index_name=index_name,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            scan_index_forward=scan_index_forward,
+            select=select,
+        )
+        try:
+            return await self.dispatch(QUERY, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise QueryError("Failed to query items: {}".format(e), e)
+
+
+class AsyncTableConnection:
+    """
+    An asyncio counterpart to :class:`~pynamodb.connection.TableConnection`
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        region: Optional[str] = None,
+        host: Optional[str] = None,
+        connect_timeout_seconds: Optional[float] = None,
+        read_timeout_seconds: Optional[float] = None,
+        max_retry_attempts: Optional[int] = None,
+        max_pool_connections: Optional[int] = None,
+        extra_headers: Optional[Mapping[str, str]] = None,
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+        aws_session_token: Optional[str] = None,
+        *,
+        meta_table: Optional[MetaTable] = None,
+        transport: Optional[Transport] = None,
+    ) -> None:
+        self.table_name = table_name
+        self.connection = AsyncConnection(region=region,
+                                          host=host,
+                                          connect_timeout_seconds=connect_timeout_seconds,
+                                          read_timeout_seconds=read_timeout_seconds,
+                                          max_retry_attempts=max_retry_attempts,
+                                          max_pool_connections=max_pool_connections,
+                                          extra_headers=extra_headers,
+                                          aws_access_key_id=aws_access_key_id,
+                                          aws_secret_access_key=aws_secret_access_key,
+                                          aws_session_token=aws_session_token,
+                                          transport=transport)
+
+        if meta_table is not None:
+            self.connection.add_meta_table(meta_table)
+
+    def get_meta_table(self) -> MetaTable:
+        """
+        Returns a MetaTable
+        """
+        return self.connection.get_meta_table(self.table_name)
+
+    async def close(self) -> None:
+        """
+        Closes the underlying aiobotocore client
+        """
+        await self.connection.close()
+
+    async def delete_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the DeleteItem operation and returns the result
+        """
+        return await self.connection.delete_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+
+    async def update_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        actions: Optional[Sequence[Action]] = None,
+        condition: Optional[Condition] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+        return_values: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the UpdateItem operation
+        """
+        return await self.connection.update_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            actions=actions,
+            condition=condition,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+            return_values=return_values,
+        )
+
+    async def put_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        attributes: Optional[Any] = None,
+        condition: Optional[Condition] = None,
+        return_values: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the PutItem operation and returns the result
+        """
+        return await self.connection.put_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            attributes=attributes,
+            condition=condition,
+            return_values=return_values,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+
+    async def batch_write_item(
+        self,
+        put_items: Optional[Any] = None,
+        delete_items: Optional[Any] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the batch_write_item operation
+        """
+        return await self.connection.batch_write_item(
+            self.table_name,
+            put_items=put_items,
+            delete_items=delete_items,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+
+    async def batch_get_item(
+        self,
+        keys: Sequence[str],
+        consistent_read: Optional[bool] = None,
+        return_consumed_capacity: Optional[str] = None,
+        attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
+        """
+        Performs the batch get item operation
+        """
+        return await self.connection.batch_get_item(
+            self.table_name,
+            keys,
+            consistent_read=consistent_read,
+            return_consumed_capacity=return_consumed_capacity,
+            attributes_to_get=attributes_to_get,
+        )
+
+    async def get_item(
+        self,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
+        """
+        Performs the GetItem operation and returns the result
+        """
+        return await self.connection.get_item(
+            self.table_name,
+            hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+        )
+
+    async def scan(
+        self,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        exclusive_start_key: Optional[str] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the scan operation
+        """
+        return await self.connection.scan(
+            self.table_name,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            segment=segment,
+            total_segments=total_segments,
+            exclusive_start_key=exclusive_start_key,
+            consistent_read=consistent_read,
+            index_name=index_name,
+        )
+
+    async def query(
+        self,
+        hash_key: str,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        consistent_read: bool = False,
+        exclusive_start_key: Optional[Any] = None,
+        index_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        select: Optional[str] = None,
+    ) -> Dict:
+        """
+        Performs the Query operation and returns the result
+        """
+        return await self.connection.query(
+            self.table_name,
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            consistent_read=consistent_read,
+            exclusive_start_key=exclusive_start_key,
+            index_name=index_name,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            scan_index_forward=scan_index_forward,
+            select=select,
+        )
@@ -1,18 +1,18 @@
 """
 Lowest level connection
 """
+import functools
 import logging
 import uuid
-from threading import local
 from typing import Any, Dict, List, Mapping, Optional, Sequence, cast
 
-import botocore.client
-import botocore.exceptions
-from botocore.client import ClientError
-from botocore.exceptions import BotoCoreError
-from botocore.session import get_session
+from typing import TYPE_CHECKING
 
-from pynamodb.connection._botocore_private import BotocoreBaseClientPrivate
+from botocore.exceptions import BotoCoreError, ClientError
+
+from pynamodb import capacity, throughput
+from pynamodb.connection.registry import ClientKey, client_registry, open_connections
+from pynamodb.connection.transport import Transport
 from pynamodb._util import bin_decode_attr
 from pynamodb.constants import (
     RETURN_CONSUMED_CAPACITY_VALUES, RETURN_ITEM_COLL_METRICS_VALUES,
@@ -26,7 +26,7 @@ from pynamodb.constants import (
     KEYS, KEY, SEGMENT, TOTAL_SEGMENTS, CREATE_TABLE, PROVISIONED_THROUGHPUT, READ_CAPACITY_UNITS,
     WRITE_CAPACITY_UNITS, GLOBAL_SECONDARY_INDEXES, PROJECTION, EXCLUSIVE_START_TABLE_NAME, TOTAL,
     DELETE_TABLE, UPDATE_TABLE, LIST_TABLES, GLOBAL_SECONDARY_INDEX_UPDATES, ATTRIBUTES,
-    CONSUMED_CAPACITY, CAPACITY_UNITS, ATTRIBUTE_TYPES,
+    CONSUMED_CAPACITY, CAPACITY_UNITS, ATTRIBUTE_TYPES, INDEXES,
     ITEMS, LAST_EVALUATED_KEY, RESPONSES, UNPROCESSED_KEYS,
     UNPROCESSED_ITEMS, STREAM_SPECIFICATION, STREAM_VIEW_TYPE, STREAM_ENABLED,
     EXPRESSION_ATTRIBUTE_NAMES, EXPRESSION_ATTRIBUTE_VALUES,
@@ -47,9 +47,15 @@ from pynamodb.expressions.operand import Path
 from pynamodb.expressions.projection import create_projection_expression
 from pynamodb.expressions.update import Action, Update
 from pynamodb.settings import get_settings_value
+from pynamodb.hooks import RequestContext, current_request, request_hooks
 from pynamodb.signals import pre_dynamodb_send, post_dynamodb_send
 from pynamodb.types import HASH, RANGE
 
+if TYPE_CHECKING:
+    # botocore's session and client modules are only imported with the first client (see _create_client)
+    import botocore.session
+    from pynamodb.connection._botocore_private import BotocoreBaseClientPrivate
+
 BOTOCORE_EXCEPTIONS = (BotoCoreError, ClientError)
 RATE_LIMITING_ERROR_CODES = ['ProvisionedThroughputExceededException', 'ThrottlingException']
 
@@ -57,6 +63,42 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
 
+def _add_headers(headers: Mapping[str, str], request, **_) -> None:
+    request.headers.update(headers)
+
+
+# botocore event handlers timing the phases of the request sent with hooks in the current context (if any)
+
+def _on_request_created(request, **_) -> None:
+    context = current_request.get()
+    if context is not None:
+        if context.attempts:
+            context.record('retry_wait')
+        else:
+            context.record('prepare')
+            context.request_size = len(request.body or b'')
+        context.attempts += 1
+
+
+def _on_before_send(**_) -> None:
+    context = current_request.get()
+    if context is not None:
+        context.record('sign')
+
+
+def _on_before_parse(response_dict, **_) -> None:
+    context = current_request.get()
+    if context is not None:
+        context.record('send')
+        context.response_size = len(response_dict.get('body') or b'')
+
+
+def _on_response_received(exception=None, **_) -> None:
+    context = current_request.get()
+    if context is not None:
+        context.record('send' if exception is not None else 'parse')
+
+
 class MetaTable(object):
     """
     A pythonic wrapper around table metadata
@@ -251,11 +293,10 @@ class Connection(object):
                  extra_headers: Optional[Mapping[str, str]] = None,
                  aws_access_key_id: Optional[str] = None,
                  aws_secret_access_key: Optional[str] = None,
-                 aws_session_token: Optional[str] = None):
+                 aws_session_token: Optional[str] = None,
+                 transport: Optional[Transport] = None):
         self._tables: Dict[str, MetaTable] = {}
         self.host = host
-        self._local = local()
-        self._client: Optional[BotocoreBaseClientPrivate] = None
         self._convert_to_request_dict__endpoint_url = False
         if region:
             self.region = region
@@ -291,7 +332,14 @@ class Connection(object):
         self._aws_secret_access_key = aws_secret_access_key
         self._aws_session_token = aws_session_token
 
+        if transport is not None:
+            self._transport = transport
+        else:
+            self._transport = get_settings_value('transport')
+
     def __repr__(self) -> str:
+        if self._transport is not None:
+            return "Connection<{!r}>".format(self._transport)
         return "Connection<{}>".format(self.client.meta.endpoint_url)
 
     def dispatch(self, operation_name: str, operation_kwargs: Dict) -> Dict:
@@ -300,24 +348,64 @@ class Connection(object):
 
         Raises TableDoesNotExist if the specified table does not exist
         """
+        self._prepare_dispatch(operation_name, operation_kwargs)
+        if throughput.governor is not None:
+            throughput.governor.acquire(operation_name, operation_kwargs)
+        if not self._has_hooks():
+            data = self._make_api_call(operation_name, operation_kwargs)
+            self._log_consumed_capacity(operation_name, data)
+            return data
+
+        context = self._start_request(operation_name, operation_kwargs)
+        token = current_request.set(context)
+        try:
+            data = self._make_api_call(operation_name, operation_kwargs)
+        except Exception as e:
+            self._finish_request(context, error=e)
+            raise
+        finally:
+            current_request.reset(token)
+        self._finish_request(context, data)
+
+        self._log_consumed_capacity(operation_name, data)
+        return data
+
+    @staticmethod
+    def _has_hooks() -> bool:
+        return bool(request_hooks or pre_dynamodb_send.receivers or post_dynamodb_send.receivers)
+
+    def _start_request(self, operation_name: str, operation_kwargs: Dict) -> RequestContext:
+        context = RequestContext(self, operation_name, operation_kwargs, req_uuid=uuid.uuid4())
+        self.send_pre_boto_callback(operation_name, context.req_uuid, context.table_name)
+        request_hooks.before_request(context)
+        return context
+
+    def _finish_request(
+        self,
+        context: RequestContext,
+        data: Optional[Dict] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        context.finish(data, error)
+        if error is None:
+            self.send_post_boto_callback(context.operation, context.req_uuid, context.table_name)
+        request_hooks.after_request(context)
+
+    def _prepare_dispatch(self, operation_name: str, operation_kwargs: Dict) -> None:
         if operation_name not in [DESCRIBE_TABLE, LIST_TABLES, UPDATE_TABLE, UPDATE_TIME_TO_LIVE, DELETE_TABLE, CREATE_TABLE]:
             if RETURN_CONSUMED_CAPACITY not in operation_kwargs:
-                operation_kwargs.update(self.get_consumed_capacity_map(TOTAL))
+                operation_kwargs.update(self.get_consumed_capacity_map(INDEXES if capacity.meter is not None else TOTAL))
+            elif capacity.meter is not None and operation_kwargs[RETURN_CONSUMED_CAPACITY] == TOTAL:
+                # the per-index breakdown still includes the total
+                operation_kwargs[RETURN_CONSUMED_CAPACITY] = INDEXES
         log.debug("Calling %s with arguments %s", operation_name, operation_kwargs)
 
-        table_name = operation_kwargs.get(TABLE_NAME)
-        req_uuid = uuid.uuid4()
-
-        self.send_pre_boto_callback(operation_name, req_uuid, table_name)
-        data = self._make_api_call(operation_name, operation_kwargs)
-        self.send_post_boto_callback(operation_name, req_uuid, table_name)
-
+    def _log_consumed_capacity(self, operation_name: str, data: Optional[Dict]) -> None:
         if data and CONSUMED_CAPACITY in data:
             capacity = data.get(CONSUMED_CAPACITY)
             if isinstance(capacity, dict) and CAPACITY_UNITS in capacity:
                 capacity = capacity.get(CAPACITY_UNITS)
             log.debug("%s %s consumed %s units",  data.get(TABLE_NAME, ''), operation_name, capacity)
-        return data
 
     def send_post_boto_callback(self, operation_name, req_uuid, table_name):
         try:
@@ -337,31 +425,41 @@ class Connection(object):
 
     def _make_api_call(self, operation_name: str, operation_kwargs: Dict) -> Dict:
         try:
+            if self._transport is not None:
+                return self._transport.make_api_call(operation_name, operation_kwargs)
             return self.client._make_api_call(operation_name, operation_kwargs)
         except ClientError as e:
-            resp_metadata = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
-            cancellation_reasons = e.response.get('CancellationReasons', [])
+            raise self._get_verbose_client_error(e, operation_name, operation_kwargs) from e
 
-            botocore_props = {'Error': e.response.get('Error', {})}
-            verbose_props = {
-                'request_id': resp_metadata.get('x-amzn-requestid', ''),
-                'table_name': self._get_table_name_for_error_context(operation_kwargs),
-            }
-            raise VerboseClientError(
-                botocore_props,
-                operation_name,
-                verbose_props,
-                cancellation_reasons=(
-                    (
-                        CancellationReason(
-                            code=d['Code'],
-                            message=d.get('Message'),
-                            raw_item=cast(Optional[Dict[str, Dict[str, Any]]], d.get('Item')),
-                        ) if d['Code'] != 'None' else None
-                    )
-                    for d in cancellation_reasons
-                ),
-            ) from e
+    def _get_verbose_client_error(
+        self,
+        e: ClientError,
+        operation_name: str,
+        operation_kwargs: Dict,
+    ) -> VerboseClientError:
+        resp_metadata = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+        cancellation_reasons = e.response.get('CancellationReasons', [])
+
+        botocore_props = {'Error': e.response.get('Error', {})}
+        verbose_props = {
+            'request_id': resp_metadata.get('x-amzn-requestid', ''),
+            'table_name': self._get_table_name_for_error_context(operation_kwargs),
+        }
+        return VerboseClientError(
+            botocore_props,
+            operation_name,
+            verbose_props,
+            cancellation_reasons=(
+                (
+                    CancellationReason(
+                        code=d['Code'],
+                        message=d.get('Message'),
+                        raw_item=cast(Optional[Dict[str, Dict[str, Any]]], d.get('Item')),
+                    ) if d['Code'] != 'None' else None
+                )
+                for d in cancellation_reasons
+            ),
+        )
 
     def _get_table_name_for_error_context(self, operation_kwargs) -> str:
         # First handle the two multi-table cases: batch and transaction operations
@@ -376,43 +474,91 @@ class Connection(object):
         return operation_kwargs.get(TABLE_NAME)
 
     @property
-    def session(self) -> botocore.session.Session:
+    def session(self) -> 'botocore.session.Session':
         """
-        Returns a valid botocore session
+        Returns a valid botocore session, shared by all threads (and by connections with the same credentials)
         """
-        # botocore client creation is not thread safe as of v1.2.5+ (see issue #153)
-        if getattr(self._local, 'session', None) is None:
-            self._local.session = get_session()
-            if self._aws_access_key_id and self._aws_secret_access_key:
-                self._local.session.set_credentials(self._aws_access_key_id,
-                                                        self._aws_secret_access_key,
-                                                        self._aws_session_token)
-        return self._local.session
+        return client_registry.get_session(self._aws_access_key_id,
+                                           self._aws_secret_access_key,
+                                           self._aws_session_token)
 
     @property
-    def client(self) -> BotocoreBaseClientPrivate:
+    def client(self) -> 'BotocoreBaseClientPrivate':
         """
         Returns a botocore dynamodb client
+
+        Connections with the same settings share a client (and its connection pool),
+        see :class:`~pynamodb.connection.registry.ClientRegistry`.
         """
-        # botocore has a known issue where it will cache empty credentials
-        # https://github.com/boto/botocore/blob/4d55c9b4142/botocore/credentials.py#L1016-L1021
-        # if the client does not have credentials, we create a new client
-        # otherwise the client is permanently poisoned in the case of metadata service flakiness when using IAM roles
-        if not self._client or (self._client._request_signer and not self._client._request_signer._credentials):
-            config = botocore.client.Config(
-                parameter_validation=False,  # Disable unnecessary validation for performance
-                connect_timeout=self._connect_timeout_seconds,
-                read_timeout=self._read_timeout_seconds,
-                max_pool_connections=self._max_pool_connections,
-                retries={
-                    'total_max_attempts': 1 + self._max_retry_attempts_exception,
-                    'mode': 'standard',
-                }
-            )
-            self._client = cast(BotocoreBaseClientPrivate, self.session.create_client(SERVICE_NAME, self.region, endpoint_url=self.host, config=config))
+        # not cached on the connection: the registry replaces clients without credentials,
+        # and discards all clients after a fork
+        return client_registry.get_client(self.client_key, self._create_client)
 
-            self._client.meta.events.register_first('before-send.*.*', self._before_send)
-        return self._client
+    @property
+    def client_key(self) -> ClientKey:
+        """
+        Returns the settings that determine this connection's botocore client
+        """
+        return ClientKey(
+            region=self.region,
+            host=self.host,
+            aws_access_key_id=self._aws_access_key_id,
+            aws_secret_access_key=self._aws_secret_access_key,
+            aws_session_token=self._aws_session_token,
+            connect_timeout_seconds=self._connect_timeout_seconds,
+            read_timeout_seconds=self._read_timeout_seconds,
+            max_retry_attempts=self._max_retry_attempts_exception,
+            max_pool_connections=self._max_pool_connections,
+            extra_headers=tuple(sorted((self._extra_headers or {}).items())),
+        )
+
+    def _create_client(self) -> 'BotocoreBaseClientPrivate':
+        from botocore.config import Config
+
+        config = Config(**self._get_client_config_kwargs())
+        client = cast('BotocoreBaseClientPrivate', self.session.create_client(SERVICE_NAME, self.region, endpoint_url=self.host, config=config))
+        if self._extra_headers:
+            # not self._before_send: the client outlives this connection
+            client.meta.events.register_first('before-send.*.*', functools.partial(_add_headers, dict(self._extra_headers)))
+        # before the request signer, which is registered for the same event
+        client.meta.events.register_first('request-created.dynamodb', _on_request_created)
+        client.meta.events.register('before-send.dynamodb', _on_before_send)
+        client.meta.events.register('before-parse.dynamodb', _on_before_parse)
+        client.meta.events.register('response-received.dynamodb', _on_response_received)
+        return client
+
+    def warm(self, pool_size: Optional[int] = None) -> None:
+        """
+        Prepares this connection for its first request: creates the botocore session and client
+        (loading the service model, resolving the endpoint and the credentials)
+        and, if `pool_size` is given, opens up to `pool_size` keep-alive connections to the endpoint.
+
+        Sessions, clients and their connections are discarded in processes forked after the warm-up,
+        but the service model stays loaded; in a prefork server, warm up once in the parent before forking
+        and, to open connections ahead of requests, again with a `pool_size` in each child.
+
+        :param pool_size: The number of connections to open (at most `max_pool_connections`)
+        """
+        if self._transport is not None:
+            return
+        client = self.client
+        service_model = client.meta.service_model
+        for operation_name in service_model.operation_names:
+            service_model.operation_model(operation_name)
+        if pool_size:
+            open_connections(client, pool_size)
+
+    def _get_client_config_kwargs(self) -> Dict[str, Any]:
+        return dict(
+            parameter_validation=False,  # Disable unnecessary validation for performance
+            connect_timeout=self._connect_timeout_seconds,
+            read_timeout=self._read_timeout_seconds,
+            max_pool_connections=self._max_pool_connections,
+            retries={
+                'total_max_attempts': 1 + self._max_retry_attempts_exception,
+                'mode': 'standard',
+            }
+        )
 
     def add_meta_table(self, meta_table: MetaTable) -> None:
         """
@@ -938,6 +1084,30 @@ class Connection(object):
         """
         Performs the TransactWrite operation and returns the result
         """
+        operation_kwargs = self._get_transact_write_items_operation_kwargs(
+            condition_check_items,
+            delete_items,
+            put_items,
+            update_items,
+            client_request_token=client_request_token,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return self.dispatch(TRANSACT_WRITE_ITEMS, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise TransactWriteError("Failed to write transaction items", e)
+
+    def _get_transact_write_items_operation_kwargs(
+        self,
+        condition_check_items: Sequence[Dict],
+        delete_items: Sequence[Dict],
+        put_items: Sequence[Dict],
+        update_items: Sequence[Dict],
+        client_request_token: Optional[str] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
         transact_items: List[Dict] = []
         transact_items.extend(
             {TRANSACT_CONDITION_CHECK: item} for item in condition_check_items
@@ -958,11 +1128,7 @@ class Connection(object):
             return_item_collection_metrics=return_item_collection_metrics
         )
         operation_kwargs[TRANSACT_ITEMS] = transact_items
-
-        try:
-            return self.dispatch(TRANSACT_WRITE_ITEMS, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise TransactWriteError("Failed to write transaction items", e)
+        return operation_kwargs
 
     def transact_get_items(
         self,
@@ -972,16 +1138,26 @@ class Connection(object):
         """
         Performs the TransactGet operation and returns the result
         """
-        operation_kwargs = self._get_transact_operation_kwargs(return_consumed_capacity=return_consumed_capacity)
-        operation_kwargs[TRANSACT_ITEMS] = [
-            {TRANSACT_GET: item} for item in get_items
-        ]
-
+        operation_kwargs = self._get_transact_get_items_operation_kwargs(
+            get_items,
+            return_consumed_capacity=return_consumed_capacity,
+        )
         try:
             return self.dispatch(TRANSACT_GET_ITEMS, operation_kwargs)
         except BOTOCORE_EXCEPTIONS as e:
             raise TransactGetError("Failed to get transaction items", e)
 
+    def _get_transact_get_items_operation_kwargs(
+        self,
+        get_items: Sequence[Dict],
+        return_consumed_capacity: Optional[str] = None,
+    ) -> Dict:
+        operation_kwargs = self._get_transact_operation_kwargs(return_consumed_capacity=return_consumed_capacity)
+        operation_kwargs[TRANSACT_ITEMS] = [
+            {TRANSACT_GET: item} for item in get_items
+        ]
+        return operation_kwargs
+
     def batch_write_item(
         self,
         table_name: str,
@@ -993,6 +1169,26 @@ class Connection(object):
         """
         Performs the batch_write_item operation
         """
+        operation_kwargs = self._get_batch_write_item_operation_kwargs(
+            table_name,
+            put_items=put_items,
+            delete_items=delete_items,
+            return_consumed_capacity=return_consumed_capacity,
+            return_item_collection_metrics=return_item_collection_metrics,
+        )
+        try:
+            return self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise PutError("Failed to batch write items: {}".format(e), e)
+
+    def _get_batch_write_item_operation_kwargs(
+        self,
+        table_name: str,
+        put_items: Optional[Any] = None,
+        delete_items: Optional[Any] = None,
+        return_consumed_capacity: Optional[str] = None,
+        return_item_collection_metrics: Optional[str] = None,
+    ) -> Dict:
         if put_items is None and delete_items is None:
             raise ValueError("Either put_items or delete_items must be specified")
         operation_kwargs: Dict[str, Any] = {
@@ -1017,10 +1213,7 @@ class Connection(object):
                     DELETE_REQUEST: self.get_item_attribute_map(table_name, item, item_key=KEY, pythonic_key=False)
                 })
         operation_kwargs[REQUEST_ITEMS][table_name] = delete_items_list + put_items_list
-        try:
-            return self.dispatch(BATCH_WRITE_ITEM, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise PutError("Failed to batch write items: {}".format(e), e)
+        return operation_kwargs
 
     def batch_get_item(
         self,
@@ -1033,6 +1226,26 @@ class Connection(object):
         """
         Performs the batch get item operation
         """
+        operation_kwargs = self._get_batch_get_item_operation_kwargs(
+            table_name,
+            keys,
+            consistent_read=consistent_read,
+            return_consumed_capacity=return_consumed_capacity,
+            attributes_to_get=attributes_to_get,
+        )
+        try:
+            return self.dispatch(BATCH_GET_ITEM, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise GetError("Failed to batch get items: {}".format(e), e)
+
+    def _get_batch_get_item_operation_kwargs(
+        self,
+        table_name: str,
+        keys: Sequence[str],
+        consistent_read: Optional[bool] = None,
+        return_consumed_capacity: Optional[str] = None,
+        attributes_to_get: Optional[Any] = None,
+    ) -> Dict:
         operation_kwargs: Dict[str, Any] = {
             REQUEST_ITEMS: {
                 table_name: {}
@@ -1058,10 +1271,7 @@ class Connection(object):
                 self.get_item_attribute_map(table_name, key)[ITEM]
             )
         operation_kwargs[REQUEST_ITEMS][table_name].update(keys_map)
-        try:
-            return self.dispatch(BATCH_GET_ITEM, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise GetError("Failed to batch get items: {}".format(e), e)
+        return operation_kwargs
 
     def get_item(
         self,
@@ -1102,6 +1312,36 @@ class Connection(object):
         """
         Performs the scan operation
         """
+        operation_kwargs = self._get_scan_operation_kwargs(
+            table_name,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            exclusive_start_key=exclusive_start_key,
+            segment=segment,
+            total_segments=total_segments,
+            consistent_read=consistent_read,
+            index_name=index_name,
+        )
+        try:
+            return self.dispatch(SCAN, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise ScanError("Failed to scan table: {}".format(e), e)
+
+    def _get_scan_operation_kwargs(
+        self,
+        table_name: str,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        exclusive_start_key: Optional[str] = None,
+        segment: Optional[int] = None,
+        total_segments: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+    ) -> Dict:
         self._check_condition('filter_condition', filter_condition)
 
         operation_kwargs: Dict[str, Any] = {TABLE_NAME: table_name}
@@ -1132,11 +1372,7 @@ class Connection(object):
             operation_kwargs[EXPRESSION_ATTRIBUTE_NAMES] = self._reverse_dict(name_placeholders)
         if expression_attribute_values:
             operation_kwargs[EXPRESSION_ATTRIBUTE_VALUES] = expression_attribute_values
-
-        try:
-            return self.dispatch(SCAN, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise ScanError("Failed to scan table: {}".format(e), e)
+        return operation_kwargs
 
     def query(
         self,
@@ -1156,6 +1392,40 @@ class Connection(object):
         """
         Performs the Query operation and returns the result
         """
+        operation_kwargs = self._get_query_operation_kwargs(
+            table_name,
+            hash_key,
+            range_key_condition=range_key_condition,
+            filter_condition=filter_condition,
+            attributes_to_get=attributes_to_get,
+            consistent_read=consistent_read,
+            exclusive_start_key=exclusive_start_key,
+            index_name=index_name,
+            limit=limit,
+            return_consumed_capacity=return_consumed_capacity,
+            scan_index_forward=scan_index_forward,
+            select=select,
+        )
+        try:
+            return self.dispatch(QUERY, operation_kwargs)
+        except BOTOCORE_EXCEPTIONS as e:
+            raise QueryError("Failed to query items: {}".format(e), e)
+
+    def _get_query_operation_kwargs(
+        self,
+        table_name: str,
+        hash_key: str,
+        range_key_condition: Optional[Condition] = None,
+        filter_condition: Optional[Any] = None,
+        attributes_to_get: Optional[Any] = None,
+        consistent_read: bool = False,
+        exclusive_start_key: Optional[Any] = None,
+        index_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        return_consumed_capacity: Optional[str] = None,
+        scan_index_forward: Optional[bool] = None,
+        select: Optional[str] = None,
+    ) -> Dict:
         self._check_condition('range_key_condition', range_key_condition)
         self._check_condition('filter_condition', filter_condition)
 
@@ -1206,11 +1476,7 @@ class Connection(object):
             operation_kwargs[EXPRESSION_ATTRIBUTE_NAMES] = self._reverse_dict(name_placeholders)
         if expression_attribute_values:
             operation_kwargs[EXPRESSION_ATTRIBUTE_VALUES] = expression_attribute_values
-
-        try:
-            return self.dispatch(QUERY, operation_kwargs)
-        except BOTOCORE_EXCEPTIONS as e:
-            raise QueryError("Failed to query items: {}".format(e), e)
+        return operation_kwargs
 
     def _check_condition(self, name, condition):
         if condition is not None:
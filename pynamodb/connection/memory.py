@@ -0,0 +1,1694 @@
+"""
+An in-memory DynamoDB, for tests and benchmarks
+"""
+import copy
+import re
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union, cast
+
+from botocore.exceptions import ClientError
+
+from pynamodb._util import key_value_id
+from pynamodb.connection.transport import Transport
+from pynamodb.constants import (
+    ALL, ALL_NEW, ALL_OLD, ALL_PROJECTED_ATTRIBUTES, ATTR_DEFINITIONS, ATTR_NAME, ATTR_TYPE, ATTRIBUTES,
+    BATCH_GET_ITEM, BATCH_GET_PAGE_LIMIT, BATCH_WRITE_ITEM, BATCH_WRITE_PAGE_LIMIT, BILLING_MODE, BINARY,
+    BINARY_SET, BOOLEAN, CAMEL_COUNT, CLIENT_REQUEST_TOKEN, CAPACITY_UNITS, CONDITION_EXPRESSION, CONSISTENT_READ, CONSUMED_CAPACITY,
+    COUNT, CREATE_TABLE, DELETE_ITEM, DELETE_REQUEST, DELETE_TABLE, DESCRIBE_TABLE, EXCLUSIVE_START_KEY,
+    EXCLUSIVE_START_TABLE_NAME, EXPRESSION_ATTRIBUTE_NAMES, EXPRESSION_ATTRIBUTE_VALUES, FILTER_EXPRESSION,
+    GET_ITEM, GLOBAL_SECONDARY_INDEX_UPDATES, GLOBAL_SECONDARY_INDEXES, INDEX_NAME, INDEXES, ITEM, ITEM_COUNT,
+    ITEMS, KEY, KEY_CONDITION_EXPRESSION, KEY_SCHEMA, KEY_TYPE, KEYS, KEYS_ONLY, LAST_EVALUATED_KEY, LIMIT,
+    LIST, LIST_TABLES, LOCAL_SECONDARY_INDEXES, MAP, NON_KEY_ATTRIBUTES, NONE, NULL, NUMBER, NUMBER_SET,
+    PAY_PER_REQUEST_BILLING_MODE, PROJECTION, PROJECTION_EXPRESSION, PROJECTION_TYPE, PROVISIONED_BILLING_MODE,
+    PROVISIONED_THROUGHPUT, PUT_ITEM, PUT_REQUEST, QUERY, READ_CAPACITY_UNITS, REQUEST_ITEMS, RESPONSES,
+    RETURN_CONSUMED_CAPACITY, RETURN_VALUES, RETURN_VALUES_ON_CONDITION_FAILURE, SCAN, SCAN_INDEX_FORWARD,
+    SCANNED_COUNT, SEGMENT, SELECT, SPECIFIC_ATTRIBUTES, STREAM_SPECIFICATION, STRING, STRING_SET,
+    TABLE_DESCRIPTION, TABLE_KEY, TABLE_NAME, TABLE_STATUS, TIME_TO_LIVE_SPECIFICATION, TOTAL, TOTAL_SEGMENTS,
+    TRANSACT_CONDITION_CHECK, TRANSACT_DELETE, TRANSACT_GET, TRANSACT_GET_ITEMS, TRANSACT_ITEMS, TRANSACT_PUT,
+    TRANSACT_UPDATE, TRANSACT_WRITE_ITEMS, UNPROCESSED_ITEMS, UNPROCESSED_KEYS, UPDATE, UPDATE_EXPRESSION,
+    UPDATE_ITEM, UPDATE_TABLE, UPDATE_TIME_TO_LIVE, UPDATED_NEW, UPDATED_OLD, WRITE_CAPACITY_UNITS, ACTIVE,
+    MAX_ITEM_SIZE_BYTES, TRANSACT_ITEM_LIMIT,
+)
+from pynamodb.sizing import item_size, read_capacity_units, write_capacity_units
+from pynamodb.types import HASH, RANGE
+
+_SET_TYPES = (STRING_SET, NUMBER_SET, BINARY_SET)
+_SET_ELEMENT_TYPES = {STRING_SET: STRING, NUMBER_SET: NUMBER, BINARY_SET: BINARY}
+_KEY_TYPES = (STRING, NUMBER, BINARY)
+_MAX_PAGE_BYTES = 1024 * 1024
+_CLIENT_REQUEST_TOKEN_SECONDS = 600
+
+_RawItem = Dict[str, Dict[str, Any]]
+_PathElement = Union[str, int]
+_Path = Tuple[_PathElement, ...]
+_Node = Tuple[Any, ...]
+
+
+class _DynamoDBError(Exception):
+    """
+    An error response, raised to the caller as a ClientError
+    """
+
+    def __init__(self, code: str, message: str, **extra: Any) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.extra = extra
+
+    def get_response(self) -> Dict[str, Any]:
+        response = {
+            'Error': {'Code': self.code, 'Message': self.message},
+            'ResponseMetadata': {'HTTPStatusCode': 400, 'HTTPHeaders': {}},
+        }
+        response.update(self.extra)
+        return response
+
+
+def _validation_error(message: str) -> _DynamoDBError:
+    return _DynamoDBError('ValidationException', message)
+
+
+# Attribute values
+
+
+def _normalize_number(value: Any) -> str:
+    try:
+        number = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        raise _validation_error("The parameter cannot be converted to a numeric value: {}".format(value)) from None
+    if not number.is_finite():
+        raise _validation_error("The parameter cannot be converted to a numeric value: {}".format(value))
+    if number.is_zero():
+        return '0'
+    # DynamoDB returns numbers in canonical form, e.g. '1.5' for '1.50' and '100' for '1E+2'
+    return '{:f}'.format(number.normalize())
+
+
+def _load_value(value: Any) -> Dict[str, Any]:
+    """
+    Validates an attribute value from a request, returning a copy with numbers in canonical form
+    """
+    if not isinstance(value, dict) or len(value) != 1:
+        raise _validation_error("Supplied AttributeValue must contain exactly one of the supported datatypes")
+    for attr_type, data in value.items():
+        if attr_type == STRING:
+            return {STRING: data}
+        if attr_type == NUMBER:
+            return {NUMBER: _normalize_number(data)}
+        if attr_type == BINARY:
+            return {BINARY: data.encode() if isinstance(data, str) else bytes(data)}
+        if attr_type == BOOLEAN:
+            return {BOOLEAN: bool(data)}
+        if attr_type == NULL:
+            return {NULL: True}
+        if attr_type == MAP:
+            return {MAP: {name: _load_value(v) for name, v in data.items()}}
+        if attr_type == LIST:
+            return {LIST: [_load_value(v) for v in data]}
+        if attr_type in _SET_TYPES:
+            if not data:
+                raise _validation_error("One or more parameter values were invalid: An {} may not be empty".format(attr_type))
+            elements: List[Any]
+            if attr_type == NUMBER_SET:
+                elements = [_normalize_number(v) for v in data]
+            elif attr_type == BINARY_SET:
+                elements = [v.encode() if isinstance(v, str) else bytes(v) for v in data]
+            else:
+                elements = list(data)
+            if len(set(elements)) != len(elements):
+                raise _validation_error("Input collection {} contains duplicates.".format(data))
+            return {attr_type: elements}
+    raise _validation_error("Supplied AttributeValue has an unsupported datatype: {}".format(value))
+
+
+def _load_item(item: Any) -> _RawItem:
+    if not isinstance(item, dict):
+        raise _validation_error("Item must be a map of attribute names to attribute values")
+    return {name: _load_value(value) for name, value in item.items()}
+
+
+def _copy_value(value: Dict[str, Any]) -> Dict[str, Any]:
+    for attr_type, data in value.items():
+        if attr_type == MAP:
+            return {MAP: {name: _copy_value(v) for name, v in data.items()}}
+        if attr_type == LIST:
+            return {LIST: [_copy_value(v) for v in data]}
+        if attr_type in _SET_TYPES:
+            return {attr_type: list(data)}
+        return {attr_type: data}
+    return {}
+
+
+def _copy_item(item: _RawItem) -> _RawItem:
+    return {name: _copy_value(value) for name, value in item.items()}
+
+
+def _get_type(value: Dict[str, Any]) -> str:
+    return next(iter(value))
+
+
+def _values_equal(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    # numbers are stored in canonical form, so they can be compared as strings
+    a_type, a_data = next(iter(a.items()))
+    b_type, b_data = next(iter(b.items()))
+    if a_type != b_type:
+        return False
+    if a_type in _SET_TYPES:
+        return set(a_data) == set(b_data)
+    if a_type == LIST:
+        return len(a_data) == len(b_data) and all(_values_equal(x, y) for x, y in zip(a_data, b_data))
+    if a_type == MAP:
+        return a_data.keys() == b_data.keys() and all(_values_equal(v, b_data[k]) for k, v in a_data.items())
+    return a_data == b_data
+
+
+def _compare(a: Dict[str, Any], b: Dict[str, Any]) -> Optional[int]:
+    """
+    Compares two scalar values of the same type, returning None if they cannot be ordered
+    """
+    a_type, a_data = next(iter(a.items()))
+    b_type, b_data = next(iter(b.items()))
+    if a_type != b_type or a_type not in _KEY_TYPES:
+        return None
+    x, y = key_value_id(a_type, a_data), key_value_id(b_type, b_data)
+    return (x > y) - (x < y)
+
+
+def _write_units(*items: Optional[_RawItem]) -> float:
+    size = max((item_size(item) for item in items if item is not None), default=0)
+    return write_capacity_units(size)
+
+
+# Expressions
+
+
+_TOKEN_REGEX = re.compile(r"""
+    \s*(?:
+        (?P<name>\#[A-Za-z0-9_]+)
+      | (?P<value>:[A-Za-z0-9_]+)
+      | (?P<number>\d+)
+      | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op><>|<=|>=|[=<>()\[\],.+-])
+    )""", re.VERBOSE)
+_COMPARATORS = ('=', '<>', '<', '<=', '>', '>=')
+_CONDITION_FUNCTIONS = ('attribute_exists', 'attribute_not_exists', 'attribute_type', 'begins_with', 'contains')
+_UPDATE_CLAUSES = ('SET', 'REMOVE', 'ADD', 'DELETE')
+
+
+class _Parser:
+    """
+    A recursive descent parser for condition, key condition, update and projection expressions.
+    Expressions are parsed into tuples, whose first element is the kind of node.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens: List[Tuple[str, str]] = []
+        pos = 0
+        expression = expression.rstrip()
+        while pos < len(expression):
+            match = _TOKEN_REGEX.match(expression, pos)
+            if match is None or match.end() == pos:
+                raise self._error("unexpected character at position {}".format(pos))
+            kind = match.lastgroup
+            assert kind is not None
+            self.tokens.append((kind, match.group(kind)))
+            pos = match.end()
+        self.tokens.append(('end', ''))
+        self.pos = 0
+
+    def _error(self, message: str) -> _DynamoDBError:
+        return _validation_error("Invalid expression: {}; expression: {}".format(message, self.expression))
+
+    def _peek(self, offset: int = 0) -> Tuple[str, str]:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def _next(self) -> Tuple[str, str]:
+        token = self.tokens[self.pos]
+        if token[0] != 'end':
+            self.pos += 1
+        return token
+
+    def _accept(self, text: str) -> bool:
+        if self._peek() == ('op', text):
+            self.pos += 1
+            return True
+        return False
+
+    def _expect(self, text: str) -> None:
+        if not self._accept(text):
+            raise self._error("expected '{}' but found '{}'".format(text, self._peek()[1]))
+
+    def _accept_keyword(self, keyword: str) -> bool:
+        kind, text = self._peek()
+        if kind == 'ident' and text.upper() == keyword:
+            self.pos += 1
+            return True
+        return False
+
+    def _is_function(self, names: Sequence[str]) -> bool:
+        kind, text = self._peek()
+        return kind == 'ident' and text.lower() in names and self._peek(1) == ('op', '(')
+
+    def _expect_end(self) -> None:
+        if self._peek()[0] != 'end':
+            raise self._error("unexpected token '{}'".format(self._peek()[1]))
+
+    # Conditions
+
+    def parse_condition(self) -> _Node:
+        node = self._parse_or()
+        self._expect_end()
+        return node
+
+    def _parse_or(self) -> _Node:
+        node = self._parse_and()
+        while self._accept_keyword('OR'):
+            node = ('or', node, self._parse_and())
+        return node
+
+    def _parse_and(self) -> _Node:
+        node = self._parse_not()
+        while self._accept_keyword('AND'):
+            node = ('and', node, self._parse_not())
+        return node
+
+    def _parse_not(self) -> _Node:
+        if self._accept_keyword('NOT'):
+            return ('not', self._parse_not())
+        return self._parse_predicate()
+
+    def _parse_predicate(self) -> _Node:
+        if self._accept('('):
+            node = self._parse_or()
+            self._expect(')')
+            return node
+        if self._is_function(_CONDITION_FUNCTIONS):
+            name = self._next()[1].lower()
+            self._expect('(')
+            args = [self._parse_operand()]
+            while self._accept(','):
+                args.append(self._parse_operand())
+            self._expect(')')
+            if len(args) != (1 if name in ('attribute_exists', 'attribute_not_exists') else 2):
+                raise self._error("incorrect number of operands for function {}".format(name))
+            if args[0][0] != 'path':
+                raise self._error("the first operand of function {} must be a document path".format(name))
+            return ('function', name, tuple(args))
+        operand = self._parse_operand()
+        if self._accept_keyword('BETWEEN'):
+            low = self._parse_operand()
+            if not self._accept_keyword('AND'):
+                raise self._error("expected AND in BETWEEN")
+            return ('between', operand, low, self._parse_operand())
+        if self._accept_keyword('IN'):
+            self._expect('(')
+            candidates = [self._parse_operand()]
+            while self._accept(','):
+                candidates.append(self._parse_operand())
+            self._expect(')')
+            return ('in', operand, tuple(candidates))
+        kind, text = self._peek()
+        if kind == 'op' and text in _COMPARATORS:
+            self.pos += 1
+            return ('compare', text, operand, self._parse_operand())
+        raise self._error("expected a comparison but found '{}'".format(text))
+
+    def _parse_operand(self) -> _Node:
+        kind, text = self._peek()
+        if kind == 'value':
+            self.pos += 1
+            return ('value', text)
+        if self._is_function(('size',)):
+            self.pos += 2
+            path = self._parse_path()
+            self._expect(')')
+            return ('size', path)
+        return self._parse_path()
+
+    def _parse_path(self) -> _Node:
+        elements: List[_PathElement] = [self._parse_path_name()]
+        while True:
+            if self._accept('.'):
+                elements.append(self._parse_path_name())
+            elif self._accept('['):
+                kind, text = self._next()
+                if kind != 'number':
+                    raise self._error("expected a list index but found '{}'".format(text))
+                self._expect(']')
+                elements.append(int(text))
+            else:
+                return ('path', tuple(elements))
+
+    def _parse_path_name(self) -> str:
+        kind, text = self._next()
+        if kind not in ('name', 'ident'):
+            raise self._error("expected an attribute name but found '{}'".format(text))
+        return text
+
+    # Updates
+
+    def parse_update(self) -> Tuple[_Node, ...]:
+        actions: List[_Node] = []
+        seen: Set[str] = set()
+        while self._peek()[0] != 'end':
+            kind, text = self._next()
+            clause = text.upper()
+            if kind != 'ident' or clause not in _UPDATE_CLAUSES:
+                raise self._error("expected SET, REMOVE, ADD or DELETE but found '{}'".format(text))
+            if clause in seen:
+                raise self._error("the {} section can only be used once".format(clause))
+            seen.add(clause)
+            while True:
+                path = self._parse_path()
+                if clause == 'SET':
+                    self._expect('=')
+                    actions.append((clause, path, self._parse_set_value()))
+                elif clause == 'REMOVE':
+                    actions.append((clause, path, None))
+                else:
+                    kind, text = self._next()
+                    if kind != 'value':
+                        raise self._error("{} requires a value but found '{}'".format(clause, text))
+                    actions.append((clause, path, ('value', text)))
+                if not self._accept(','):
+                    break
+        if not actions:
+            raise self._error("the expression is empty")
+        return tuple(actions)
+
+    def _parse_set_value(self) -> _Node:
+        operand = self._parse_set_operand()
+        if self._accept('+'):
+            return ('+', operand, self._parse_set_operand())
+        if self._accept('-'):
+            return ('-', operand, self._parse_set_operand())
+        return operand
+
+    def _parse_set_operand(self) -> _Node:
+        if self._is_function(('if_not_exists', 'list_append')):
+            name = self._next()[1].lower()
+            self._expect('(')
+            first = self._parse_set_operand()
+            self._expect(',')
+            second = self._parse_set_operand()
+            self._expect(')')
+            if name == 'if_not_exists' and first[0] != 'path':
+                raise self._error("the first operand of if_not_exists must be a document path")
+            return (name, first, second)
+        kind, text = self._peek()
+        if kind == 'value':
+            self.pos += 1
+            return ('value', text)
+        return self._parse_path()
+
+    # Projections
+
+    def parse_projection(self) -> Tuple[_Node, ...]:
+        paths = [self._parse_path()]
+        while self._accept(','):
+            paths.append(self._parse_path())
+        self._expect_end()
+        return tuple(paths)
+
+
+@lru_cache(maxsize=1024)
+def _parse_condition(expression: str) -> _Node:
+    return _Parser(expression).parse_condition()
+
+
+@lru_cache(maxsize=1024)
+def _parse_update(expression: str) -> Tuple[_Node, ...]:
+    return _Parser(expression).parse_update()
+
+
+@lru_cache(maxsize=1024)
+def _parse_projection(expression: str) -> Tuple[_Node, ...]:
+    return _Parser(expression).parse_projection()
+
+
+class _Context:
+    """
+    The expression attribute names and values of a request
+    """
+
+    def __init__(self, params: Dict[str, Any]) -> None:
+        self._names: Dict[str, str] = params.get(EXPRESSION_ATTRIBUTE_NAMES) or {}
+        self._raw_values: Dict[str, Any] = params.get(EXPRESSION_ATTRIBUTE_VALUES) or {}
+        self._values: Dict[str, Dict[str, Any]] = {}
+
+    def path(self, node: _Node) -> _Path:
+        return tuple(self._name(element) if isinstance(element, str) else element for element in node[1])
+
+    def _name(self, element: str) -> str:
+        if not element.startswith('#'):
+            return element
+        try:
+            return self._names[element]
+        except KeyError:
+            raise _validation_error(
+                "An expression attribute name used in the document path is not defined; attribute name: {}".format(element)
+            ) from None
+
+    def value(self, placeholder: str) -> Dict[str, Any]:
+        value = self._values.get(placeholder)
+        if value is None:
+            if placeholder not in self._raw_values:
+                raise _validation_error(
+                    "An expression attribute value used in expression is not defined; attribute value: {}".format(placeholder)
+                )
+            value = self._values[placeholder] = _load_value(self._raw_values[placeholder])
+        return value
+
+
+def _get_path(item: _RawItem, path: _Path) -> Optional[Dict[str, Any]]:
+    value = item.get(cast(str, path[0]))
+    for element in path[1:]:
+        if value is None:
+            return None
+        if isinstance(element, int):
+            elements = value.get(LIST)
+            value = elements[element] if elements is not None and element < len(elements) else None
+        else:
+            attributes = value.get(MAP)
+            value = attributes.get(element) if attributes is not None else None
+    return value
+
+
+def _check_overlap(paths: Sequence[_Path]) -> None:
+    for i, path in enumerate(paths):
+        for other in paths[i + 1:]:
+            if path[:len(other)] == other[:len(path)]:
+                raise _validation_error(
+                    "Invalid expression: Two document paths overlap with each other; "
+                    "must remove or rewrite one of these paths"
+                )
+
+
+def _evaluate_operand(node: _Node, item: _RawItem, context: _Context) -> Optional[Dict[str, Any]]:
+    kind = node[0]
+    if kind == 'path':
+        return _get_path(item, context.path(node))
+    if kind == 'value':
+        return context.value(node[1])
+    # size
+    value = _get_path(item, context.path(node[1]))
+    if value is None:
+        return None
+    attr_type, data = next(iter(value.items()))
+    if attr_type == STRING:
+        size = len(data)
+    elif attr_type in (BINARY, LIST, MAP) or attr_type in _SET_TYPES:
+        size = len(data)
+    else:
+        return None
+    return {NUMBER: str(size)}
+
+
+def _evaluate_condition(node: _Node, item: _RawItem, context: _Context) -> bool:
+    kind = node[0]
+    if kind == 'and':
+        return _evaluate_condition(node[1], item, context) and _evaluate_condition(node[2], item, context)
+    if kind == 'or':
+        return _evaluate_condition(node[1], item, context) or _evaluate_condition(node[2], item, context)
+    if kind == 'not':
+        return not _evaluate_condition(node[1], item, context)
+    if kind == 'compare':
+        left = _evaluate_operand(node[2], item, context)
+        right = _evaluate_operand(node[3], item, context)
+        if left is None or right is None:
+            return False
+        operator = node[1]
+        if operator == '=':
+            return _values_equal(left, right)
+        if operator == '<>':
+            return not _values_equal(left, right)
+        result = _compare(left, right)
+        if result is None:
+            return False
+        if operator == '<':
+            return result < 0
+        if operator == '<=':
+            return result <= 0
+        if operator == '>':
+            return result > 0
+        return result >= 0
+    if kind == 'between':
+        value = _evaluate_operand(node[1], item, context)
+        low = _evaluate_operand(node[2], item, context)
+        high = _evaluate_operand(node[3], item, context)
+        if value is None or low is None or high is None:
+            return False
+        lower, upper = _compare(low, value), _compare(value, high)
+        return lower is not None and upper is not None and lower <= 0 and upper <= 0
+    if kind == 'in':
+        value = _evaluate_operand(node[1], item, context)
+        if value is None:
+            return False
+        for candidate_node in node[2]:
+            candidate = _evaluate_operand(candidate_node, item, context)
+            if candidate is not None and _values_equal(value, candidate):
+                return True
+        return False
+    return _evaluate_function(node[1], node[2], item, context)
+
+
+def _evaluate_function(name: str, args: Tuple[_Node, ...], item: _RawItem, context: _Context) -> bool:
+    value = _evaluate_operand(args[0], item, context)
+    if name == 'attribute_exists':
+        return value is not None
+    if name == 'attribute_not_exists':
+        return value is None
+    operand = _evaluate_operand(args[1], item, context)
+    if value is None or operand is None:
+        return False
+    attr_type, data = next(iter(value.items()))
+    operand_type, operand_data = next(iter(operand.items()))
+    if name == 'attribute_type':
+        return attr_type == operand_data
+    if name == 'begins_with':
+        return attr_type == operand_type and attr_type in (STRING, BINARY) and data.startswith(operand_data)
+    # contains
+    if attr_type == STRING:
+        return operand_type == STRING and operand_data in data
+    if attr_type in _SET_TYPES:
+        return _SET_ELEMENT_TYPES[attr_type] == operand_type and operand_data in data
+    if attr_type == LIST:
+        return any(_values_equal(element, operand) for element in data)
+    return False
+
+
+def _project(item: _RawItem, paths: Sequence[_Path]) -> _RawItem:
+    projected: Dict[Any, Any] = {}
+    nested = False
+    for path in paths:
+        value = _get_path(item, path)
+        if value is None:
+            continue
+        holder = projected
+        for element, next_element in zip(path, path[1:]):
+            nested = True
+            child = holder.get(element)
+            if child is None:
+                child = holder[element] = {LIST: {}} if isinstance(next_element, int) else {MAP: {}}
+            holder = child[LIST] if LIST in child else child[MAP]
+        holder[path[-1]] = _copy_value(value)
+    if nested:
+        # projected list elements are returned in order, without gaps
+        return {name: _compact_projected_value(value) for name, value in projected.items()}
+    return projected
+
+
+def _compact_projected_value(value: Dict[str, Any]) -> Dict[str, Any]:
+    elements = value.get(LIST)
+    if isinstance(elements, dict):
+        return {LIST: [_compact_projected_value(elements[i]) for i in sorted(elements)]}
+    attributes = value.get(MAP)
+    if attributes is not None:
+        return {MAP: {name: _compact_projected_value(v) for name, v in attributes.items()}}
+    return value
+
+
+def _evaluate_update_operand(node: _Node, item: _RawItem, context: _Context) -> Dict[str, Any]:
+    kind = node[0]
+    if kind == 'value':
+        return context.value(node[1])
+    if kind == 'path':
+        value = _get_path(item, context.path(node))
+        if value is None:
+            raise _validation_error("The provided expression refers to an attribute that does not exist in the item")
+        return value
+    if kind == 'if_not_exists':
+        value = _get_path(item, context.path(node[1]))
+        return value if value is not None else _evaluate_update_operand(node[2], item, context)
+    first = _evaluate_update_operand(node[1], item, context)
+    second = _evaluate_update_operand(node[2], item, context)
+    if kind == 'list_append':
+        if LIST not in first or LIST not in second:
+            raise _validation_error("Incorrect operand type for operator or function; operator or function: list_append")
+        return {LIST: first[LIST] + second[LIST]}
+    if NUMBER not in first or NUMBER not in second:
+        raise _validation_error("An operand in the update expression has an incorrect data type")
+    if kind == '+':
+        return {NUMBER: _normalize_number(Decimal(first[NUMBER]) + Decimal(second[NUMBER]))}
+    return {NUMBER: _normalize_number(Decimal(first[NUMBER]) - Decimal(second[NUMBER]))}
+
+
+def _set_path(item: _RawItem, path: _Path, value: Dict[str, Any]) -> None:
+    if len(path) == 1:
+        item[cast(str, path[0])] = value
+        return
+    parent = _get_path(item, path[:-1])
+    element = path[-1]
+    if parent is not None:
+        if isinstance(element, int) and LIST in parent:
+            elements = parent[LIST]
+            if element < len(elements):
+                elements[element] = value
+            else:
+                elements.append(value)
+            return
+        if isinstance(element, str) and MAP in parent:
+            parent[MAP][element] = value
+            return
+    raise _validation_error("The document path provided in the update expression is invalid for update")
+
+
+def _apply_update(
+    item: _RawItem,
+    actions: Tuple[_Node, ...],
+    context: _Context,
+    key_names: Sequence[str],
+) -> Set[str]:
+    """
+    Applies the actions of an update expression to (a copy of) an item, returning the names
+    of the (top-level) attributes that were updated.
+    All operands are evaluated against the item before the update.
+    """
+    paths = [context.path(path) for _, path, _ in actions]
+    _check_overlap(paths)
+    for path in paths:
+        if path[0] in key_names:
+            raise _validation_error(
+                "One or more parameter values were invalid: Cannot update attribute {}. "
+                "This attribute is part of the key".format(path[0])
+            )
+    values = [
+        _evaluate_update_operand(operand, item, context) if clause == 'SET' else None
+        for clause, _, operand in actions
+    ]
+
+    removals: List[_Path] = []
+    for (clause, _, operand), path, value in zip(actions, paths, values):
+        if clause == 'SET':
+            assert value is not None
+            _set_path(item, path, _copy_value(value))
+        elif clause == 'REMOVE':
+            removals.append(path)
+        elif clause == 'ADD':
+            _add(item, path, context.value(operand[1]))
+        else:
+            _delete(item, path, context.value(operand[1]))
+
+    # list elements are removed by their index before the update, so the highest indexes go first
+    for path in sorted(removals, key=lambda p: p[-1] if isinstance(p[-1], int) else -1, reverse=True):
+        if len(path) == 1:
+            item.pop(cast(str, path[0]), None)
+            continue
+        parent = _get_path(item, path[:-1])
+        element = path[-1]
+        if parent is None:
+            continue
+        if isinstance(element, int) and LIST in parent and element < len(parent[LIST]):
+            del parent[LIST][element]
+        elif isinstance(element, str) and MAP in parent:
+            parent[MAP].pop(element, None)
+    return {cast(str, path[0]) for path in paths}
+
+
+def _add(item: _RawItem, path: _Path, value: Dict[str, Any]) -> None:
+    current = _get_path(item, path)
+    value_type = _get_type(value)
+    if value_type != NUMBER and value_type not in _SET_TYPES:
+        raise _validation_error(
+            "Incorrect operand type for operator or function; operator: ADD, operand type: {}".format(value_type)
+        )
+    if current is None:
+        _set_path(item, path, _copy_value(value))
+        return
+    current_type = _get_type(current)
+    if current_type != value_type:
+        raise _validation_error("An operand in the update expression has an incorrect data type")
+    if value_type == NUMBER:
+        _set_path(item, path, {NUMBER: _normalize_number(Decimal(current[NUMBER]) + Decimal(value[NUMBER]))})
+    else:
+        elements = list(current[current_type])
+        elements.extend(v for v in value[value_type] if v not in current[current_type])
+        _set_path(item, path, {current_type: elements})
+
+
+def _delete(item: _RawItem, path: _Path, value: Dict[str, Any]) -> None:
+    value_type = _get_type(value)
+    if value_type not in _SET_TYPES:
+        raise _validation_error(
+            "Incorrect operand type for operator or function; operator: DELETE, operand type: {}".format(value_type)
+        )
+    current = _get_path(item, path)
+    if current is None:
+        return
+    if _get_type(current) != value_type:
+        raise _validation_error("An operand in the update expression has an incorrect data type")
+    removed = set(value[value_type])
+    elements = [v for v in current[value_type] if v not in removed]
+    if elements:
+        _set_path(item, path, {value_type: elements})
+    elif len(path) == 1:
+        del item[cast(str, path[0])]
+    else:
+        parent = _get_path(item, path[:-1])
+        assert parent is not None
+        if MAP in parent:
+            del parent[MAP][path[-1]]
+        else:
+            del parent[LIST][path[-1]]
+
+
+# Storage
+
+
+class _Partition:
+    """
+    The items sharing a hash key, ordered by their sort key
+    """
+    __slots__ = ('items', 'sort_keys')
+
+    def __init__(self) -> None:
+        self.items: Dict[Any, _RawItem] = {}
+        self.sort_keys: List[Any] = []
+
+    def put(self, sort_key: Any, item: _RawItem) -> None:
+        if sort_key not in self.items:
+            insort(self.sort_keys, sort_key)
+        self.items[sort_key] = item
+
+    def delete(self, sort_key: Any) -> None:
+        if self.items.pop(sort_key, None) is not None:
+            if len(self.sort_keys) == 1:
+                # the only item of a table without a range key, whose sort key is None
+                self.sort_keys.clear()
+            else:
+                del self.sort_keys[bisect_left(self.sort_keys, sort_key)]
+
+
+class _KeySchema:
+    """
+    The key attributes of a table or an index, and its items by key
+    """
+
+    def __init__(self, key_schema: List[Dict[str, str]], attribute_types: Dict[str, str]) -> None:
+        self.hash_name = ''
+        self.range_name: Optional[str] = None
+        for key in key_schema:
+            if key[KEY_TYPE] == HASH:
+                self.hash_name = key[ATTR_NAME]
+            elif key[KEY_TYPE] == RANGE:
+                self.range_name = key[ATTR_NAME]
+        for name in (self.hash_name, self.range_name):
+            if name is not None and name not in attribute_types:
+                raise _validation_error(
+                    "One or more parameter values were invalid: "
+                    "Some index key attributes are not defined in AttributeDefinitions"
+                )
+        self.hash_type = attribute_types[self.hash_name]
+        self.range_type = attribute_types[self.range_name] if self.range_name is not None else None
+        self.partitions: Dict[Any, _Partition] = {}
+        self._hash_ids: Optional[List[Any]] = None
+
+    @property
+    def key_names(self) -> List[str]:
+        return [self.hash_name] if self.range_name is None else [self.hash_name, self.range_name]
+
+    def put(self, hash_id: Any, sort_key: Any, item: _RawItem) -> None:
+        partition = self.partitions.get(hash_id)
+        if partition is None:
+            partition = self.partitions[hash_id] = _Partition()
+            self._hash_ids = None
+        partition.put(sort_key, item)
+
+    def delete(self, hash_id: Any, sort_key: Any) -> None:
+        partition = self.partitions.get(hash_id)
+        if partition is not None:
+            partition.delete(sort_key)
+            if not partition.items:
+                del self.partitions[hash_id]
+                self._hash_ids = None
+
+    def get_hash_ids(self) -> List[Any]:
+        # scans visit partitions in the order of their hash keys
+        if self._hash_ids is None:
+            self._hash_ids = sorted(self.partitions)
+        return self._hash_ids
+
+    def iter_items(self) -> Iterator[_RawItem]:
+        for partition in self.partitions.values():
+            yield from partition.items.values()
+
+
+class _Index(_KeySchema):
+
+    def __init__(self, description: Dict[str, Any], attribute_types: Dict[str, str], is_global: bool) -> None:
+        super().__init__(description[KEY_SCHEMA], attribute_types)
+        self.name: str = description[INDEX_NAME]
+        self.is_global = is_global
+        self.description = description
+        projection = description.get(PROJECTION) or {}
+        self.projection_type = projection.get(PROJECTION_TYPE, ALL)
+        self.non_key_attributes = projection.get(NON_KEY_ATTRIBUTES) or []
+
+    def get_entry(self, item: _RawItem, table: '_Table', key: Tuple[Any, Any]) -> Optional[Tuple[Any, Any]]:
+        """
+        Returns the hash key and sort key of `item` in the index, or None if the index does not include it
+        """
+        hash_value = item.get(self.hash_name)
+        if hash_value is None:
+            return None
+        range_id = None
+        if self.range_name is not None:
+            range_value = item.get(self.range_name)
+            if range_value is None:
+                return None
+            assert self.range_type is not None
+            range_id = key_value_id(self.range_type, range_value[self.range_type])
+        # items with the same index key are ordered by their table key
+        return key_value_id(self.hash_type, hash_value[self.hash_type]), (range_id, key[0], key[1])
+
+    def validate(self, item: _RawItem) -> None:
+        for name, attr_type in ((self.hash_name, self.hash_type), (self.range_name, self.range_type)):
+            value = item.get(name) if name is not None else None
+            if value is not None and attr_type not in value:
+                raise _validation_error(
+                    "One or more parameter values were invalid: Type mismatch for Index Key {} Expected: {} "
+                    "Actual: {} IndexName: {}".format(name, attr_type, _get_type(value), self.name)
+                )
+
+    def project(self, item: _RawItem, table: '_Table') -> _RawItem:
+        if self.projection_type == ALL:
+            return item
+        names = set(table.key_names) | set(self.key_names)
+        if self.projection_type != KEYS_ONLY:
+            names.update(self.non_key_attributes)
+        return {name: value for name, value in item.items() if name in names}
+
+    def describe(self) -> Dict[str, Any]:
+        description = copy.deepcopy(self.description)
+        if self.is_global:
+            description['IndexStatus'] = ACTIVE
+        description[ITEM_COUNT] = sum(len(partition.items) for partition in self.partitions.values())
+        return description
+
+
+class _Table(_KeySchema):
+
+    def __init__(self, params: Dict[str, Any]) -> None:
+        self.name: str = params[TABLE_NAME]
+        self.attribute_definitions = copy.deepcopy(params.get(ATTR_DEFINITIONS) or [])
+        attribute_types = {d[ATTR_NAME]: d[ATTR_TYPE] for d in self.attribute_definitions}
+        if len(attribute_types) != len(self.attribute_definitions):
+            raise _validation_error("Cannot have two attributes with the same name")
+        for attr_type in attribute_types.values():
+            if attr_type not in _KEY_TYPES:
+                raise _validation_error("Member must satisfy enum value set: [B, N, S]")
+        super().__init__(params.get(KEY_SCHEMA) or [], attribute_types)
+        self.key_schema = copy.deepcopy(params[KEY_SCHEMA])
+        self.billing_mode = params.get(BILLING_MODE, PROVISIONED_BILLING_MODE)
+        self.throughput = copy.deepcopy(params.get(PROVISIONED_THROUGHPUT) or {})
+        self.stream_specification = copy.deepcopy(params.get(STREAM_SPECIFICATION))
+        self.time_to_live: Optional[Dict[str, Any]] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.attribute_types = attribute_types
+        self.indexes: Dict[str, _Index] = {}
+        for index in params.get(GLOBAL_SECONDARY_INDEXES) or []:
+            self.add_index(copy.deepcopy(index), is_global=True)
+        for index in params.get(LOCAL_SECONDARY_INDEXES) or []:
+            if index[KEY_SCHEMA][0][ATTR_NAME] != self.hash_name:
+                raise _validation_error("Local secondary indexes must have the same hash key as the table")
+            self.add_index(copy.deepcopy(index), is_global=False)
+
+    def add_index(self, description: Dict[str, Any], is_global: bool) -> None:
+        index = _Index(description, self.attribute_types, is_global)
+        if index.name in self.indexes:
+            raise _validation_error("Duplicate index name: {}".format(index.name))
+        for key, item in self._iter_keyed_items():
+            entry = index.get_entry(item, self, key)
+            if entry is not None:
+                index.put(entry[0], entry[1], item)
+        self.indexes[index.name] = index
+
+    def _iter_keyed_items(self) -> Iterator[Tuple[Tuple[Any, Any], _RawItem]]:
+        for hash_id, partition in self.partitions.items():
+            for range_id, item in partition.items.items():
+                yield (hash_id, range_id), item
+
+    def get_index(self, name: Optional[str]) -> Optional[_Index]:
+        if name is None:
+            return None
+        try:
+            return self.indexes[name]
+        except KeyError:
+            raise _validation_error("The table does not have the specified index: {}".format(name)) from None
+
+    def get_key(self, key: Any) -> Tuple[Any, Any]:
+        """
+        Returns the identity of the item with the given (serialized) primary key
+        """
+        if not isinstance(key, dict) or set(key) != set(self.key_names):
+            raise _validation_error("The provided key element does not match the schema")
+        return self._get_item_key(key)
+
+    def get_item_key(self, item: _RawItem) -> Tuple[Any, Any]:
+        for name in self.key_names:
+            if name not in item:
+                raise _validation_error(
+                    "One or more parameter values were invalid: Missing the key {} in the item".format(name)
+                )
+        return self._get_item_key(item)
+
+    def _get_item_key(self, item: Dict[str, Any]) -> Tuple[Any, Any]:
+        hash_id = self._get_key_value_id(item, self.hash_name, self.hash_type)
+        range_id = None
+        if self.range_name is not None:
+            assert self.range_type is not None
+            range_id = self._get_key_value_id(item, self.range_name, self.range_type)
+        return hash_id, range_id
+
+    def _get_key_value_id(self, item: Dict[str, Any], name: str, attr_type: str) -> Any:
+        value = item[name]
+        if not isinstance(value, dict) or attr_type not in value:
+            raise _validation_error(
+                "One or more parameter values were invalid: Type mismatch for key {} expected: {} actual: {}".format(
+                    name, attr_type, next(iter(value), None) if isinstance(value, dict) else None,
+                )
+            )
+        data = value[attr_type]
+        if attr_type == NUMBER:
+            data = _normalize_number(data)
+        elif not data:
+            raise _validation_error(
+                "One or more parameter values are not valid. "
+                "The AttributeValue for a key attribute cannot contain an empty {} value. Key: {}".format(
+                    'string' if attr_type == STRING else 'binary', name,
+                )
+            )
+        return key_value_id(attr_type, data)
+
+    def get(self, key: Tuple[Any, Any]) -> Optional[_RawItem]:
+        partition = self.partitions.get(key[0])
+        return partition.items.get(key[1]) if partition is not None else None
+
+    def get_key_attributes(self, item: _RawItem) -> _RawItem:
+        return {name: item[name] for name in self.key_names}
+
+    def validate(self, item: _RawItem) -> None:
+        for index in self.indexes.values():
+            index.validate(item)
+        if item_size(item) > MAX_ITEM_SIZE_BYTES:
+            raise _validation_error("Item size has exceeded the maximum allowed size")
+
+    def store(self, key: Tuple[Any, Any], old: Optional[_RawItem], new: Optional[_RawItem]) -> None:
+        """
+        Replaces the item `old` with `new` (either of which may be None), updating the indexes
+        """
+        for index in self.indexes.values():
+            if old is not None:
+                entry = index.get_entry(old, self, key)
+                if entry is not None:
+                    index.delete(*entry)
+            if new is not None:
+                entry = index.get_entry(new, self, key)
+                if entry is not None:
+                    index.put(entry[0], entry[1], new)
+        if new is not None:
+            self.put(key[0], key[1], new)
+        elif old is not None:
+            self.delete(key[0], key[1])
+
+    def describe(self, status: str = ACTIVE) -> Dict[str, Any]:
+        description: Dict[str, Any] = {
+            TABLE_NAME: self.name,
+            TABLE_STATUS: status,
+            KEY_SCHEMA: copy.deepcopy(self.key_schema),
+            ATTR_DEFINITIONS: copy.deepcopy(self.attribute_definitions),
+            'CreationDateTime': self.created_at,
+            ITEM_COUNT: sum(len(partition.items) for partition in self.partitions.values()),
+            'TableSizeBytes': sum(item_size(item) for item in self.iter_items()),
+            'TableArn': 'arn:aws:dynamodb:local:000000000000:table/{}'.format(self.name),
+            PROVISIONED_THROUGHPUT: {
+                READ_CAPACITY_UNITS: self.throughput.get(READ_CAPACITY_UNITS, 0),
+                WRITE_CAPACITY_UNITS: self.throughput.get(WRITE_CAPACITY_UNITS, 0),
+                'NumberOfDecreasesToday': 0,
+            },
+        }
+        if self.billing_mode == PAY_PER_REQUEST_BILLING_MODE:
+            description['BillingModeSummary'] = {BILLING_MODE: PAY_PER_REQUEST_BILLING_MODE}
+        global_indexes = [index.describe() for index in self.indexes.values() if index.is_global]
+        local_indexes = [index.describe() for index in self.indexes.values() if not index.is_global]
+        if global_indexes:
+            description[GLOBAL_SECONDARY_INDEXES] = global_indexes
+        if local_indexes:
+            description[LOCAL_SECONDARY_INDEXES] = local_indexes
+        if self.stream_specification:
+            description[STREAM_SPECIFICATION] = copy.deepcopy(self.stream_specification)
+        return description
+
+
+class _Write(NamedTuple):
+    table: _Table
+    key: Tuple[Any, Any]
+    old: Optional[_RawItem]
+    new: Optional[_RawItem]
+    condition_met: bool
+
+
+class InMemoryTransport(Transport):
+    """
+    A :class:`~pynamodb.connection.transport.Transport` that keeps tables in memory, for tests and benchmarks.
+
+    It implements the table and item operations PynamoDB uses (including queries and scans with expressions,
+    pagination, parallel scans, batch operations and transactions) and maintains global and local secondary
+    indexes as items are written. Operations are serialized with a lock, so each one is atomic.
+    Capacity is not enforced, but consumed capacity is reported (estimated from item sizes) when requested.
+
+    Example:
+        transport = InMemoryTransport()
+
+        class Thread(Model):
+            class Meta:
+                table_name = 'Thread'
+                transport = transport
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._tables: Dict[str, _Table] = {}
+        self._client_request_tokens: Dict[str, Tuple[float, str]] = {}
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            CREATE_TABLE: self._create_table,
+            DELETE_TABLE: self._delete_table,
+            DESCRIBE_TABLE: self._describe_table,
+            LIST_TABLES: self._list_tables,
+            UPDATE_TABLE: self._update_table,
+            UPDATE_TIME_TO_LIVE: self._update_time_to_live,
+            GET_ITEM: self._get_item,
+            PUT_ITEM: self._put_item,
+            UPDATE_ITEM: self._update_item,
+            DELETE_ITEM: self._delete_item,
+            QUERY: self._query,
+            SCAN: self._scan,
+            BATCH_GET_ITEM: self._batch_get_item,
+            BATCH_WRITE_ITEM: self._batch_write_item,
+            TRANSACT_GET_ITEMS: self._transact_get_items,
+            TRANSACT_WRITE_ITEMS: self._transact_write_items,
+        }
+
+    def make_api_call(self, operation_name: str, operation_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        handler = self._handlers.get(operation_name)
+        try:
+            if handler is None:
+                raise _DynamoDBError('UnknownOperationException', 'Unsupported operation: {}'.format(operation_name))
+            with self._lock:
+                return handler(operation_kwargs)
+        except _DynamoDBError as e:
+            raise ClientError(e.get_response(), operation_name) from None
+        except KeyError as e:
+            raise ClientError(
+                _validation_error("Missing required parameter: {}".format(e)).get_response(),
+                operation_name,
+            ) from e
+
+    def clear(self) -> None:
+        """
+        Deletes all tables
+        """
+        with self._lock:
+            self._tables.clear()
+            self._client_request_tokens.clear()
+
+    def _get_table(self, table_name: str) -> _Table:
+        try:
+            return self._tables[table_name]
+        except KeyError:
+            raise _DynamoDBError(
+                'ResourceNotFoundException', 'Requested resource not found: Table: {} not found'.format(table_name),
+            ) from None
+
+    @staticmethod
+    def _get_capacity(
+        params: Dict[str, Any],
+        table_name: str,
+        units: float,
+        index: Optional[_Index] = None,
+    ) -> Dict[str, Any]:
+        return_consumed_capacity = params.get(RETURN_CONSUMED_CAPACITY, NONE)
+        if return_consumed_capacity not in (TOTAL, INDEXES):
+            return {}
+        capacity: Dict[str, Any] = {TABLE_NAME: table_name, CAPACITY_UNITS: units}
+        if return_consumed_capacity == INDEXES:
+            # index maintenance on writes is not modelled: writes are charged to the table only
+            if index is None:
+                capacity[TABLE_KEY] = {CAPACITY_UNITS: units}
+            else:
+                capacity[TABLE_KEY] = {CAPACITY_UNITS: 0.0}
+                indexes_key = GLOBAL_SECONDARY_INDEXES if index.is_global else LOCAL_SECONDARY_INDEXES
+                capacity[indexes_key] = {index.name: {CAPACITY_UNITS: units}}
+        return {CONSUMED_CAPACITY: capacity}
+
+    @staticmethod
+    def _get_capacities(params: Dict[str, Any], units_by_table: Dict[str, float]) -> Dict[str, Any]:
+        return_consumed_capacity = params.get(RETURN_CONSUMED_CAPACITY, NONE)
+        if return_consumed_capacity not in (TOTAL, INDEXES):
+            return {}
+        capacities = []
+        for table_name, units in units_by_table.items():
+            capacity: Dict[str, Any] = {TABLE_NAME: table_name, CAPACITY_UNITS: units}
+            if return_consumed_capacity == INDEXES:
+                capacity[TABLE_KEY] = {CAPACITY_UNITS: units}
+            capacities.append(capacity)
+        return {CONSUMED_CAPACITY: capacities}
+
+    @staticmethod
+    def _get_projection(params: Dict[str, Any], context: _Context) -> Optional[List[_Path]]:
+        expression = params.get(PROJECTION_EXPRESSION)
+        if not expression:
+            return None
+        paths = [context.path(node) for node in _parse_projection(expression)]
+        _check_overlap(paths)
+        return paths
+
+    @staticmethod
+    def _get_output_item(item: _RawItem, projection: Optional[List[_Path]]) -> _RawItem:
+        return _project(item, projection) if projection is not None else _copy_item(item)
+
+    # Tables
+
+    def _create_table(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table_name = params[TABLE_NAME]
+        if table_name in self._tables:
+            raise _DynamoDBError('ResourceInUseException', 'Table already exists: {}'.format(table_name))
+        table = self._tables[table_name] = _Table(params)
+        return {TABLE_DESCRIPTION: table.describe()}
+
+    def _delete_table(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        del self._tables[table.name]
+        return {TABLE_DESCRIPTION: table.describe(status='DELETING')}
+
+    def _describe_table(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {TABLE_KEY: self._get_table(params[TABLE_NAME]).describe()}
+
+    def _list_tables(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table_names = sorted(self._tables)
+        start = params.get(EXCLUSIVE_START_TABLE_NAME)
+        if start:
+            table_names = table_names[bisect_right(table_names, start):]
+        limit = params.get(LIMIT) or 100
+        response: Dict[str, Any] = {'TableNames': table_names[:limit]}
+        if len(table_names) > limit:
+            response['LastEvaluatedTableName'] = table_names[limit - 1]
+        return response
+
+    def _update_table(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        if PROVISIONED_THROUGHPUT in params:
+            table.throughput = copy.deepcopy(params[PROVISIONED_THROUGHPUT])
+        if BILLING_MODE in params:
+            table.billing_mode = params[BILLING_MODE]
+        for attribute_definition in params.get(ATTR_DEFINITIONS) or []:
+            if attribute_definition[ATTR_NAME] not in table.attribute_types:
+                table.attribute_definitions.append(copy.deepcopy(attribute_definition))
+                table.attribute_types[attribute_definition[ATTR_NAME]] = attribute_definition[ATTR_TYPE]
+        for index_update in params.get(GLOBAL_SECONDARY_INDEX_UPDATES) or []:
+            if 'Create' in index_update:
+                table.add_index(copy.deepcopy(index_update['Create']), is_global=True)
+            elif 'Delete' in index_update:
+                index = table.get_index(index_update['Delete'][INDEX_NAME])
+                assert index is not None
+                del table.indexes[index.name]
+            elif UPDATE in index_update:
+                index = table.get_index(index_update[UPDATE][INDEX_NAME])
+                assert index is not None
+                index.description[PROVISIONED_THROUGHPUT] = copy.deepcopy(index_update[UPDATE][PROVISIONED_THROUGHPUT])
+        return {TABLE_DESCRIPTION: table.describe()}
+
+    def _update_time_to_live(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        table.time_to_live = copy.deepcopy(params[TIME_TO_LIVE_SPECIFICATION])
+        return {TIME_TO_LIVE_SPECIFICATION: copy.deepcopy(table.time_to_live)}
+
+    # Items
+
+    def _get_item(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        context = _Context(params)
+        projection = self._get_projection(params, context)
+        item = table.get(table.get_key(params[KEY]))
+        response: Dict[str, Any] = {}
+        if item is not None:
+            response[ITEM] = self._get_output_item(item, projection)
+        units = read_capacity_units(item_size(item) if item is not None else 0, bool(params.get(CONSISTENT_READ)))
+        response.update(self._get_capacity(params, table.name, units))
+        return response
+
+    def _check_condition(self, params: Dict[str, Any], item: Optional[_RawItem], context: _Context) -> bool:
+        expression = params.get(CONDITION_EXPRESSION)
+        if not expression:
+            return True
+        return _evaluate_condition(_parse_condition(expression), item or {}, context)
+
+    def _prepare_put(self, table: _Table, params: Dict[str, Any]) -> _Write:
+        new = _load_item(params[ITEM])
+        key = table.get_item_key(new)
+        table.validate(new)
+        old = table.get(key)
+        return _Write(table, key, old, new, self._check_condition(params, old, _Context(params)))
+
+    def _prepare_update(self, table: _Table, params: Dict[str, Any]) -> Tuple[_Write, Set[str]]:
+        key = table.get_key(params[KEY])
+        old = table.get(key)
+        context = _Context(params)
+        condition_met = self._check_condition(params, old, context)
+        if old is not None:
+            new = _copy_item(old)
+        else:
+            new = {name: _load_value(value) for name, value in params[KEY].items()}
+        updated: Set[str] = set()
+        expression = params.get(UPDATE_EXPRESSION)
+        if expression:
+            updated = _apply_update(new, _parse_update(expression), context, table.key_names)
+        table.validate(new)
+        return _Write(table, key, old, new, condition_met), updated
+
+    def _prepare_delete(self, table: _Table, params: Dict[str, Any]) -> _Write:
+        key = table.get_key(params[KEY])
+        old = table.get(key)
+        return _Write(table, key, old, None, self._check_condition(params, old, _Context(params)))
+
+    def _prepare_condition_check(self, table: _Table, params: Dict[str, Any]) -> _Write:
+        key = table.get_key(params[KEY])
+        old = table.get(key)
+        if not params.get(CONDITION_EXPRESSION):
+            raise _validation_error("The ConditionCheck operation requires a ConditionExpression")
+        return _Write(table, key, old, old, self._check_condition(params, old, _Context(params)))
+
+    @staticmethod
+    def _raise_for_condition(write: _Write, params: Dict[str, Any]) -> None:
+        if not write.condition_met:
+            extra = {}
+            if params.get(RETURN_VALUES_ON_CONDITION_FAILURE) == ALL_OLD and write.old is not None:
+                extra[ITEM] = _copy_item(write.old)
+            raise _DynamoDBError('ConditionalCheckFailedException', 'The conditional request failed', **extra)
+
+    @staticmethod
+    def _get_return_values(params: Dict[str, Any], allowed: Sequence[str]) -> str:
+        return_values = params.get(RETURN_VALUES) or NONE
+        if return_values not in allowed:
+            raise _validation_error("Return values set to invalid value: {}".format(return_values))
+        return return_values
+
+    def _put_item(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        return_values = self._get_return_values(params, (NONE, ALL_OLD))
+        write = self._prepare_put(table, params)
+        self._raise_for_condition(write, params)
+        table.store(write.key, write.old, write.new)
+        response: Dict[str, Any] = {}
+        if return_values == ALL_OLD and write.old is not None:
+            response[ATTRIBUTES] = _copy_item(write.old)
+        response.update(self._get_capacity(params, table.name, _write_units(write.old, write.new)))
+        return response
+
+    def _update_item(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        return_values = self._get_return_values(params, (NONE, ALL_OLD, ALL_NEW, UPDATED_OLD, UPDATED_NEW))
+        write, updated = self._prepare_update(table, params)
+        self._raise_for_condition(write, params)
+        table.store(write.key, write.old, write.new)
+        response: Dict[str, Any] = {}
+        attributes: Optional[_RawItem] = None
+        if return_values in (ALL_OLD, UPDATED_OLD):
+            attributes = write.old
+        elif return_values in (ALL_NEW, UPDATED_NEW):
+            attributes = write.new
+        if attributes is not None and return_values in (UPDATED_OLD, UPDATED_NEW):
+            attributes = {name: value for name, value in attributes.items() if name in updated}
+        if attributes:
+            response[ATTRIBUTES] = _copy_item(attributes)
+        response.update(self._get_capacity(params, table.name, _write_units(write.old, write.new)))
+        return response
+
+    def _delete_item(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        return_values = self._get_return_values(params, (NONE, ALL_OLD))
+        write = self._prepare_delete(table, params)
+        self._raise_for_condition(write, params)
+        table.store(write.key, write.old, None)
+        response: Dict[str, Any] = {}
+        if return_values == ALL_OLD and write.old is not None:
+            response[ATTRIBUTES] = _copy_item(write.old)
+        response.update(self._get_capacity(params, table.name, _write_units(write.old)))
+        return response
+
+    # Queries and scans
+
+    def _query(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        index = table.get_index(params.get(INDEX_NAME))
+        source: _KeySchema = index if index is not None else table
+        if index is not None and index.is_global and params.get(CONSISTENT_READ):
+            raise _validation_error("Consistent reads are not supported on global secondary indexes")
+        context = _Context(params)
+        key_condition = _parse_condition(params[KEY_CONDITION_EXPRESSION])
+        hash_value = self._get_hash_key_value(key_condition, source, context)
+        if source.hash_type not in hash_value:
+            raise _validation_error("One or more parameter values were invalid: Condition parameter type does not match schema type")
+        partition = source.partitions.get(key_value_id(source.hash_type, hash_value[source.hash_type]))
+        sort_keys = partition.sort_keys if partition is not None else []
+        forward = params.get(SCAN_INDEX_FORWARD, True)
+
+        start = params.get(EXCLUSIVE_START_KEY)
+        if start is None:
+            positions: Iterable[int] = range(len(sort_keys)) if forward else range(len(sort_keys) - 1, -1, -1)
+        else:
+            start_key = self._get_start_sort_key(table, index, start)
+            if forward:
+                positions = range(_get_start_position(sort_keys, start_key), len(sort_keys))
+            elif start_key is None:
+                positions = range(0)
+            else:
+                positions = range(bisect_left(sort_keys, start_key) - 1, -1, -1)
+
+        def candidates() -> Iterator[_RawItem]:
+            assert partition is not None
+            for position in positions:
+                item = partition.items[sort_keys[position]]
+                if _evaluate_condition(key_condition, item, context):
+                    yield item
+
+        return self._read_page(table, index, params, context, candidates() if partition is not None else iter(()))
+
+    @staticmethod
+    def _get_hash_key_value(key_condition: _Node, source: _KeySchema, context: _Context) -> Dict[str, Any]:
+        """
+        Validates a key condition, returning the value of its hash key
+        """
+        terms = []
+        pending = [key_condition]
+        while pending:
+            node = pending.pop()
+            if node[0] == 'and':
+                pending.extend((node[2], node[1]))
+            else:
+                terms.append(node)
+        hash_value = None
+        for term in terms:
+            kind, operator = term[0], term[1]
+            paths = [context.path(operand) for operand in _iter_operands(term) if operand[0] == 'path']
+            if kind not in ('compare', 'between', 'function') or len(paths) != 1:
+                raise _validation_error("Invalid KeyConditionExpression: Unsupported condition")
+            if paths[0] == (source.hash_name,):
+                if kind != 'compare' or operator != '=' or hash_value is not None:
+                    raise _validation_error("Query key condition not supported")
+                value_node = term[3] if term[2][0] == 'path' else term[2]
+                hash_value = context.value(value_node[1])
+            elif paths[0] != (source.range_name,):
+                raise _validation_error("Query condition missed key schema element")
+            elif kind == 'function' and operator != 'begins_with' or kind == 'compare' and operator == '<>':
+                raise _validation_error("Invalid KeyConditionExpression: Unsupported operator on KeyCondition")
+        if hash_value is None:
+            raise _validation_error("Query condition missed key schema element: {}".format(source.hash_name))
+        return hash_value
+
+    @staticmethod
+    def _get_start_sort_key(table: _Table, index: Optional[_Index], start: Dict[str, Any]) -> Any:
+        key = table.get_key({name: start[name] for name in table.key_names})
+        if index is None:
+            return key[1]
+        item = {name: _load_value(value) for name, value in start.items()}
+        entry = index.get_entry(item, table, key)
+        if entry is None:
+            raise _validation_error("The provided starting key is invalid")
+        return entry[1]
+
+    def _scan(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._get_table(params[TABLE_NAME])
+        index = table.get_index(params.get(INDEX_NAME))
+        source: _KeySchema = index if index is not None else table
+        if index is not None and index.is_global and params.get(CONSISTENT_READ):
+            raise _validation_error("Consistent reads are not supported on global secondary indexes")
+        segment, total_segments = params.get(SEGMENT), params.get(TOTAL_SEGMENTS)
+        if (segment is None) != (total_segments is None):
+            raise _validation_error("The Segment parameter is required but was not present in the request when parameter TotalSegments is present")
+        if total_segments is not None and not 0 <= segment < total_segments:  # type: ignore[operator]
+            raise _validation_error("The Segment parameter is zero-based and must be less than parameter TotalSegments")
+        context = _Context(params)
+
+        hash_ids = source.get_hash_ids()
+        first_hash, resume, start_sort_key = 0, False, None
+        start = params.get(EXCLUSIVE_START_KEY)
+        if start is not None:
+            start_hash = table.get_key({name: start[name] for name in table.key_names})[0]
+            if index is not None:
+                start_item = {name: _load_value(value) for name, value in start.items()}
+                start_hash = key_value_id(index.hash_type, start_item[index.hash_name][index.hash_type])
+            first_hash = bisect_left(hash_ids, start_hash)
+            if first_hash < len(hash_ids) and hash_ids[first_hash] == start_hash:
+                resume = True
+                start_sort_key = self._get_start_sort_key(table, index, start)
+
+        def candidates() -> Iterator[_RawItem]:
+            for position in range(first_hash, len(hash_ids)):
+                hash_id = hash_ids[position]
+                if total_segments is not None and _get_segment(hash_id, total_segments) != segment:
+                    continue
+                partition = source.partitions[hash_id]
+                sort_keys = partition.sort_keys
+                first = 0
+                if resume and position == first_hash:
+                    first = _get_start_position(sort_keys, start_sort_key)
+                for sort_key in sort_keys[first:]:
+                    yield partition.items[sort_key]
+
+        return self._read_page(table, index, params, context, candidates())
+
+    def _read_page(
+        self,
+        table: _Table,
+        index: Optional[_Index],
+        params: Dict[str, Any],
+        context: _Context,
+        candidates: Iterator[_RawItem],
+    ) -> Dict[str, Any]:
+        """
+        Reads a page of items for a query or a scan
+        """
+        limit = params.get(LIMIT)
+        if limit is not None and limit <= 0:
+            raise _validation_error("Limit must be greater than or equal to 1")
+        select = params.get(SELECT) or (ALL_PROJECTED_ATTRIBUTES if index is not None else ALL)
+        projection = self._get_projection(params, context)
+        if projection is not None and select not in (SPECIFIC_ATTRIBUTES, ALL_PROJECTED_ATTRIBUTES, ALL):
+            raise _validation_error("Cannot specify the ProjectionExpression when choosing to get {}".format(select))
+        filter_expression = params.get(FILTER_EXPRESSION)
+        filter_condition = _parse_condition(filter_expression) if filter_expression else None
+
+        items = []
+        count = scanned = size = 0
+        last_item = None
+        for item in candidates:
+            if limit is not None and scanned >= limit or size >= _MAX_PAGE_BYTES:
+                break
+            scanned += 1
+            size += item_size(item)
+            last_item = item
+            if index is not None and index.is_global:
+                item = index.project(item, table)
+            if filter_condition is not None and not _evaluate_condition(filter_condition, item, context):
+                continue
+            count += 1
+            if select != COUNT:
+                if index is not None and projection is None and select != ALL:
+                    item = index.project(item, table)
+                items.append(self._get_output_item(item, projection))
+        else:
+            last_item = None
+
+        response: Dict[str, Any] = {CAMEL_COUNT: count, SCANNED_COUNT: scanned}
+        if select != COUNT:
+            response[ITEMS] = items
+        if last_item is not None:
+            last_evaluated_key = table.get_key_attributes(last_item)
+            if index is not None:
+                last_evaluated_key.update((name, last_item[name]) for name in index.key_names)
+            response[LAST_EVALUATED_KEY] = _copy_item(last_evaluated_key)
+        units = read_capacity_units(size, bool(params.get(CONSISTENT_READ)))
+        response.update(self._get_capacity(params, table.name, units, index))
+        return response
+
+    # Batches
+
+    def _batch_get_item(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        request_items = params[REQUEST_ITEMS]
+        if sum(len(request[KEYS]) for request in request_items.values()) > BATCH_GET_PAGE_LIMIT:
+            raise _validation_error("Too many items requested for the BatchGetItem call")
+        requests = []
+        for table_name, request in request_items.items():
+            table = self._get_table(table_name)
+            keys = [table.get_key(key) for key in request[KEYS]]
+            if len(set(keys)) != len(keys):
+                raise _validation_error("Provided list of item keys contains duplicates")
+            context = _Context(request)
+            requests.append((table, request, keys, self._get_projection(request, context)))
+
+        responses: Dict[str, List[_RawItem]] = {}
+        units: Dict[str, float] = {}
+        for table, request, keys, projection in requests:
+            items = responses[table.name] = []
+            consistent_read = bool(request.get(CONSISTENT_READ))
+            units[table.name] = 0
+            for key in keys:
+                item = table.get(key)
+                units[table.name] += read_capacity_units(item_size(item) if item is not None else 0, consistent_read)
+                if item is not None:
+                    items.append(self._get_output_item(item, projection))
+        response = {RESPONSES: responses, UNPROCESSED_KEYS: {}}
+        response.update(self._get_capacities(params, units))
+        return response
+
+    def _batch_write_item(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        request_items = params[REQUEST_ITEMS]
+        if sum(len(requests) for requests in request_items.values()) > BATCH_WRITE_PAGE_LIMIT:
+            raise _validation_error("Too many items requested for the BatchWriteItem call")
+        writes = []
+        for table_name, requests in request_items.items():
+            table = self._get_table(table_name)
+            keys = set()
+            for request in requests:
+                if PUT_REQUEST in request:
+                    write = self._prepare_put(table, request[PUT_REQUEST])
+                else:
+                    write = self._prepare_delete(table, request[DELETE_REQUEST])
+                if write.key in keys:
+                    raise _validation_error("Provided list of item keys contains duplicates")
+                keys.add(write.key)
+                writes.append(write)
+
+        units: Dict[str, float] = {}
+        for write in writes:
+            write.table.store(write.key, write.old, write.new)
+            units[write.table.name] = units.get(write.table.name, 0) + _write_units(write.old, write.new)
+        response: Dict[str, Any] = {UNPROCESSED_ITEMS: {}}
+        response.update(self._get_capacities(params, units))
+        return response
+
+    # Transactions
+
+    def _transact_get_items(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        transact_items = params[TRANSACT_ITEMS]
+        if len(transact_items) > TRANSACT_ITEM_LIMIT:
+            raise _validation_error("Member must have length less than or equal to {}".format(TRANSACT_ITEM_LIMIT))
+        responses = []
+        units: Dict[str, float] = {}
+        for transact_item in transact_items:
+            request = transact_item[TRANSACT_GET]
+            table = self._get_table(request[TABLE_NAME])
+            projection = self._get_projection(request, _Context(request))
+            item = table.get(table.get_key(request[KEY]))
+            responses.append({ITEM: self._get_output_item(item, projection)} if item is not None else {})
+            units[table.name] = units.get(table.name, 0) + 2 * read_capacity_units(
+                item_size(item) if item is not None else 0, True,
+            )
+        response: Dict[str, Any] = {RESPONSES: responses}
+        response.update(self._get_capacities(params, units))
+        return response
+
+    def _transact_write_items(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        transact_items = params[TRANSACT_ITEMS]
+        if len(transact_items) > TRANSACT_ITEM_LIMIT:
+            raise _validation_error("Member must have length less than or equal to {}".format(TRANSACT_ITEM_LIMIT))
+        client_request_token = params.get(CLIENT_REQUEST_TOKEN)
+        if client_request_token is not None:
+            now = time.monotonic()
+            self._client_request_tokens = {
+                token: entry for token, entry in self._client_request_tokens.items() if entry[0] > now
+            }
+            fingerprint = repr(transact_items)
+            entry = self._client_request_tokens.get(client_request_token)
+            if entry is not None:
+                if entry[1] != fingerprint:
+                    raise _DynamoDBError(
+                        'IdempotentParameterMismatchException',
+                        'Request parameters do not match the previous request with the same client token',
+                    )
+                # a retry of a transaction that succeeded
+                return {}
+        writes = []
+        keys = set()
+        for transact_item in transact_items:
+            operation, request = next(iter(transact_item.items()))
+            table = self._get_table(request[TABLE_NAME])
+            if operation == TRANSACT_PUT:
+                write = self._prepare_put(table, request)
+            elif operation == TRANSACT_UPDATE:
+                write, _ = self._prepare_update(table, request)
+            elif operation == TRANSACT_DELETE:
+                write = self._prepare_delete(table, request)
+            elif operation == TRANSACT_CONDITION_CHECK:
+                write = self._prepare_condition_check(table, request)
+            else:
+                raise _validation_error("Unsupported transaction operation: {}".format(operation))
+            if (table.name, write.key) in keys:
+                raise _validation_error("Transaction request cannot include multiple operations on one item")
+            keys.add((table.name, write.key))
+            writes.append((operation, request, write))
+
+        if not all(write.condition_met for _, _, write in writes):
+            reasons = []
+            for _, request, write in writes:
+                if write.condition_met:
+                    reasons.append({'Code': 'None'})
+                    continue
+                reason: Dict[str, Any] = {'Code': 'ConditionalCheckFailed', 'Message': 'The conditional request failed'}
+                if request.get(RETURN_VALUES_ON_CONDITION_FAILURE) == ALL_OLD and write.old is not None:
+                    reason[ITEM] = _copy_item(write.old)
+                reasons.append(reason)
+            raise _DynamoDBError(
+                'TransactionCanceledException',
+                'Transaction cancelled, please refer cancellation reasons for specific reasons [{}]'.format(
+                    ', '.join(reason['Code'] for reason in reasons)
+                ),
+                CancellationReasons=reasons,
+            )
+
+        units: Dict[str, float] = {}
+        for operation, _, write in writes:
+            if operation != TRANSACT_CONDITION_CHECK:
+                write.table.store(write.key, write.old, write.new)
+            units[write.table.name] = units.get(write.table.name, 0) + 2 * _write_units(write.old, write.new)
+        if client_request_token is not None:
+            self._client_request_tokens[client_request_token] = (now + _CLIENT_REQUEST_TOKEN_SECONDS, fingerprint)
+        response: Dict[str, Any] = {}
+        response.update(self._get_capacities(params, units))
+        return response
+
+
+def _iter_operands(node: _Node) -> Iterator[_Node]:
+    kind = node[0]
+    if kind == 'compare':
+        yield node[2]
+        yield node[3]
+    elif kind == 'between':
+        yield from node[1:]
+    elif kind == 'function':
+        yield from node[2]
+    elif kind == 'in':
+        yield node[1]
+        yield from node[2]
+
+
+def _get_start_position(sort_keys: List[Any], start_sort_key: Any) -> int:
+    """
+    Returns the position of the first sort key after `start_sort_key`
+    """
+    if start_sort_key is None:
+        # the sort key of the only item of a table without a range key
+        return len(sort_keys)
+    return bisect_right(sort_keys, start_sort_key)
+
+
+def _get_segment(hash_id: Any, total_segments: int) -> int:
+    return zlib.crc32(repr(hash_id).encode()) % total_segments
@@ -0,0 +1,210 @@
+"""
+Process-wide registry of botocore sessions and clients shared by connections
+"""
+import os
+import threading
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import botocore.loaders
+    import botocore.session
+    from pynamodb.connection._botocore_private import BotocoreBaseClientPrivate
+
+_SessionKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class ClientKey(NamedTuple):
+    """
+    The settings that determine a botocore client: connections with equal keys share a client
+    """
+    region: Optional[str]
+    host: Optional[str]
+    aws_access_key_id: Optional[str]
+    aws_secret_access_key: Optional[str]
+    aws_session_token: Optional[str]
+    connect_timeout_seconds: float
+    read_timeout_seconds: float
+    max_retry_attempts: int
+    max_pool_connections: int
+    extra_headers: Tuple[Tuple[str, str], ...]
+
+
+class PoolStats(NamedTuple):
+    """
+    The occupancy of one of a client's connection pools (there is one pool per endpoint host)
+    """
+    key: ClientKey
+    host: str
+    max_size: int
+    in_use: int
+    idle: int
+    num_connections: int
+    num_requests: int
+
+
+class ClientRegistry:
+    """
+    A thread-safe registry of botocore sessions and clients, keyed by :class:`ClientKey`.
+
+    Each botocore client owns a urllib3 connection pool, so connections (and hence models) that get their
+    client from the same registry with the same settings also share their pool, their credentials and
+    their warm TLS connections. All threads share the same sessions and clients: since creating clients
+    from a botocore session is not thread-safe, sessions and clients are only created with the registry locked.
+
+    A client whose credentials could not be resolved is replaced on its next use,
+    since botocore would otherwise keep the empty credentials for good.
+
+    In a child process created by :func:`os.fork`, the sessions and clients inherited from the parent
+    are discarded (and recreated on first use), while the service models loaded by the parent are kept.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._data_loader: Optional['botocore.loaders.Loader'] = None
+        self._sessions: Dict[_SessionKey, 'botocore.session.Session'] = {}
+        self._clients: Dict[ClientKey, 'BotocoreBaseClientPrivate'] = {}
+
+    def get_session(
+        self,
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+        aws_session_token: Optional[str] = None,
+    ) -> 'botocore.session.Session':
+        """
+        Returns the session for the given credentials, creating it if there is none
+
+        Without credentials, the session resolves them from the environment (as botocore does).
+        """
+        key = (aws_access_key_id, aws_secret_access_key, aws_session_token)
+        session = self._sessions.get(key)
+        if session is not None:
+            return session
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                import botocore.session
+
+                session = botocore.session.get_session()
+                # the loader caches the service models it loads, so all sessions share one
+                if self._data_loader is None:
+                    self._data_loader = session.get_component('data_loader')
+                else:
+                    session.register_component('data_loader', self._data_loader)
+                if aws_access_key_id and aws_secret_access_key:
+                    session.set_credentials(aws_access_key_id, aws_secret_access_key, aws_session_token)
+                # resolve the credentials (and load the credential chain) before any thread can use the session
+                session.get_credentials()
+                self._sessions[key] = session
+            return session
+
+    def get_client(
+        self,
+        key: ClientKey,
+        create_client: Callable[[], 'BotocoreBaseClientPrivate'],
+    ) -> 'BotocoreBaseClientPrivate':
+        """
+        Returns the client registered for `key`, creating it with `create_client` if there is none
+
+        :param key: The settings of the client
+        :param create_client: Creates a client for `key`; called with the registry locked
+        """
+        client = self._clients.get(key)
+        if client is not None and _has_credentials(client):
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or not _has_credentials(client):
+                client = self._clients[key] = create_client()
+            return client
+
+    def clear(self) -> None:
+        """
+        Removes all sessions and clients from the registry
+        """
+        with self._lock:
+            self._sessions.clear()
+            self._clients.clear()
+
+    def _reset_after_fork(self) -> None:
+        # sessions and clients hold sockets (pooled connections, credential fetchers) shared with the parent,
+        # and the lock may have been held by a thread that does not exist in the child;
+        # the data loader holds no sockets, so service models loaded before the fork stay loaded
+        self._lock = threading.RLock()
+        self._sessions = {}
+        self._clients = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, key: ClientKey) -> bool:
+        return key in self._clients
+
+    def pool_stats(self) -> List[PoolStats]:
+        """
+        Returns the occupancy of the connection pools of all registered clients
+        """
+        with self._lock:
+            clients = list(self._clients.items())
+        return [stats for key, client in clients for stats in _iter_pool_stats(key, client)]
+
+
+def _has_credentials(client: 'BotocoreBaseClientPrivate') -> bool:
+    # botocore has a known issue where it will cache empty credentials
+    # https://github.com/boto/botocore/blob/4d55c9b4142/botocore/credentials.py#L1016-L1021
+    # if the client does not have credentials, we create a new client
+    # otherwise the client is permanently poisoned in the case of metadata service flakiness when using IAM roles
+    return not client._request_signer or bool(client._request_signer._credentials)
+
+
+def _iter_pool_stats(key: ClientKey, client: 'BotocoreBaseClientPrivate') -> Iterator[PoolStats]:
+    http_session = client._endpoint.http_session
+    for manager in [http_session._manager, *http_session._proxy_managers.values()]:
+        for pool_key in manager.pools.keys():
+            pool = manager.pools.get(pool_key)
+            if pool is None or pool.pool is None:
+                continue
+            max_size = pool.pool.maxsize
+            # the pool's queue is filled with placeholders (None) until connections are made
+            queued = list(pool.pool.queue)
+            yield PoolStats(
+                key=key,
+                host=pool.host,
+                max_size=max_size,
+                in_use=max_size - len(queued),
+                idle=sum(conn is not None for conn in queued),
+                num_connections=pool.num_connections,
+                num_requests=pool.num_requests,
+            )
+
+
+def open_connections(client: 'BotocoreBaseClientPrivate', count: int) -> int:
+    """
+    Opens up to `count` keep-alive connections to the client's endpoint and returns them to its pool,
+    returning the number of connections in the pool
+
+    :param client: The client whose pool to fill
+    :param count: The number of connections to open (capped at the pool size)
+    """
+    url = client.meta.endpoint_url
+    http_session = client._endpoint.http_session
+    manager = http_session._get_connection_manager(url, http_session._proxy_config.proxy_url_for(url))
+    pool = manager.connection_from_url(url)
+    http_session._setup_ssl_cert(pool, url, http_session._verify)
+    # take the connections out of the pool first, so that each one is opened
+    connections = [pool._get_conn() for _ in range(min(count, pool.pool.maxsize if pool.pool else 0))]
+    try:
+        for conn in connections:
+            if not conn.is_connected:
+                conn.connect()
+    finally:
+        for conn in connections:
+            pool._put_conn(conn)
+    return len(connections)
+
+
+#: The registry used by all connections
+client_registry = ClientRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=client_registry._reset_after_fork)
@@ -6,6 +6,7 @@ PynamoDB Connection classes
 from typing import Any, Dict, Mapping, Optional, Sequence
 
 from pynamodb.connection.base import Connection, MetaTable
+from pynamodb.connection.transport import Transport
 from pynamodb.constants import DEFAULT_BILLING_MODE, KEY
 from pynamodb.expressions.condition import Condition
 from pynamodb.expressions.update import Action
@@ -31,6 +32,7 @@ class TableConnection:
         aws_session_token: Optional[str] = None,
         *,
         meta_table: Optional[MetaTable] = None,
+        transport: Optional[Transport] = None,
     ) -> None:
         self.table_name = table_name
         self.connection = Connection(region=region,
@@ -42,7 +44,8 @@ class TableConnection:
                                      extra_headers=extra_headers,
                                      aws_access_key_id=aws_access_key_id,
                                      aws_secret_access_key=aws_secret_access_key,
-                                     aws_session_token=aws_session_token)
+                                     aws_session_token=aws_session_token,
+                                     transport=transport)
 
         if meta_table is not None:
             self.connection.add_meta_table(meta_table)
@@ -0,0 +1,30 @@
+"""
+Transports carry DynamoDB requests built by a :class:`~pynamodb.connection.Connection`
+"""
+from typing import Any, Dict
+
+
+class Transport:
+    """
+    The interface between a :class:`~pynamodb.connection.Connection` and a DynamoDB implementation.
+
+    By default, connections send requests to DynamoDB with a botocore client. A connection given a transport
+    sends them to the transport instead, e.g. :class:`~pynamodb.connection.memory.InMemoryTransport`.
+
+    Requests and responses use the same (low-level) shape as botocore's ``_make_api_call``:
+    attribute values are DynamoDB JSON, with binary values as bytes.
+    Errors are raised as :class:`botocore.exceptions.ClientError`, so that connections can
+    handle them as they handle errors from DynamoDB.
+    """
+
+    def make_api_call(self, operation_name: str, operation_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Performs the operation `operation_name` (e.g. ``GetItem``) and returns its response
+
+        :param operation_name: The name of the DynamoDB operation
+        :param operation_kwargs: The parameters of the request
+        """
+        raise NotImplementedError()
+
+    def __repr__(self) -> str:
+        return "{}()".format(type(self).__name__)
@@ -23,6 +23,9 @@ GET_ITEM = 'GetItem'
 PUT_ITEM = 'PutItem'
 QUERY = 'Query'
 SCAN = 'Scan'
+# Operations consuming read and write capacity
+READ_OPERATIONS = [GET_ITEM, BATCH_GET_ITEM, QUERY, SCAN, TRANSACT_GET_ITEMS]
+WRITE_OPERATIONS = [PUT_ITEM, UPDATE_ITEM, DELETE_ITEM, BATCH_WRITE_ITEM, TRANSACT_WRITE_ITEMS]
 
 # Request Parameters
 RETURN_VALUES_ON_CONDITION_FAILURE = 'ReturnValuesOnConditionCheckFailure'
@@ -195,6 +198,13 @@ UPDATED_NEW = 'UPDATED_NEW'
 RETURN_VALUES_VALUES = [NONE, ALL_OLD, UPDATED_OLD, ALL_NEW, UPDATED_NEW]
 RETURN_VALUES_ON_CONDITION_FAILURE_VALUES = [NONE, ALL_OLD]
 
+# These are the valid result formats of Model.query, Model.scan and Model.batch_get
+RESULT_FORMAT_MODEL = 'model'
+RESULT_FORMAT_DICT = 'dict'
+RESULT_FORMAT_NAMEDTUPLE = 'namedtuple'
+RESULT_FORMAT_RAW = 'raw'
+RESULT_FORMAT_VALUES = [RESULT_FORMAT_MODEL, RESULT_FORMAT_DICT, RESULT_FORMAT_NAMEDTUPLE, RESULT_FORMAT_RAW]
+
 # These are constants used in the AttributeUpdates parameter for UpdateItem
 # See: http://docs.aws.amazon.com/amazondynamodb/latest/APIReference/API_UpdateItem.html#DDB-UpdateItem-request-AttributeUpdates
 PUT = 'PUT'
@@ -202,6 +212,10 @@ DELETE = 'DELETE'
 ADD = 'ADD'
 BATCH_GET_PAGE_LIMIT = 100
 BATCH_WRITE_PAGE_LIMIT = 25
+BATCH_WRITE_MAX_BYTES = 16 * 1024 * 1024
+TRANSACT_ITEM_LIMIT = 100
+TRANSACT_MAX_BYTES = 4 * 1024 * 1024
+MAX_ITEM_SIZE_BYTES = 400 * 1024
 
 META_CLASS_NAME = "Meta"
 REGION = "region"
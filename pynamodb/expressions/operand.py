@@ -239,6 +239,46 @@ class Value(_NumericOperand, _ListAppendOperand, _ConditionOperand):
         return attr_class.attr_type, attr_class.serialize(value)
 
 
+class Param(_NumericOperand, _ListAppendOperand, _ConditionOperand):
+    """
+    Param is an operand that represents a bind parameter of a prepared expression: a value given each time
+    the expression is used (see :mod:`pynamodb.expressions.prepared`).
+    """
+    format_string = '{0}'
+
+    def __init__(self, name: str, attribute: Optional['Attribute'] = None, set_element: bool = False) -> None:
+        self.attribute = attribute
+        self.set_element = set_element
+        if attribute is not None:
+            # the elements of a set have the type of the set without its trailing 'S'
+            self.attr_type = attribute.attr_type[0] if set_element else attribute.attr_type
+        super(Param, self).__init__(name)
+
+    @property
+    def name(self) -> str:
+        return self.values[0]
+
+    def bind(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the serialized value of the parameter in `params`
+        """
+        try:
+            value = params[self.name]
+        except KeyError:
+            raise ValueError("No value given for parameter '{}'".format(self.name)) from None
+        if self.set_element:
+            (attr_type, attr_value), = Value([value], attribute=self.attribute).value.items()
+            return {attr_type[0]: attr_value[0]}
+        return Value(value, attribute=self.attribute).value
+
+    def _serialize_value(self, value, placeholder_names, expression_attribute_values):
+        # the parameter stands in for its value until the expression is bound
+        return get_value_placeholder(self, expression_attribute_values)
+
+    def __repr__(self) -> str:
+        return "Param({!r})".format(self.name)
+
+
 class Path(_NumericOperand, _ListAppendOperand, _ConditionOperand):
     """
     Path is an operand that represents either an attribute name or document path.
@@ -340,7 +380,9 @@ class Path(_NumericOperand, _ListAppendOperand, _ConditionOperand):
         return BeginsWith(self, operand)
 
     def contains(self, item: Any) -> Contains:
-        if self.attribute and self.attribute.attr_type in [BINARY_SET, NUMBER_SET, STRING_SET]:
+        if self.attribute and self.attribute.attr_type in [BINARY_SET, NUMBER_SET, STRING_SET] and isinstance(item, Param):
+            item = Param(item.name, attribute=self.attribute, set_element=True)
+        elif self.attribute and self.attribute.attr_type in [BINARY_SET, NUMBER_SET, STRING_SET]:
             # Set attributes assume the values to be serialized are sets.
             (attr_type, attr_value), = self._to_value([item]).value.items()
             item = {attr_type[0]: attr_value[0]}
@@ -349,6 +391,12 @@ class Path(_NumericOperand, _ListAppendOperand, _ConditionOperand):
     def _serialize_value(self, value, placeholder_names, expression_attribute_values):
         return substitute_names(value, placeholder_names)
 
+    def _to_operand(self, value: Any):
+        if isinstance(value, Param) and value.attribute is None:
+            # parameters compared to (or assigned to) an attribute are serialized by that attribute
+            return Param(value.name, attribute=self.attribute)
+        return super(Path, self)._to_operand(value)
+
     def _to_value(self, value: Any) -> Value:
         return Value(value, attribute=self.attribute)
 
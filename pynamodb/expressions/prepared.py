@@ -0,0 +1,163 @@
+"""
+Prepared condition and update expressions: expressions serialized once, with bind parameters
+(:class:`~pynamodb.expressions.operand.Param`) whose values are given each time the expression is used.
+
+Example:
+    popular = PreparedCondition((Thread.views >= Param('views')) & Thread.subject.startswith(Param('prefix')))
+    Thread.scan(popular.bind(views=100, prefix='PynamoDB'))
+
+    viewed = PreparedUpdate(Thread.views.add(Param('views')), Thread.last_viewed_at.set(Param('now')))
+    thread.update(viewed.bind(views=1, now=datetime.now(timezone.utc)))
+"""
+import re
+from typing import Any, Dict, List, Union
+
+from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.operand import Param
+from pynamodb.expressions.update import Action, AddAction, DeleteAction, RemoveAction, SetAction, Update
+
+# The name (#0) and value (:0) placeholders of a serialized expression
+_PLACEHOLDER_REGEX = re.compile(r'([#:])(\d+)')
+
+
+class _Template:
+    """
+    A serialized expression whose placeholders can be renumbered, to be combined with other expressions
+    """
+
+    def __init__(self, expression: Union[Condition, Action]) -> None:
+        placeholder_names: Dict[str, str] = {}
+        expression_attribute_values: Dict[str, Any] = {}
+        self.expression = expression.serialize(placeholder_names, expression_attribute_values)
+        # placeholders are numbered in insertion order
+        self.placeholder_names = placeholder_names
+        self.names = list(placeholder_names)
+        self.values: List[Union[Dict[str, Any], Param]] = list(expression_attribute_values.values())
+        self.format_string = _PLACEHOLDER_REGEX.sub(
+            lambda match: '{{{}[{}]}}'.format(0 if match.group(1) == '#' else 1, match.group(2)),
+            self.expression.replace('{', '{{').replace('}', '}}'),
+        )
+
+    def serialize(
+        self,
+        params: Dict[str, Any],
+        placeholder_names: Dict[str, str],
+        expression_attribute_values: Dict[str, Any],
+    ) -> str:
+        if not placeholder_names and not expression_attribute_values:
+            # the expression comes first: its placeholders are already numbered
+            placeholder_names.update(self.placeholder_names)
+            for index, value in enumerate(self.values):
+                expression_attribute_values[':' + str(index)] = self._bind(value, params)
+            return self.expression
+        names = []
+        for name in self.names:
+            placeholder = placeholder_names.get(name)
+            if placeholder is None:
+                placeholder = placeholder_names[name] = '#' + str(len(placeholder_names))
+            names.append(placeholder)
+        values = []
+        for value in self.values:
+            placeholder = ':' + str(len(expression_attribute_values))
+            expression_attribute_values[placeholder] = self._bind(value, params)
+            values.append(placeholder)
+        return self.format_string.format(names, values)
+
+    @staticmethod
+    def _bind(value: Union[Dict[str, Any], Param], params: Dict[str, Any]) -> Dict[str, Any]:
+        return value.bind(params) if isinstance(value, Param) else value
+
+
+class PreparedCondition:
+    """
+    A condition serialized once, to be bound to the values of its parameters each time it is used.
+    """
+
+    def __init__(self, condition: Condition) -> None:
+        if not isinstance(condition, Condition):
+            raise ValueError("'condition' must be an instance of Condition")
+        self.condition = condition
+        self._template = _Template(condition)
+
+    def bind(self, **params: Any) -> Condition:
+        """
+        Returns the condition with the given parameter values, to be passed wherever a condition is accepted
+        """
+        return _BoundCondition(self.condition, self._template, params)
+
+
+class PreparedUpdate:
+    """
+    Update actions serialized once, to be bound to the values of their parameters each time they are used.
+    """
+
+    def __init__(self, *actions: Action) -> None:
+        Update(*actions)  # validates the actions
+        self.actions = actions
+        self._templates = [_Template(action) for action in actions]
+
+    def bind(self, **params: Any) -> List[Action]:
+        """
+        Returns the actions with the given parameter values, to be passed wherever update actions are accepted
+        """
+        return [
+            _bind_action(action, template, params)
+            for action, template in zip(self.actions, self._templates)
+        ]
+
+
+class _BoundCondition(Condition):
+
+    def __init__(self, condition: Condition, template: _Template, params: Dict[str, Any]) -> None:
+        super().__init__(condition.operator, *condition.values)
+        self.format_string = condition.format_string
+        self._template = template
+        self._params = params
+
+    def serialize(self, placeholder_names: Dict[str, str], expression_attribute_values: Dict[str, str]) -> str:
+        return self._template.serialize(self._params, placeholder_names, expression_attribute_values)
+
+
+class _BoundAction(Action):
+
+    def __init__(self, action: Action, template: _Template, params: Dict[str, Any]) -> None:
+        # skips the checks of the action classes, already made on `action`
+        Action.__init__(self, *action.values)
+        self.format_string = action.format_string
+        self._template = template
+        self._params = params
+
+    def serialize(self, placeholder_names: Dict[str, str], expression_attribute_values: Dict[str, str]) -> str:
+        return self._template.serialize(self._params, placeholder_names, expression_attribute_values)
+
+
+class _BoundSetAction(_BoundAction, SetAction):
+    pass
+
+
+class _BoundRemoveAction(_BoundAction, RemoveAction):
+    pass
+
+
+class _BoundAddAction(_BoundAction, AddAction):
+    pass
+
+
+class _BoundDeleteAction(_BoundAction, DeleteAction):
+    pass
+
+
+_BOUND_ACTION_CLASSES = (
+    (SetAction, _BoundSetAction),
+    (RemoveAction, _BoundRemoveAction),
+    (AddAction, _BoundAddAction),
+    (DeleteAction, _BoundDeleteAction),
+)
+
+
+def _bind_action(action: Action, template: _Template, params: Dict[str, Any]) -> Action:
+    # bound actions keep the class of their action, which decides their clause of the update expression
+    for action_class, bound_action_class in _BOUND_ACTION_CLASSES:
+        if isinstance(action, action_class):
+            return bound_action_class(action, template, params)
+    raise ValueError("unsupported action type: '{}'".format(action.__class__.__name__))
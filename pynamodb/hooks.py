@@ -0,0 +1,192 @@
+"""
+Request lifecycle hooks
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pynamodb.constants import CONSUMED_CAPACITY, INDEX_NAME, REQUEST_ITEMS, TABLE_NAME, TRANSACT_ITEMS
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+#: The phases of a request, in order. A request sent by botocore is prepared (parameters are validated and
+#: serialized), then each attempt is signed, sent, and its response parsed; `retry_wait` is the time spent
+#: between attempts and `finish` the time from the last response to the end of the request.
+#: Requests sent through a transport (and asyncio requests) are timed as a whole, as `send`.
+PHASES = ('prepare', 'sign', 'send', 'parse', 'retry_wait', 'finish')
+
+
+def get_table_names(request: Dict[str, Any]) -> List[str]:
+    """
+    Returns the names of all tables the parameters of a request refer to
+    """
+    if REQUEST_ITEMS in request:
+        return list(request[REQUEST_ITEMS])
+    if TRANSACT_ITEMS in request:
+        return list(dict.fromkeys(op[TABLE_NAME] for item in request[TRANSACT_ITEMS] for op in item.values()))
+    table_name = request.get(TABLE_NAME)
+    return [table_name] if table_name is not None else []
+
+
+class RequestContext:
+    """
+    Describes a request to DynamoDB, for the handlers of :class:`RequestHooks`.
+
+    Handlers called before the request see the request only; handlers called after it
+    also see the response (or the error) and the measurements.
+    """
+
+    __slots__ = (
+        'connection', 'operation', 'table_name', 'index_name', 'request', 'req_uuid',
+        'response', 'error', 'request_size', 'response_size', 'attempts', 'start_time', 'duration', 'timings',
+        '_mark',
+    )
+
+    def __init__(self, connection: Any, operation: str, request: Dict[str, Any], req_uuid: Any = None) -> None:
+        #: The connection sending the request
+        self.connection = connection
+        #: The name of the DynamoDB operation, e.g. ``GetItem``
+        self.operation = operation
+        #: The name of the table (``None`` for batch and transaction operations, see :attr:`table_names`)
+        self.table_name: Optional[str] = request.get(TABLE_NAME)
+        #: The name of the index queried or scanned, if any
+        self.index_name: Optional[str] = request.get(INDEX_NAME)
+        #: The parameters of the request
+        self.request = request
+        #: A unique identifier of the request (as sent with the signals)
+        self.req_uuid = req_uuid
+        #: The response, once the request succeeded
+        self.response: Optional[Dict[str, Any]] = None
+        #: The error raised by the request, if it failed
+        self.error: Optional[Exception] = None
+        #: The size of the (first) request body in bytes, when sent by botocore
+        self.request_size: Optional[int] = None
+        #: The size of the (last) response body in bytes, when sent by botocore
+        self.response_size: Optional[int] = None
+        #: The number of attempts made by botocore
+        self.attempts = 0
+        #: When the request started (as a :func:`time.perf_counter` value)
+        self.start_time = time.perf_counter()
+        #: How long the request took in seconds, once it finished
+        self.duration: Optional[float] = None
+        #: The time spent in each phase of the request (see :data:`PHASES`), in seconds
+        self.timings: Dict[str, float] = {}
+        self._mark = self.start_time
+
+    @property
+    def retries(self) -> int:
+        """
+        The number of times the request was retried by botocore
+        """
+        return max(self.attempts - 1, 0)
+
+    @property
+    def table_names(self) -> List[str]:
+        """
+        The names of all tables the request reads or writes
+        """
+        return get_table_names(self.request)
+
+    @property
+    def consumed_capacity(self) -> Any:
+        """
+        The consumed capacity returned by DynamoDB (a list for batch and transaction operations), if any
+        """
+        return self.response.get(CONSUMED_CAPACITY) if self.response else None
+
+    def record(self, phase: str) -> None:
+        """
+        Adds the time since the end of the previous phase to `phase`
+        """
+        now = time.perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def finish(self, response: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None) -> None:
+        """
+        Records the outcome of the request
+        """
+        self.record('finish' if self.attempts else 'send')
+        self.duration = self._mark - self.start_time
+        self.response = response
+        self.error = error
+
+    def __repr__(self) -> str:
+        return "RequestContext<{} {}>".format(self.operation, ','.join(self.table_names))
+
+
+RequestHandler = Callable[[RequestContext], None]
+
+
+class RequestHooks:
+    """
+    Handlers called before and after every request sent by a connection (synchronous or asyncio).
+
+    When no handler is registered (and no receiver is connected to the signals), requests are sent
+    without creating a :class:`RequestContext`. Handlers are called in the thread sending the request,
+    so they should be quick; exceptions raised by handlers are logged and ignored.
+
+    Example:
+        from pynamodb.hooks import request_hooks
+
+        def log_slow_requests(context):
+            if context.duration > 0.1:
+                log.warning("%s on %s took %.3fs", context.operation, context.table_name, context.duration)
+
+        request_hooks.register(after=log_slow_requests)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._before: Tuple[RequestHandler, ...] = ()
+        self._after: Tuple[RequestHandler, ...] = ()
+
+    def register(self, before: Optional[RequestHandler] = None, after: Optional[RequestHandler] = None) -> None:
+        """
+        Registers handlers to be called before and/or after every request
+
+        :param before: Called before the request is sent
+        :param after: Called after the request succeeded or failed
+        """
+        with self._lock:
+            if before is not None:
+                self._before += (before,)
+            if after is not None:
+                self._after += (after,)
+
+    def unregister(self, before: Optional[RequestHandler] = None, after: Optional[RequestHandler] = None) -> None:
+        """
+        Unregisters handlers registered with :meth:`register`
+        """
+        with self._lock:
+            if before is not None:
+                self._before = tuple(handler for handler in self._before if handler != before)
+            if after is not None:
+                self._after = tuple(handler for handler in self._after if handler != after)
+
+    def __bool__(self) -> bool:
+        return bool(self._before or self._after)
+
+    def before_request(self, context: RequestContext) -> None:
+        for handler in self._before:
+            try:
+                handler(context)
+            except Exception:
+                log.exception("before_request hook threw an exception.")
+
+    def after_request(self, context: RequestContext) -> None:
+        for handler in self._after:
+            try:
+                handler(context)
+            except Exception:
+                log.exception("after_request hook threw an exception.")
+
+
+#: The hooks called for the requests of all connections
+request_hooks = RequestHooks()
+
+#: The request being sent in the current context, while it is being sent with hooks
+current_request: ContextVar[Optional[RequestContext]] = ContextVar('current_request', default=None)
@@ -1,8 +1,7 @@
 """
 PynamoDB Indexes
 """
-from inspect import getmembers
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 from typing import TYPE_CHECKING
 
 from pynamodb._schema import IndexSchema, GlobalSecondaryIndexSchema
@@ -12,9 +11,10 @@ from pynamodb.constants import (
     PROJECTION_TYPE, NON_KEY_ATTRIBUTES,
     READ_CAPACITY_UNITS, WRITE_CAPACITY_UNITS,
 )
+from pynamodb._util import get_class_members
 from pynamodb.attributes import Attribute
 from pynamodb.expressions.condition import Condition
-from pynamodb.pagination import ResultIterator
+from pynamodb.pagination import RateLimiter, ResultIterator
 from pynamodb.types import HASH, RANGE
 if TYPE_CHECKING:
     from pynamodb.models import Model
@@ -35,7 +35,7 @@ class Index(Generic[_M]):
         super().__init_subclass__(**kwargs)
         if cls.Meta is not None:
             cls.Meta.attributes = {}
-            for name, attribute in getmembers(cls, lambda o: isinstance(o, Attribute)):
+            for name, attribute in get_class_members(cls, lambda o: isinstance(o, Attribute)):
                 cls.Meta.attributes[name] = attribute
 
     def __init__(self) -> None:
@@ -55,7 +55,7 @@ class Index(Generic[_M]):
         filter_condition: Optional[Condition] = None,
         consistent_read: bool = False,
         limit: Optional[int] = None,
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
     ) -> int:
         """
         Count on an index
@@ -81,7 +81,10 @@ class Index(Generic[_M]):
         last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None,
         attributes_to_get: Optional[List[str]] = None,
         page_size: Optional[int] = None,
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+        prefetch: int = 0,
+        lazy_deserialization: Optional[bool] = None,
+        result_format: Optional[str] = None,
     ) -> ResultIterator[_M]:
         """
         Queries an index
@@ -98,6 +101,9 @@ class Index(Generic[_M]):
             attributes_to_get=attributes_to_get,
             page_size=page_size,
             rate_limit=rate_limit,
+            prefetch=prefetch,
+            lazy_deserialization=lazy_deserialization,
+            result_format=result_format,
         )
 
     def scan(
@@ -109,8 +115,11 @@ class Index(Generic[_M]):
         last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None,
         page_size: Optional[int] = None,
         consistent_read: Optional[bool] = None,
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
         attributes_to_get: Optional[List[str]] = None,
+        prefetch: int = 0,
+        lazy_deserialization: Optional[bool] = None,
+        result_format: Optional[str] = None,
     ) -> ResultIterator[_M]:
         """
         Scans an index
@@ -126,6 +135,9 @@ class Index(Generic[_M]):
             index_name=self.Meta.index_name,
             rate_limit=rate_limit,
             attributes_to_get=attributes_to_get,
+            prefetch=prefetch,
+            lazy_deserialization=lazy_deserialization,
+            result_format=result_format,
         )
 
     @classmethod
@@ -1,16 +1,24 @@
 """
 DynamoDB Models for PynamoDB
 """
+import contextvars
+import queue
 import random
+import threading
 import time
 import logging
 import warnings
 import sys
-from copy import deepcopy
-from inspect import getmembers
+from collections import namedtuple
+from copy import copy
+from functools import partial
+from operator import itemgetter
 from typing import Any
+from typing import AsyncIterator
+from typing import Callable
 from typing import Dict
 from typing import Generic
+from typing import Hashable
 from typing import Iterable
 from typing import Iterator
 from typing import List
@@ -24,7 +32,15 @@ from typing import TypeVar
 from typing import Union
 from typing import cast
 
+from pynamodb import profiling
+from pynamodb import retries
+from pynamodb._coalesce import GetCoalescer
 from pynamodb._schema import ModelSchema
+from pynamodb._util import get_class_members
+from pynamodb._util import key_value_id
+from pynamodb.cache import ItemCache
+from pynamodb.retries import Backoff, RetryPolicy
+from pynamodb.sizing import item_size, pack, read_capacity_units, write_capacity_units
 from pynamodb.connection.base import MetaTable
 
 if sys.version_info >= (3, 8):
@@ -34,28 +50,35 @@ else:
 
 from pynamodb.expressions.update import Action
 from pynamodb.exceptions import DoesNotExist, TableDoesNotExist, TableError, InvalidStateError, PutError, \
-    AttributeNullError
+    AttributeNullError, GetError
 from pynamodb.attributes import (
-    AttributeContainer, AttributeContainerMeta, TTLAttribute, VersionAttribute
+    AttributeContainer, AttributeContainerMeta, ListAttribute, MapAttribute, TTLAttribute, VersionAttribute,
+    _IMMUTABLE_TYPES, _LazyAttributeValues,
 )
+from pynamodb.connection.aio import AsyncTableConnection
 from pynamodb.connection.table import TableConnection
+from pynamodb.connection.transport import Transport
 from pynamodb.expressions.condition import Condition
+from pynamodb.expressions.operand import Value
 from pynamodb.types import HASH, RANGE
 from pynamodb.indexes import Index
-from pynamodb.pagination import ResultIterator
+from pynamodb.pagination import RateLimiter, ResultIterator, map_concurrently, merge_page_iterators
 from pynamodb.settings import get_settings_value
 from pynamodb import constants
 from pynamodb.constants import (
     ATTR_NAME, ATTR_TYPE,
-    KEY_TYPE, ITEM,
+    KEY_TYPE, ITEM, ITEMS,
     ATTRIBUTES, PUT, DELETE, RESPONSES,
     ALL_NEW,
     KEYS,
     TABLE_STATUS, ACTIVE, BATCH_GET_PAGE_LIMIT,
     UNPROCESSED_KEYS, PUT_REQUEST, DELETE_REQUEST,
-    BATCH_WRITE_PAGE_LIMIT,
+    BATCH_WRITE_PAGE_LIMIT, BATCH_WRITE_MAX_BYTES, MAX_ITEM_SIZE_BYTES,
     META_CLASS_NAME, REGION, HOST, NULL,
     COUNT, ITEM_COUNT, KEY, UNPROCESSED_ITEMS,
+    NONE, STRING_SET, NUMBER_SET, BINARY_SET,
+    RESULT_FORMAT_MODEL, RESULT_FORMAT_DICT, RESULT_FORMAT_NAMEDTUPLE, RESULT_FORMAT_RAW, RESULT_FORMAT_VALUES,
+    CONSUMED_CAPACITY, CAPACITY_UNITS, TABLE_NAME, TOTAL,
 )
 
 _T = TypeVar('_T', bound='Model')
@@ -70,12 +93,22 @@ class BatchWrite(Generic[_T]):
     """
     A class for batch writes
     """
-    def __init__(self, model: Type[_T], auto_commit: bool = True):
+    def __init__(
+        self,
+        model: Type[_T],
+        auto_commit: bool = True,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+    ):
         self.model = model
         self.auto_commit = auto_commit
         self.max_operations = BATCH_WRITE_PAGE_LIMIT
         self.pending_operations: List[Dict[str, Any]] = []
         self.failed_operations: List[Any] = []
+        self.rate_limiter: Optional[RateLimiter] = None
+        if isinstance(rate_limit, RateLimiter):
+            self.rate_limiter = rate_limit
+        elif rate_limit:
+            self.rate_limiter = RateLimiter(rate_limit)
 
     def save(self, put_item: _T) -> None:
         """
@@ -90,12 +123,7 @@ class BatchWrite(Generic[_T]):
 
         :param put_item: Should be an instance of a `Model` to be written
         """
-        if len(self.pending_operations) == self.max_operations:
-            if not self.auto_commit:
-                raise ValueError("DynamoDB allows a maximum of 25 batch operations")
-            else:
-                self.commit()
-        self.pending_operations.append({"action": PUT, "item": put_item})
+        self._add_operation(PUT, put_item)
 
     def delete(self, del_item: _T) -> None:
         """
@@ -110,12 +138,15 @@ class BatchWrite(Generic[_T]):
 
         :param del_item: Should be an instance of a `Model` to be deleted
         """
+        self._add_operation(DELETE, del_item)
+
+    def _add_operation(self, action: str, item: _T) -> None:
         if len(self.pending_operations) == self.max_operations:
             if not self.auto_commit:
                 raise ValueError("DynamoDB allows a maximum of 25 batch operations")
             else:
                 self.commit()
-        self.pending_operations.append({"action": DELETE, "item": del_item})
+        self.pending_operations.append({"action": action, "item": item})
 
     def __enter__(self):
         return self
@@ -132,32 +163,92 @@ class BatchWrite(Generic[_T]):
         Writes all of the changes that are pending
         """
         log.debug("%s committing batch operation", self.model)
-        put_items = []
-        delete_items = []
-        for item in self.pending_operations:
+        operations = self.pending_operations
+        self.pending_operations = []
+        self._commit_operations(operations)
+
+    def _commit_operations(self, operations: List[Dict[str, Any]]) -> None:
+        # (action, item or keys to write, size, request to report if it fails)
+        requests: List[Tuple[str, Dict[str, Any], int, Dict[str, Any]]] = []
+        oversized_items = []
+        for item in self._collapse_operations(operations):
             if item['action'] == PUT:
-                put_items.append(item['item'].serialize())
+                put_item = item['item'].serialize()
+                size = item_size(put_item)
+                if size > MAX_ITEM_SIZE_BYTES:
+                    oversized_items.append({PUT_REQUEST: {ITEM: put_item}})
+                else:
+                    requests.append((PUT, put_item, size, {PUT_REQUEST: {ITEM: put_item}}))
             elif item['action'] == DELETE:
-                delete_items.append(item['item']._get_keys())
-        self.pending_operations = []
-        if not len(put_items) and not len(delete_items):
-            return
+                delete_key = self._get_delete_key(item['item'])
+                requests.append(
+                    (DELETE, item['item']._get_keys(), item_size(delete_key), {DELETE_REQUEST: {KEY: delete_key}})
+                )
+        try:
+            request_packs = pack(requests, itemgetter(2), self.max_operations, BATCH_WRITE_MAX_BYTES)
+            for request_pack in request_packs:
+                put_items = [request for action, request, _, _ in request_pack if action == PUT]
+                delete_items = [request for action, request, _, _ in request_pack if action == DELETE]
+                try:
+                    self._write(put_items, delete_items)
+                except Exception as e:
+                    # the requests of this pack and of the packs not sent yet
+                    unwritten = request_pack + [request for rest in request_packs for request in rest]
+                    self._fail_write([failed_request for _, _, _, failed_request in unwritten], e)
+        finally:
+            for operation in operations:
+                operation['item']._invalidate_cached_item()
+                operation['item']._stop_tracking_changes()
+        if oversized_items:
+            self._fail(oversized_items, PutError(
+                "Failed to batch write items: {} items exceed the maximum item size".format(len(oversized_items))
+            ))
+
+    def _get_delete_key(self, item: _T) -> Dict[str, Dict[str, Any]]:
+        return self.model._get_typed_key(item._get_keys())
+
+    def _collapse_operations(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keeps only the last operation on each key, since DynamoDB rejects batches with duplicate keys
+        """
+        collapsed: Dict[Hashable, Dict[str, Any]] = {}
+        for operation in operations:
+            key_id = self.model._get_cache_key(operation['item']._get_keys())
+            collapsed.pop(key_id, None)
+            collapsed[key_id] = operation
+        if len(collapsed) < len(operations):
+            log.debug("Collapsed %d operations on duplicate keys", len(operations) - len(collapsed))
+        return list(collapsed.values())
+
+    def _batch_write_item(self, put_items: List[Any], delete_items: List[Any]) -> Dict[str, Any]:
+        if self.rate_limiter is None:
+            return self.model._get_connection().batch_write_item(
+                put_items=put_items,
+                delete_items=delete_items,
+            )
+        self.rate_limiter.acquire()
         data = self.model._get_connection().batch_write_item(
             put_items=put_items,
             delete_items=delete_items,
+            return_consumed_capacity=TOTAL,
         )
+        for capacity in data.get(CONSUMED_CAPACITY) or []:
+            if capacity.get(TABLE_NAME) == self.model.Meta.table_name:
+                self.rate_limiter.consume(capacity.get(CAPACITY_UNITS, 0))
+        return data
+
+    def _write(self, put_items: List[Any], delete_items: List[Any]) -> None:
+        backoff = self.model._get_retry_policy().backoff(max_attempts=self.model.Meta.max_retry_attempts)
+        data = self._batch_write_item_with_retries(put_items, delete_items, backoff)
         if data is None:
             return
-        retries = 0
         unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
         while unprocessed_items:
-            # TODO: we should consider using exponential backoff here
             # TODO: it is somewhat unintuitive that we retry unprocessed items max_retry_attempts times,
             # since each `batch_write_item` operation is also subject to max_retry_attempts
-            retries += 1
-            if retries >= self.model.Meta.max_retry_attempts:
-                self.failed_operations = unprocessed_items
-                raise PutError("Failed to batch write items: max_retry_attempts exceeded")
+            if not backoff.retry():
+                self._fail(unprocessed_items, PutError("Failed to batch write items: max_retry_attempts exceeded"))
+                return
             put_items = []
             delete_items = []
             for item in unprocessed_items:
@@ -165,13 +256,150 @@ class BatchWrite(Generic[_T]):
                     put_items.append(item.get(PUT_REQUEST).get(ITEM))  # type: ignore
                 elif DELETE_REQUEST in item:
                     delete_items.append(item.get(DELETE_REQUEST).get(KEY))  # type: ignore
-            log.info("Resending %d unprocessed keys for batch operation (retry %d)", len(unprocessed_items), retries)
-            data = self.model._get_connection().batch_write_item(
-                put_items=put_items,
-                delete_items=delete_items,
+            log.info(
+                "Resending %d unprocessed keys for batch operation (retry %d)", len(unprocessed_items), backoff.retries,
             )
+            data = self._batch_write_item_with_retries(put_items, delete_items, backoff)
             unprocessed_items = data.get(UNPROCESSED_ITEMS, {}).get(self.model.Meta.table_name)
 
+    def _batch_write_item_with_retries(
+        self,
+        put_items: List[Any],
+        delete_items: List[Any],
+        backoff: Backoff,
+    ) -> Dict[str, Any]:
+        while True:
+            try:
+                return self._batch_write_item(put_items, delete_items)
+            except PutError as e:
+                if not backoff.retry(e):
+                    raise
+
+    def _fail(self, failed_operations: List[Any], error: PutError) -> None:
+        self.failed_operations = failed_operations
+        raise error
+
+    def _fail_write(self, failed_operations: List[Any], error: Exception) -> None:
+        """
+        Called when writing `failed_operations` raised `error`; the error is propagated
+        """
+        raise error
+
+
+class ParallelBatchWrite(BatchWrite[_T]):
+    """
+    A batch write that commits its batches on a pool of worker threads, see :meth:`Model.batch_write`
+
+    ``save`` and ``delete`` queue up to `max_pending_batches` batches of 25 operations and only block when the
+    queue is full. The requests left unprocessed, or that failed, are added to `failed_operations` and passed to
+    `on_failure`; without `on_failure`, the first error is raised by :meth:`commit` (or on exit of the block).
+    """
+    def __init__(
+        self,
+        model: Type[_T],
+        workers: int = 4,
+        max_pending_batches: Optional[int] = None,
+        on_failure: Optional[Callable[[PutError, List[Any]], None]] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        super().__init__(model, auto_commit=True, rate_limit=rate_limit)
+        self.workers = workers
+        self.on_failure = on_failure
+        self._batches: 'queue.Queue[Optional[List[Dict[str, Any]]]]' = queue.Queue(
+            maxsize=max_pending_batches or 2 * workers,
+        )
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._error: Optional[PutError] = None
+
+    def _add_operation(self, action: str, item: _T) -> None:
+        with self._lock:
+            self.pending_operations.append({"action": action, "item": item})
+            if len(self.pending_operations) < self.max_operations:
+                return
+            operations = self.pending_operations
+            self.pending_operations = []
+        self._enqueue(operations)
+
+    def _enqueue(self, operations: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(self._work,),
+                    name='pynamodb-batch-write',
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+        # blocks while the queue is full
+        self._batches.put(operations)
+
+    def _work(self) -> None:
+        while True:
+            operations = self._batches.get()
+            if operations is None:
+                self._batches.task_done()
+                return
+            try:
+                self._commit_operations(operations)
+            except Exception as e:
+                # raised before any request was built (e.g. by serialize)
+                self._fail_write([], e)
+            finally:
+                self._batches.task_done()
+
+    def _fail_write(self, failed_operations: List[Any], error: Exception) -> None:
+        # the same requests that were sent, so that they can be resent as they are
+        if not isinstance(error, PutError):
+            error = PutError("Failed to batch write items", error)
+        self._fail(failed_operations, error)
+
+    def _fail(self, failed_operations: List[Any], error: PutError) -> None:
+        with self._lock:
+            self.failed_operations.extend(failed_operations)
+            if self.on_failure is None and self._error is None:
+                self._error = error
+        if self.on_failure is not None:
+            try:
+                self.on_failure(error, failed_operations)
+            except Exception:
+                log.exception("Batch write failure callback failed.")
+
+    def commit(self) -> None:
+        """
+        Queues the pending operations and waits until all queued batches have been written
+        """
+        with self._lock:
+            operations = self.pending_operations
+            self.pending_operations = []
+        if operations:
+            self._enqueue(operations)
+        self._batches.join()
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """
+        Commits the pending operations and stops the worker threads
+        """
+        try:
+            self.commit()
+        finally:
+            with self._lock:
+                threads, self._threads = self._threads, []
+            for _ in threads:
+                self._batches.put(None)
+            for thread in threads:
+                thread.join()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self.close()
+
 
 class MetaProtocol(Protocol):
     table_name: str
@@ -190,6 +418,11 @@ class MetaProtocol(Protocol):
     billing_mode: Optional[str]
     tags: Optional[Dict[str, str]]
     stream_view_type: Optional[str]
+    get_coalescing_window_seconds: Optional[float]
+    item_cache: Optional[ItemCache]
+    retry_policy: Optional[RetryPolicy]
+    lazy_deserialization: bool
+    transport: Optional[Transport]
 
 
 class MetaModel(AttributeContainerMeta):
@@ -251,6 +484,16 @@ class MetaModel(AttributeContainerMeta):
                         setattr(attr_obj, 'aws_secret_access_key', None)
                     if not hasattr(attr_obj, 'aws_session_token'):
                         setattr(attr_obj, 'aws_session_token', None)
+                    if not hasattr(attr_obj, 'get_coalescing_window_seconds'):
+                        setattr(attr_obj, 'get_coalescing_window_seconds', None)
+                    if not hasattr(attr_obj, 'item_cache'):
+                        setattr(attr_obj, 'item_cache', None)
+                    if not hasattr(attr_obj, 'retry_policy'):
+                        setattr(attr_obj, 'retry_policy', None)
+                    if not hasattr(attr_obj, 'lazy_deserialization'):
+                        setattr(attr_obj, 'lazy_deserialization', False)
+                    if not hasattr(attr_obj, 'transport'):
+                        setattr(attr_obj, 'transport', None)
 
             # create a custom Model.DoesNotExist derived from pynamodb.exceptions.DoesNotExist,
             # so that "except Model.DoesNotExist:" would not catch other models' exceptions
@@ -267,11 +510,13 @@ class MetaModel(AttributeContainerMeta):
         Initialize indexes on the class.
         """
         cls._indexes = {}
-        for name, index in getmembers(cls, lambda o: isinstance(o, Index)):
+        for name, index in get_class_members(cls, lambda o: isinstance(o, Index)):
             # Store a local reference to the containing Model class on a copy of the index to support polymorphism.
-            index = deepcopy(index)
+            # Indexes keep their settings on their (shared) Meta class, so inherited indexes need only a shallow copy.
+            if hasattr(index, '_model'):
+                index = copy(index)
+                setattr(cls, name, index)
             index._model = cls
-            setattr(cls, name, index)
             cls._indexes[index.Meta.index_name] = index
 
 
@@ -288,8 +533,12 @@ class Model(AttributeContainer, metaclass=MetaModel):
     _hash_keyname: Optional[str] = None
     _range_keyname: Optional[str] = None
     _connection: Optional[TableConnection] = None
+    _async_connection: Optional[AsyncTableConnection] = None
+    _coalescer: Optional[GetCoalescer] = None
     DoesNotExist: Type[DoesNotExist] = DoesNotExist
     _version_attribute_name: Optional[str] = None
+    # The serialized item that changes are tracked against (see `save_changes`)
+    _loaded_item: Dict[str, Dict[str, Any]]
 
     Meta: MetaProtocol
     _indexes: Dict[str, Index]
@@ -322,67 +571,200 @@ class Model(AttributeContainer, metaclass=MetaModel):
         items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
         consistent_read: Optional[bool] = None,
         attributes_to_get: Optional[Sequence[str]] = None,
+        result_format: Optional[str] = None,
+        workers: int = 1,
+        ordered: bool = False,
     ) -> Iterator[_T]:
         """
         BatchGetItem for this model
 
         :param items: Should be a list of hash keys to retrieve, or a list of
-            tuples if range keys are used.
+            tuples if range keys are used. Any iterable is accepted: it is consumed lazily,
+            a page of keys at a time.
+        :param result_format: If set, the format of the returned items (see :meth:`query`)
+        :param workers: The number of BatchGetItem requests to keep in flight
+        :param ordered: If True, items are returned in the order of `items` (missing items are skipped)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        map_fn = cls._get_map_fn(result_format=result_format)
+        pages = cls._iter_batch_get_pages(items)
+        if workers == 1 and not ordered and cls._get_batch_get_cache(consistent_read, attributes_to_get) is None:
+            # yield the items of each response as soon as it arrives
+            for _, keys in pages:
+                for page in cls._batch_get_pages(list(keys.values()), consistent_read, attributes_to_get):
+                    for batch_item in page:
+                        yield map_fn(batch_item)
+            return
+
+        for entries, found in cls._load_batch_get_pages(pages, consistent_read, attributes_to_get, workers):
+            if ordered:
+                for _, key_id in entries:
+                    item_data = found.get(key_id)
+                    if item_data is not None:
+                        yield map_fn(item_data)
+            else:
+                for item_data in found.values():
+                    yield map_fn(item_data)
+
+    @classmethod
+    def batch_get_map(
+        cls: Type[_T],
+        items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
+        consistent_read: Optional[bool] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        result_format: Optional[str] = None,
+        workers: int = 1,
+    ) -> Dict[Any, Optional[_T]]:
+        """
+        Like :meth:`batch_get`, but returns a dict mapping each of `items` to its item, or to None if it does not exist.
+        (hash key, range key) pairs are mapped as tuples.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        map_fn = cls._get_map_fn(result_format=result_format)
+        has_range_key = cls._range_keyname is not None
+        pages = cls._iter_batch_get_pages(items)
+        results: Dict[Any, Optional[_T]] = {}
+        for entries, found in cls._load_batch_get_pages(pages, consistent_read, attributes_to_get, workers):
+            for item, key_id in entries:
+                item_data = found.get(key_id)
+                results[tuple(item) if has_range_key else item] = map_fn(item_data) if item_data is not None else None
+        return results
+
+    @classmethod
+    def _iter_batch_get_pages(
+        cls,
+        items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
+    ) -> Iterator[Tuple[List[Tuple[Any, Hashable]], Dict[Hashable, Dict[str, Any]]]]:
+        """
+        Groups `items` into pages of up to BATCH_GET_PAGE_LIMIT distinct keys, consuming them lazily.
+        Yields the (item, key id) of each item of the page, in order, and the distinct keys of the page by id.
+        """
+        entries: List[Tuple[Any, Hashable]] = []
+        keys: Dict[Hashable, Dict[str, Any]] = {}
+        for item in items:
+            key = cls._get_batch_get_key(item)
+            key_id = cls._get_cache_key(key)
+            if key_id not in keys:
+                if len(keys) == BATCH_GET_PAGE_LIMIT:
+                    yield entries, keys
+                    entries, keys = [], {}
+                keys[key_id] = key
+            entries.append((item, key_id))
+        if keys:
+            yield entries, keys
+
+    @classmethod
+    def _load_batch_get_pages(
+        cls,
+        pages: Iterator[Tuple[List[Tuple[Any, Hashable]], Dict[Hashable, Dict[str, Any]]]],
+        consistent_read: Optional[bool],
+        attributes_to_get: Optional[Sequence[str]],
+        workers: int,
+    ) -> Iterator[Tuple[List[Tuple[Any, Hashable]], Dict[Hashable, Dict[str, Any]]]]:
+        """
+        Loads each page from :meth:`_iter_batch_get_pages` (with up to `workers` pages in flight),
+        yielding its entries and the items found by key id
+        """
+        item_cache = cls._get_batch_get_cache(consistent_read, attributes_to_get)
+        if attributes_to_get is not None:
+            # the key attributes identify the items returned
+            attributes_to_get = list(attributes_to_get) + [
+                name for name, _ in cls._get_key_attributes() if name not in attributes_to_get
+            ]
+
+        def load(page):
+            entries, keys = page
+            return entries, cls._load_batch_get_page(keys, consistent_read, attributes_to_get, item_cache)
+
+        if workers == 1:
+            return map(load, pages)
+        return map_concurrently(load, pages, workers)
+
+    @classmethod
+    def _load_batch_get_page(
+        cls,
+        keys: Dict[Hashable, Dict[str, Any]],
+        consistent_read: Optional[bool],
+        attributes_to_get: Optional[Sequence[str]],
+        item_cache: Optional[ItemCache],
+    ) -> Dict[Hashable, Dict[str, Any]]:
+        found: Dict[Hashable, Dict[str, Any]] = {}
+        keys_to_get: Dict[Hashable, Dict[str, Any]] = {}
+        for key_id, key in keys.items():
+            if item_cache is not None:
+                cached, item_data = item_cache.lookup(key_id)
+                if cached:
+                    if item_data:
+                        found[key_id] = item_data
+                    continue
+            keys_to_get[key_id] = key
+
+        for page in cls._batch_get_pages(list(keys_to_get.values()), consistent_read, attributes_to_get):
+            for batch_item in page:
+                found[cls._get_cache_key(batch_item, serialized=True)] = batch_item
+        if item_cache is not None:
+            # whatever was not returned does not exist
+            for key_id in keys_to_get:
+                item_cache.set(key_id, found.get(key_id))
+        return found
+
+    @classmethod
+    def _get_batch_get_cache(
+        cls,
+        consistent_read: Optional[bool],
+        attributes_to_get: Optional[Sequence[str]],
+    ) -> Optional[ItemCache]:
+        if consistent_read or attributes_to_get is not None:
+            return None
+        return cls._get_item_cache()
+
+    @classmethod
+    async def abatch_get(
+        cls: Type[_T],
+        items: Iterable[Union[_KeyType, Iterable[_KeyType]]],
+        consistent_read: Optional[bool] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[_T]:
         """
-        items = set(items)
-        hash_key_attribute = cls._hash_key_attribute()
-        range_key_attribute = cls._range_key_attribute()
-        keys_to_get: List[Any] = []
-        while items:
-            if len(keys_to_get) == BATCH_GET_PAGE_LIMIT:
-                while keys_to_get:
-                    page, unprocessed_keys = cls._batch_get_page(
+        Asynchronous counterpart to :meth:`batch_get`, for use with ``async for``
+
+        :param items: Should be a list of hash keys to retrieve, or a list of
+            tuples if range keys are used. Any iterable is accepted: it is consumed lazily.
+        """
+        for _, keys in cls._iter_batch_get_pages(items):
+            keys_to_get = list(keys.values())
+            backoff = cls._get_retry_policy().backoff(max_attempts=cls.Meta.max_retry_attempts)
+            while keys_to_get:
+                try:
+                    page, unprocessed_keys = await cls._abatch_get_page(
                         keys_to_get,
                         consistent_read=consistent_read,
                         attributes_to_get=attributes_to_get,
                     )
-                    for batch_item in page:
-                        yield cls.from_raw_data(batch_item)
-                    if unprocessed_keys:
-                        keys_to_get = unprocessed_keys
-                    else:
-                        keys_to_get = []
-            item = items.pop()
-            if range_key_attribute:
-                if isinstance(item, str):
-                    raise ValueError(f'Invalid key value {item!r}: '
-                                     'expected non-str iterable with exactly 2 elements (hash key, range key)')
-                try:
-                    hash_key, range_key = item
-                except (TypeError, ValueError):
-                    raise ValueError(f'Invalid key value {item!r}: '
-                                     'expected iterable with exactly 2 elements (hash key, range key)')
-                hash_key_ser, range_key_ser = cls._serialize_keys(hash_key, range_key)
-                keys_to_get.append({
-                    hash_key_attribute.attr_name: hash_key_ser,
-                    range_key_attribute.attr_name: range_key_ser,
-                })
-            else:
-                hash_key_ser, _ = cls._serialize_keys(item)
-                keys_to_get.append({
-                    hash_key_attribute.attr_name: hash_key_ser
-                })
-
-        while keys_to_get:
-            page, unprocessed_keys = cls._batch_get_page(
-                keys_to_get,
-                consistent_read=consistent_read,
-                attributes_to_get=attributes_to_get,
-            )
-            for batch_item in page:
-                yield cls.from_raw_data(batch_item)
-            if unprocessed_keys:
-                keys_to_get = unprocessed_keys
-            else:
-                keys_to_get = []
+                except GetError as e:
+                    if not await backoff.aretry(e):
+                        raise
+                    continue
+                for batch_item in page:
+                    yield cls.from_raw_data(batch_item)
+                keys_to_get = unprocessed_keys or []
+                if keys_to_get and page:
+                    # resent at once, since the response was likely cut short by its size limit
+                    backoff.reset()
+                elif keys_to_get and not await backoff.aretry():
+                    raise GetError("Failed to batch get items: max_retry_attempts exceeded")
 
     @classmethod
-    def batch_write(cls: Type[_T], auto_commit: bool = True) -> BatchWrite[_T]:
+    def batch_write(
+        cls: Type[_T],
+        auto_commit: bool = True,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+        workers: Optional[int] = None,
+        max_pending_batches: Optional[int] = None,
+        on_failure: Optional[Callable[[PutError, List[Any]], None]] = None,
+    ) -> BatchWrite[_T]:
         """
         Returns a BatchWrite context manager for a batch operation.
 
@@ -391,8 +773,28 @@ class Model(AttributeContainer, metaclass=MetaModel):
                             in the DynamoDB API (see BatchWrite). Regardless of the value
                             passed here, changes automatically commit on context exit
                             (whether successful or not).
-        """
-        return BatchWrite(cls, auto_commit=auto_commit)
+        :param rate_limit: If set then consumed write capacity will be limited to this amount per second.
+                           Also accepts a RateLimiter (e.g. a SharedRateLimiter) to share a budget.
+        :param workers: If set, batches are committed in the background by this many threads
+                        (see ParallelBatchWrite). Requires auto_commit.
+        :param max_pending_batches: The number of batches queued before `save` and `delete` block,
+                                    twice the number of workers by default
+        :param on_failure: Called with the error and the failed requests of batches that could not be written,
+                           instead of raising the error on commit
+        """
+        if workers is None:
+            if max_pending_batches is not None or on_failure is not None:
+                raise ValueError("max_pending_batches and on_failure require workers")
+            return BatchWrite(cls, auto_commit=auto_commit, rate_limit=rate_limit)
+        if not auto_commit:
+            raise ValueError("workers requires auto_commit")
+        return ParallelBatchWrite(
+            cls,
+            workers=workers,
+            max_pending_batches=max_pending_batches,
+            on_failure=on_failure,
+            rate_limit=rate_limit,
+        )
 
     def delete(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
         """
@@ -403,13 +805,21 @@ class Model(AttributeContainer, metaclass=MetaModel):
           Set to `False` for a 'delete anyway' strategy.
         :raises pynamodb.exceptions.DeleteError: If the record can not be deleted
         """
-        hk_value, rk_value = self._get_hash_range_key_serialized_values()
-
-        version_condition = self._handle_version_attribute()
-        if add_version_condition and version_condition is not None:
-            condition &= version_condition
+        args, kwargs = self._get_delete_args(condition=condition, add_version_condition=add_version_condition)
+        try:
+            return self._get_connection().delete_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
 
-        return self._get_connection().delete_item(hk_value, range_key=rk_value, condition=condition)
+    async def adelete(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
+        """
+        Asynchronous counterpart to :meth:`delete`
+        """
+        args, kwargs = self._get_delete_args(condition=condition, add_version_condition=add_version_condition)
+        try:
+            return await self._get_async_connection().delete_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
 
     def update(self, actions: List[Action], condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
         """
@@ -425,20 +835,24 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :raises ModelInstance.DoesNotExist: if the object to be updated does not exist
         :raises pynamodb.exceptions.UpdateError: if the `condition` is not met
         """
-        if not isinstance(actions, list) or len(actions) == 0:
-            raise TypeError("the value of `actions` is expected to be a non-empty list")
-
-        hk_value, rk_value = self._get_hash_range_key_serialized_values()
-        version_condition = self._handle_version_attribute(actions=actions)
-        if add_version_condition and version_condition is not None:
-            condition &= version_condition
+        args, kwargs = self._get_update_args(actions, condition=condition, add_version_condition=add_version_condition)
+        try:
+            data = self._get_connection().update_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
+        self._deserialize_update_response(data)
+        return data
 
-        data = self._get_connection().update_item(hk_value, range_key=rk_value, return_values=ALL_NEW, condition=condition, actions=actions)
-        item_data = data[ATTRIBUTES]
-        stored_cls = self._get_discriminator_class(item_data)
-        if stored_cls and stored_cls != type(self):
-            raise ValueError("Cannot update this item from the returned class: {}".format(stored_cls.__name__))
-        self.deserialize(item_data)
+    async def aupdate(self, actions: List[Action], condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Any:
+        """
+        Asynchronous counterpart to :meth:`update`
+        """
+        args, kwargs = self._get_update_args(actions, condition=condition, add_version_condition=add_version_condition)
+        try:
+            data = await self._get_async_connection().update_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
+        self._deserialize_update_response(data)
         return data
 
     def save(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Dict[str, Any]:
@@ -446,8 +860,73 @@ class Model(AttributeContainer, metaclass=MetaModel):
         Save this object to dynamodb
         """
         args, kwargs = self._get_save_args(condition=condition, add_version_condition=add_version_condition)
-        data = self._get_connection().put_item(*args, **kwargs)
+        try:
+            data = self._get_connection().put_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
+        self.update_local_version_attribute()
+        self._track_changes(self._get_saved_item(args, kwargs))
+        return data
+
+    async def asave(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart to :meth:`save`
+        """
+        args, kwargs = self._get_save_args(condition=condition, add_version_condition=add_version_condition)
+        try:
+            data = await self._get_async_connection().put_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
+        self.update_local_version_attribute()
+        self._track_changes(self._get_saved_item(args, kwargs))
+        return data
+
+    def save_changes(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Dict[str, Any]:
+        """
+        Saves the attributes that changed since this object was loaded (or last saved) using a single UpdateItem,
+        instead of putting the whole item. Sets are updated with ADD and DELETE where possible.
+
+        Objects that were not loaded from (or saved to) DynamoDB, or were last written in a batch or a transaction,
+        are saved in full, as with :meth:`save`.
+
+        :param condition: an optional Condition on which to save
+        :param add_version_condition: For models which have a :class:`~pynamodb.attributes.VersionAttribute`,
+          specifies whether only to save if the version matches the model that is currently loaded.
+        :raises ValueError: if the hash or range key was changed
+        :raises pynamodb.exceptions.UpdateError: if the `condition` is not met
+        """
+        if self._changed_attributes is None:
+            return self.save(condition=condition, add_version_condition=add_version_condition)
+        actions, saved_item = self._get_change_actions()
+        if not actions:
+            return {}
+        args, kwargs = self._get_update_args(actions, condition=condition, add_version_condition=add_version_condition)
+        kwargs['return_values'] = NONE
+        try:
+            data = self._get_connection().update_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
         self.update_local_version_attribute()
+        self._track_changes(saved_item)
+        return data
+
+    async def asave_changes(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart to :meth:`save_changes`
+        """
+        if self._changed_attributes is None:
+            return await self.asave(condition=condition, add_version_condition=add_version_condition)
+        actions, saved_item = self._get_change_actions()
+        if not actions:
+            return {}
+        args, kwargs = self._get_update_args(actions, condition=condition, add_version_condition=add_version_condition)
+        kwargs['return_values'] = NONE
+        try:
+            data = await self._get_async_connection().update_item(*args, **kwargs)
+        finally:
+            self._invalidate_cached_item()
+        self.update_local_version_attribute()
+        self._track_changes(saved_item)
         return data
 
     def refresh(self, consistent_read: bool = False) -> None:
@@ -530,6 +1009,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
         range_key: Optional[_KeyType] = None,
         consistent_read: bool = False,
         attributes_to_get: Optional[Sequence[Text]] = None,
+        lazy_deserialization: Optional[bool] = None,
     ) -> _T:
         """
         Returns a single object using the provided keys
@@ -538,34 +1018,148 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param range_key: The range key of the desired item, only used when appropriate.
         :param consistent_read:
         :param attributes_to_get:
+        :param lazy_deserialization: If set, overrides `Meta.lazy_deserialization` for this call
         :raises ModelInstance.DoesNotExist: if the object to be updated does not exist
         """
         hash_key, range_key = cls._serialize_keys(hash_key, range_key)
 
+        item_cache = cls._get_item_cache()
+        if item_cache is not None and attributes_to_get is None:
+            cache_key = cls._get_cache_key(cls._get_key_values(hash_key, range_key))
+            if consistent_read:
+                # a consistent read bypasses the cache, but refreshes it
+                item_data = cls._get_item_data(hash_key, range_key, consistent_read=True)
+                item_cache.set(cache_key, item_data)
+            else:
+                item_data = item_cache.get_or_load(cache_key, lambda: cls._get_item_data(hash_key, range_key))
+        else:
+            item_data = cls._get_item_data(
+                hash_key,
+                range_key,
+                consistent_read=consistent_read,
+                attributes_to_get=attributes_to_get,
+            )
+        if item_data:
+            return cls.from_raw_data(item_data, lazy_deserialization=lazy_deserialization)
+        raise cls.DoesNotExist()
+
+    @classmethod
+    def _get_item_data(
+        cls,
+        hash_key: _KeyType,
+        range_key: Optional[_KeyType] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Sequence[Text]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the raw item for the serialized keys, or None if it does not exist
+        """
+        coalescer = cls._get_coalescer()
+        if coalescer is not None and attributes_to_get is None:
+            return coalescer.get(cls._get_key_values(hash_key, range_key), consistent_read=consistent_read)
+
         data = cls._get_connection().get_item(
             hash_key,
             range_key=range_key,
             consistent_read=consistent_read,
             attributes_to_get=attributes_to_get,
         )
-        if data:
-            item_data = data.get(ITEM)
-            if item_data:
-                return cls.from_raw_data(item_data)
+        return data.get(ITEM) if data else None
+
+    @classmethod
+    async def aget(
+        cls: Type[_T],
+        hash_key: _KeyType,
+        range_key: Optional[_KeyType] = None,
+        consistent_read: bool = False,
+        attributes_to_get: Optional[Sequence[Text]] = None,
+        lazy_deserialization: Optional[bool] = None,
+    ) -> _T:
+        """
+        Asynchronous counterpart to :meth:`get`
+
+        :raises ModelInstance.DoesNotExist: if the object to be updated does not exist
+        """
+        hash_key, range_key = cls._serialize_keys(hash_key, range_key)
+
+        item_cache = cls._get_item_cache() if attributes_to_get is None else None
+        cache_key = cls._get_cache_key(cls._get_key_values(hash_key, range_key)) if item_cache is not None else None
+        if item_cache is not None and not consistent_read:
+            found, item_data = item_cache.lookup(cache_key)
+            if found:
+                if item_data:
+                    return cls.from_raw_data(item_data, lazy_deserialization=lazy_deserialization)
+                raise cls.DoesNotExist()
+
+        data = await cls._get_async_connection().get_item(
+            hash_key,
+            range_key=range_key,
+            consistent_read=consistent_read,
+            attributes_to_get=attributes_to_get,
+        )
+        item_data = data.get(ITEM) if data else None
+        if item_cache is not None:
+            item_cache.set(cache_key, item_data)
+        if item_data:
+            return cls.from_raw_data(item_data, lazy_deserialization=lazy_deserialization)
         raise cls.DoesNotExist()
 
     @classmethod
-    def from_raw_data(cls: Type[_T], data: Dict[str, Any]) -> _T:
+    def from_raw_data(cls: Type[_T], data: Dict[str, Any], lazy_deserialization: Optional[bool] = None) -> _T:
         """
         Returns an instance of this class
         from the raw data
 
         :param data: A serialized DynamoDB object
+        :param lazy_deserialization: If True, each attribute is only deserialized when it is first accessed,
+            and attributes that are never accessed are serialized back as is. Defaults to `Meta.lazy_deserialization`.
         """
         if data is None:
             raise ValueError("Received no data to construct object")
 
-        return cls._instantiate(data)
+        if lazy_deserialization is None:
+            lazy_deserialization = cls.Meta.lazy_deserialization
+        if profiling.profiler is not None:
+            start = time.perf_counter()
+            instance = cls._instantiate(data, lazy=lazy_deserialization)
+            instance._track_changes(data)
+            profiling.profiler.record_deserialization(cls.Meta.table_name, time.perf_counter() - start)
+            return instance
+        instance = cls._instantiate(data, lazy=lazy_deserialization)
+        instance._track_changes(data)
+        return instance
+
+    @classmethod
+    def _get_map_fn(
+        cls: Type[_T],
+        lazy_deserialization: Optional[bool] = None,
+        result_format: Optional[str] = None,
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Returns the function that turns raw items into results of the given format
+        """
+        if result_format is None or result_format == RESULT_FORMAT_MODEL:
+            if lazy_deserialization is None:
+                return cls.from_raw_data
+            return partial(cls.from_raw_data, lazy_deserialization=lazy_deserialization)
+        if result_format == RESULT_FORMAT_DICT:
+            return cls._deserialize_to_dict
+        if result_format == RESULT_FORMAT_NAMEDTUPLE:
+            deserialize_to_dict = cls._deserialize_to_dict
+            result_tuple = cls._get_result_tuple()
+            return lambda item: result_tuple(*deserialize_to_dict(item).values())
+        if result_format == RESULT_FORMAT_RAW:
+            return lambda item: item
+        raise ValueError("result_format must be one of {}".format(RESULT_FORMAT_VALUES))
+
+    @classmethod
+    def _get_result_tuple(cls) -> Type[Tuple]:
+        """
+        Returns the namedtuple type for the `namedtuple` result format, with a field per attribute
+        """
+        if '_result_tuple' not in cls.__dict__:
+            setattr(cls, '_result_tuple', namedtuple(cls.__name__, list(cls.get_attributes()), rename=True))
+        return cls.__dict__['_result_tuple']
 
     @classmethod
     def count(
@@ -576,7 +1170,7 @@ class Model(AttributeContainer, metaclass=MetaModel):
         consistent_read: bool = False,
         index_name: Optional[str] = None,
         limit: Optional[int] = None,
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
     ) -> int:
         """
         Provides a filtered count
@@ -639,7 +1233,10 @@ class Model(AttributeContainer, metaclass=MetaModel):
         last_evaluated_key: Optional[Dict[str, Dict[str, Any]]] = None,
         attributes_to_get: Optional[Iterable[str]] = None,
         page_size: Optional[int] = None,
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+        prefetch: int = 0,
+        lazy_deserialization: Optional[bool] = None,
+        result_format: Optional[str] = None,
     ) -> ResultIterator[_T]:
         """
         Provides a high level query API
@@ -656,6 +1253,12 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param attributes_to_get: If set, only returns these elements
         :param page_size: Page size of the query to DynamoDB
         :param rate_limit: If set then consumed capacity will be limited to this amount per second
+        :param prefetch: If set, up to this many pages are fetched ahead on a background thread
+            while the current page is being consumed
+        :param lazy_deserialization: If set, overrides `Meta.lazy_deserialization` for the returned items
+        :param result_format: If set, the format of the returned items: `model` (the default) for model instances,
+            `dict` for dicts and `namedtuple` for named tuples of the deserialized attributes (by python attribute name,
+            without defaults), or `raw` for the items as returned by DynamoDB.
         """
         if index_name:
             hash_key = cls._indexes[index_name]._hash_key_attribute().serialize(hash_key)
@@ -686,9 +1289,11 @@ class Model(AttributeContainer, metaclass=MetaModel):
             cls._get_connection().query,
             query_args,
             query_kwargs,
-            map_fn=cls.from_raw_data,
+            map_fn=cls._get_map_fn(lazy_deserialization, result_format),
             limit=limit,
             rate_limit=rate_limit,
+            async_operation=cls._aquery,
+            prefetch=prefetch,
         )
 
     @classmethod
@@ -702,8 +1307,11 @@ class Model(AttributeContainer, metaclass=MetaModel):
         page_size: Optional[int] = None,
         consistent_read: Optional[bool] = None,
         index_name: Optional[str] = None,
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
         attributes_to_get: Optional[Sequence[str]] = None,
+        prefetch: int = 0,
+        lazy_deserialization: Optional[bool] = None,
+        result_format: Optional[str] = None,
     ) -> ResultIterator[_T]:
         """
         Iterates through all items in the table
@@ -718,6 +1326,10 @@ class Model(AttributeContainer, metaclass=MetaModel):
         :param index_name: If set, then this index is used
         :param rate_limit: If set then consumed capacity will be limited to this amount per second
         :param attributes_to_get: If set, specifies the properties to include in the projection expression
+        :param prefetch: If set, up to this many pages are fetched ahead on a background thread
+            while the current page is being consumed
+        :param lazy_deserialization: If set, overrides `Meta.lazy_deserialization` for the returned items
+        :param result_format: If set, the format of the returned items (see :meth:`query`)
         """
         # If this class has a discriminator attribute, filter the scan to only return instances of this class.
         discriminator_attr = cls._get_discriminator_attribute()
@@ -743,11 +1355,63 @@ class Model(AttributeContainer, metaclass=MetaModel):
             cls._get_connection().scan,
             scan_args,
             scan_kwargs,
-            map_fn=cls.from_raw_data,
+            map_fn=cls._get_map_fn(lazy_deserialization, result_format),
             limit=limit,
             rate_limit=rate_limit,
+            async_operation=cls._ascan,
+            prefetch=prefetch,
         )
 
+    @classmethod
+    def parallel_scan(
+        cls: Type[_T],
+        total_segments: int,
+        workers: Optional[int] = None,
+        filter_condition: Optional[Condition] = None,
+        page_size: Optional[int] = None,
+        consistent_read: Optional[bool] = None,
+        index_name: Optional[str] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        lazy_deserialization: Optional[bool] = None,
+    ) -> Iterator[_T]:
+        """
+        Scans all `total_segments` segments of the table concurrently and yields their items as a single stream.
+        Items arrive in no particular order.
+
+        :param total_segments: The number of segments to divide the table into
+        :param workers: The number of segments to scan at once. Defaults to `total_segments`.
+        :param filter_condition: Condition used to restrict the scan results
+        :param page_size: Page size of the scan to DynamoDB
+        :param consistent_read: If True, a consistent read is performed
+        :param index_name: If set, then this index is used
+        :param rate_limit: If set then consumed capacity will be limited to this amount per second,
+            across all segments combined
+        :param attributes_to_get: If set, specifies the properties to include in the projection expression
+        :param lazy_deserialization: If set, overrides `Meta.lazy_deserialization` for the returned items
+        """
+        if total_segments < 1:
+            raise ValueError("total_segments must be at least 1")
+        if rate_limit and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+
+        segments = [
+            cls.scan(
+                filter_condition=filter_condition,
+                segment=segment,
+                total_segments=total_segments,
+                page_size=page_size,
+                consistent_read=consistent_read,
+                index_name=index_name,
+                rate_limit=rate_limit,
+                attributes_to_get=attributes_to_get,
+            ).page_iter
+            for segment in range(total_segments)
+        ]
+        pages = merge_page_iterators(segments, workers or total_segments)
+        map_fn = cls._get_map_fn(lazy_deserialization)
+        return (map_fn(item) for page in pages for item in page.get(ITEMS, ()))
+
     @classmethod
     def exists(cls: Type[_T]) -> bool:
         """
@@ -773,6 +1437,15 @@ class Model(AttributeContainer, metaclass=MetaModel):
         """
         return cls._get_connection().describe_table()
 
+    @classmethod
+    def warm_connection(cls, pool_size: Optional[int] = None) -> None:
+        """
+        Prepares this model's connection for its first request (see :meth:`~pynamodb.connection.Connection.warm`)
+
+        :param pool_size: The number of keep-alive connections to open
+        """
+        cls._get_connection().connection.warm(pool_size=pool_size)
+
     @classmethod
     def create_table(
         cls,
@@ -917,6 +1590,45 @@ class Model(AttributeContainer, metaclass=MetaModel):
         kwargs['condition'] = condition
         return args, kwargs
 
+    def _get_delete_args(self, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Tuple[Iterable[Any], Dict[str, Any]]:
+        """
+        Gets the proper *args, **kwargs for deleting this item
+        """
+        hk_value, rk_value = self._get_hash_range_key_serialized_values()
+
+        version_condition = self._handle_version_attribute()
+        if add_version_condition and version_condition is not None:
+            condition &= version_condition
+
+        return (hk_value,), {'range_key': rk_value, 'condition': condition}
+
+    def _get_update_args(self, actions: List[Action], condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> Tuple[Iterable[Any], Dict[str, Any]]:
+        """
+        Gets the proper *args, **kwargs for updating this item
+        """
+        if not isinstance(actions, list) or len(actions) == 0:
+            raise TypeError("the value of `actions` is expected to be a non-empty list")
+
+        hk_value, rk_value = self._get_hash_range_key_serialized_values()
+        version_condition = self._handle_version_attribute(actions=actions)
+        if add_version_condition and version_condition is not None:
+            condition &= version_condition
+
+        kwargs = {
+            'range_key': rk_value,
+            'return_values': ALL_NEW,
+            'condition': condition,
+            'actions': actions,
+        }
+        return (hk_value,), kwargs
+
+    def _deserialize_update_response(self, data: Dict[str, Any]) -> None:
+        item_data = data[ATTRIBUTES]
+        stored_cls = self._get_discriminator_class(item_data)
+        if stored_cls and stored_cls != type(self):
+            raise ValueError("Cannot update this item from the returned class: {}".format(stored_cls.__name__))
+        self.deserialize(item_data)
+
     def _get_hash_range_key_serialized_values(self) -> Tuple[Any, Optional[Any]]:
         if self._hash_keyname is None:
             raise Exception("The model has no hash key")
@@ -959,6 +1671,93 @@ class Model(AttributeContainer, metaclass=MetaModel):
 
         return condition
 
+    def _track_changes(self, item: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Starts tracking the changes made to this object, relative to the given serialized item
+        """
+        self._changed_attributes = set()
+        self._loaded_item = item
+
+    def _stop_tracking_changes(self) -> None:
+        """
+        Stops tracking changes after this object was written in a batch or a transaction, which leaves the
+        stored item unknown here: the next :meth:`save_changes` saves it in full
+        """
+        self._changed_attributes = None
+
+    def _get_saved_item(self, args: Iterable[Any], kwargs: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the serialized item that was written by a put with the given arguments
+        """
+        item = dict(kwargs['attributes'])
+        hash_key_attribute = self._hash_key_attribute()
+        item[hash_key_attribute.attr_name] = {hash_key_attribute.attr_type: next(iter(args))}
+        if kwargs.get('range_key') is not None:
+            range_key_attribute = self._range_key_attribute()
+            item[range_key_attribute.attr_name] = {range_key_attribute.attr_type: kwargs['range_key']}
+        return item
+
+    def _get_change_actions(self) -> Tuple[List[Action], Dict[str, Dict[str, Any]]]:
+        """
+        Returns the update actions for the attributes that changed since this object was loaded,
+        along with the serialized item once they are applied.
+
+        Besides the attributes that were set, attributes holding mutable values (e.g. maps, lists and sets)
+        are compared with their loaded value, since they may have been modified in place.
+        """
+        loaded_item = self._loaded_item
+        saved_item = dict(loaded_item)
+        values = self.attribute_values
+        raw_values = values.raw if isinstance(values, _LazyAttributeValues) else {}
+        changed_attributes = self._changed_attributes or ()
+        actions: List[Action] = []
+        for name, attr in self.get_attributes().items():
+            if name == self._version_attribute_name or name in raw_values:
+                continue
+            value = values.get(name)
+            if name not in changed_attributes and isinstance(value, _IMMUTABLE_TYPES):
+                continue
+
+            if value is None:
+                serialized = None
+            elif isinstance(attr, (ListAttribute, MapAttribute)):
+                serialized = attr.serialize(value, null_check=True)
+            else:
+                serialized = attr.serialize(value)
+            if serialized is None and not attr.null:
+                raise AttributeNullError(name)
+            attr_value = {attr.attr_type: serialized} if serialized is not None else None
+            loaded_value = loaded_item.get(attr.attr_name)
+            if loaded_value is not None and NULL in loaded_value:
+                loaded_value = None
+
+            if attr_value == loaded_value:
+                continue
+            if attr.is_hash_key or attr.is_range_key:
+                if attr_value is not None and loaded_value is not None and attr.attr_type in loaded_value \
+                        and attr.deserialize(loaded_value[attr.attr_type]) == value:
+                    continue
+                raise ValueError("The key attribute '{}' was changed, use save() instead".format(name))
+
+            if attr_value is None:
+                actions.append(attr.remove())
+                saved_item.pop(attr.attr_name, None)
+                continue
+            saved_item[attr.attr_name] = attr_value
+            if attr.attr_type in (STRING_SET, NUMBER_SET, BINARY_SET) and loaded_value is not None:
+                new_values, loaded_values = set(attr_value[attr.attr_type]), set(loaded_value[attr.attr_type])
+                added, removed = new_values - loaded_values, loaded_values - new_values
+                if not added and not removed:
+                    continue
+                if not removed:
+                    actions.append(attr.add(Value({attr.attr_type: list(added)})))
+                    continue
+                if not added:
+                    actions.append(attr.delete(Value({attr.attr_type: list(removed)})))
+                    continue
+            actions.append(attr.set(Value(attr_value)))
+        return actions, saved_item
+
     def update_local_version_attribute(self):
         if self._version_attribute_name is not None:
             value = getattr(self, self._version_attribute_name, None) or 0
@@ -1022,10 +1821,80 @@ class Model(AttributeContainer, metaclass=MetaModel):
         data = cls._get_connection().batch_get_item(
             keys_to_get, consistent_read=consistent_read, attributes_to_get=attributes_to_get,
         )
-        item_data = data.get(RESPONSES).get(cls.Meta.table_name)  # type: ignore
-        unprocessed_items = data.get(UNPROCESSED_KEYS).get(cls.Meta.table_name, {}).get(KEYS, None)  # type: ignore
+        return cls._parse_batch_get_page(data)
+
+    @classmethod
+    def _batch_get_pages(cls, keys_to_get, consistent_read, attributes_to_get) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yields the pages from BatchGetItem for a list of keys (at most a page), resending any unprocessed keys
+        (after a backoff if the page was empty) and backing off before resending a throttled request
+        """
+        backoff = cls._get_retry_policy().backoff(max_attempts=cls.Meta.max_retry_attempts)
+        while keys_to_get:
+            try:
+                page, unprocessed_keys = cls._batch_get_page(keys_to_get, consistent_read, attributes_to_get)
+            except GetError as e:
+                if not backoff.retry(e):
+                    raise
+                continue
+            yield page
+            keys_to_get = unprocessed_keys or []
+            if keys_to_get and page:
+                # resent at once, since the response was likely cut short by its size limit
+                backoff.reset()
+            elif keys_to_get and not backoff.retry():
+                raise GetError("Failed to batch get items: max_retry_attempts exceeded")
+
+    @classmethod
+    async def _abatch_get_page(cls, keys_to_get, consistent_read, attributes_to_get):
+        """
+        Asynchronous counterpart to :meth:`_batch_get_page`
+        """
+        log.debug("Fetching a BatchGetItem page")
+        data = await cls._get_async_connection().batch_get_item(
+            keys_to_get, consistent_read=consistent_read, attributes_to_get=attributes_to_get,
+        )
+        return cls._parse_batch_get_page(data)
+
+    @classmethod
+    def _parse_batch_get_page(cls, data):
+        item_data = data.get(RESPONSES).get(cls.Meta.table_name)
+        unprocessed_items = data.get(UNPROCESSED_KEYS).get(cls.Meta.table_name, {}).get(KEYS, None)
         return item_data, unprocessed_items
 
+    @classmethod
+    def _get_batch_get_key(cls, item: Union[_KeyType, Iterable[_KeyType]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Serializes a hash key, or a (hash key, range key) tuple, into a BatchGetItem key
+        """
+        hash_key_attribute = cls._hash_key_attribute()
+        range_key_attribute = cls._range_key_attribute()
+        if range_key_attribute:
+            if isinstance(item, str):
+                raise ValueError(f'Invalid key value {item!r}: '
+                                 'expected non-str iterable with exactly 2 elements (hash key, range key)')
+            try:
+                hash_key, range_key = item
+            except (TypeError, ValueError):
+                raise ValueError(f'Invalid key value {item!r}: '
+                                 'expected iterable with exactly 2 elements (hash key, range key)')
+            hash_key_ser, range_key_ser = cls._serialize_keys(hash_key, range_key)
+            return {
+                hash_key_attribute.attr_name: hash_key_ser,
+                range_key_attribute.attr_name: range_key_ser,
+            }
+        hash_key_ser, _ = cls._serialize_keys(item)
+        return {
+            hash_key_attribute.attr_name: hash_key_ser
+        }
+
+    @classmethod
+    def _get_typed_key(cls, key: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Adds the attribute types to a key returned by :meth:`_get_batch_get_key` or :meth:`_get_keys`
+        """
+        return {name: {attr_type: key[name]} for name, attr_type in cls._get_key_attributes()}
+
     @classmethod
     def _get_connection(cls) -> TableConnection:
         """
@@ -1050,40 +1919,138 @@ class Model(AttributeContainer, metaclass=MetaModel):
         # For now we just check that the connection exists and (in the case of model inheritance)
         # points to the same table. In the future we should update the connection if any of the attributes differ.
         if cls._connection is None or cls._connection.table_name != cls.Meta.table_name:
-            schema = cls._get_schema()
-            meta_table = MetaTable({
-                constants.TABLE_NAME: cls.Meta.table_name,
-                constants.KEY_SCHEMA: schema['key_schema'],
-                constants.ATTR_DEFINITIONS: schema['attribute_definitions'],
-                constants.GLOBAL_SECONDARY_INDEXES: [
-                    {
-                        constants.INDEX_NAME: index_schema['index_name'],
-                        constants.KEY_SCHEMA: index_schema['key_schema'],
-                    }
-                    for index_schema in schema['global_secondary_indexes']
-                ],
-                constants.LOCAL_SECONDARY_INDEXES: [
-                    {
-                        constants.INDEX_NAME: index_schema['index_name'],
-                        constants.KEY_SCHEMA: index_schema['key_schema'],
-                    }
-                    for index_schema in schema['local_secondary_indexes']
-                ],
-            })
             cls._connection = TableConnection(cls.Meta.table_name,
-                                              meta_table=meta_table,
-                                              region=cls.Meta.region,
-                                              host=cls.Meta.host,
-                                              connect_timeout_seconds=cls.Meta.connect_timeout_seconds,
-                                              read_timeout_seconds=cls.Meta.read_timeout_seconds,
-                                              max_retry_attempts=cls.Meta.max_retry_attempts,
-                                              max_pool_connections=cls.Meta.max_pool_connections,
-                                              extra_headers=cls.Meta.extra_headers,
-                                              aws_access_key_id=cls.Meta.aws_access_key_id,
-                                              aws_secret_access_key=cls.Meta.aws_secret_access_key,
-                                              aws_session_token=cls.Meta.aws_session_token)
+                                              meta_table=cls._get_meta_table(),
+                                              **cls._get_connection_kwargs())
         return cls._connection
 
+    @classmethod
+    async def _aquery(cls, *args: Any, **kwargs: Any) -> Dict:
+        """
+        Performs a Query through the asyncio connection, created only once results are iterated with ``async for``
+        """
+        return await cls._get_async_connection().query(*args, **kwargs)
+
+    @classmethod
+    async def _ascan(cls, *args: Any, **kwargs: Any) -> Dict:
+        """
+        Performs a Scan through the asyncio connection, created only once results are iterated with ``async for``
+        """
+        return await cls._get_async_connection().scan(*args, **kwargs)
+
+    @classmethod
+    def _get_async_connection(cls) -> AsyncTableConnection:
+        """
+        Returns a (cached) asyncio connection
+        """
+        table_name = cls._get_connection().table_name
+        if cls._async_connection is None or cls._async_connection.table_name != table_name:
+            cls._async_connection = AsyncTableConnection(table_name,
+                                                         meta_table=cls._get_connection().get_meta_table(),
+                                                         **cls._get_connection_kwargs())
+        return cls._async_connection
+
+    @classmethod
+    def _get_item_cache(cls) -> Optional[ItemCache]:
+        return getattr(cls.Meta, 'item_cache', None)
+
+    @classmethod
+    def _get_retry_policy(cls) -> RetryPolicy:
+        return getattr(cls.Meta, 'retry_policy', None) or retries.default_retry_policy
+
+    @classmethod
+    def _get_key_attributes(cls) -> List[Tuple[str, str]]:
+        """
+        Returns the (name, type) of the hash key and, if any, the range key
+        """
+        key_attributes = [(cls._hash_key_attribute().attr_name, cls._hash_key_attribute().attr_type)]
+        if cls._range_keyname is not None:
+            key_attributes.append((cls._range_key_attribute().attr_name, cls._range_key_attribute().attr_type))
+        return key_attributes
+
+    @classmethod
+    def _get_key_values(cls, hash_key: _KeyType, range_key: Optional[_KeyType] = None) -> Dict[str, Any]:
+        """
+        Maps the key attribute names to the serialized hash and range keys
+        """
+        key = {cls._hash_key_attribute().attr_name: hash_key}
+        if cls._range_keyname is not None:
+            key[cls._range_key_attribute().attr_name] = range_key
+        return key
+
+    @classmethod
+    def _get_cache_key(cls, key: Dict[str, Any], serialized: bool = False) -> Hashable:
+        """
+        Returns the item cache key for the given key values, or for a raw item if `serialized` is True
+        """
+        if serialized:
+            values = tuple(key_value_id(attr_type, key[name][attr_type]) for name, attr_type in cls._get_key_attributes())
+        else:
+            values = tuple(key_value_id(attr_type, key[name]) for name, attr_type in cls._get_key_attributes())
+        return (cls.Meta.table_name,) + values
+
+    def _invalidate_cached_item(self) -> None:
+        item_cache = self._get_item_cache()
+        if item_cache is not None:
+            item_cache.invalidate(self._get_cache_key(self._get_key_values(*self._get_serialized_keys())))
+
+    @classmethod
+    def _get_coalescer(cls) -> Optional[GetCoalescer]:
+        """
+        Returns a (cached) coalescer for `get` calls, if enabled by `Meta.get_coalescing_window_seconds`
+        """
+        window_seconds = getattr(cls.Meta, 'get_coalescing_window_seconds', None)
+        if window_seconds is None:
+            return None
+        table_name = cls._get_connection().table_name
+        if cls._coalescer is None or cls._coalescer.table_name != table_name:
+            cls._coalescer = GetCoalescer(
+                table_name,
+                cls._batch_get_page,
+                cls._get_key_attributes(),
+                window_seconds,
+                retry_policy=cls._get_retry_policy(),
+                max_retry_attempts=cls.Meta.max_retry_attempts,
+            )
+        return cls._coalescer
+
+    @classmethod
+    def _get_connection_kwargs(cls) -> Dict[str, Any]:
+        return dict(region=cls.Meta.region,
+                    host=cls.Meta.host,
+                    connect_timeout_seconds=cls.Meta.connect_timeout_seconds,
+                    read_timeout_seconds=cls.Meta.read_timeout_seconds,
+                    max_retry_attempts=cls.Meta.max_retry_attempts,
+                    max_pool_connections=cls.Meta.max_pool_connections,
+                    extra_headers=cls.Meta.extra_headers,
+                    aws_access_key_id=cls.Meta.aws_access_key_id,
+                    aws_secret_access_key=cls.Meta.aws_secret_access_key,
+                    aws_session_token=cls.Meta.aws_session_token,
+                    transport=cls.Meta.transport)
+
+    @classmethod
+    def _get_meta_table(cls) -> MetaTable:
+        schema = cls._get_schema()
+        return MetaTable({
+            constants.TABLE_NAME: cls.Meta.table_name,
+            constants.KEY_SCHEMA: schema['key_schema'],
+            constants.ATTR_DEFINITIONS: schema['attribute_definitions'],
+            constants.GLOBAL_SECONDARY_INDEXES: [
+                {
+                    constants.INDEX_NAME: index_schema['index_name'],
+                    constants.KEY_SCHEMA: index_schema['key_schema'],
+                }
+                for index_schema in schema['global_secondary_indexes']
+            ],
+            constants.LOCAL_SECONDARY_INDEXES: [
+                {
+                    constants.INDEX_NAME: index_schema['index_name'],
+                    constants.KEY_SCHEMA: index_schema['key_schema'],
+                }
+                for index_schema in schema['local_secondary_indexes']
+            ],
+        })
+
     @classmethod
     def _serialize_value(cls, attr, value):
         """
@@ -1126,13 +2093,38 @@ class Model(AttributeContainer, metaclass=MetaModel):
             Use :meth:`~pynamodb.attributes.AttributeContainer.to_dynamodb_dict`
             and :meth:`~pynamodb.attributes.AttributeContainer.to_simple_dict` for JSON-serializable mappings.
         """
+        if profiling.profiler is not None:
+            start = time.perf_counter()
+            attribute_values = self._container_serialize(null_check=null_check)
+            profiling.profiler.record_serialization(self.Meta.table_name, time.perf_counter() - start)
+            return attribute_values
         return self._container_serialize(null_check=null_check)
 
     def deserialize(self, attribute_values: Dict[str, Dict[str, Any]]) -> None:
         """
         Deserializes a model from botocore's DynamoDB client.
         """
-        return self._container_deserialize(attribute_values=attribute_values)
+        self._container_deserialize(attribute_values=attribute_values)
+        self._track_changes(attribute_values)
+
+    def estimate_size(self) -> int:
+        """
+        Returns the estimated size in bytes of this item as stored by DynamoDB (see :mod:`pynamodb.sizing`).
+        """
+        return item_size(self.serialize(null_check=False))
+
+    def estimate_read_capacity_units(self, consistent_read: bool = False, transactional: bool = False) -> float:
+        """
+        Returns the estimated read capacity units consumed by reading this item.
+        """
+        return read_capacity_units(self.estimate_size(), consistent_read=consistent_read, transactional=transactional)
+
+    def estimate_write_capacity_units(self, transactional: bool = False) -> float:
+        """
+        Returns the estimated write capacity units consumed by writing this item to the table
+        (writes to global secondary indexes are not included).
+        """
+        return write_capacity_units(self.estimate_size(), transactional=transactional)
 
 
 class _ModelFuture(Generic[_T]):
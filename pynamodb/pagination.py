@@ -1,10 +1,24 @@
+import contextvars
+import itertools
+import mmap
+import os
+import queue
+import struct
+import threading
 import time
-from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import (Any, AsyncIterator, Callable, Deque, Dict, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar,
+                    Union)
 
 from pynamodb.constants import (CAMEL_COUNT, ITEMS, LAST_EVALUATED_KEY, SCANNED_COUNT,
                                 CONSUMED_CAPACITY, TOTAL, CAPACITY_UNITS)
 
 _T = TypeVar('_T')
+_A = TypeVar('_A')
 
 
 class RateLimiter:
@@ -21,6 +35,8 @@ class RateLimiter:
         And after an operation, update the number of units consumed
             rate_limiter.consume(units)
 
+    A RateLimiter is thread-safe and may be shared by concurrent operations
+    (e.g. passed as the `rate_limit` of several scans) to enforce one combined budget.
     """
     def __init__(self, rate_limit: float, time_module: Optional[Any] = None) -> None:
         """
@@ -35,6 +51,7 @@ class RateLimiter:
         self._consumed = 0
         self._time_of_last_acquire = 0.0
         self._time_module: Any = time_module or time
+        self._lock = threading.Lock()
 
     def consume(self, units: int) -> None:
         """
@@ -44,7 +61,8 @@ class RateLimiter:
 
         :return: None
         """
-        self._consumed += units
+        with self._lock:
+            self._consumed += units
 
     def acquire(self) -> None:
         """
@@ -53,9 +71,29 @@ class RateLimiter:
         :return: None
         """
 
-        self._time_module.sleep(max(0, self._consumed/float(self.rate_limit) - (self._time_module.time()-self._time_of_last_acquire)))
-        self._consumed = 0
-        self._time_of_last_acquire = self._time_module.time()
+        self._time_module.sleep(self._reserve())
+
+    async def acquire_async(self) -> None:
+        """
+        Like :meth:`acquire`, but yields to the event loop instead of blocking the thread
+
+        :return: None
+        """
+        import asyncio  # already imported by the running event loop
+
+        await asyncio.sleep(self._reserve())
+
+    def _reserve(self) -> float:
+        """
+        Settles the units consumed so far and returns how long the caller must wait.
+        The wait is accounted for up front so concurrent callers queue up behind each other.
+        """
+        with self._lock:
+            now = self._time_module.time()
+            wait_time = max(0, self._consumed/float(self.rate_limit) - (now - self._time_of_last_acquire))
+            self._consumed = 0
+            self._time_of_last_acquire = now + wait_time
+        return wait_time
 
     @property
     def rate_limit(self) -> float:
@@ -71,10 +109,218 @@ class RateLimiter:
         self._rate_limit = rate_limit
 
 
-class PageIterator(Iterator[_T]):
+class SharedRateLimiter(RateLimiter):
+    """
+    A RateLimiter whose budget is shared by all the processes of a host using the same `path`,
+    e.g. the workers of a backfill. It can be passed as `rate_limit` wherever a RateLimiter is accepted.
+
+    The budget lives in a small memory-mapped file (place it on a RAM-backed filesystem such as ``/dev/shm``
+    to keep it off disk). Units consumed are accumulated in the process and settled with the shared budget
+    when the next operation is acquired, under a short-lived file lock; the time spent waiting is not spent
+    holding the lock. The limiter is safe to use across threads and after forking. Requires a POSIX system.
+
+    Example:
+        Each worker process attaches to the same budget
+            rate_limiter = SharedRateLimiter(100, '/dev/shm/backfill.ratelimit')
+            for item in Thread.scan(segment=worker, total_segments=workers, rate_limit=rate_limiter):
+                ...
+    """
+    # the rate limit, and the time from which capacity is available again
+    _STATE = struct.Struct('dd')
+
+    def __init__(self, rate_limit: Optional[float], path: str, time_module: Optional[Any] = None) -> None:
+        """
+        Initializes a SharedRateLimiter object, creating the shared budget if needed
+
+        :param rate_limit: The desired rate, which replaces the rate of the shared budget.
+            Set to None to attach to an existing budget with its rate.
+        :param path: The file holding the shared budget
+        :param time_module: Optional: the module responsible for calculating time. Intended to be used for testing purposes.
+        """
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("rate_limit must be greater than zero")
+        self._path = path
+        self._consumed = 0
+        self._time_module: Any = time_module or time
+        self._lock = threading.Lock()
+        self._fd = -1
+        self._pid = -1
+        self._state: Optional[mmap.mmap] = None
+        with self._lock:
+            self._open()
+            with self._locked_state() as (shared_rate_limit, available_at):
+                if rate_limit is None and shared_rate_limit <= 0:
+                    raise ValueError("rate_limit must be given to create the shared budget at {}".format(path))
+                self._write_state(rate_limit or shared_rate_limit, available_at)
+
+    def _open(self) -> None:
+        # a forked child reopens the file: locks held through an inherited descriptor would not exclude the parent
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._flock(fd):
+                if os.fstat(fd).st_size < self._STATE.size:
+                    os.ftruncate(fd, self._STATE.size)
+            self._state = mmap.mmap(fd, self._STATE.size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._pid = os.getpid()
+
+    @staticmethod
+    @contextmanager
+    def _flock(fd: int) -> Iterator[None]:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Tuple[float, float]]:
+        """
+        Locks the shared budget and returns its state. Must be called holding the thread lock.
+        """
+        if self._state is None:
+            raise ValueError("The rate limiter is closed")
+        if self._pid != os.getpid():
+            self._state.close()
+            os.close(self._fd)
+            self._open()
+        with self._flock(self._fd):
+            yield self._STATE.unpack_from(self._state)
+
+    def _write_state(self, rate_limit: float, available_at: float) -> None:
+        assert self._state is not None
+        self._STATE.pack_into(self._state, 0, rate_limit, available_at)
+
+    def _reserve(self) -> float:
+        with self._lock:
+            with self._locked_state() as (rate_limit, available_at):
+                now = self._time_module.time()
+                available_at = max(now, available_at + self._consumed / rate_limit)
+                self._write_state(rate_limit, available_at)
+            self._consumed = 0
+        return available_at - now
+
+    @property
+    def rate_limit(self) -> float:
+        """
+        A limit of units per seconds, shared by all processes
+        """
+        with self._lock:
+            with self._locked_state() as (rate_limit, _):
+                return rate_limit
+
+    @rate_limit.setter
+    def rate_limit(self, rate_limit: float):
+        if rate_limit <= 0:
+            raise ValueError("rate_limit must be greater than zero")
+        with self._lock:
+            with self._locked_state() as (_, available_at):
+                self._write_state(rate_limit, available_at)
+
+    def close(self) -> None:
+        """
+        Detaches from the shared budget, which is left in place for the other processes
+        """
+        with self._lock:
+            if self._state is not None:
+                self._state.close()
+                os.close(self._fd)
+                self._state = None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # attach to the same budget when sent to a spawned process
+        return self.__class__, (None, self._path)
+
+
+def _fetch_page(
+    operation: Callable,
+    args: Any,
+    kwargs: Dict[str, Any],
+    rate_limiter: Optional[RateLimiter],
+    exclusive_start_key: Optional[Dict[str, Dict[str, Any]]],
+) -> Any:
+    kwargs['exclusive_start_key'] = exclusive_start_key
+
+    if rate_limiter:
+        rate_limiter.acquire()
+        kwargs['return_consumed_capacity'] = TOTAL
+    page = operation(*args, **kwargs)
+
+    if rate_limiter:
+        consumed_capacity = page.get(CONSUMED_CAPACITY, {}).get(CAPACITY_UNITS, 0)
+        rate_limiter.consume(consumed_capacity)
+    return page
+
+
+class _PagePrefetcher:
+    """
+    Fetches up to `prefetch` pages ahead of the consumer on a background thread.
+
+    The thread only holds on to the fetch function, never to the owning PageIterator,
+    so an abandoned iterator can be garbage collected, which stops the thread.
+    """
+    def __init__(
+        self,
+        fetch_page: Callable[[Any], Dict[str, Any]],
+        exclusive_start_key: Optional[Dict[str, Dict[str, Any]]],
+        prefetch: int,
+    ) -> None:
+        self._pages: 'queue.Queue[Any]' = queue.Queue(maxsize=prefetch)
+        self._stopped = threading.Event()
+        # the thread runs in a copy of the caller's context, e.g. to keep its capacity tag
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._run, fetch_page, exclusive_start_key),
+            name='pynamodb-prefetch',
+            daemon=True,
+        )
+        thread.start()
+
+    def _run(self, fetch_page: Callable[[Any], Dict[str, Any]], exclusive_start_key: Any) -> None:
+        try:
+            while not self._stopped.is_set():
+                page = fetch_page(exclusive_start_key)
+                exclusive_start_key = page.get(LAST_EVALUATED_KEY)
+                if not self._put(page) or exclusive_start_key is None:
+                    return
+        except BaseException as e:
+            self._put(e)
+
+    def _put(self, item: Any) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(self) -> Dict[str, Any]:
+        item = self._pages.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+class PageIterator(Iterator[_T], AsyncIterator[_T]):
     """
     PageIterator handles Query and Scan result pagination.
 
+    If an `async_operation` (the coroutine counterpart of `operation`) is given,
+    the pages can also be consumed with ``async for``.
+
+    If `prefetch` is set, up to that many pages are requested ahead of the consumer on a background thread
+    (synchronous iteration only). The iterator's state, e.g. `last_evaluated_key`, only reflects pages
+    that have been returned to the caller.
+
     https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Query.Pagination.html
     https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Scan.html#Scan.Pagination
     """
@@ -83,16 +329,25 @@ class PageIterator(Iterator[_T]):
         operation: Callable,
         args: Any,
         kwargs: Dict[str, Any],
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+        async_operation: Optional[Callable] = None,
+        prefetch: int = 0,
     ) -> None:
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
         self._operation = operation
+        self._async_operation = async_operation
+        self._prefetch = prefetch
+        self._prefetcher: Optional[_PagePrefetcher] = None
         self._args = args
         self._kwargs = kwargs
         self._last_evaluated_key = kwargs.get('exclusive_start_key')
         self._is_last_page = False
         self._total_scanned_count = 0
-        self._rate_limiter = None
-        if rate_limit:
+        self._rate_limiter: Optional[RateLimiter] = None
+        if isinstance(rate_limit, RateLimiter):
+            self._rate_limiter = rate_limit
+        elif rate_limit:
             self._rate_limiter = RateLimiter(rate_limit)
 
     def __iter__(self) -> Iterator[_T]:
@@ -102,24 +357,55 @@ class PageIterator(Iterator[_T]):
         if self._is_last_page:
             raise StopIteration()
 
+        if self._prefetch:
+            page = self._get_prefetched_page()
+        else:
+            page = _fetch_page(self._operation, self._args, self._kwargs, self._rate_limiter, self._last_evaluated_key)
+        self._update_state(page)
+        return page
+
+    def _get_prefetched_page(self) -> Any:
+        if self._prefetcher is None:
+            fetch_page = partial(_fetch_page, self._operation, self._args, self._kwargs, self._rate_limiter)
+            self._prefetcher = _PagePrefetcher(fetch_page, self._last_evaluated_key, self._prefetch)
+            weakref.finalize(self, self._prefetcher.stop)
+        try:
+            return self._prefetcher.get()
+        except BaseException:
+            # the background thread has exited; a retry resumes from the last page returned
+            self._prefetcher.stop()
+            self._prefetcher = None
+            raise
+
+    def next(self) -> _T:
+        return self.__next__()
+
+    def __aiter__(self) -> AsyncIterator[_T]:
+        return self
+
+    async def __anext__(self) -> _T:
+        if self._async_operation is None:
+            raise TypeError("This {} does not support asynchronous iteration".format(type(self).__name__))
+        if self._is_last_page:
+            raise StopAsyncIteration()
+
         self._kwargs['exclusive_start_key'] = self._last_evaluated_key
 
         if self._rate_limiter:
-            self._rate_limiter.acquire()
+            await self._rate_limiter.acquire_async()
             self._kwargs['return_consumed_capacity'] = TOTAL
-        page = self._operation(*self._args, **self._kwargs)
-        self._last_evaluated_key = page.get(LAST_EVALUATED_KEY)
-        self._is_last_page = self._last_evaluated_key is None
-        self._total_scanned_count += page[SCANNED_COUNT]
+        page = await self._async_operation(*self._args, **self._kwargs)
 
         if self._rate_limiter:
             consumed_capacity = page.get(CONSUMED_CAPACITY, {}).get(CAPACITY_UNITS, 0)
             self._rate_limiter.consume(consumed_capacity)
-
+        self._update_state(page)
         return page
 
-    def next(self) -> _T:
-        return self.__next__()
+    def _update_state(self, page: Dict[str, Any]) -> None:
+        self._last_evaluated_key = page.get(LAST_EVALUATED_KEY)
+        self._is_last_page = self._last_evaluated_key is None
+        self._total_scanned_count += page[SCANNED_COUNT]
 
     @property
     def key_names(self) -> Iterable[str]:
@@ -148,10 +434,12 @@ class PageIterator(Iterator[_T]):
         return self._total_scanned_count
 
 
-class ResultIterator(Iterator[_T]):
+class ResultIterator(Iterator[_T], AsyncIterator[_T]):
     """
     ResultIterator handles Query and Scan item pagination.
 
+    Supports ``async for`` when constructed with an `async_operation`.
+
     https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Query.Pagination.html
     https://docs.aws.amazon.com/amazondynamodb/latest/developerguide/Scan.html#Scan.Pagination
     """
@@ -162,9 +450,11 @@ class ResultIterator(Iterator[_T]):
         kwargs: Dict[str, Any],
         map_fn: Optional[Callable] = None,
         limit: Optional[int] = None,
-        rate_limit: Optional[float] = None,
+        rate_limit: Optional[Union[float, RateLimiter]] = None,
+        async_operation: Optional[Callable] = None,
+        prefetch: int = 0,
     ) -> None:
-        self.page_iter: PageIterator = PageIterator(operation, args, kwargs, rate_limit)
+        self.page_iter: PageIterator = PageIterator(operation, args, kwargs, rate_limit, async_operation, prefetch)
         self._map_fn = map_fn
         self._limit = limit
         self._total_count = 0
@@ -172,7 +462,12 @@ class ResultIterator(Iterator[_T]):
         self._count = 0
 
     def _get_next_page(self) -> None:
-        page = next(self.page_iter)
+        self._set_page(next(self.page_iter))
+
+    async def _get_next_page_async(self) -> None:
+        self._set_page(await self.page_iter.__anext__())
+
+    def _set_page(self, page: Dict[str, Any]) -> None:
         self._count = page[CAMEL_COUNT]
         self._items = page.get(ITEMS)  # not returned if 'Select' is set to 'COUNT'
         self._index = 0 if self._items else self._count
@@ -188,7 +483,27 @@ class ResultIterator(Iterator[_T]):
         while self._index == self._count:
             self._get_next_page()
 
-        item = self._items[self._index]
+        return self._next_item()
+
+    def next(self) -> _T:
+        return self.__next__()
+
+    def __aiter__(self) -> AsyncIterator[_T]:
+        return self
+
+    async def __anext__(self) -> _T:
+        if self._limit == 0:
+            raise StopAsyncIteration
+
+        while self._index == self._count:
+            await self._get_next_page_async()
+
+        return self._next_item()
+
+    def _next_item(self) -> _T:
+        items = self._items
+        assert items is not None  # pages without items are skipped
+        item = items[self._index]
         self._index += 1
         if self._limit is not None:
             self._limit -= 1
@@ -196,9 +511,6 @@ class ResultIterator(Iterator[_T]):
             item = self._map_fn(item)
         return item
 
-    def next(self) -> _T:
-        return self.__next__()
-
     @property
     def last_evaluated_key(self) -> Optional[Dict[str, Dict[str, Any]]]:
         if self._index == self._count:
@@ -210,9 +522,87 @@ class ResultIterator(Iterator[_T]):
         # In the middle of a page of results: reconstruct a last_evaluated_key from the current item
         # The operation should be resumed starting at the last item returned, not the last item evaluated.
         # This can occur if the 'limit' is reached in the middle of a page.
-        item = self._items[self._index - 1]
+        items = self._items
+        assert items is not None
+        item = items[self._index - 1]
         return {key: item[key] for key in self.page_iter.key_names}
 
     @property
     def total_count(self) -> int:
         return self._total_count
+
+
+_SEGMENT_DONE = object()
+
+
+def merge_page_iterators(page_iterators: Sequence[PageIterator[_T]], workers: int) -> Iterator[_T]:
+    """
+    Drains the given page iterators concurrently on a pool of `workers` threads,
+    yielding their pages in the order they arrive.
+
+    At most a couple of pages per worker are buffered. If the caller stops iterating early,
+    the workers stop requesting further pages. The first error raised by any iterator is re-raised.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    pages: 'queue.Queue[Any]' = queue.Queue(maxsize=2 * workers)
+    stop = threading.Event()
+
+    def drain(page_iterator: PageIterator[_T]) -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    page = next(page_iterator)
+                except StopIteration:
+                    break
+                pages.put(page)
+        except BaseException as e:
+            pages.put(e)
+        finally:
+            pages.put(_SEGMENT_DONE)
+
+    pending = len(page_iterators)
+    with ThreadPoolExecutor(max_workers=min(workers, pending or 1), thread_name_prefix='pynamodb') as executor:
+        for page_iterator in page_iterators:
+            executor.submit(contextvars.copy_context().run, drain, page_iterator)
+        try:
+            while pending:
+                page = pages.get()
+                if page is _SEGMENT_DONE:
+                    pending -= 1
+                elif isinstance(page, BaseException):
+                    raise page
+                else:
+                    yield page
+        finally:
+            stop.set()
+            # unblock any worker waiting on a full queue so the pool can shut down
+            while pending:
+                if pages.get() is _SEGMENT_DONE:
+                    pending -= 1
+
+
+def map_concurrently(fn: Callable[[_A], _T], args: Iterable[_A], workers: int) -> Iterator[_T]:
+    """
+    Calls `fn` on each of `args` on a pool of `workers` threads, yielding the results in the order of `args`.
+
+    `args` is consumed lazily: at most `workers` calls are in flight (or done but not yet yielded) at any time.
+    If the caller stops iterating early, the calls not yet started are cancelled. The first error is re-raised.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    args = iter(args)
+    futures: 'Deque[Future[_T]]' = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pynamodb') as executor:
+        try:
+            for arg in itertools.islice(args, workers):
+                futures.append(executor.submit(contextvars.copy_context().run, fn, arg))
+            while futures:
+                result = futures.popleft().result()
+                # keep `workers` calls in flight while the caller handles this result
+                for arg in itertools.islice(args, 1):
+                    futures.append(executor.submit(contextvars.copy_context().run, fn, arg))
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
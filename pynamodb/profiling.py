@@ -0,0 +1,226 @@
+"""
+Opt-in latency profiling of requests and model (de)serialization
+"""
+import math
+import sys
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+from pynamodb.hooks import PHASES, RequestContext, request_hooks
+
+#: The phases reported by :class:`LatencyProfiler`, in order: the model serialization preceding a request,
+#: the phases of the request (see :data:`pynamodb.hooks.PHASES`), its total duration, and the deserialization
+#: of the items it returned
+PROFILED_PHASES = ('serialize',) + PHASES + ('total', 'deserialize')
+
+_MIN_SECONDS = 1e-6
+_GROWTH = 1.05
+_LOG_GROWTH = math.log(_GROWTH)
+
+#: The enabled profiler, if any (see :meth:`LatencyProfiler.enable`)
+profiler: Optional['LatencyProfiler'] = None
+
+# model serializations awaiting the request they are sent with, and the last request sent in this context
+_pending_serializations: ContextVar[Tuple[Tuple[str, float], ...]] = ContextVar('_pending_serializations', default=())
+_last_request: ContextVar[Optional[Tuple[str, Tuple[str, ...]]]] = ContextVar('_last_request', default=None)
+# at most a transaction's worth of serializations awaits a request; older ones are recorded without an operation
+_MAX_PENDING_SERIALIZATIONS = 100
+
+
+class LatencyHistogram:
+    """
+    A histogram of durations with logarithmic buckets (each 5% wider than the previous one),
+    so that quantiles are estimated within 2.5% using constant memory.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, seconds: float) -> None:
+        index = int(math.log(seconds / _MIN_SECONDS) / _LOG_GROWTH) if seconds > _MIN_SECONDS else 0
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns an estimate of the `q` quantile (e.g. 0.95), in seconds
+        """
+        if not self.count:
+            return 0.0
+        if q >= 1:
+            return self.max
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # the geometric middle of the bucket
+                return min(_MIN_SECONDS * _GROWTH ** (index + 0.5), self.max)
+        return self.max
+
+
+class PhaseStats(NamedTuple):
+    """
+    The latency of a phase of an operation on a table, in seconds
+    """
+    table_name: Optional[str]
+    operation: Optional[str]
+    phase: str
+    samples: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class LatencyProfiler:
+    """
+    Records how long each phase of each operation takes, per table, in histograms.
+
+    The phases (see :data:`PROFILED_PHASES`) are the model serialization preceding a request
+    (:meth:`~pynamodb.models.Model.serialize`), the phases of the request itself as measured by the
+    request hooks (botocore's parameter serialization, signing, sending and response parsing),
+    and the deserialization of the items returned (:meth:`~pynamodb.models.Model.from_raw_data`).
+    Deserializations that do not follow a request on the same table (in the same thread or task)
+    are recorded without an operation.
+
+    Example:
+        profiler = LatencyProfiler()
+        with profiler:
+            Thread.get('forum', 'subject')
+        profiler.dump()
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[Optional[str], Optional[str], str], LatencyHistogram] = {}
+
+    def enable(self) -> None:
+        """
+        Starts profiling all requests and model (de)serializations, replacing the enabled profiler (if any)
+        """
+        global profiler
+        if profiler is not None:
+            profiler.disable()
+        request_hooks.register(before=self._before_request, after=self._after_request)
+        profiler = self
+
+    def disable(self) -> None:
+        """
+        Stops profiling
+        """
+        global profiler
+        request_hooks.unregister(before=self._before_request, after=self._after_request)
+        if profiler is self:
+            profiler = None
+
+    def __enter__(self) -> 'LatencyProfiler':
+        self.enable()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.disable()
+
+    def record(self, table_name: Optional[str], operation: Optional[str], phase: str, seconds: float) -> None:
+        """
+        Records that `phase` of `operation` on `table_name` took `seconds`
+        """
+        key = (table_name, operation, phase)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def record_serialization(self, table_name: str, seconds: float) -> None:
+        """
+        Records a model serialization, to be attributed to the next request on `table_name`
+        """
+        pending = _pending_serializations.get()
+        if len(pending) >= _MAX_PENDING_SERIALIZATIONS:
+            # not followed by a request (e.g. serialized to estimate its size)
+            stale_table_name, stale_seconds = pending[0]
+            self.record(stale_table_name, None, 'serialize', stale_seconds)
+            pending = pending[1:]
+        _pending_serializations.set(pending + ((table_name, seconds),))
+
+    def record_deserialization(self, table_name: str, seconds: float) -> None:
+        """
+        Records a model deserialization, attributed to the last request (if it was on `table_name`)
+        """
+        last_request = _last_request.get()
+        operation = last_request[0] if last_request is not None and table_name in last_request[1] else None
+        self.record(table_name, operation, 'deserialize', seconds)
+
+    def _before_request(self, context: RequestContext) -> None:
+        pending = _pending_serializations.get()
+        if pending:
+            _pending_serializations.set(())
+            table_names = context.table_names
+            for table_name, seconds in pending:
+                if table_name in table_names:
+                    self.record(table_name, context.operation, 'serialize', seconds)
+
+    def _after_request(self, context: RequestContext) -> None:
+        table_names = context.table_names
+        _last_request.set((context.operation, tuple(table_names)))
+        # multi-table requests are recorded once, under all their tables
+        table_name = ','.join(table_names) or None
+        for phase, seconds in context.timings.items():
+            self.record(table_name, context.operation, phase, seconds)
+        if context.duration is not None:
+            self.record(table_name, context.operation, 'total', context.duration)
+
+    def stats(self) -> List[PhaseStats]:
+        """
+        Returns the latency of each phase of each operation, per table
+        """
+        with self._lock:
+            histograms = list(self._histograms.items())
+        phase_order = {phase: i for i, phase in enumerate(PROFILED_PHASES)}
+        histograms.sort(key=lambda item: (item[0][0] or '', item[0][1] or '', phase_order.get(item[0][2], 0)))
+        return [
+            PhaseStats(
+                table_name=table_name,
+                operation=operation,
+                phase=phase,
+                samples=histogram.count,
+                mean=histogram.total / histogram.count,
+                p50=histogram.quantile(0.50),
+                p95=histogram.quantile(0.95),
+                p99=histogram.quantile(0.99),
+                max=histogram.max,
+            )
+            for (table_name, operation, phase), histogram in histograms
+        ]
+
+    def dump(self, file: Optional[TextIO] = None) -> None:
+        """
+        Writes the latencies (in milliseconds) as a table, to `file` or stdout
+        """
+        file = file or sys.stdout
+        header = ('table', 'operation', 'phase', 'samples', 'mean', 'p50', 'p95', 'p99', 'max')
+        rows = [header] + [
+            (s.table_name or '-', s.operation or '-', s.phase, str(s.samples))
+            + tuple('{:.3f}'.format(v * 1000) for v in (s.mean, s.p50, s.p95, s.p99, s.max))
+            for s in self.stats()
+        ]
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        for row in rows:
+            print('  '.join(cell.ljust(width) if i < 3 else cell.rjust(width)
+                            for i, (cell, width) in enumerate(zip(row, widths))), file=file)
+
+    def reset(self) -> None:
+        """
+        Discards all recorded latencies
+        """
+        with self._lock:
+            self._histograms.clear()
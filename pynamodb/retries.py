@@ -0,0 +1,204 @@
+"""
+Retries of partially processed batch requests and of throttled requests
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+from pynamodb.connection.base import RATE_LIMITING_ERROR_CODES
+from pynamodb.exceptions import PynamoDBException
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """
+    Returns whether `error` was raised because DynamoDB throttled the request
+    (after botocore ran out of its own retries)
+    """
+    return isinstance(error, PynamoDBException) and error.cause_response_code in RATE_LIMITING_ERROR_CODES
+
+
+class RetryStats(NamedTuple):
+    """
+    Counters of a :class:`RetryPolicy`
+    """
+    #: The number of operations that started a backoff
+    calls: int
+    #: The number of retries allowed
+    retries: int
+    #: The number of retries that followed a throttling error (included in `retries`)
+    throttled_retries: int
+    #: The number of retries denied by the retry budget
+    budget_exhausted: int
+    #: The total time spent backing off, in seconds
+    backoff_seconds: float
+
+
+class RetryPolicy:
+    """
+    Decides whether and when to retry the unprocessed items of batch requests (``UnprocessedItems`` and
+    ``UnprocessedKeys``) and batch requests that failed because DynamoDB throttled them.
+
+    The delays follow an exponential backoff with decorrelated jitter: each delay is drawn at random between
+    `base_delay_seconds` and three times the previous delay, up to `max_delay_seconds`.
+
+    Retries of throttled requests are also capped by a retry budget shared by all the operations using the policy:
+    each operation adds `budget_ratio` of a retry to the budget, and each retry of a throttled request takes one out.
+    Up to `budget_reserve` retries can be saved up, so that occasional retries are always allowed while a persistently
+    throttled table cannot cause more than `budget_ratio` retries per operation. Resending unprocessed items or keys
+    is not charged to the budget, since DynamoDB also leaves them unprocessed when a response reaches its size limit.
+
+    Example:
+        class Thread(Model):
+            class Meta:
+                table_name = 'Thread'
+                retry_policy = RetryPolicy(max_delay_seconds=1, budget_ratio=0.5)
+    """
+
+    def __init__(
+        self,
+        base_delay_seconds: float = 0.05,
+        max_delay_seconds: float = 5,
+        budget_ratio: float = 0.2,
+        budget_reserve: float = 10,
+        time_module: Optional[Any] = None,
+        random_module: Optional[Any] = None,
+    ) -> None:
+        """
+        :param base_delay_seconds: The minimum delay before a retry
+        :param max_delay_seconds: The maximum delay before a retry
+        :param budget_ratio: The retries of throttled requests allowed per operation, once the reserve is used up
+        :param budget_reserve: The retries of throttled requests that can be saved up
+        :param time_module: Optional: the module responsible for calculating time. Intended to be used for testing purposes.
+        :param random_module: Optional: the module responsible for the jitter. Intended to be used for testing purposes.
+        """
+        if not 0 < base_delay_seconds <= max_delay_seconds:
+            raise ValueError("base_delay_seconds must be greater than zero and at most max_delay_seconds")
+        if budget_ratio < 0 or budget_reserve < 0:
+            raise ValueError("budget_ratio and budget_reserve must not be negative")
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self._time_module: Any = time_module or time
+        self._random_module: Any = random_module or random
+        self._lock = threading.Lock()
+        self._budget = budget_reserve
+        self._calls = 0
+        self._retries = 0
+        self._throttled_retries = 0
+        self._budget_exhausted = 0
+        self._backoff_seconds = 0.0
+
+    def backoff(self, max_attempts: Optional[int] = None) -> 'Backoff':
+        """
+        Starts an operation, returning the :class:`Backoff` deciding on its retries
+
+        :param max_attempts: If set, the attempts after which the operation gives up (e.g. ``Meta.max_retry_attempts``)
+        """
+        with self._lock:
+            self._calls += 1
+            self._budget = min(self._budget + self.budget_ratio, self.budget_reserve)
+        return Backoff(self, max_attempts)
+
+    def stats(self) -> RetryStats:
+        """
+        Returns the counters of the policy
+        """
+        with self._lock:
+            return RetryStats(
+                calls=self._calls,
+                retries=self._retries,
+                throttled_retries=self._throttled_retries,
+                budget_exhausted=self._budget_exhausted,
+                backoff_seconds=self._backoff_seconds,
+            )
+
+    def _withdraw(self, throttled: bool) -> bool:
+        with self._lock:
+            if throttled:
+                if self._budget < 1:
+                    self._budget_exhausted += 1
+                    return False
+                self._budget -= 1
+                self._throttled_retries += 1
+            self._retries += 1
+            return True
+
+    def _next_delay(self, previous_delay: float) -> float:
+        delay = self._random_module.uniform(self.base_delay_seconds, previous_delay * 3)
+        return min(delay, self.max_delay_seconds)
+
+    def _record_backoff(self, seconds: float) -> None:
+        with self._lock:
+            self._backoff_seconds += seconds
+
+
+class Backoff:
+    """
+    The retries of one operation, see :meth:`RetryPolicy.backoff`
+    """
+
+    def __init__(self, policy: RetryPolicy, max_attempts: Optional[int] = None) -> None:
+        self.policy = policy
+        self.max_attempts = max_attempts
+        #: The number of retries so far
+        self.retries = 0
+        self._delay = policy.base_delay_seconds
+
+    def reset(self) -> None:
+        """
+        Starts over after an attempt that made progress: the retries before it no longer count
+        towards `max_attempts`, and the next delay is short again
+        """
+        self.retries = 0
+        self._delay = self.policy.base_delay_seconds
+
+    def retry(self, error: Optional[BaseException] = None) -> bool:
+        """
+        Sleeps before retrying, unless the retry is not allowed
+
+        :param error: The error raised by the last attempt, if any: only throttling errors are retried,
+            and only while the retry budget lasts
+        :return: Whether to retry
+        """
+        delay = self._reserve(error)
+        if delay is None:
+            return False
+        self.policy._time_module.sleep(delay)
+        return True
+
+    async def aretry(self, error: Optional[BaseException] = None) -> bool:
+        """
+        Like :meth:`retry`, but yields to the event loop instead of blocking the thread
+        """
+        import asyncio  # already imported by the running event loop
+
+        delay = self._reserve(error)
+        if delay is None:
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+    def _reserve(self, error: Optional[BaseException]) -> Optional[float]:
+        if error is not None and not is_throttling_error(error):
+            return None
+        if self.max_attempts is not None and self.retries + 1 >= self.max_attempts:
+            log.warning("Giving up after %d retries", self.retries)
+            return None
+        if not self.policy._withdraw(throttled=error is not None):
+            log.warning("Retry budget exhausted, giving up after %d retries", self.retries)
+            return None
+        self.retries += 1
+        self._delay = self.policy._next_delay(self._delay)
+        self.policy._record_backoff(self._delay)
+        log.debug("Backing off %.3fs before retry %d", self._delay, self.retries)
+        return self._delay
+
+
+#: The retry policy of the models that do not set ``Meta.retry_policy``
+default_retry_policy = RetryPolicy()
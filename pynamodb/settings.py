@@ -15,6 +15,7 @@ default_settings_dict = {
     'region': None,
     'max_pool_connections': 10,
     'extra_headers': None,
+    'transport': None,
 }
 
 OVERRIDE_SETTINGS_PATH = getenv('PYNAMODB_CONFIG', '/etc/pynamodb/global_default_settings.py')
@@ -21,6 +21,8 @@ class _FakeSignal(object):
     will just ignore the arguments and do nothing instead.
     """
 
+    receivers: dict = {}
+
     def __init__(self, name, doc=None):
         self.name = name
         self.__doc__ = doc
@@ -0,0 +1,119 @@
+"""
+Estimates of the size and capacity units of DynamoDB items, following the sizing rules of DynamoDB
+"""
+import math
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TypeVar
+
+from pynamodb.constants import (
+    BINARY, BINARY_SET, EXPRESSION_ATTRIBUTE_NAMES, EXPRESSION_ATTRIBUTE_VALUES, ITEM, KEY, LIST, MAP, NUMBER,
+    NUMBER_SET, STRING, STRING_SET,
+)
+
+_T = TypeVar('_T')
+
+# The overhead of a list or map, and of each of its elements
+_CONTAINER_BYTES = 3
+_ELEMENT_BYTES = 1
+
+
+def attribute_value_size(value: Dict[str, Any]) -> int:
+    """
+    Returns the size in bytes of a serialized attribute value (e.g. ``{'S': 'foo'}``), without its name
+    """
+    attr_type, data = next(iter(value.items()))
+    if attr_type == STRING:
+        return len(data.encode())
+    if attr_type == NUMBER:
+        return _number_size(data)
+    if attr_type == BINARY:
+        return _binary_size(data)
+    if attr_type == STRING_SET:
+        return sum(len(v.encode()) for v in data)
+    if attr_type == NUMBER_SET:
+        return sum(_number_size(v) for v in data)
+    if attr_type == BINARY_SET:
+        return sum(_binary_size(v) for v in data)
+    if attr_type == LIST:
+        return _CONTAINER_BYTES + sum(_ELEMENT_BYTES + attribute_value_size(v) for v in data)
+    if attr_type == MAP:
+        return _CONTAINER_BYTES + sum(_ELEMENT_BYTES + len(k.encode()) + attribute_value_size(v) for k, v in data.items())
+    # NULL and BOOL
+    return 1
+
+
+def item_size(item: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Returns the size in bytes of a serialized item (or key): the sum of the lengths of its attribute names
+    and the sizes of its values
+    """
+    return sum(len(name.encode()) + attribute_value_size(value) for name, value in item.items())
+
+
+def operation_size(operation_kwargs: Dict[str, Any]) -> int:
+    """
+    Returns the estimated size in bytes of an operation on a single item (e.g. the arguments returned by
+    :meth:`~pynamodb.models.Model.get_save_kwargs_from_instance`): its item or key, expressions and
+    expression attribute names and values
+    """
+    size = 0
+    for name, value in operation_kwargs.items():
+        if name in (ITEM, KEY, EXPRESSION_ATTRIBUTE_VALUES):
+            size += item_size(value)
+        elif name == EXPRESSION_ATTRIBUTE_NAMES:
+            size += sum(len(placeholder.encode()) + len(attr_name.encode()) for placeholder, attr_name in value.items())
+        elif isinstance(value, str):
+            size += len(value.encode())
+    return size
+
+
+def read_capacity_units(size: int, consistent_read: bool = False, transactional: bool = False) -> float:
+    """
+    Returns the read capacity units consumed by reading an item of `size` bytes:
+    one per 4 KB for a strongly consistent read, half as many for an eventually consistent read,
+    and twice as many in a transaction
+    """
+    units = float(max(1, math.ceil(size / 4096)))
+    if transactional:
+        return 2 * units
+    return units if consistent_read else units / 2
+
+
+def write_capacity_units(size: int, transactional: bool = False) -> float:
+    """
+    Returns the write capacity units consumed by writing an item of `size` bytes:
+    one per 1 KB, and twice as many in a transaction
+    """
+    units = float(max(1, math.ceil(size / 1024)))
+    return 2 * units if transactional else units
+
+
+def pack(entries: Iterable[_T], size: Callable[[_T], int], max_count: int, max_bytes: int) -> Iterator[List[_T]]:
+    """
+    Groups `entries` into consecutive packs of at most `max_count` entries and `max_bytes` bytes
+    (an entry larger than `max_bytes` gets a pack of its own)
+    """
+    entries_pack: List[_T] = []
+    pack_bytes = 0
+    for entry in entries:
+        entry_bytes = size(entry)
+        if entries_pack and (len(entries_pack) == max_count or pack_bytes + entry_bytes > max_bytes):
+            yield entries_pack
+            entries_pack, pack_bytes = [], 0
+        entries_pack.append(entry)
+        pack_bytes += entry_bytes
+    if entries_pack:
+        yield entries_pack
+
+
+def _number_size(data: str) -> int:
+    # one byte per two significant digits, plus one byte
+    mantissa = data.lstrip('+-').lower().partition('e')[0]
+    digits = mantissa.replace('.', '').strip('0')
+    return (len(digits) + 1) // 2 + 1
+
+
+def _binary_size(data: Any) -> int:
+    if isinstance(data, str):
+        # base64 encoded
+        return len(data) * 3 // 4 - data.count('=')
+    return len(data)
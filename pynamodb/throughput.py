@@ -0,0 +1,277 @@
+"""
+Client-side throughput governance
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pynamodb.capacity import split_capacity_units
+from pynamodb.constants import READ_OPERATIONS, TABLE_NAME, WRITE_OPERATIONS
+from pynamodb.hooks import RequestContext, get_table_names, request_hooks
+
+#: The enabled governor, if any (see :meth:`ThroughputGovernor.enable`)
+governor: Optional['ThroughputGovernor'] = None
+
+_background: ContextVar[bool] = ContextVar('_background', default=False)
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """
+    Marks the requests sent within the block (in the current thread or task) as background traffic,
+    which leaves the capacity reserved for foreground traffic alone (see :class:`ThroughputGovernor`)
+
+    Example:
+        with background():
+            for thread in Thread.scan():
+                ...
+    """
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket, refilled with `rate` units per second up to `burst` units.
+
+    Units are charged once they have been consumed (:meth:`charge`), so the balance can go negative:
+    callers of :meth:`acquire` wait until the debt is repaid.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, time_module: Optional[Any] = None) -> None:
+        """
+        :param rate: The units added per second
+        :param burst: The maximum balance. Defaults to one second of `rate`.
+        :param time_module: Optional: the module responsible for calculating time. Intended to be used for testing purposes.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        self._rate = rate
+        self._burst = rate if burst is None else burst
+        if self._burst <= 0:
+            raise ValueError("burst must be greater than zero")
+        self._time_module: Any = time_module or time
+        self._lock = threading.Lock()
+        self._tokens = self._burst
+        self._last_refill = self._time_module.time()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        return self._burst
+
+    @property
+    def tokens(self) -> float:
+        """
+        The current balance
+        """
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self, reserve: float = 0) -> None:
+        """
+        Sleeps until the balance is at least `reserve` units
+
+        :param reserve: The units to leave to other callers, at most `burst`
+        """
+        while True:
+            wait_time = self._wait_time(reserve)
+            if not wait_time:
+                return
+            self._time_module.sleep(wait_time)
+
+    async def acquire_async(self, reserve: float = 0) -> None:
+        """
+        Like :meth:`acquire`, but yields to the event loop instead of blocking the thread
+        """
+        import asyncio  # already imported by the running event loop
+
+        while True:
+            wait_time = self._wait_time(reserve)
+            if not wait_time:
+                return
+            await asyncio.sleep(wait_time)
+
+    def charge(self, units: float) -> None:
+        """
+        Takes `units` out of the balance
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= units
+
+    def _wait_time(self, reserve: float) -> float:
+        with self._lock:
+            self._refill()
+            threshold = min(reserve, self._burst)
+            if self._tokens >= threshold:
+                return 0.0
+            return (threshold - self._tokens) / self._rate
+
+    def _refill(self) -> None:
+        now = self._time_module.time()
+        self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+
+class ThroughputGovernor:
+    """
+    Limits the capacity consumed by all the requests of all connections, per table,
+    with separate read and write budgets (token buckets refilled at the given capacity units per second).
+
+    Before a request is sent, it waits until the budget of each table it accesses is no longer overdrawn;
+    once the response is received, the capacity actually consumed is charged to the budgets. Concurrent requests
+    may therefore briefly overdraw a budget, by their combined cost. Requests that do not return their
+    consumed capacity (``return_consumed_capacity='NONE'``) are charged one unit per table.
+
+    Requests sent within :func:`background` only proceed while at least `background_reserve` of the burst
+    is left, so that background jobs can share the capacity of a table without throttling foreground traffic.
+
+    Example:
+        governor = ThroughputGovernor()
+        governor.set_limit('Thread', read_capacity_units=100, write_capacity_units=50)
+        governor.enable()
+    """
+
+    def __init__(self, background_reserve: float = 0.5, time_module: Optional[Any] = None) -> None:
+        """
+        :param background_reserve: The fraction of the burst of each budget reserved for foreground traffic
+        :param time_module: Optional: the module responsible for calculating time. Intended to be used for testing purposes.
+        """
+        if not 0 <= background_reserve <= 1:
+            raise ValueError("background_reserve must be between 0 and 1")
+        self._background_reserve = background_reserve
+        self._time_module = time_module
+        self._lock = threading.Lock()
+        # table name -> (read budget, write budget)
+        self._limits: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+
+    def set_limit(
+        self,
+        table_name: str,
+        read_capacity_units: Optional[float] = None,
+        write_capacity_units: Optional[float] = None,
+        burst_seconds: float = 1,
+    ) -> None:
+        """
+        Limits the capacity consumed on a table (including its indexes), replacing its current limits
+
+        :param read_capacity_units: The read capacity units per second, unlimited if not set
+        :param write_capacity_units: The write capacity units per second, unlimited if not set
+        :param burst_seconds: How many seconds of unused capacity can be used in a burst
+        """
+        if burst_seconds <= 0:
+            raise ValueError("burst_seconds must be greater than zero")
+        read_bucket = self._create_bucket(read_capacity_units, burst_seconds)
+        write_bucket = self._create_bucket(write_capacity_units, burst_seconds)
+        with self._lock:
+            self._limits[table_name] = (read_bucket, write_bucket)
+
+    def _create_bucket(self, units: Optional[float], burst_seconds: float) -> Optional[TokenBucket]:
+        if units is None:
+            return None
+        return TokenBucket(units, units * burst_seconds, time_module=self._time_module)
+
+    def remove_limit(self, table_name: str) -> None:
+        """
+        Removes the limits on a table
+        """
+        with self._lock:
+            self._limits.pop(table_name, None)
+
+    def get_budgets(self, table_name: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        """
+        Returns the read and write budgets of a table (``None`` when unlimited)
+        """
+        return self._limits.get(table_name, (None, None))
+
+    def enable(self) -> None:
+        """
+        Starts governing all requests, replacing the enabled governor (if any)
+        """
+        global governor
+        if governor is not None:
+            governor.disable()
+        request_hooks.register(after=self._after_request)
+        governor = self
+
+    def disable(self) -> None:
+        """
+        Stops governing requests
+        """
+        global governor
+        request_hooks.unregister(after=self._after_request)
+        if governor is self:
+            governor = None
+
+    def __enter__(self) -> 'ThroughputGovernor':
+        self.enable()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.disable()
+
+    def acquire(self, operation_name: str, operation_kwargs: Dict[str, Any]) -> None:
+        """
+        Waits until the budgets of the tables accessed by a request allow it to be sent
+        """
+        reserve = self._background_reserve if _background.get() else 0.0
+        for bucket in self._get_buckets(operation_name, operation_kwargs):
+            bucket.acquire(reserve * bucket.burst)
+
+    async def acquire_async(self, operation_name: str, operation_kwargs: Dict[str, Any]) -> None:
+        """
+        Like :meth:`acquire`, but yields to the event loop instead of blocking the thread
+        """
+        reserve = self._background_reserve if _background.get() else 0.0
+        for bucket in self._get_buckets(operation_name, operation_kwargs):
+            await bucket.acquire_async(reserve * bucket.burst)
+
+    def _get_buckets(self, operation_name: str, operation_kwargs: Dict[str, Any]) -> List[TokenBucket]:
+        if not self._limits:
+            return []
+        budget = _get_budget(operation_name)
+        if budget is None:
+            return []
+        buckets = []
+        for table_name in get_table_names(operation_kwargs):
+            bucket = self.get_budgets(table_name)[budget]
+            if bucket is not None:
+                buckets.append(bucket)
+        return buckets
+
+    def _after_request(self, context: RequestContext) -> None:
+        if context.error is not None or not self._limits:
+            return
+        budget = _get_budget(context.operation)
+        if budget is None:
+            return
+        consumed_capacity = context.consumed_capacity
+        if consumed_capacity is None:
+            units_by_table = {table_name: 1.0 for table_name in context.table_names}
+        else:
+            units_by_table = {}
+            for entry in consumed_capacity if isinstance(consumed_capacity, list) else [consumed_capacity]:
+                units = split_capacity_units(context.operation, entry)[budget]
+                units_by_table[entry[TABLE_NAME]] = units_by_table.get(entry[TABLE_NAME], 0.0) + units
+        for table_name, units in units_by_table.items():
+            bucket = self.get_budgets(table_name)[budget]
+            if bucket is not None:
+                bucket.charge(units)
+
+
+def _get_budget(operation_name: str) -> Optional[int]:
+    if operation_name in READ_OPERATIONS:
+        return 0
+    if operation_name in WRITE_OPERATIONS:
+        return 1
+    return None
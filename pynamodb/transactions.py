@@ -1,10 +1,11 @@
 from typing import Tuple, TypeVar, Type, Any, List, Optional, Dict, Union, Text, Generic
 
 from pynamodb.connection import Connection
-from pynamodb.constants import ITEM, RESPONSES
+from pynamodb.constants import ITEM, MAX_ITEM_SIZE_BYTES, RESPONSES, TRANSACT_ITEM_LIMIT, TRANSACT_MAX_BYTES
 from pynamodb.expressions.condition import Condition
 from pynamodb.expressions.update import Action
 from pynamodb.models import Model, _ModelFuture, _KeyType
+from pynamodb.sizing import item_size, operation_size
 
 _M = TypeVar('_M', bound=Model)
 _TTransaction = TypeVar('_TTransaction', bound='Transaction')
@@ -19,6 +20,30 @@ class Transaction:
     def __init__(self, connection: Connection, return_consumed_capacity: Optional[str] = None) -> None:
         self._connection = connection
         self._return_consumed_capacity = return_consumed_capacity
+        self._item_count = 0
+        self._estimated_size = 0
+
+    @property
+    def estimated_size(self) -> int:
+        """
+        The estimated size in bytes of the items of the transaction (see :mod:`pynamodb.sizing`)
+        """
+        return self._estimated_size
+
+    def _add_operation(self, operation_kwargs: Dict[str, Any]) -> None:
+        """
+        Accounts for an operation, raising ValueError if the transaction would exceed the limits of DynamoDB
+        (so that the caller can commit and start another transaction)
+        """
+        if self._item_count == TRANSACT_ITEM_LIMIT:
+            raise ValueError("DynamoDB allows a maximum of {} items per transaction".format(TRANSACT_ITEM_LIMIT))
+        if ITEM in operation_kwargs and item_size(operation_kwargs[ITEM]) > MAX_ITEM_SIZE_BYTES:
+            raise ValueError("The item exceeds the maximum item size of {} bytes".format(MAX_ITEM_SIZE_BYTES))
+        size = operation_size(operation_kwargs)
+        if self._estimated_size + size > TRANSACT_MAX_BYTES:
+            raise ValueError("The transaction would exceed the maximum size of {} bytes".format(TRANSACT_MAX_BYTES))
+        self._item_count += 1
+        self._estimated_size += size
 
     def _commit(self):
         raise NotImplementedError()
@@ -51,6 +76,7 @@ class TransactGet(Transaction):
         :return:
         """
         operation_kwargs = model_cls.get_operation_kwargs_from_class(hash_key, range_key=range_key)
+        self._add_operation(operation_kwargs)
         model_future = _ModelFuture(model_cls)
         self._futures.append(model_future)
         self._get_items.append(operation_kwargs)
@@ -89,6 +115,7 @@ class TransactWrite(Transaction):
         self._put_items: List[Dict] = []
         self._update_items: List[Dict] = []
         self._models_for_version_attribute_update: List[Any] = []
+        self._written_models: List[Any] = []
 
     def condition_check(self, model_cls: Type[_M], hash_key: _KeyType, range_key: Optional[_KeyType] = None, condition: Optional[Condition] = None):
         if condition is None:
@@ -98,6 +125,7 @@ class TransactWrite(Transaction):
             range_key=range_key,
             condition=condition
         )
+        self._add_operation(operation_kwargs)
         self._condition_check_items.append(operation_kwargs)
 
     def delete(self, model: _M, condition: Optional[Condition] = None, *, add_version_condition: bool = True) -> None:
@@ -105,15 +133,19 @@ class TransactWrite(Transaction):
             condition=condition,
             add_version_condition=add_version_condition,
         )
+        self._add_operation(operation_kwargs)
         self._delete_items.append(operation_kwargs)
+        self._written_models.append(model)
 
     def save(self, model: _M, condition: Optional[Condition] = None, return_values: Optional[str] = None) -> None:
         operation_kwargs = model.get_save_kwargs_from_instance(
             condition=condition,
             return_values_on_condition_failure=return_values
         )
+        self._add_operation(operation_kwargs)
         self._put_items.append(operation_kwargs)
         self._models_for_version_attribute_update.append(model)
+        self._written_models.append(model)
 
     def update(self, model: _M, actions: List[Action], condition: Optional[Condition] = None,
                return_values: Optional[str] = None,
@@ -125,19 +157,26 @@ class TransactWrite(Transaction):
             return_values_on_condition_failure=return_values,
             add_version_condition=add_version_condition,
         )
+        self._add_operation(operation_kwargs)
         self._update_items.append(operation_kwargs)
         self._models_for_version_attribute_update.append(model)
+        self._written_models.append(model)
 
     def _commit(self) -> Any:
-        response = self._connection.transact_write_items(
-            condition_check_items=self._condition_check_items,
-            delete_items=self._delete_items,
-            put_items=self._put_items,
-            update_items=self._update_items,
-            client_request_token=self._client_request_token,
-            return_consumed_capacity=self._return_consumed_capacity,
-            return_item_collection_metrics=self._return_item_collection_metrics,
-        )
+        try:
+            response = self._connection.transact_write_items(
+                condition_check_items=self._condition_check_items,
+                delete_items=self._delete_items,
+                put_items=self._put_items,
+                update_items=self._update_items,
+                client_request_token=self._client_request_token,
+                return_consumed_capacity=self._return_consumed_capacity,
+                return_item_collection_metrics=self._return_item_collection_metrics,
+            )
+        finally:
+            for model in self._written_models:
+                model._invalidate_cached_item()
+                model._stop_tracking_changes()
         for model in self._models_for_version_attribute_update:
             model.update_local_version_attribute()
         return response
@@ -39,6 +39,7 @@ setup(
     ],
     extras_require={
         'signals': ['blinker>=1.3,<2.0'],
+        'asyncio': ['aiobotocore'],
     },
     package_data={'pynamodb': ['py.typed']},
 )
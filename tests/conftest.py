@@ -0,0 +1,10 @@
+import pytest
+
+from pynamodb.connection.registry import client_registry
+
+
+@pytest.fixture(autouse=True)
+def clear_client_registry():
+    # clients created by one test (possibly mocks) must not be shared with the next
+    yield
+    client_registry.clear()
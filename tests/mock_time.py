@@ -0,0 +1,17 @@
+class MockTime():
+    """
+    A time module whose clock only moves when slept on or incremented; the sleeps are kept in `slept`
+    """
+    def __init__(self, current_time=0.0):
+        self.current_time = current_time
+        self.slept = []
+
+    def sleep(self, amount):
+        self.current_time += amount
+        self.slept.append(amount)
+
+    def time(self):
+        return self.current_time
+
+    def increment_time(self, amount):
+        self.current_time += amount
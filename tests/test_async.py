@@ -0,0 +1,255 @@
+"""
+Tests for the asyncio connection and Model API
+"""
+import asyncio
+import sys
+from types import ModuleType, SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute, VersionAttribute
+from pynamodb.connection import AsyncConnection, Connection
+from pynamodb.exceptions import GetError, PutError
+from pynamodb.models import Model
+
+ASYNC_PATCH_METHOD = 'pynamodb.connection.aio.AsyncConnection._make_api_call'
+
+
+class AwaitableMock(Mock):
+    """
+    A Mock whose calls return awaitables (unittest.mock.AsyncMock requires Python 3.8)
+    """
+
+    def __call__(_mock_self, *args, **kwargs):
+        async def call():
+            return Mock.__call__(_mock_self, *args, **kwargs)
+        return call()
+
+
+class AsyncThing(Model):
+    class Meta:
+        table_name = 'AsyncThing'
+
+    id = UnicodeAttribute(hash_key=True)
+    rank = NumberAttribute(range_key=True)
+    name = UnicodeAttribute(null=True)
+    version = VersionAttribute()
+
+
+def _thing(id, rank, **attrs):
+    item = {'id': {'S': id}, 'rank': {'N': str(rank)}}
+    item.update(attrs)
+    return item
+
+
+def test_async_connection_builds_same_request_as_connection():
+    sync_conn = Connection()
+    async_conn = AsyncConnection()
+    sync_conn.add_meta_table(AsyncThing._get_connection().get_meta_table())
+    async_conn.add_meta_table(AsyncThing._get_connection().get_meta_table())
+
+    with patch('pynamodb.connection.Connection._make_api_call', return_value={}) as sync_mock:
+        sync_conn.get_item('AsyncThing', 'foo', range_key='1', consistent_read=True, attributes_to_get=['name'])
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock, return_value={}) as async_mock:
+        asyncio.run(async_conn.get_item('AsyncThing', 'foo', range_key='1', consistent_read=True,
+                                        attributes_to_get=['name']))
+
+    assert async_mock.call_args == sync_mock.call_args
+
+
+def test_async_connection_wraps_errors():
+    conn = AsyncConnection()
+    conn.add_meta_table(AsyncThing._get_connection().get_meta_table())
+    error = ClientError({'Error': {'Code': 'ValidationException', 'Message': 'bad'}}, 'GetItem')
+
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock, side_effect=error):
+        with pytest.raises(GetError):
+            asyncio.run(conn.get_item('AsyncThing', 'foo', range_key='1'))
+
+
+def test_async_connection_requires_aiobotocore():
+    try:
+        import aiobotocore  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        pytest.skip('aiobotocore is installed')
+
+    conn = AsyncConnection()
+    with pytest.raises(ImportError, match=r'pynamodb\[asyncio\]'):
+        asyncio.run(conn._make_api_call('GetItem', {}))
+
+
+def test_aget():
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock) as req:
+        req.return_value = {'Item': _thing('foo', 1, name={'S': 'bar'}, version={'N': '1'})}
+        item = asyncio.run(AsyncThing.aget('foo', 1))
+        assert item.name == 'bar'
+        assert req.call_args[0][0] == 'GetItem'
+        assert req.call_args[0][1]['Key'] == {'id': {'S': 'foo'}, 'rank': {'N': '1'}}
+
+        req.return_value = {}
+        with pytest.raises(AsyncThing.DoesNotExist):
+            asyncio.run(AsyncThing.aget('foo', 2))
+
+
+def test_asave_and_adelete():
+    item = AsyncThing('foo', 1, name='bar')
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock, return_value={}) as req:
+        asyncio.run(item.asave())
+        assert item.version == 1
+        operation, kwargs = req.call_args[0]
+        assert operation == 'PutItem'
+        assert kwargs['Item']['version'] == {'N': '1'}
+        assert kwargs['ConditionExpression'] == 'attribute_not_exists (#0)'
+
+        asyncio.run(item.adelete())
+        operation, kwargs = req.call_args[0]
+        assert operation == 'DeleteItem'
+        assert kwargs['ConditionExpression'] == '#0 = :0'
+
+
+def test_asave_error():
+    item = AsyncThing('foo', 1)
+    error = ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'no'}}, 'PutItem')
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock, side_effect=error):
+        with pytest.raises(PutError) as exc_info:
+            asyncio.run(item.asave())
+    assert exc_info.value.cause_response_code == 'ConditionalCheckFailedException'
+    assert item.version is None
+
+
+def test_aupdate():
+    item = AsyncThing('foo', 1, version=1)
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock) as req:
+        req.return_value = {'Attributes': _thing('foo', 1, name={'S': 'baz'}, version={'N': '2'})}
+        asyncio.run(item.aupdate(actions=[AsyncThing.name.set('baz')]))
+        assert item.name == 'baz'
+        assert item.version == 2
+        assert req.call_args[0][0] == 'UpdateItem'
+        assert req.call_args[0][1]['ReturnValues'] == 'ALL_NEW'
+
+
+def test_abatch_get():
+    async def collect():
+        return [item async for item in AsyncThing.abatch_get([('a', 1), ('b', 2)])]
+
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock) as req:
+        req.side_effect = [
+            {
+                'Responses': {'AsyncThing': [_thing('a', 1)]},
+                'UnprocessedKeys': {'AsyncThing': {'Keys': [{'id': {'S': 'b'}, 'rank': {'N': '2'}}]}},
+            },
+            {
+                'Responses': {'AsyncThing': [_thing('b', 2)]},
+                'UnprocessedKeys': {},
+            },
+        ]
+        items = asyncio.run(collect())
+
+    assert sorted(item.id for item in items) == ['a', 'b']
+    assert req.call_count == 2
+    assert req.call_args[0][1]['RequestItems']['AsyncThing']['Keys'] == [{'id': {'S': 'b'}, 'rank': {'N': '2'}}]
+
+
+def test_async_query_pagination():
+    async def collect(results):
+        return [item async for item in results]
+
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock) as req:
+        req.side_effect = [
+            {'Count': 1, 'ScannedCount': 1, 'Items': [_thing('foo', 1)],
+             'LastEvaluatedKey': {'id': {'S': 'foo'}, 'rank': {'N': '1'}}},
+            {'Count': 1, 'ScannedCount': 1, 'Items': [_thing('foo', 2)]},
+        ]
+        results = AsyncThing.query('foo')
+        items = asyncio.run(collect(results))
+
+    assert [item.rank for item in items] == [1, 2]
+    assert req.call_args_list[1][0][1]['ExclusiveStartKey'] == {'id': {'S': 'foo'}, 'rank': {'N': '1'}}
+    assert results.last_evaluated_key is None
+    assert results.total_count == 2
+
+
+def test_async_scan_limit():
+    async def collect(results):
+        return [item async for item in results]
+
+    with patch(ASYNC_PATCH_METHOD, new_callable=AwaitableMock) as req:
+        req.return_value = {'Count': 2, 'ScannedCount': 2, 'Items': [_thing('foo', 1), _thing('bar', 2)],
+                            'LastEvaluatedKey': {'id': {'S': 'bar'}, 'rank': {'N': '2'}}}
+        results = AsyncThing.scan(limit=1)
+        items = asyncio.run(collect(results))
+
+    assert [item.id for item in items] == ['foo']
+    assert req.call_count == 1
+    assert results.last_evaluated_key == {'id': {'S': 'foo'}, 'rank': {'N': '1'}}
+
+
+def test_sync_query_and_scan_do_not_create_async_connection():
+    with patch.object(AsyncThing, '_get_async_connection') as get_async_connection:
+        AsyncThing.query('foo')
+        AsyncThing.scan()
+    assert not get_async_connection.called
+
+
+def test_async_connection_closes_client_of_previous_loop():
+    conn = AsyncConnection()
+    stale_client_context = SimpleNamespace(__aexit__=AwaitableMock())
+    conn._client, conn._client_context, conn._client_loop = object(), stale_client_context, object()
+
+    async def get_client():
+        try:
+            await conn._get_client()
+        except ImportError:
+            pass  # aiobotocore is not installed
+        await conn.close()
+
+    asyncio.run(get_client())
+    stale_client_context.__aexit__.assert_called_once_with(None, None, None)
+
+
+def test_async_connection_creates_aiobotocore_client():
+    client = Mock()
+    client._make_api_call = AwaitableMock(return_value={})
+    client_context = SimpleNamespace(__aenter__=AwaitableMock(return_value=client), __aexit__=AwaitableMock())
+    session = Mock()
+    session.create_client.return_value = client_context
+    aiobotocore_config = ModuleType('aiobotocore.config')
+    aiobotocore_config.AioConfig = Mock()
+    aiobotocore_session = ModuleType('aiobotocore.session')
+    aiobotocore_session.get_session = Mock(return_value=session)
+    modules = {
+        'aiobotocore': ModuleType('aiobotocore'),
+        'aiobotocore.config': aiobotocore_config,
+        'aiobotocore.session': aiobotocore_session,
+    }
+    conn = AsyncConnection(region='us-west-2', host='http://localhost:8000', aws_access_key_id='key',
+                           aws_secret_access_key='secret', aws_session_token='token')
+
+    async def get_items():
+        await conn._make_api_call('GetItem', {'TableName': 'AsyncThing'})
+        await conn._make_api_call('GetItem', {'TableName': 'AsyncThing'})
+
+    with patch.dict(sys.modules, modules):
+        asyncio.run(get_items())
+
+        aiobotocore_session.get_session.assert_called_once_with()
+        session.set_credentials.assert_called_once_with('key', 'secret', 'token')
+        aiobotocore_config.AioConfig.assert_called_once_with(**conn.connection._get_client_config_kwargs())
+        session.create_client.assert_called_once_with(
+            'dynamodb', 'us-west-2', endpoint_url='http://localhost:8000',
+            config=aiobotocore_config.AioConfig.return_value,
+        )
+        client.meta.events.register_first.assert_called_once_with('before-send.*.*', conn.connection._before_send)
+        assert client._make_api_call.call_args_list == [(('GetItem', {'TableName': 'AsyncThing'}),)] * 2
+
+        # a new event loop gets its own client, and the client of the previous loop is closed
+        asyncio.run(get_items())
+        assert session.create_client.call_count == 2
+        client_context.__aexit__.assert_called_once_with(None, None, None)
+
+        asyncio.run(conn.close())
+        assert client_context.__aexit__.call_count == 2
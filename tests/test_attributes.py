@@ -133,6 +133,41 @@ class TestAttributeDescriptor:
         assert self.instance.json_attr == {'foo': 'bar', 'bar': 42}
 
 
+class TestCompiledPlans:
+    def test_plans_cover_attributes(self):
+        assert [entry[0] for entry in AttributeTestModel._serialize_plan] == list(AttributeTestModel.get_attributes())
+        assert [entry[0] for entry in AttributeTestModel._deserialize_plan] == list(AttributeTestModel.get_attributes())
+        assert [entry[0] for entry in DefaultsMap._defaults_plan] == ['map_field']
+
+    def test_descriptor_overrides_are_used(self):
+        class VersionedModel(Model):
+            class Meta:
+                table_name = 'versioned'
+            id = UnicodeAttribute(hash_key=True)
+            version = VersionAttribute()
+            ttl = TTLAttribute(null=True)
+
+        item = VersionedModel.from_raw_data({'id': {'S': 'a'}, 'version': {'N': '2'}, 'ttl': {'N': '0'}})
+        assert item.version == 2 and isinstance(item.version, int)
+        assert item.ttl == datetime.fromtimestamp(0, tz=timezone.utc)
+
+        item.attribute_values['version'] = 3.0  # VersionAttribute.__get__ casts to int
+        assert item.serialize()['version'] == {NUMBER: '3'}
+
+    def test_custom_get_value(self):
+        class LenientNumberAttribute(NumberAttribute):
+            def get_value(self, value):
+                return value[NUMBER] if NUMBER in value else value[STRING]
+
+        class LenientModel(Model):
+            class Meta:
+                table_name = 'lenient'
+            id = UnicodeAttribute(hash_key=True)
+            count = LenientNumberAttribute()
+
+        assert LenientModel.from_raw_data({'id': {'S': 'a'}, 'count': {'S': '4'}}).count == 4
+
+
 class TestDefault:
     def test_default(self):
         Attribute(default='test')
@@ -0,0 +1,144 @@
+from unittest import mock
+
+import pytest
+
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.batch import MultiBatchGet, MultiBatchWrite
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.exceptions import DoesNotExist, PutError
+from pynamodb.models import Model
+from pynamodb.retries import RetryPolicy
+
+transport = InMemoryTransport()
+
+
+class User(Model):
+    class Meta:
+        table_name = 'User'
+        transport = transport
+
+    id = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(null=True)
+
+
+class Setting(Model):
+    class Meta:
+        table_name = 'Setting'
+        transport = transport
+
+    user_id = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(range_key=True)
+    value = NumberAttribute(default=0)
+
+
+class OtherUser(Model):
+    class Meta:
+        table_name = 'User'
+        transport = InMemoryTransport()
+
+    id = UnicodeAttribute(hash_key=True)
+
+
+@pytest.fixture(autouse=True)
+def create_tables():
+    for model in (User, Setting):
+        model.create_table(read_capacity_units=1, write_capacity_units=1)
+    yield
+    for model in (User, Setting):
+        model.delete_table()
+
+
+@pytest.fixture
+def retry_policy():
+    policy = RetryPolicy(time_module=mock.MagicMock())
+    with mock.patch.object(User.Meta, 'retry_policy', policy):
+        yield policy
+
+
+def test_multi_batch_write_and_get():
+    with mock.patch.object(transport, 'make_api_call', wraps=transport.make_api_call) as dispatch:
+        with MultiBatchWrite() as batch:
+            batch.save(User('u1', name='Ann'))
+            batch.save(User('u2'))
+            batch.save(Setting('u1', 'theme', value=1))
+            # the last operation on a key wins
+            batch.save(Setting('u1', 'theme', value=2))
+            batch.delete(User('u2'))
+    assert [c.args[0] for c in dispatch.call_args_list] == ['BatchWriteItem']
+    assert sorted(dispatch.call_args.args[1]['RequestItems']) == ['Setting', 'User']
+    assert [user.id for user in User.scan()] == ['u1']
+
+    with mock.patch.object(transport, 'make_api_call', wraps=transport.make_api_call) as dispatch:
+        with MultiBatchGet(consistent_read=True) as batch:
+            user = batch.get(User, 'u1')
+            same_user = batch.get(User, 'u1')
+            setting = batch.get(Setting, 'u1', 'theme')
+            missing = batch.get(User, 'u2')
+    assert [c.args[0] for c in dispatch.call_args_list] == ['BatchGetItem']
+    request_items = dispatch.call_args.args[1]['RequestItems']
+    assert request_items['User'] == {'Keys': [{'id': {'S': 'u1'}}, {'id': {'S': 'u2'}}], 'ConsistentRead': True}
+    assert user.get().name == 'Ann'
+    assert same_user.get().name == 'Ann'
+    assert isinstance(setting.get(), Setting)
+    assert setting.get().value == 2
+    with pytest.raises(DoesNotExist):
+        missing.get()
+
+
+def test_multi_batch__limits():
+    with mock.patch.object(transport, 'make_api_call', wraps=transport.make_api_call) as dispatch:
+        with MultiBatchWrite() as batch:
+            for i in range(20):
+                batch.save(User(str(i)))
+                batch.save(Setting(str(i), 'theme'))
+    assert [len(c.args[1]['RequestItems']['User']) + len(c.args[1]['RequestItems']['Setting'])
+            for c in dispatch.call_args_list] == [25, 15]
+
+    batch = MultiBatchWrite(auto_commit=False)
+    for i in range(25):
+        batch.delete(User(str(i)))
+    with pytest.raises(ValueError):
+        batch.delete(Setting('0', 'theme'))
+
+    with mock.patch.object(transport, 'make_api_call', wraps=transport.make_api_call) as dispatch:
+        with MultiBatchGet() as batch:
+            futures = [batch.get(User, str(i)) for i in range(60)] + [batch.get(Setting, str(i), 'theme') for i in range(60)]
+    assert dispatch.call_count == 2
+    assert sum(future._model is not None for future in futures) == 40
+
+
+def test_multi_batch_get__unprocessed_keys(retry_policy):
+    User('u1').save()
+    Setting('u1', 'theme').save()
+    responses = [
+        {'Responses': {'User': [{'id': {'S': 'u1'}}]}, 'UnprocessedKeys': {'Setting': {'Keys': [
+            {'user_id': {'S': 'u1'}, 'name': {'S': 'theme'}},
+        ]}}},
+        {'Responses': {'Setting': [{'user_id': {'S': 'u1'}, 'name': {'S': 'theme'}, 'value': {'N': '3'}}]}},
+    ]
+    with mock.patch.object(transport, 'make_api_call', side_effect=responses) as dispatch:
+        with MultiBatchGet() as batch:
+            user = batch.get(User, 'u1')
+            setting = batch.get(Setting, 'u1', 'theme')
+    assert dispatch.call_args.args[1]['RequestItems'] == responses[0]['UnprocessedKeys']
+    assert user.get().id == 'u1'
+    assert setting.get().value == 3
+    # the first response returned an item: the unprocessed keys were resent at once
+    assert retry_policy.stats().retries == 0
+
+
+def test_multi_batch_write__unprocessed_items(retry_policy):
+    unprocessed_items = {'User': [{'DeleteRequest': {'Key': {'id': {'S': 'u1'}}}}]}
+    with mock.patch.object(transport, 'make_api_call', return_value={'UnprocessedItems': unprocessed_items}):
+        batch = MultiBatchWrite()
+        batch.delete(User('u1'))
+        with pytest.raises(PutError, match='max_retry_attempts exceeded'):
+            batch.commit()
+    assert batch.failed_operations == unprocessed_items
+
+
+def test_multi_batch__connection_mismatch():
+    batch = MultiBatchGet()
+    batch.get(User, 'u1')
+    with pytest.raises(ValueError, match='connection settings differ'):
+        batch.get(OtherUser, 'u1')
@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pynamodb.cache import ItemCache
+from tests.mock_time import MockTime
+
+
+def _item(id):
+    return {'id': {'S': id}}
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ItemCache(max_size=0)
+    with pytest.raises(ValueError):
+        ItemCache(ttl_seconds=0)
+
+
+def test_lookup_and_ttl():
+    mock_time = MockTime()
+    cache = ItemCache(ttl_seconds=10, time_module=mock_time)
+
+    assert cache.lookup('a') == (False, None)
+    cache.set('a', _item('a'))
+    assert cache.lookup('a') == (True, _item('a'))
+
+    mock_time.increment_time(10)
+    assert cache.lookup('a') == (False, None)
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_negative_caching():
+    mock_time = MockTime()
+    cache = ItemCache(ttl_seconds=10, negative_ttl_seconds=1, time_module=mock_time)
+
+    cache.set('a', None)
+    assert cache.lookup('a') == (True, None)
+    mock_time.increment_time(1)
+    assert cache.lookup('a') == (False, None)
+
+    cache = ItemCache(negative_ttl_seconds=0)
+    cache.set('a', None)
+    assert cache.lookup('a') == (False, None)
+
+
+def test_lru_eviction():
+    cache = ItemCache(max_size=2)
+    cache.set('a', _item('a'))
+    cache.set('b', _item('b'))
+    cache.lookup('a')
+    cache.set('c', _item('c'))
+
+    assert cache.lookup('b') == (False, None)
+    assert cache.lookup('a') == (True, _item('a'))
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_get_or_load():
+    cache = ItemCache()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return _item('a')
+
+    assert cache.get_or_load('a', load) == _item('a')
+    assert cache.get_or_load('a', load) == _item('a')
+    assert len(loads) == 1
+
+    cache.invalidate('a')
+    assert cache.get_or_load('a', load) == _item('a')
+    assert len(loads) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_get_or_load_stampede():
+    cache = ItemCache()
+    release = threading.Event()
+    loads = []
+
+    def load():
+        loads.append(1)
+        release.wait()
+        return _item('a')
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.get_or_load, 'a', load) for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        assert [future.result() for future in futures] == [_item('a')] * 4
+
+    assert len(loads) == 1
+
+
+def test_get_or_load_error():
+    cache = ItemCache()
+
+    def load():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        cache.get_or_load('a', load)
+    assert cache.lookup('a') == (False, None)
+
+
+def test_invalidate_during_load():
+    cache = ItemCache()
+
+    def load():
+        cache.invalidate('a')
+        return _item('stale')
+
+    assert cache.get_or_load('a', load) == _item('stale')
+    assert cache.lookup('a') == (False, None)
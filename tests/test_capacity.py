@@ -0,0 +1,221 @@
+import logging
+import threading
+from unittest import mock
+
+import pytest
+
+from pynamodb import capacity
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.capacity import CapacityMeter, CapacityReporter, CapacityUsage, capacity_tag
+from pynamodb.connection import Connection
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.hooks import request_hooks
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex, LocalSecondaryIndex
+from pynamodb.models import Model
+from tests.mock_time import MockTime
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+
+
+class AuthorIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'author_index'
+        projection = AllProjection()
+
+    author = UnicodeAttribute(hash_key=True)
+
+
+class ViewsIndex(LocalSecondaryIndex):
+    class Meta:
+        index_name = 'views_index'
+        projection = AllProjection()
+
+    forum = UnicodeAttribute(hash_key=True)
+    views = NumberAttribute(range_key=True)
+
+
+class Thread(Model):
+    class Meta:
+        table_name = 'Thread'
+        transport = InMemoryTransport()
+
+    forum = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    author = UnicodeAttribute()
+    views = NumberAttribute(default=0)
+    author_index = AuthorIndex()
+    views_index = ViewsIndex()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def create_table():
+    Thread.create_table(read_capacity_units=1, write_capacity_units=1)
+    Thread('forum', 'first', author='alice').save()
+    Thread('forum', 'second', author='bob').save()
+
+
+def _usage(table_name, index_name, operation, tag, read, write, requests, seconds):
+    return CapacityUsage(table_name, index_name, operation, tag, read, write, requests, seconds)
+
+
+def test_meter():
+    mock_time = MockTime(1000.0)
+    with CapacityMeter(time_module=mock_time) as meter:
+        assert capacity.meter is meter
+        mock_time.increment_time(10)
+        Thread('forum', 'third', author='carol').save()
+        Thread.get('forum', 'first')
+        Thread.get('forum', 'first', consistent_read=True)
+        list(Thread.author_index.query('alice'))
+        list(Thread.views_index.query('forum', consistent_read=True))
+    assert capacity.meter is None
+    assert not request_hooks
+
+    assert meter.usage() == [
+        _usage('Thread', None, 'GetItem', None, 1.5, 0.0, 2, 10),
+        _usage('Thread', None, 'PutItem', None, 0.0, 1.0, 1, 10),
+        _usage('Thread', 'author_index', 'Query', None, 0.5, 0.0, 1, 10),
+        _usage('Thread', 'views_index', 'Query', None, 1.0, 0.0, 1, 10),
+    ]
+    assert meter.usage(group_by=('table_name',)) == [
+        _usage('Thread', None, None, None, 3.0, 1.0, 5, 10),
+    ]
+    assert meter.usage()[0].read_capacity_units_per_second == 0.15
+
+    # not metered once disabled
+    Thread.get('forum', 'first')
+    assert meter.usage(group_by=())[0].requests == 5
+
+
+def test_meter__invalid_arguments():
+    with pytest.raises(ValueError):
+        CapacityMeter(resolution_seconds=0)
+    with pytest.raises(ValueError):
+        CapacityMeter(window_seconds=1, resolution_seconds=10)
+    with pytest.raises(ValueError):
+        CapacityMeter().usage(group_by=('table',))
+
+
+def test_meter__tags():
+    with CapacityMeter() as meter:
+        with capacity_tag('checkout'):
+            Thread.get('forum', 'first')
+            with capacity_tag('inventory'):
+                Thread.get('forum', 'first')
+            # propagated to the thread prefetching pages
+            list(Thread.query('forum', page_size=1, prefetch=1))
+        Thread.get('forum', 'first')
+
+    assert [(usage.operation, usage.tag, usage.requests) for usage in meter.usage(group_by=('operation', 'tag'))] == [
+        ('GetItem', None, 1),
+        ('GetItem', 'checkout', 1),
+        ('GetItem', 'inventory', 1),
+        ('Query', 'checkout', 3),
+    ]
+
+
+def test_meter__window():
+    mock_time = MockTime(1000.0)
+    meter = CapacityMeter(window_seconds=60, resolution_seconds=10, time_module=mock_time)
+    meter.record('Thread', None, 'GetItem', 1, 0)
+    mock_time.increment_time(30)
+    meter.record('Thread', None, 'GetItem', 2, 0)
+    mock_time.increment_time(30)
+    meter.record('Thread', None, 'PutItem', 0, 4)
+
+    assert [usage.read_capacity_units for usage in meter.usage(group_by=())] == [2]
+    assert meter.usage(group_by=())[0].write_capacity_units == 4
+    assert meter.usage(group_by=())[0].seconds == 60
+    assert meter.usage(window_seconds=20, group_by=())[0].read_capacity_units == 0
+    mock_time.increment_time(30)
+    assert meter.usage(group_by=()) == [_usage(None, None, None, None, 0, 4, 1, 60)]
+    mock_time.increment_time(30)
+    assert meter.usage() == []
+    # expired buckets are dropped on the next record
+    meter.record('Thread', None, 'GetItem', 1, 0)
+    assert len(meter._buckets) == 1
+
+    meter.reset()
+    assert meter.usage() == []
+
+
+@mock.patch(PATCH_METHOD)
+def test_meter__indexes_mode(mock_req):
+    mock_req.return_value = {'ConsumedCapacity': {
+        'TableName': 'Thread',
+        'CapacityUnits': 4.0,
+        'Table': {'CapacityUnits': 2.0},
+        'GlobalSecondaryIndexes': {'author_index': {'CapacityUnits': 1.0}},
+        'LocalSecondaryIndexes': {'views_index': {'CapacityUnits': 1.0}},
+    }}
+    connection = Connection()
+    with CapacityMeter() as meter:
+        connection.dispatch('PutItem', {'TableName': 'Thread', 'Item': {}})
+        connection.dispatch('PutItem', {'TableName': 'Thread', 'Item': {}, 'ReturnConsumedCapacity': 'TOTAL'})
+        connection.dispatch('PutItem', {'TableName': 'Thread', 'Item': {}, 'ReturnConsumedCapacity': 'NONE'})
+    assert [call[0][1]['ReturnConsumedCapacity'] for call in mock_req.call_args_list] == ['INDEXES', 'INDEXES', 'NONE']
+    assert [
+        (usage.index_name, usage.write_capacity_units) for usage in meter.usage(group_by=('index_name',))
+    ] == [(None, 6.0), ('author_index', 3.0), ('views_index', 3.0)]
+
+    connection.dispatch('PutItem', {'TableName': 'Thread', 'Item': {}})
+    assert mock_req.call_args[0][1]['ReturnConsumedCapacity'] == 'TOTAL'
+
+
+@mock.patch(PATCH_METHOD)
+def test_meter__batch_and_transactions(mock_req):
+    connection = Connection()
+    with CapacityMeter() as meter:
+        mock_req.return_value = {'Responses': [], 'ConsumedCapacity': [
+            {'TableName': 'First', 'CapacityUnits': 2.0, 'Table': {'CapacityUnits': 2.0}},
+            {'TableName': 'Second', 'CapacityUnits': 4.0, 'WriteCapacityUnits': 4.0},
+        ]}
+        connection.transact_write_items([], [], [], [])
+        mock_req.return_value = {'Responses': {}, 'ConsumedCapacity': [{'TableName': 'First', 'CapacityUnits': 0.5}]}
+        connection.batch_get_item('First', [])
+    assert meter.usage(group_by=('table_name', 'operation')) == [
+        _usage('First', None, 'BatchGetItem', None, 0.5, 0.0, 1, mock.ANY),
+        _usage('First', None, 'TransactWriteItems', None, 0.0, 2.0, 1, mock.ANY),
+        _usage('Second', None, 'TransactWriteItems', None, 0.0, 4.0, 1, mock.ANY),
+    ]
+
+
+def test_reporter():
+    mock_time = MockTime(1000.0)
+    meter = CapacityMeter(time_module=mock_time)
+    meter.record('Thread', None, 'GetItem', 1, 0, tag='checkout')
+    reports = []
+    reported = threading.Event()
+
+    def callback(usages):
+        reports.append(usages)
+        reported.set()
+
+    with pytest.raises(ValueError):
+        CapacityReporter(meter, interval_seconds=0)
+
+    reporter = CapacityReporter(meter, interval_seconds=0.01, callback=callback, group_by=('tag',))
+    with reporter:
+        assert reported.wait(5)
+        with pytest.raises(RuntimeError):
+            reporter.start()
+    count = len(reports)
+    assert reports[0] == [_usage(None, None, None, 'checkout', 1, 0, 1, 0)]
+    reporter.stop()
+    assert len(reports) == count
+
+
+def test_reporter__logs(caplog):
+    meter = CapacityMeter()
+    meter.record('Thread', 'author_index', 'Query', 1, 0)
+    with caplog.at_level(logging.INFO, logger='pynamodb.capacity'):
+        CapacityReporter(meter).report()
+    assert caplog.messages[0].startswith('table=Thread index=author_index operation=Query tag=None read_capacity_units=1.0')
+
+
+def test_reporter__callback_errors_are_logged(caplog):
+    def fail(usages):
+        raise ValueError()
+
+    CapacityReporter(CapacityMeter(), callback=fail).report()
+    assert caplog.messages == ['Capacity report failed.']
@@ -0,0 +1,227 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+
+from pynamodb.connection import Connection, TableConnection
+from pynamodb.connection.registry import ClientRegistry, client_registry
+from pynamodb.models import Model
+from pynamodb.attributes import UnicodeAttribute
+
+
+def test_connections_with_same_settings_share_client():
+    conn1 = Connection(region='us-east-1', host='http://localhost:8000')
+    conn2 = TableConnection('Thread', region='us-east-1', host='http://localhost:8000').connection
+    assert conn1.client_key == conn2.client_key
+    assert conn1.client is conn2.client
+    assert len(client_registry) == 1
+
+
+def test_connections_with_different_settings_do_not_share_client():
+    base = dict(region='us-east-1', host='http://localhost:8000')
+    client = Connection(**base).client
+    assert Connection(region='us-west-2', host='http://localhost:8000').client is not client
+    assert Connection(region='us-east-1').client is not client
+    assert Connection(**base, read_timeout_seconds=1).client is not client
+    assert Connection(**base, max_pool_connections=1).client is not client
+    assert Connection(**base, max_retry_attempts=1).client is not client
+    assert Connection(**base, aws_access_key_id='a', aws_secret_access_key='b').client is not client
+    assert Connection(**base, extra_headers={'foo': 'bar'}).client is not client
+    assert Connection(**base).client is client
+    assert len(client_registry) == 8
+
+
+def test_models_share_client():
+    class First(Model):
+        class Meta:
+            table_name = 'First'
+            host = 'http://localhost:8000'
+        id = UnicodeAttribute(hash_key=True)
+
+    class Second(Model):
+        class Meta:
+            table_name = 'Second'
+            host = 'http://localhost:8000'
+        id = UnicodeAttribute(hash_key=True)
+
+    assert First._get_connection().connection.client is Second._get_connection().connection.client
+
+
+def test_threads_share_session_and_client():
+    conn = Connection(region='us-east-1', host='http://localhost:8000')
+    barrier = threading.Barrier(8)
+
+    def get_session_and_client():
+        barrier.wait()
+        return conn.session, conn.client
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: get_session_and_client(), range(8)))
+
+    assert len({id(session) for session, _ in results}) == 1
+    assert len({id(client) for _, client in results}) == 1
+    assert Connection(region='us-west-2').session is conn.session
+
+
+def test_client_is_created_once_under_contention():
+    registry = ClientRegistry()
+    key = Connection().client_key
+    barrier = threading.Barrier(8)
+    created = []
+
+    def create_client():
+        created.append(mock.Mock())
+        return created[-1]
+
+    def get_client():
+        barrier.wait()
+        return registry.get_client(key, create_client)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: get_client(), range(8)))
+
+    assert len(created) == 1
+    assert all(client is created[0] for client in clients)
+
+
+def test_sessions_are_keyed_by_credentials():
+    registry = ClientRegistry()
+    session = registry.get_session('access_key_id', 'secret_access_key')
+    assert registry.get_session('access_key_id', 'secret_access_key') is session
+    assert registry.get_session('access_key_id', 'secret_access_key', 'session_token') is not session
+    assert registry.get_session() is not session
+    assert session.get_credentials().access_key == 'access_key_id'
+
+
+def test_client_without_credentials_is_replaced():
+    registry = ClientRegistry()
+    key = Connection().client_key
+    without_credentials = mock.Mock()
+    without_credentials._request_signer._credentials = None
+    with_credentials = mock.Mock()
+    create_client = mock.Mock(side_effect=[without_credentials, with_credentials])
+
+    assert registry.get_client(key, create_client) is without_credentials
+    assert registry.get_client(key, create_client) is with_credentials
+    assert registry.get_client(key, create_client) is with_credentials
+    assert create_client.call_count == 2
+
+
+def test_clear():
+    client = Connection().client
+    client_registry.clear()
+    assert len(client_registry) == 0
+    assert Connection().client is not client
+
+
+class _ListTablesHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = b'{"TableNames": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ListTablesHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}'.format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_stats(server):
+    conn = Connection(host=server, max_pool_connections=5, max_retry_attempts=0)
+    assert conn.client
+    assert client_registry.pool_stats() == []
+
+    conn.list_tables()
+    conn.list_tables()
+
+    stats, = client_registry.pool_stats()
+    assert stats.key == conn.client_key
+    assert stats.host == '127.0.0.1'
+    assert stats.max_size == 5
+    assert stats.in_use == 0
+    assert stats.idle == 1
+    assert stats.num_connections == 1
+    assert stats.num_requests == 2
+
+
+def test_warm(server):
+    conn = Connection(host=server, max_pool_connections=5)
+    conn.warm()
+    assert conn.client_key in client_registry
+    assert client_registry.pool_stats() == []
+
+    conn.warm(pool_size=3)
+    stats, = client_registry.pool_stats()
+    assert stats.idle == 3
+    assert stats.num_connections == 3
+    assert stats.num_requests == 0
+
+    conn.list_tables()
+    stats, = client_registry.pool_stats()
+    assert stats.idle == 3
+    assert stats.num_connections == 3
+
+
+def test_warm__pool_size_is_capped(server):
+    conn = Connection(host=server, max_pool_connections=2)
+    conn.warm(pool_size=10)
+    stats, = client_registry.pool_stats()
+    assert stats.idle == 2
+
+
+def test_model_warm_connection(server):
+    class Thread(Model):
+        class Meta:
+            table_name = 'Thread'
+            host = server
+        id = UnicodeAttribute(hash_key=True)
+
+    Thread.warm_connection(pool_size=1)
+    stats, = client_registry.pool_stats()
+    assert stats.key == Thread._get_connection().connection.client_key
+    assert stats.idle == 1
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_clients_are_discarded_after_fork(server):
+    conn = Connection(host=server)
+    conn.warm(pool_size=1)
+    client, session = conn.client, conn.session
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        try:
+            result = (
+                len(client_registry) == 0
+                and conn.client is not client
+                and conn.session is not session
+                and client_registry.pool_stats() == []
+            )
+            os.write(write_fd, b'1' if result else b'0')
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b'1'
+    os.close(read_fd)
+
+    assert conn.client is client
+    assert client_registry.pool_stats()[0].idle == 1
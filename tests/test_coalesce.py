@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+from pynamodb._coalesce import GetCoalescer
+from pynamodb.retries import RetryPolicy
+from tests.mock_time import MockTime
+
+
+class FakeTable:
+    def __init__(self, items, unprocessed_first=False):
+        self.items = items
+        self.calls = []
+        self.unprocessed_first = unprocessed_first
+        self.release = threading.Event()
+        self.release.set()
+
+    def batch_get_page(self, keys, consistent_read, attributes_to_get):
+        self.release.wait()
+        self.calls.append((list(keys), consistent_read))
+        unprocessed = None
+        if self.unprocessed_first and len(self.calls) == 1:
+            keys, unprocessed = keys[:1], keys[1:]
+        found = [self.items[str(Decimal(key['id']).normalize())] for key in keys]
+        return [item for item in found if item is not None], unprocessed
+
+
+def _item(id):
+    return {'id': {'N': id}, 'name': {'S': 'name-{}'.format(id)}}
+
+
+def _get_all(coalescer, ids, consistent_read=False):
+    with ThreadPoolExecutor(max_workers=len(ids)) as executor:
+        return list(executor.map(lambda id: coalescer.get({'id': id}, consistent_read=consistent_read), ids))
+
+
+def test_coalesces_concurrent_gets():
+    table = FakeTable({'1': _item('1'), '2': _item('2'), '3': None})
+    coalescer = GetCoalescer('table', table.batch_get_page, [('id', 'N')], window_seconds=10, max_keys=3)
+
+    results = _get_all(coalescer, ['1', '2', '3'])
+
+    assert results == [_item('1'), _item('2'), None]
+    assert len(table.calls) == 1
+    assert sorted(key['id'] for key in table.calls[0][0]) == ['1', '2', '3']
+
+
+def test_window_flushes_partial_batch():
+    table = FakeTable({'1': _item('1')})
+    coalescer = GetCoalescer('table', table.batch_get_page, [('id', 'N')], window_seconds=0.01)
+
+    assert coalescer.get({'id': '1'}) == _item('1')
+    assert coalescer.get({'id': '1.0'}) == _item('1')  # numbers are matched by value
+    assert len(table.calls) == 2
+
+
+def test_deduplicates_in_flight_keys():
+    table = FakeTable({'1': _item('1'), '2': _item('2')})
+    table.release.clear()
+    coalescer = GetCoalescer('table', table.batch_get_page, [('id', 'N')], window_seconds=10, max_keys=2)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(coalescer.get, {'id': id}) for id in ['1', '2', '1']]
+        time.sleep(0.1)
+        table.release.set()
+        results = [future.result() for future in futures]
+
+    assert results == [_item('1'), _item('2'), _item('1')]
+    assert len(table.calls) == 1
+    assert len(table.calls[0][0]) == 2
+
+
+def test_separates_consistent_reads():
+    table = FakeTable({'1': _item('1')})
+    coalescer = GetCoalescer('table', table.batch_get_page, [('id', 'N')], window_seconds=0.01)
+
+    assert coalescer.get({'id': '1'}, consistent_read=True) == _item('1')
+    assert table.calls[0][1] is True
+
+
+def test_retries_unprocessed_keys():
+    table = FakeTable({'1': _item('1'), '2': _item('2')}, unprocessed_first=True)
+    coalescer = GetCoalescer('table', table.batch_get_page, [('id', 'N')], window_seconds=10, max_keys=2)
+
+    assert sorted(_get_all(coalescer, ['1', '2']), key=lambda item: item['id']['N']) == [_item('1'), _item('2')]
+    assert len(table.calls) == 2
+
+
+def test_unprocessed_keys_are_retried_with_backoff():
+    time_module = MockTime()
+    retry_policy = RetryPolicy(time_module=time_module)
+    # the first page returns nothing: its unprocessed keys are resent after a backoff
+    table = FakeTable({'1': None, '2': _item('2')}, unprocessed_first=True)
+    coalescer = GetCoalescer(
+        'table', table.batch_get_page, [('id', 'N')], window_seconds=10, max_keys=2, retry_policy=retry_policy,
+    )
+
+    assert _get_all(coalescer, ['1', '2']) == [None, _item('2')]
+    assert len(time_module.slept) == 1
+    assert retry_policy.stats().retries == 1
+
+    # a page that returns items is followed at once
+    time_module.slept.clear()
+    table = FakeTable({'1': _item('1'), '2': _item('2')}, unprocessed_first=True)
+    coalescer = GetCoalescer(
+        'table', table.batch_get_page, [('id', 'N')], window_seconds=10, max_keys=2, retry_policy=retry_policy,
+    )
+    assert _get_all(coalescer, ['1', '2']) == [_item('1'), _item('2')]
+    assert len(table.calls) == 2
+    assert time_module.slept == []
+
+
+def test_error_is_raised_to_all_callers():
+    def batch_get_page(keys, consistent_read, attributes_to_get):
+        raise ValueError('boom')
+
+    coalescer = GetCoalescer('table', batch_get_page, [('id', 'N')], window_seconds=10, max_keys=2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(coalescer.get, {'id': id}) for id in ['1', '2']]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        GetCoalescer('table', lambda *a, **kw: ([], None), [('id', 'N')], window_seconds=-1)
+    with pytest.raises(ValueError):
+        GetCoalescer('table', lambda *a, **kw: ([], None), [('id', 'N')], window_seconds=1, max_keys=101)
@@ -5,7 +5,8 @@ from unittest import TestCase
 from pynamodb.attributes import ListAttribute, MapAttribute, NumberSetAttribute, UnicodeAttribute, UnicodeSetAttribute, \
     NumberAttribute
 from pynamodb.expressions.condition import Condition, size
-from pynamodb.expressions.operand import Path, Value
+from pynamodb.expressions.operand import Param, Path, Value
+from pynamodb.expressions.prepared import PreparedCondition, PreparedUpdate
 from pynamodb.expressions.projection import create_projection_expression
 from pynamodb.expressions.update import Action, Update
 
@@ -649,3 +650,54 @@ class UpdateExpressionTestCase(TestCase):
         assert expression is None
         assert self.placeholder_names == {}
         assert self.expression_attribute_values == {}
+
+
+class PreparedExpressionTestCase(TestCase):
+
+    def setUp(self):
+        self.attribute = UnicodeAttribute(attr_name='foo')
+        self.number_attribute = NumberAttribute(attr_name='bar')
+        self.set_attribute = UnicodeSetAttribute(attr_name='baz')
+        self.placeholder_names: Dict[str, str] = {}
+        self.expression_attribute_values: Dict[str, str] = {}
+
+    def test_param_serialized_by_attribute(self):
+        condition = PreparedCondition((self.number_attribute > Param('min')) & self.set_attribute.contains(Param('tag')))
+        bound = condition.bind(min=3, tag='a')
+        expression = bound.serialize(self.placeholder_names, self.expression_attribute_values)
+        assert expression == "(#0 > :0 AND contains (#1, :1))"
+        assert self.placeholder_names == {'bar': '#0', 'baz': '#1'}
+        assert self.expression_attribute_values == {':0': {'N': '3'}, ':1': {'S': 'a'}}
+
+    def test_bound_condition_is_renumbered(self):
+        condition = PreparedCondition(self.attribute.startswith(Param('prefix')) | (self.number_attribute == 1))
+        self.placeholder_names['bar'] = '#0'
+        self.expression_attribute_values[':0'] = {'N': '0'}
+        expression = condition.bind(prefix='x').serialize(self.placeholder_names, self.expression_attribute_values)
+        assert expression == "(begins_with (#1, :1) OR #0 = :2)"
+        assert self.placeholder_names == {'bar': '#0', 'foo': '#1'}
+        assert self.expression_attribute_values == {':0': {'N': '0'}, ':1': {'S': 'x'}, ':2': {'N': '1'}}
+
+    def test_bound_condition_combined(self):
+        condition = PreparedCondition(self.attribute == Param('foo')).bind(foo='a') & (self.number_attribute < 2)
+        assert isinstance(condition, Condition)
+        expression = condition.serialize(self.placeholder_names, self.expression_attribute_values)
+        assert expression == "(#0 = :0 AND #1 < :1)"
+        assert self.expression_attribute_values == {':0': {'S': 'a'}, ':1': {'N': '2'}}
+
+    def test_missing_param(self):
+        condition = PreparedCondition(self.attribute == Param('foo'))
+        with self.assertRaises(ValueError):
+            condition.bind(bar='a').serialize(self.placeholder_names, self.expression_attribute_values)
+
+    def test_prepared_update(self):
+        update = PreparedUpdate(
+            self.attribute.set(Param('foo')),
+            self.number_attribute.add(Param('bar')),
+            self.set_attribute.remove(),
+        )
+        actions = update.bind(foo='a', bar=2) + [Path('qux').set(Path('qux') + 1)]
+        expression = Update(*actions).serialize(self.placeholder_names, self.expression_attribute_values)
+        assert expression == "SET #0 = :0, #1 = #1 + :1 REMOVE #2 ADD #3 :2"
+        assert self.placeholder_names == {'foo': '#0', 'qux': '#1', 'baz': '#2', 'bar': '#3'}
+        assert self.expression_attribute_values == {':0': {'S': 'a'}, ':1': {'N': '1'}, ':2': {'N': '2'}}
@@ -0,0 +1,183 @@
+import json
+from unittest import mock
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.connection import Connection
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.exceptions import VerboseClientError
+from pynamodb.hooks import PHASES, RequestContext, request_hooks
+from pynamodb.models import Model
+from pynamodb.signals import post_dynamodb_send, pre_dynamodb_send
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+
+
+@pytest.fixture
+def recorded():
+    before = []
+    after = []
+
+    def record_before(context):
+        before.append((context, context.response))
+
+    request_hooks.register(before=record_before, after=after.append)
+    yield before, after
+    request_hooks.unregister(before=record_before, after=after.append)
+
+
+def _response(status_code, body):
+    response = AWSResponse(url='', status_code=status_code, headers={}, raw='')
+    response._content = json.dumps(body).encode('utf-8')
+    return response
+
+
+@mock.patch(PATCH_METHOD)
+@mock.patch('pynamodb.connection.base.uuid')
+def test_no_hooks(mock_uuid, mock_req):
+    assert not request_hooks
+    mock_req.return_value = {}
+    Connection().dispatch('GetItem', {'TableName': 'MyTable', 'Key': {}})
+    mock_uuid.uuid4.assert_not_called()
+
+
+@mock.patch(PATCH_METHOD)
+def test_hooks(mock_req, recorded):
+    before, after = recorded
+    mock_req.return_value = {'Items': [], 'ConsumedCapacity': {'TableName': 'MyTable', 'CapacityUnits': 0.5}}
+    Connection().dispatch('Query', {'TableName': 'MyTable', 'IndexName': 'MyIndex'})
+
+    (context, response), = before
+    assert response is None
+    assert after == [context]
+    assert context.operation == 'Query'
+    assert context.table_name == 'MyTable'
+    assert context.table_names == ['MyTable']
+    assert context.index_name == 'MyIndex'
+    assert context.req_uuid is not None
+    assert context.response == mock_req.return_value
+    assert context.error is None
+    assert context.consumed_capacity == {'TableName': 'MyTable', 'CapacityUnits': 0.5}
+    assert context.retries == 0
+    # the request was not sent by botocore
+    assert context.request_size is None
+    assert list(context.timings) == ['send']
+    assert context.duration == context.timings['send']
+
+
+@mock.patch(PATCH_METHOD)
+def test_hooks__error(mock_req, recorded):
+    _, after = recorded
+    post_recorded = []
+
+    def record_post_dynamodb_send(sender, operation_name, table_name, req_uuid):
+        post_recorded.append(operation_name)
+
+    error = ValueError()
+    mock_req.side_effect = error
+    post_dynamodb_send.connect(record_post_dynamodb_send)
+    try:
+        with pytest.raises(ValueError):
+            Connection().dispatch('GetItem', {'TableName': 'MyTable', 'Key': {}})
+    finally:
+        post_dynamodb_send.disconnect(record_post_dynamodb_send)
+
+    context, = after
+    assert context.error is error
+    assert context.response is None
+    assert post_recorded == []
+
+
+@mock.patch(PATCH_METHOD)
+def test_hooks__signals_share_req_uuid(mock_req, recorded):
+    _, after = recorded
+    pre_recorded = []
+
+    def record_pre_dynamodb_send(sender, operation_name, table_name, req_uuid):
+        pre_recorded.append(req_uuid)
+
+    mock_req.return_value = {}
+    pre_dynamodb_send.connect(record_pre_dynamodb_send)
+    try:
+        Connection().dispatch('GetItem', {'TableName': 'MyTable', 'Key': {}})
+    finally:
+        pre_dynamodb_send.disconnect(record_pre_dynamodb_send)
+
+    assert pre_recorded == [after[0].req_uuid]
+
+
+@mock.patch(PATCH_METHOD)
+def test_hooks__exceptions_are_ignored(mock_req):
+    def fail(context):
+        raise ValueError()
+
+    mock_req.return_value = {}
+    request_hooks.register(before=fail, after=fail)
+    try:
+        assert Connection().dispatch('GetItem', {'TableName': 'MyTable', 'Key': {}}) == {}
+    finally:
+        request_hooks.unregister(before=fail, after=fail)
+    assert not request_hooks
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_hooks__botocore(send_mock, recorded):
+    _, after = recorded
+    body = {'Item': {'id': {'S': 'foo'}}}
+    send_mock.side_effect = [_response(500, {}), _response(200, body)]
+
+    Connection(max_retry_attempts=1).dispatch('GetItem', {'TableName': 'MyTable', 'Key': {'id': {'S': 'foo'}}})
+
+    context, = after
+    assert context.retries == 1
+    assert context.request_size == len(send_mock.call_args[0][0].body)
+    assert context.response_size == len(json.dumps(body))
+    assert list(context.timings) == list(PHASES)
+    assert context.duration == pytest.approx(sum(context.timings.values()))
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_hooks__botocore_error(send_mock, recorded):
+    _, after = recorded
+    send_mock.return_value = _response(400, {'__type': 'ValidationException', 'message': 'nope'})
+
+    with pytest.raises(VerboseClientError):
+        Connection(max_retry_attempts=0).dispatch('GetItem', {'TableName': 'MyTable', 'Key': {'id': {'S': 'foo'}}})
+
+    context, = after
+    assert context.retries == 0
+    assert context.error is not None
+    assert context.response_size is not None
+
+
+def test_table_names():
+    context = RequestContext(None, 'TransactWriteItems', {'TransactItems': [
+        {'Put': {'TableName': 'First'}},
+        {'Update': {'TableName': 'Second'}},
+        {'Delete': {'TableName': 'First'}},
+    ]})
+    assert context.table_name is None
+    assert context.table_names == ['First', 'Second']
+
+    context = RequestContext(None, 'BatchGetItem', {'RequestItems': {'First': {}, 'Second': {}}})
+    assert context.table_names == ['First', 'Second']
+
+
+def test_hooks__model(recorded):
+    class Counter(Model):
+        class Meta:
+            table_name = 'Counter'
+            transport = InMemoryTransport()
+        name = UnicodeAttribute(hash_key=True)
+        value = NumberAttribute(default=0)
+
+    Counter.create_table(read_capacity_units=1, write_capacity_units=1)
+    _, after = recorded
+    del after[:]
+    Counter('foo').save()
+
+    context, = after
+    assert context.operation == 'PutItem'
+    assert context.consumed_capacity == {'TableName': 'Counter', 'CapacityUnits': 1.0}
@@ -0,0 +1,642 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+
+from pynamodb.attributes import (
+    ListAttribute, MapAttribute, NumberAttribute, NumberSetAttribute, UnicodeAttribute, UnicodeSetAttribute,
+    UTCDateTimeAttribute, VersionAttribute,
+)
+from pynamodb.connection import Connection
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.expressions.condition import size
+from pynamodb.expressions.operand import Param
+from pynamodb.expressions.prepared import PreparedCondition, PreparedUpdate
+from pynamodb.exceptions import (
+    DeleteError, DoesNotExist, PutError, QueryError, TransactWriteError, UpdateError,
+)
+from pynamodb.indexes import GlobalSecondaryIndex, IncludeProjection, KeysOnlyProjection, LocalSecondaryIndex
+from pynamodb.models import Model, ParallelBatchWrite
+from pynamodb.pagination import RateLimiter
+from pynamodb.transactions import TransactGet, TransactWrite
+
+transport = InMemoryTransport()
+
+
+class AuthorIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = 'author_index'
+        projection = IncludeProjection(['views'])
+
+    author = UnicodeAttribute(hash_key=True)
+    created_at = UTCDateTimeAttribute(range_key=True)
+
+
+class ViewsIndex(LocalSecondaryIndex):
+    class Meta:
+        index_name = 'views_index'
+        projection = KeysOnlyProjection()
+
+    forum = UnicodeAttribute(hash_key=True)
+    views = NumberAttribute(range_key=True)
+
+
+class Location(MapAttribute):
+    city = UnicodeAttribute()
+    zip_code = NumberAttribute(null=True)
+
+
+class Thread(Model):
+    class Meta:
+        table_name = 'Thread'
+        transport = transport
+
+    forum = UnicodeAttribute(hash_key=True)
+    subject = UnicodeAttribute(range_key=True)
+    author = UnicodeAttribute(null=True)
+    created_at = UTCDateTimeAttribute(null=True)
+    views = NumberAttribute(default=0)
+    tags = UnicodeSetAttribute(null=True)
+    scores = NumberSetAttribute(null=True)
+    replies = ListAttribute(of=UnicodeAttribute, null=True)
+    location = Location(null=True)
+    version = VersionAttribute()
+    author_index = AuthorIndex()
+    views_index = ViewsIndex()
+
+
+class Counter(Model):
+    class Meta:
+        table_name = 'Counter'
+        transport = transport
+
+    name = UnicodeAttribute(hash_key=True)
+    value = NumberAttribute(default=0)
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    transport.clear()
+    Thread.create_table(read_capacity_units=1, write_capacity_units=1)
+    Counter.create_table(billing_mode='PAY_PER_REQUEST')
+    yield
+
+
+def _created_at(day):
+    return datetime(2024, 1, day, tzinfo=timezone.utc)
+
+
+def _save_threads(forum='f', count=10):
+    for i in range(count):
+        Thread(forum, 'subject-{:02d}'.format(i), author='author-{}'.format(i % 2), created_at=_created_at(i + 1),
+               views=i * 10).save()
+
+
+def test_table_operations():
+    assert Thread.exists()
+    assert Thread.describe_table()['TableStatus'] == 'ACTIVE'
+    assert sorted(transport.make_api_call('ListTables', {})['TableNames']) == ['Counter', 'Thread']
+    page = transport.make_api_call('ListTables', {'Limit': 1})
+    assert page == {'TableNames': ['Counter'], 'LastEvaluatedTableName': 'Counter'}
+    assert transport.make_api_call('ListTables', {'ExclusiveStartTableName': 'Counter'}) == {'TableNames': ['Thread']}
+
+    Counter.delete_table()
+    assert not Counter.exists()
+    assert repr(Connection(transport=transport)) == 'Connection<InMemoryTransport()>'
+
+
+def test_put_get_delete():
+    created_at = _created_at(1)
+    thread = Thread('f', 's', author='a', created_at=created_at, tags={'x', 'y'}, scores={1, 2.5},
+                    replies=['r1'], location=Location(city='Paris'))
+    thread.save()
+    assert thread.version == 1
+
+    loaded = Thread.get('f', 's')
+    assert loaded.author == 'a'
+    assert loaded.created_at == created_at
+    assert loaded.tags == {'x', 'y'}
+    assert loaded.scores == {1, 2.5}
+    assert loaded.replies == ['r1']
+    assert loaded.location.city == 'Paris'
+    assert loaded.version == 1
+
+    partial = Thread.get('f', 's', attributes_to_get=['author', 'location'])
+    assert partial.author == 'a'
+    assert partial.location.city == 'Paris'
+    assert partial.tags is None
+
+    # returned items are copies
+    raw = Thread._get_connection().get_item('f', 's')['Item']
+    raw['author']['S'] = 'changed'
+    assert Thread.get('f', 's').author == 'a'
+
+    loaded.delete()
+    with pytest.raises(DoesNotExist):
+        Thread.get('f', 's')
+
+
+def test_conditions():
+    thread = Thread('f', 's', views=5)
+    thread.save()
+
+    with pytest.raises(PutError) as exc_info:
+        Thread('f', 's').save(condition=Thread.forum.does_not_exist(), add_version_condition=False)
+    assert exc_info.value.cause_response_code == 'ConditionalCheckFailedException'
+
+    # the version attribute protects against concurrent writes
+    stale = Thread.get('f', 's')
+    thread.save()
+    with pytest.raises(PutError):
+        stale.save()
+
+    thread.save(condition=(Thread.views > 4) & (Thread.views.between(0, 10)) & Thread.author.does_not_exist())
+    thread.save(condition=Thread.views.is_in(1, 5) | Thread.views.is_in(2))
+    thread.save(condition=Thread.subject.startswith('s') & (size(Thread.subject) == 1) & ~(Thread.views == 4))
+    with pytest.raises(PutError):
+        thread.save(condition=Thread.views < 5)
+    with pytest.raises(PutError):
+        thread.save(condition=Thread.author != 'a')
+    with pytest.raises(DeleteError):
+        thread.delete(condition=Thread.author.exists())
+    thread.delete(condition=Thread.views.is_type() & Thread.views.exists())
+
+
+def test_update():
+    thread = Thread('f', 's', views=1, tags={'a', 'b'}, replies=['r0', 'r1', 'r2', 'r3'],
+                    location=Location(city='Paris'))
+    thread.save()
+
+    thread.update(actions=[
+        Thread.views.set(Thread.views + 2),
+        Thread.author.set(Thread.author | 'default'),
+        Thread.replies.set(Thread.replies.append(['r4'])),
+        Thread.location.zip_code.set(75001),
+        Thread.tags.add({'c'}),
+        Thread.scores.add({1}),
+    ])
+    assert thread.views == 3
+    assert thread.author == 'default'
+    assert thread.replies == ['r0', 'r1', 'r2', 'r3', 'r4']
+    assert thread.location.zip_code == 75001
+    assert thread.tags == {'a', 'b', 'c'}
+    assert thread.scores == {1}
+    assert thread.version == 2
+
+    thread.update(actions=[
+        Thread.replies[0].remove(),
+        Thread.replies[2].remove(),
+        Thread.tags.delete({'a', 'b', 'c'}),
+        Thread.views.add(-3),
+        Thread.location.zip_code.remove(),
+    ])
+    assert thread.replies == ['r1', 'r3', 'r4']
+    assert thread.tags is None
+    assert thread.views == 0
+    assert thread.location.zip_code is None
+    assert Thread.get('f', 's').replies == ['r1', 'r3', 'r4']
+
+    with pytest.raises(UpdateError) as exc_info:
+        thread.update(actions=[Thread.location.zip_code.set(1)], condition=Thread.location.does_not_exist())
+    assert exc_info.value.cause_response_code == 'ConditionalCheckFailedException'
+
+    # updates create missing items
+    Counter('c').update(actions=[Counter.value.add(1)])
+    Counter('c').update(actions=[Counter.value.add(1)])
+    assert Counter.get('c').value == 2
+
+
+def test_save_changes():
+    Thread('f', 's', views=1, tags={'a'}).save()
+    thread = Thread.get('f', 's')
+    thread.views = 2
+    thread.tags.add('b')
+    thread.save_changes()
+    loaded = Thread.get('f', 's')
+    assert loaded.views == 2
+    assert loaded.tags == {'a', 'b'}
+    assert loaded.version == 2
+
+
+def test_save_changes__after_batch_or_transaction_write():
+    Thread('f', 's', views=1, tags={'a'}).save()
+    thread = Thread.get('f', 's')
+    thread.tags = {'a', 'b'}
+    with Thread.batch_write() as batch:
+        batch.save(thread)
+    thread.tags = {'a'}
+    thread.views = 1
+    thread.save_changes()
+    assert Thread.get('f', 's').tags == {'a'}
+
+    thread.tags = {'a', 'c'}
+    thread.views = 2
+    with TransactWrite(connection=Connection(transport=transport)) as transaction:
+        transaction.save(thread)
+    thread.tags = {'a'}
+    thread.views = 1
+    thread.save_changes()
+    loaded = Thread.get('f', 's')
+    assert (loaded.tags, loaded.views) == ({'a'}, 1)
+
+
+def test_query():
+    _save_threads()
+    _save_threads(forum='other', count=3)
+
+    assert [t.subject for t in Thread.query('f')] == ['subject-{:02d}'.format(i) for i in range(10)]
+    assert [t.subject for t in Thread.query('f', Thread.subject > 'subject-07')] == ['subject-08', 'subject-09']
+    assert [t.subject for t in Thread.query('f', Thread.subject.between('subject-02', 'subject-03'))] == [
+        'subject-02', 'subject-03',
+    ]
+    assert [t.subject for t in Thread.query('f', Thread.subject.startswith('subject-0'), scan_index_forward=False,
+                                            limit=2)] == ['subject-09', 'subject-08']
+    assert Thread.count('f', Thread.subject <= 'subject-04') == 5
+    assert Thread.count('f', filter_condition=Thread.views >= 50) == 5
+
+    # pagination applies the limit before the filter
+    results = Thread.query('f', filter_condition=Thread.author == 'author-1', page_size=3)
+    assert [t.subject for t in results] == ['subject-01', 'subject-03', 'subject-05', 'subject-07', 'subject-09']
+    assert results.page_iter.total_scanned_count == 10
+
+    page = Thread.query('f', limit=4)
+    assert len(list(page)) == 4
+    assert page.last_evaluated_key == {'forum': {'S': 'f'}, 'subject': {'S': 'subject-03'}}
+    resumed = Thread.query('f', last_evaluated_key=page.last_evaluated_key, scan_index_forward=True)
+    assert [t.subject for t in resumed][0] == 'subject-04'
+    reverse = Thread.query('f', last_evaluated_key=page.last_evaluated_key, scan_index_forward=False)
+    assert [t.subject for t in reverse] == ['subject-02', 'subject-01', 'subject-00']
+
+    with pytest.raises(QueryError):
+        list(Thread.query('f', Thread.views == 1))
+
+
+def test_prepared_expressions():
+    _save_threads()
+    by_author = PreparedCondition((Thread.author == Param('author')) & (Thread.views >= Param('views')))
+    range_key = PreparedCondition(Thread.subject.startswith(Param('prefix')))
+    results = Thread.query('f', range_key.bind(prefix='subject-0'), by_author.bind(author='author-1', views=50))
+    assert [t.subject for t in results] == ['subject-05', 'subject-07', 'subject-09']
+    assert Thread.count('f', filter_condition=by_author.bind(author='author-0', views=0)) == 5
+
+    viewed = PreparedUpdate(Thread.views.add(Param('views')), Thread.tags.add(Param('tags')))
+    thread = Thread.get('f', 'subject-01')
+    thread.update(viewed.bind(views=5, tags={'new'}), condition=by_author.bind(author='author-1', views=10))
+    assert (thread.views, thread.tags, thread.version) == (15, {'new'}, 2)
+    with pytest.raises(UpdateError):
+        thread.update(viewed.bind(views=5, tags={'new'}), condition=by_author.bind(author='author-1', views=100))
+
+
+def test_indexes():
+    _save_threads()
+
+    by_author = list(Thread.author_index.query('author-1', Thread.created_at >= _created_at(5)))
+    assert [t.subject for t in by_author] == ['subject-05', 'subject-07', 'subject-09']
+    # the index only projects the keys and views
+    assert by_author[0].views == 50
+    assert by_author[0].version is None
+
+    by_views = list(Thread.views_index.query('f', Thread.views < 30, scan_index_forward=False))
+    assert [t.subject for t in by_views] == ['subject-02', 'subject-01', 'subject-00']
+    assert by_views[0].author is None
+
+    # indexes are updated as items change
+    thread = Thread.get('f', 'subject-09')
+    thread.update(actions=[Thread.author.set('author-0'), Thread.views.set(5)])
+    assert [t.subject for t in Thread.author_index.query('author-1')] == [
+        'subject-01', 'subject-03', 'subject-05', 'subject-07',
+    ]
+    assert [t.subject for t in Thread.views_index.query('f', Thread.views < 10)] == ['subject-00', 'subject-09']
+    thread.delete()
+    assert Thread.author_index.count('author-0') == 5
+    assert Thread.views_index.count('f') == 9
+
+    # items without the index key are not in the index
+    Thread('f', 'no-author').save()
+    assert Thread.author_index.count('author-0') == 5
+    assert len(list(Thread.author_index.scan())) == 9
+
+    with pytest.raises(QueryError):
+        list(Thread.author_index.query('author-0', consistent_read=True))
+
+
+def test_index_created_after_items():
+    for i in range(5):
+        Counter(str(i), value=i % 2).save()
+    transport.make_api_call('UpdateTable', {
+        'TableName': 'Counter',
+        'AttributeDefinitions': [{'AttributeName': 'value', 'AttributeType': 'N'}],
+        'GlobalSecondaryIndexUpdates': [{'Create': {
+            'IndexName': 'by_value',
+            'KeySchema': [{'AttributeName': 'value', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'},
+        }}],
+    })
+    response = transport.make_api_call('Query', {
+        'TableName': 'Counter',
+        'IndexName': 'by_value',
+        'KeyConditionExpression': '#0 = :0',
+        'ExpressionAttributeNames': {'#0': 'value'},
+        'ExpressionAttributeValues': {':0': {'N': '1'}},
+    })
+    assert [item['name']['S'] for item in response['Items']] == ['1', '3']
+
+
+def test_scan():
+    for i in range(20):
+        Counter('counter-{}'.format(i), value=i).save()
+
+    assert Counter.count() == 20
+    assert sorted(c.value for c in Counter.scan(Counter.value >= 15)) == [15, 16, 17, 18, 19]
+
+    results = Counter.scan(page_size=3)
+    assert len(list(results)) == 20
+
+    segments = [{c.name for c in Counter.scan(segment=segment, total_segments=3)} for segment in range(3)]
+    assert sum(len(names) for names in segments) == 20
+    assert set.union(*segments) == {'counter-{}'.format(i) for i in range(20)}
+
+
+def test_batch_operations():
+    with Counter.batch_write() as batch:
+        for i in range(30):
+            batch.save(Counter(str(i), value=i))
+    assert Counter.count() == 30
+
+    items = list(Counter.batch_get([str(i) for i in range(0, 40, 2)]))
+    assert sorted(c.value for c in items) == list(range(0, 30, 2))
+
+    with Counter.batch_write() as batch:
+        for i in range(10):
+            batch.delete(Counter(str(i)))
+    assert Counter.count() == 20
+
+    with pytest.raises(Exception):
+        Counter._get_connection().connection.batch_get_item('Counter', ['1', '1'])
+
+
+def test_batch_get__streaming():
+    with Counter.batch_write() as batch:
+        for i in range(250):
+            batch.save(Counter(str(i), value=i))
+    consumed = []
+
+    def keys():
+        for i in range(300):
+            consumed.append(i)
+            yield str(i)
+
+    items = Counter.batch_get(keys())
+    next(items)
+    # only the first page of keys has been read
+    assert len(consumed) == 101
+    assert len(list(items)) == 249
+
+    keys_in_order = [str(i) for i in range(300, -1, -3)]
+    items = list(Counter.batch_get(keys_in_order, workers=4, ordered=True))
+    assert [c.value for c in items] == [i for i in range(300, -1, -3) if i < 250]
+    # duplicate keys yield their item again
+    assert [c.name for c in Counter.batch_get(['2', '1', '2'], ordered=True)] == ['2', '1', '2']
+
+    items = list(Counter.batch_get(keys(), workers=3, attributes_to_get=['value']))
+    assert sorted(c.value for c in items) == list(range(250))
+
+    with pytest.raises(ValueError):
+        next(Counter.batch_get(['1'], workers=0))
+
+
+def test_batch_get_map():
+    _save_threads(count=3)
+    keys = [('f', 'subject-01'), ['f', 'subject-99'], ('f', 'subject-00')]
+    results = Thread.batch_get_map(keys, result_format='dict', workers=2)
+    assert list(results) == [('f', 'subject-01'), ('f', 'subject-99'), ('f', 'subject-00')]
+    assert results[('f', 'subject-01')]['views'] == 10
+    assert results[('f', 'subject-99')] is None
+    assert [c and c.value for c in Counter.batch_get_map(['1', '2']).values()] == [None, None]
+
+
+def test_batch_write__duplicate_keys():
+    with Counter.batch_write() as batch:
+        batch.save(Counter('1', value=1))
+        batch.delete(Counter('2'))
+        batch.save(Counter('2', value=2))
+        batch.save(Counter('1', value=3))
+    assert sorted((c.name, c.value) for c in Counter.scan()) == [('1', 3), ('2', 2)]
+
+
+def test_batch_write__oversized_items():
+    with pytest.raises(PutError, match='1 items exceed the maximum item size'):
+        with Thread.batch_write() as batch:
+            batch.save(Thread('f', 'small'))
+            batch.save(Thread('f', 'large', author='x' * 400 * 1024))
+    # the other items are written
+    assert [thread.subject for thread in Thread.query('f')] == ['small']
+    assert [request['PutRequest']['Item']['subject'] for request in batch.failed_operations] == [{'S': 'large'}]
+
+
+def test_batch_write__workers():
+    with Counter.batch_write(workers=4) as batch:
+        for i in range(500):
+            batch.save(Counter(str(i % 300), value=i))
+    assert isinstance(batch, ParallelBatchWrite)
+    assert batch.failed_operations == []
+    assert Counter.count() == 300
+
+    with pytest.raises(ValueError):
+        Counter.batch_write(auto_commit=False, workers=2)
+    with pytest.raises(ValueError):
+        Counter.batch_write(on_failure=print)
+    with pytest.raises(ValueError):
+        Counter.batch_write(workers=0)
+
+
+def test_batch_write__workers__backpressure():
+    release = threading.Event()
+    write = ParallelBatchWrite._batch_write_item
+
+    def blocking_write(self, put_items, delete_items):
+        release.wait()
+        return write(self, put_items, delete_items)
+
+    batch = Counter.batch_write(workers=1, max_pending_batches=1)
+    produced = []
+
+    def produce():
+        for i in range(100):
+            batch.save(Counter(str(i)))
+            produced.append(i)
+
+    with mock.patch.object(ParallelBatchWrite, '_batch_write_item', blocking_write):
+        producer = threading.Thread(target=produce)
+        producer.start()
+        # one batch in flight and one queued
+        producer.join(0.2)
+        assert producer.is_alive()
+        assert len(produced) == 74
+        release.set()
+        producer.join()
+        batch.close()
+    assert Counter.count() == 100
+
+
+def test_batch_write__workers__failures():
+    error = PutError("Failed")
+    with mock.patch.object(Counter._get_connection(), 'batch_write_item', side_effect=error):
+        batch = Counter.batch_write(workers=2)
+        with pytest.raises(PutError):
+            with batch:
+                batch.save(Counter('1', value=1))
+                batch.delete(Counter('2'))
+        assert batch.failed_operations == [
+            {'PutRequest': {'Item': {'name': {'S': '1'}, 'value': {'N': '1'}}}},
+            {'DeleteRequest': {'Key': {'name': {'S': '2'}}}},
+        ]
+
+        failures = []
+        with Counter.batch_write(workers=2, on_failure=lambda e, requests: failures.append((e, requests))) as batch:
+            for i in range(30):
+                batch.save(Counter(str(i)))
+        assert sorted(len(requests) for _, requests in failures) == [5, 25]
+        assert all(e is error for e, _ in failures)
+        assert len(batch.failed_operations) == 30
+
+        # operations on the same key are reported as they were sent: collapsed into the last one
+        failures.clear()
+        with Counter.batch_write(workers=1, on_failure=lambda e, requests: failures.append((e, requests))) as batch:
+            batch.save(Counter('1', value=1))
+            batch.delete(Counter('2'))
+            batch.save(Counter('1', value=2))
+            batch.delete(Counter('2'))
+        assert [requests for _, requests in failures] == [[
+            {'PutRequest': {'Item': {'name': {'S': '1'}, 'value': {'N': '2'}}}},
+            {'DeleteRequest': {'Key': {'name': {'S': '2'}}}},
+        ]]
+        assert batch.failed_operations == failures[0][1]
+
+
+def test_batch_write__rate_limit():
+    rate_limiter = RateLimiter(1000)
+    with Counter.batch_write(rate_limit=rate_limiter) as batch:
+        for i in range(30):
+            batch.save(Counter(str(i), value=i))
+    assert Counter.count() == 30
+    # the capacity consumed by the second batch, to be waited for on the next acquire
+    assert rate_limiter._consumed == 5
+
+
+def test_transactions():
+    connection = Connection(transport=transport)
+    Counter('a', value=1).save()
+
+    with TransactWrite(connection=connection) as transaction:
+        transaction.update(Counter('a'), actions=[Counter.value.add(1)], condition=Counter.value == 1)
+        transaction.save(Counter('b', value=5))
+        transaction.condition_check(Counter, 'c', condition=Counter.name.does_not_exist())
+    assert Counter.get('a').value == 2
+    assert Counter.get('b').value == 5
+
+    with pytest.raises(TransactWriteError) as exc_info:
+        with TransactWrite(connection=connection) as transaction:
+            transaction.delete(Counter('b'))
+            transaction.save(Counter('a', value=0), condition=Counter.value == 1,
+                             return_values='ALL_OLD')
+    assert exc_info.value.cause_response_code == 'TransactionCanceledException'
+    reasons = exc_info.value.cancellation_reasons
+    assert reasons[0] is None
+    assert reasons[1].code == 'ConditionalCheckFailed'
+    assert reasons[1].raw_item == {'name': {'S': 'a'}, 'value': {'N': '2'}}
+    # nothing was written
+    assert Counter.get('b').value == 5
+
+    with pytest.raises(TransactWriteError) as exc_info:
+        with TransactWrite(connection=connection) as transaction:
+            transaction.save(Counter('a'))
+            transaction.delete(Counter('a'))
+    assert exc_info.value.cause_response_code == 'ValidationException'
+
+    with TransactGet(connection=connection) as transaction:
+        a = transaction.get(Counter, 'a')
+        missing = transaction.get(Counter, 'missing')
+    assert a.get().value == 2
+    with pytest.raises(DoesNotExist):
+        missing.get()
+
+
+def test_transactions__limits():
+    connection = Connection(transport=transport)
+    transaction = TransactWrite(connection=connection)
+    with pytest.raises(ValueError, match='maximum item size'):
+        transaction.save(Thread('f', 's', author='x' * 400 * 1024))
+    for i in range(100):
+        transaction.save(Counter(str(i)))
+    assert transaction.estimated_size == sum(len('Counter') + Counter(str(i)).estimate_size() for i in range(100))
+    with pytest.raises(ValueError, match='maximum of 100 items'):
+        transaction.delete(Counter('a'))
+
+    transaction = TransactWrite(connection=connection)
+    for i in range(10):
+        transaction.save(Thread('f', str(i), author='x' * 390 * 1024))
+    with pytest.raises(ValueError, match='maximum size'):
+        transaction.save(Thread('f', '10', author='x' * 390 * 1024))
+
+
+def test_consumed_capacity():
+    Counter('a').save()
+    response = transport.make_api_call('GetItem', {
+        'TableName': 'Counter', 'Key': {'name': {'S': 'a'}}, 'ReturnConsumedCapacity': 'TOTAL',
+    })
+    assert response['ConsumedCapacity'] == {'TableName': 'Counter', 'CapacityUnits': 0.5}
+    response = transport.make_api_call('PutItem', {
+        'TableName': 'Counter', 'Item': {'name': {'S': 'b'}, 'data': {'S': 'x' * 2000}},
+        'ReturnConsumedCapacity': 'TOTAL',
+    })
+    assert response['ConsumedCapacity'] == {'TableName': 'Counter', 'CapacityUnits': 2.0}
+
+
+def test_errors():
+    with pytest.raises(Exception) as exc_info:
+        transport.make_api_call('GetItem', {'TableName': 'Missing', 'Key': {'name': {'S': 'a'}}})
+    assert exc_info.value.response['Error']['Code'] == 'ResourceNotFoundException'
+
+    with pytest.raises(Exception) as exc_info:
+        transport.make_api_call('GetItem', {'TableName': 'Counter', 'Key': {'name': {'N': '1'}}})
+    assert exc_info.value.response['Error']['Code'] == 'ValidationException'
+
+    with pytest.raises(Exception) as exc_info:
+        transport.make_api_call('PutItem', {'TableName': 'Counter', 'Item': {'name': {'S': 'a'}, 'tags': {'SS': []}}})
+    assert exc_info.value.response['Error']['Code'] == 'ValidationException'
+
+    with pytest.raises(Exception) as exc_info:
+        transport.make_api_call('UpdateItem', {
+            'TableName': 'Counter', 'Key': {'name': {'S': 'a'}}, 'UpdateExpression': 'SET #0 = :0',
+            'ExpressionAttributeNames': {'#0': 'name'}, 'ExpressionAttributeValues': {':0': {'S': 'b'}},
+        })
+    assert 'part of the key' in exc_info.value.response['Error']['Message']
+
+    with pytest.raises(Exception) as exc_info:
+        transport.make_api_call('Query', {
+            'TableName': 'Counter', 'KeyConditionExpression': '#0 = :0 AND #1 = :1',
+            'ExpressionAttributeNames': {'#0': 'name', '#1': 'value'},
+            'ExpressionAttributeValues': {':0': {'S': 'a'}, ':1': {'N': '1'}},
+        })
+    assert exc_info.value.response['Error']['Code'] == 'ValidationException'
+
+
+def test_numbers_are_canonical():
+    transport.make_api_call('PutItem', {
+        'TableName': 'Counter', 'Item': {'name': {'S': 'a'}, 'value': {'N': '1.50'}, 'big': {'N': '1E+2'}},
+    })
+    item = transport.make_api_call('GetItem', {'TableName': 'Counter', 'Key': {'name': {'S': 'a'}}})['Item']
+    assert item == {'name': {'S': 'a'}, 'value': {'N': '1.5'}, 'big': {'N': '100'}}
+    assert transport.make_api_call('GetItem', {'TableName': 'Counter', 'Key': {'name': {'S': 'a'}},
+                                               'ProjectionExpression': 'big'})['Item'] == {'big': {'N': '100'}}
+
+
+def test_async():
+    async def save_and_get():
+        await Counter('a', value=1).asave()
+        return await Counter.aget('a')
+
+    assert asyncio.run(save_and_get()).value == 1
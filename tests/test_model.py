@@ -8,6 +8,7 @@ import re
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 
 from botocore.client import ClientError
@@ -20,7 +21,10 @@ from pynamodb.constants import (
     RESPONSES, KEYS, ITEMS, LAST_EVALUATED_KEY, EXCLUSIVE_START_KEY, ATTRIBUTES, BINARY,
     UNPROCESSED_ITEMS, DEFAULT_ENCODING, MAP, LIST, NUMBER, SCANNED_COUNT,
 )
+from pynamodb.cache import ItemCache
+from pynamodb.connection import Connection
 from pynamodb.models import Model
+from pynamodb.transactions import TransactWrite
 from pynamodb.indexes import (
     GlobalSecondaryIndex, LocalSecondaryIndex, AllProjection,
     IncludeProjection, KeysOnlyProjection, Index
@@ -1566,6 +1570,56 @@ class ModelTestCase(TestCase):
             self.assertEqual(results_iter.total_count, 30)
             self.assertEqual(results_iter.page_iter.total_scanned_count, 60)
 
+    def test_query_prefetch(self):
+        with patch(PATCH_METHOD) as req:
+            items = []
+            for idx in range(30):
+                item = copy.copy(GET_MODEL_ITEM_DATA.get(ITEM))
+                item['user_id'] = {STRING: 'id-{}'.format(idx)}
+                items.append(item)
+
+            req.side_effect = [
+                {'Count': 10, 'ScannedCount': 10, 'Items': items[:10], 'LastEvaluatedKey': {'user_name': items[9]['user_name'], 'user_id': items[9]['user_id']}},
+                {'Count': 10, 'ScannedCount': 10, 'Items': items[10:20], 'LastEvaluatedKey': {'user_name': items[19]['user_name'], 'user_id': items[19]['user_id']}},
+                {'Count': 10, 'ScannedCount': 10, 'Items': items[20:30]},
+            ]
+            results_iter = UserModel.query('foo', limit=15, page_size=10, prefetch=2)
+            results = list(results_iter)
+            self.assertEqual(len(results), 15)
+            self.assertEqual(results_iter.last_evaluated_key, {
+                'user_name': items[14]['user_name'],
+                'user_id': items[14]['user_id'],
+            })
+            self.assertEqual(req.mock_calls[1][1][1]['ExclusiveStartKey']['user_id'], items[9]['user_id'])
+
+    def test_parallel_scan(self):
+        """
+        Model.parallel_scan
+        """
+        def fake_scan(operation_name, kwargs):
+            segment = kwargs['Segment']
+            page = 1 if EXCLUSIVE_START_KEY in kwargs else 0
+            item = copy.copy(GET_MODEL_ITEM_DATA.get(ITEM))
+            item['user_id'] = {STRING: 'id-{}-{}'.format(segment, page)}
+            data = {CAMEL_COUNT: 1, ITEMS: [item], SCANNED_COUNT: 1, 'ConsumedCapacity': {'CapacityUnits': 1}}
+            if page == 0:
+                data[LAST_EVALUATED_KEY] = {'user_name': item['user_name'], 'user_id': item['user_id']}
+            return data
+
+        with patch(PATCH_METHOD, side_effect=fake_scan) as req:
+            items = list(UserModel.parallel_scan(total_segments=4, workers=2, rate_limit=1000))
+
+        self.assertEqual(
+            sorted(item.user_id for item in items),
+            ['id-{}-{}'.format(segment, page) for segment in range(4) for page in range(2)],
+        )
+        self.assertEqual(req.call_count, 8)
+        self.assertEqual({call[0][1]['TotalSegments'] for call in req.call_args_list}, {4})
+        self.assertEqual({call[0][1]['Segment'] for call in req.call_args_list}, {0, 1, 2, 3})
+
+        with pytest.raises(ValueError):
+            UserModel.parallel_scan(total_segments=0)
+
     def test_scan_limit(self):
         """
         Model.scan(limit)
@@ -1669,6 +1723,251 @@ class ModelTestCase(TestCase):
             }
             self.assertEqual(params, req.call_args[0][1])
 
+    def test_get_coalescing(self):
+        class CoalescingModel(Model):
+            class Meta:
+                table_name = 'CoalescingModel'
+                get_coalescing_window_seconds = 10
+
+            id = UnicodeAttribute(hash_key=True)
+            name = UnicodeAttribute(null=True)
+
+        CoalescingModel._get_coalescer()._max_keys = 3
+        with patch(PATCH_METHOD) as req:
+            req.return_value = {
+                'Responses': {'CoalescingModel': [
+                    {'id': {'S': 'a'}, 'name': {'S': 'A'}},
+                    {'id': {'S': 'b'}, 'name': {'S': 'B'}},
+                ]},
+                'UnprocessedKeys': {},
+            }
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(CoalescingModel.get, id) for id in ['a', 'b', 'c']]
+                self.assertEqual(futures[0].result().name, 'A')
+                self.assertEqual(futures[1].result().name, 'B')
+                with self.assertRaises(CoalescingModel.DoesNotExist):
+                    futures[2].result()
+
+            self.assertEqual(req.call_count, 1)
+            self.assertEqual(req.call_args[0][0], 'BatchGetItem')
+            keys = req.call_args[0][1]['RequestItems']['CoalescingModel']['Keys']
+            self.assertEqual(sorted(key['id']['S'] for key in keys), ['a', 'b', 'c'])
+
+            # projections are not coalesced
+            req.return_value = {'Item': {'id': {'S': 'a'}}}
+            CoalescingModel.get('a', attributes_to_get=['id'])
+            self.assertEqual(req.call_args[0][0], 'GetItem')
+
+    def test_item_cache(self):
+        class CachedModel(Model):
+            class Meta:
+                table_name = 'CachedModel'
+                item_cache = ItemCache()
+
+            id = UnicodeAttribute(hash_key=True)
+            name = UnicodeAttribute(null=True)
+
+        with patch(PATCH_METHOD) as req:
+            req.return_value = {'Item': {'id': {'S': 'a'}, 'name': {'S': 'A'}}}
+            self.assertEqual(CachedModel.get('a').name, 'A')
+            self.assertEqual(CachedModel.get('a').name, 'A')
+            self.assertEqual(req.call_count, 1)
+
+            # a consistent read goes to the table
+            CachedModel.get('a', consistent_read=True)
+            self.assertEqual(req.call_count, 2)
+
+            # a write invalidates the cached item
+            req.return_value = {}
+            CachedModel('a', name='B').save()
+            req.return_value = {'Item': {'id': {'S': 'a'}, 'name': {'S': 'B'}}}
+            self.assertEqual(CachedModel.get('a').name, 'B')
+            self.assertEqual(req.call_count, 4)
+
+            # missing items are cached too
+            req.return_value = {}
+            with self.assertRaises(CachedModel.DoesNotExist):
+                CachedModel.get('c')
+            with self.assertRaises(CachedModel.DoesNotExist):
+                CachedModel.get('c')
+            self.assertEqual(req.call_count, 5)
+
+            req.return_value = {
+                'Responses': {'CachedModel': [{'id': {'S': 'd'}, 'name': {'S': 'D'}}]},
+                'UnprocessedKeys': {},
+            }
+            items = list(CachedModel.batch_get(['a', 'c', 'd', 'e']))
+            self.assertEqual(sorted(item.id for item in items), ['a', 'd'])
+            self.assertEqual(req.call_count, 6)
+            keys = req.call_args[0][1]['RequestItems']['CachedModel']['Keys']
+            self.assertEqual(sorted(key['id']['S'] for key in keys), ['d', 'e'])
+
+            self.assertEqual([item.id for item in CachedModel.batch_get(['d', 'e'])], ['d'])
+            self.assertEqual(req.call_count, 6)
+
+            req.return_value = {}
+            with TransactWrite(connection=Connection()) as transaction:
+                transaction.delete(CachedModel('d'))
+            req.return_value = {'Item': {'id': {'S': 'd'}, 'name': {'S': 'D2'}}}
+            self.assertEqual(CachedModel.get('d').name, 'D2')
+
+        cache = CachedModel.Meta.item_cache
+        self.assertEqual((cache.hits, cache.misses), (6, 6))
+
+    def test_save_changes(self):
+        class ChangesModel(Model):
+            class Meta:
+                table_name = 'ChangesModel'
+
+            id = UnicodeAttribute(hash_key=True)
+            name = UnicodeAttribute(null=True)
+            tags = UnicodeSetAttribute(null=True)
+            doc = MapAttribute(null=True)
+            version = VersionAttribute()
+
+        raw = {
+            'id': {'S': 'a'},
+            'name': {'S': 'n'},
+            'tags': {'SS': ['x', 'y']},
+            'doc': {'M': {'k': {'S': 'v'}}},
+            'version': {'N': '1'},
+        }
+        with patch(PATCH_METHOD) as req:
+            req.return_value = {}
+            item = ChangesModel.from_raw_data(raw)
+            self.assertEqual(item.save_changes(), {})
+            self.assertEqual(req.call_count, 0)
+
+            item.name = 'z'
+            item.doc['k2'] = 'v2'  # modified in place
+            item.save_changes()
+            self.assertEqual(req.call_args[0][0], 'UpdateItem')
+            params = req.call_args[0][1]
+            self.assertEqual(params['UpdateExpression'], 'SET #1 = :1, #2 = :2 ADD #0 :3')
+            self.assertEqual(params['ExpressionAttributeNames'], {'#0': 'version', '#1': 'doc', '#2': 'name'})
+            self.assertEqual(params['ConditionExpression'], '#0 = :0')
+            self.assertEqual(params['ExpressionAttributeValues'][':0'], {'N': '1'})
+            self.assertEqual(params['ReturnValues'], 'NONE')
+            self.assertEqual(item.version, 2)
+
+            # sets are updated with ADD or DELETE, and removed attributes with REMOVE
+            item.tags.add('w')
+            item.name = None
+            item.save_changes()
+            params = req.call_args[0][1]
+            self.assertEqual(params['UpdateExpression'], 'REMOVE #1 ADD #2 :1, #0 :2')
+            self.assertEqual(params['ExpressionAttributeValues'][':1'], {'SS': ['w']})
+
+            item.tags = {'x'}
+            item.save_changes()
+            self.assertEqual(req.call_args[0][1]['UpdateExpression'], 'ADD #0 :1 DELETE #1 :2')
+
+            call_count = req.call_count
+            item.save_changes()
+            self.assertEqual(req.call_count, call_count)
+
+            item.id = 'b'
+            with self.assertRaises(ValueError):
+                item.save_changes()
+
+            # objects that were not loaded are saved in full
+            ChangesModel('c', name='new').save_changes()
+            self.assertEqual(req.call_args[0][0], 'PutItem')
+
+    def test_result_format(self):
+        class Details(MapAttribute):
+            size = NumberAttribute()
+
+        class FormatModel(Model):
+            class Meta:
+                table_name = 'FormatModel'
+
+            id = UnicodeAttribute(hash_key=True)
+            details = Details(null=True)
+            created = UTCDateTimeAttribute(null=True)
+            count = NumberAttribute(default=0)
+
+        raw = {
+            'id': {'S': 'a'},
+            'details': {'M': {'size': {'N': '3'}}},
+            'created': {'S': '2022-10-27T20:00:00.000000+0000'},
+        }
+        expected = {
+            'id': 'a',
+            'details': {'size': 3},
+            'created': datetime(2022, 10, 27, 20, tzinfo=timezone.utc),
+            'count': None,
+        }
+        with patch(PATCH_METHOD) as req:
+            req.return_value = {'Items': [raw], 'Count': 1, 'ScannedCount': 1}
+            self.assertEqual(list(FormatModel.scan(result_format='dict')), [expected])
+            self.assertEqual(list(FormatModel.query('a', result_format='raw')), [raw])
+
+            item = next(iter(FormatModel.scan(result_format='namedtuple')))
+            self.assertEqual(item._asdict(), expected)
+            self.assertEqual(type(item).__name__, 'FormatModel')
+
+            req.return_value = {'Responses': {'FormatModel': [raw]}, 'UnprocessedKeys': {}}
+            self.assertEqual(list(FormatModel.batch_get(['a'], result_format='dict')), [expected])
+
+        with self.assertRaises(ValueError):
+            FormatModel.scan(result_format='xml')
+
+    def test_lazy_deserialization(self):
+        class Details(MapAttribute):
+            size = NumberAttribute()
+
+        class LazyModel(Model):
+            class Meta:
+                table_name = 'LazyModel'
+                lazy_deserialization = True
+
+            id = UnicodeAttribute(hash_key=True)
+            details = Details(null=True)
+            tags = ListAttribute(of=UnicodeAttribute, null=True)
+            version = VersionAttribute()
+
+        raw = {
+            'id': {'S': 'a'},
+            'details': {'M': {'size': {'N': '3'}}},
+            'tags': {'L': [{'S': 'x'}]},
+            'version': {'N': '1'},
+        }
+        item = LazyModel.from_raw_data(raw)
+        self.assertEqual(set(item.attribute_values.raw), {'id', 'details', 'tags', 'version'})
+
+        self.assertEqual(item.details.size, 3)
+        self.assertNotIn('details', item.attribute_values.raw)
+        self.assertEqual(item.version, 1)
+
+        # untouched attributes are passed through, read or written ones are re-encoded
+        item.tags = ['y']
+        serialized = item.serialize()
+        self.assertEqual(serialized['details'], {'M': {'size': {'N': '3'}}})
+        self.assertEqual(serialized['tags'], {'L': [{'S': 'y'}]})
+        self.assertIs(serialized['id'], raw['id'])
+
+        copied = copy.deepcopy(item)
+        self.assertEqual(type(copied.attribute_values), dict)
+        self.assertEqual(copied.id, 'a')
+
+        eager = LazyModel.from_raw_data(raw, lazy_deserialization=False)
+        self.assertEqual(type(eager.attribute_values), dict)
+        self.assertEqual(eager.serialize(), LazyModel.from_raw_data(raw).serialize())
+
+        with patch(PATCH_METHOD) as req:
+            req.return_value = {'Items': [raw], 'Count': 1, 'ScannedCount': 1}
+            item = next(iter(LazyModel.scan(lazy_deserialization=False)))
+            self.assertEqual(type(item.attribute_values), dict)
+            item = next(iter(LazyModel.scan()))
+            self.assertIn('details', item.attribute_values.raw)
+
+            req.return_value = {}
+            item.save()
+            put_item = req.call_args[0][1]['Item']
+            self.assertEqual(put_item['details'], raw['details'])
+            self.assertEqual(put_item['version'], {'N': '2'})
+
     def test_get(self):
         """
         Model.get
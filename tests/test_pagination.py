@@ -1,19 +1,10 @@
-import pytest
-from pynamodb.pagination import RateLimiter
-
-
-class MockTime():
-    def __init__(self):
-        self.current_time = 0.0
-
-    def sleep(self, amount):
-        self.current_time += amount
+import multiprocessing
+import pickle
+import threading
 
-    def time(self):
-        return self.current_time
-
-    def increment_time(self, amount):
-        self.current_time += amount
+import pytest
+from pynamodb.pagination import PageIterator, RateLimiter, SharedRateLimiter, map_concurrently, merge_page_iterators
+from tests.mock_time import MockTime
 
 
 def test_rate_limiter_exceptions():
@@ -77,3 +68,215 @@ def test_basic_rate_limiting_large_increment():
 
     # The operation takes longer than the minimum wait, so rate limiting should have no effect
     assert mock_time.time() == 1100.0
+
+
+def test_rate_limiter_concurrent_callers_share_budget():
+    mock_time = MockTime()
+    sleeps = []
+    mock_time.sleep = sleeps.append  # callers sleeping concurrently don't advance the clock
+    r = RateLimiter(10, mock_time)
+
+    r.acquire()
+    r.acquire()
+    # two operations in flight, 20 units consumed between them
+    r.consume(10)
+    r.consume(10)
+    r.acquire()
+    # a second caller arriving before the first has finished sleeping must wait as well
+    r.acquire()
+    assert sleeps == [0, 0, 2.0, 2.0]
+
+
+def test_shared_rate_limiter(tmp_path):
+    path = str(tmp_path / 'budget')
+    mock_time = MockTime()
+    first = SharedRateLimiter(10, path, mock_time)
+    second = SharedRateLimiter(None, path, mock_time)
+    assert second.rate_limit == 10
+
+    first.acquire()
+    second.acquire()
+    assert mock_time.time() == 0
+
+    # both processes draw from one budget: 20 units at 10 units per second
+    first.consume(10)
+    second.consume(10)
+    first.acquire()
+    second.acquire()
+    assert mock_time.time() == 2
+
+    # the rate is shared too
+    second.rate_limit = 20
+    assert first.rate_limit == 20
+    first.consume(20)
+    first.acquire()
+    assert mock_time.time() == 3
+
+    first.close()
+    first.close()
+    with pytest.raises(ValueError):
+        first.acquire()
+    second.close()
+
+
+def test_shared_rate_limiter_exceptions(tmp_path):
+    with pytest.raises(ValueError):
+        SharedRateLimiter(None, str(tmp_path / 'budget'))
+    with pytest.raises(ValueError):
+        SharedRateLimiter(0, str(tmp_path / 'budget'))
+    with pytest.raises(ValueError):
+        SharedRateLimiter(10, str(tmp_path / 'budget')).rate_limit = 0
+
+
+def test_shared_rate_limiter_pickle(tmp_path):
+    r = SharedRateLimiter(10, str(tmp_path / 'budget'))
+    attached = pickle.loads(pickle.dumps(r))
+    assert isinstance(attached, SharedRateLimiter)
+    assert attached.rate_limit == 10
+    r.rate_limit = 5
+    assert attached.rate_limit == 5
+
+
+def _consume_in_child(rate_limiter):
+    rate_limiter.consume(50)
+    rate_limiter._reserve()
+
+
+def test_shared_rate_limiter_fork(tmp_path):
+    r = SharedRateLimiter(100, str(tmp_path / 'budget'))
+    r.acquire()
+    process = multiprocessing.get_context('fork').Process(target=_consume_in_child, args=(r,))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    # the 50 units consumed by the child take half a second of the shared budget
+    assert 0.2 < r._reserve() <= 0.5
+
+
+def _page_iterator(segment, page_count):
+    def operation(exclusive_start_key=None):
+        page_number = exclusive_start_key or 0
+        page = {'Count': 1, 'ScannedCount': 1, 'Items': [(segment, page_number)]}
+        if page_number + 1 < page_count:
+            page['LastEvaluatedKey'] = page_number + 1
+        return page
+    return PageIterator(operation, (), {})
+
+
+def test_merge_page_iterators():
+    page_iterators = [_page_iterator(segment, 3) for segment in range(4)]
+    items = [item for page in merge_page_iterators(page_iterators, workers=2) for item in page['Items']]
+    assert sorted(items) == [(segment, page) for segment in range(4) for page in range(3)]
+
+
+def test_merge_page_iterators_error():
+    def failing_operation(exclusive_start_key=None):
+        raise ValueError('boom')
+
+    page_iterators = [_page_iterator(0, 5), PageIterator(failing_operation, (), {})]
+    with pytest.raises(ValueError, match='boom'):
+        list(merge_page_iterators(page_iterators, workers=2))
+
+
+def test_merge_page_iterators_stops_early():
+    calls = []
+    lock = threading.Lock()
+
+    def operation(exclusive_start_key=None):
+        with lock:
+            calls.append(exclusive_start_key)
+        return {'Count': 0, 'ScannedCount': 0, 'Items': [], 'LastEvaluatedKey': (exclusive_start_key or 0) + 1}
+
+    pages = merge_page_iterators([PageIterator(operation, (), {})], workers=1)
+    next(pages)
+    pages.close()
+    # the worker stops after at most filling the buffer
+    assert len(calls) <= 4
+
+
+def test_map_concurrently():
+    consumed = []
+
+    def args():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    results = map_concurrently(lambda i: i * i, args(), workers=3)
+    assert next(results) == 0
+    # the input is consumed lazily, keeping `workers` calls in flight
+    assert consumed == [0, 1, 2, 3]
+    assert list(results) == [i * i for i in range(1, 10)]
+
+    with pytest.raises(ValueError):
+        next(map_concurrently(abs, [], workers=0))
+
+
+def test_map_concurrently_error():
+    def fail(i):
+        if i == 2:
+            raise ValueError('boom')
+        return i
+
+    results = map_concurrently(fail, range(5), workers=2)
+    assert [next(results), next(results)] == [0, 1]
+    with pytest.raises(ValueError, match='boom'):
+        next(results)
+
+
+def test_page_iterator_prefetch():
+    fetched = []
+    consumed = threading.Event()
+
+    def operation(exclusive_start_key=None):
+        page_number = exclusive_start_key or 0
+        fetched.append(page_number)
+        page = {'Count': 1, 'ScannedCount': 1, 'Items': [page_number]}
+        if page_number < 4:
+            page['LastEvaluatedKey'] = page_number + 1
+        return page
+
+    page_iter = PageIterator(operation, (), {}, prefetch=2)
+    assert next(page_iter)['Items'] == [0]
+    # state only reflects pages handed to the caller, even though later pages are being fetched
+    assert page_iter.last_evaluated_key == 1
+    assert page_iter.total_scanned_count == 1
+    assert [page['Items'] for page in page_iter] == [[1], [2], [3], [4]]
+    assert page_iter.last_evaluated_key is None
+    assert fetched == [0, 1, 2, 3, 4]
+
+
+def test_page_iterator_prefetch_error_resumes():
+    calls = []
+
+    def operation(exclusive_start_key=None):
+        calls.append(exclusive_start_key)
+        if exclusive_start_key == 1 and calls.count(1) == 1:
+            raise ValueError('throttled')
+        page = {'Count': 1, 'ScannedCount': 1, 'Items': [exclusive_start_key]}
+        if not exclusive_start_key:
+            page['LastEvaluatedKey'] = 1
+        return page
+
+    page_iter = PageIterator(operation, (), {}, prefetch=1)
+    next(page_iter)
+    with pytest.raises(ValueError):
+        next(page_iter)
+    assert page_iter.last_evaluated_key == 1
+    assert next(page_iter)['Items'] == [1]
+    assert calls == [None, 1, 1]
+
+
+def test_page_iterator_prefetch_rate_limit():
+    mock_time = MockTime()
+    rate_limiter = RateLimiter(1, mock_time)
+
+    def operation(exclusive_start_key=None, return_consumed_capacity=None):
+        assert return_consumed_capacity == 'TOTAL'
+        page = {'Count': 1, 'ScannedCount': 1, 'Items': [], 'ConsumedCapacity': {'CapacityUnits': 2}}
+        if not exclusive_start_key:
+            page['LastEvaluatedKey'] = 1
+        return page
+
+    assert len(list(PageIterator(operation, (), {}, rate_limit=rate_limiter, prefetch=3))) == 2
+    assert mock_time.time() == 2.0
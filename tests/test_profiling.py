@@ -0,0 +1,154 @@
+import contextvars
+import io
+import json
+from unittest import mock
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+from pynamodb import profiling
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.hooks import request_hooks
+from pynamodb.models import Model
+from pynamodb.profiling import LatencyHistogram, LatencyProfiler
+
+
+class Counter(Model):
+    class Meta:
+        table_name = 'Counter'
+        transport = InMemoryTransport()
+    name = UnicodeAttribute(hash_key=True)
+    value = NumberAttribute(default=0)
+
+
+class BotocoreCounter(Model):
+    class Meta:
+        table_name = 'BotocoreCounter'
+        max_retry_attempts = 0
+    name = UnicodeAttribute(hash_key=True)
+    value = NumberAttribute(default=0)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def create_table():
+    Counter.create_table(read_capacity_units=1, write_capacity_units=1)
+
+
+def _phases(profiler, table_name, operation):
+    return {s.phase: s for s in profiler.stats() if s.table_name == table_name and s.operation == operation}
+
+
+def test_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) == 0
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+    assert histogram.count == 100
+    assert histogram.max == 0.1
+    assert histogram.quantile(0.5) == pytest.approx(0.050, rel=0.05)
+    assert histogram.quantile(0.95) == pytest.approx(0.095, rel=0.05)
+    assert histogram.quantile(0.99) == pytest.approx(0.099, rel=0.05)
+    assert histogram.quantile(1) == 0.1
+    histogram.add(0)
+    assert histogram.quantile(0) < 2e-6
+
+
+def test_profiler():
+    profiler = LatencyProfiler()
+    with profiler:
+        assert profiling.profiler is profiler
+        Counter('foo').save()
+        Counter.get('foo')
+        list(Counter.scan())
+    assert profiling.profiler is None
+    assert not request_hooks
+
+    put_item = _phases(profiler, 'Counter', 'PutItem')
+    assert list(put_item) == ['serialize', 'send', 'total']
+    assert put_item['total'].samples == 1
+    assert put_item['total'].p50 <= put_item['total'].max
+
+    get_item = _phases(profiler, 'Counter', 'GetItem')
+    assert list(get_item) == ['send', 'total', 'deserialize']
+    scan = _phases(profiler, 'Counter', 'Scan')
+    assert scan['deserialize'].samples == 1
+
+    # not profiled once disabled
+    Counter.get('foo')
+    assert _phases(profiler, 'Counter', 'GetItem')['total'].samples == 1
+
+
+def test_profiler__deserialization_without_request():
+    with LatencyProfiler() as profiler:
+        # in a context where no request was sent
+        contextvars.Context().run(Counter.from_raw_data, {'name': {'S': 'foo'}})
+    stats, = profiler.stats()
+    assert (stats.table_name, stats.operation, stats.phase) == ('Counter', None, 'deserialize')
+
+
+def test_profiler__serialization_attributed_to_next_request():
+    with LatencyProfiler() as profiler:
+        Counter('foo').serialize()
+        Counter('bar').serialize()
+        Counter.get('foo')
+        Counter.get('foo')
+    assert _phases(profiler, 'Counter', 'GetItem')['serialize'].samples == 2
+    assert _phases(profiler, 'Counter', 'GetItem')['total'].samples == 2
+
+
+def test_profiler__serialization_without_request():
+    def serialize_many():
+        with LatencyProfiler() as profiler:
+            for _ in range(150):
+                Counter('foo').serialize()
+            assert len(profiling._pending_serializations.get()) == profiling._MAX_PENDING_SERIALIZATIONS
+        return profiler
+
+    profiler = contextvars.Context().run(serialize_many)
+    stats, = profiler.stats()
+    assert (stats.table_name, stats.operation, stats.phase, stats.samples) == ('Counter', None, 'serialize', 50)
+
+
+@mock.patch('botocore.httpsession.URLLib3Session.send')
+def test_profiler__botocore(send_mock):
+    response = AWSResponse(url='', status_code=200, headers={}, raw='')
+    response._content = json.dumps({'Item': {'name': {'S': 'foo'}}}).encode('utf-8')
+    send_mock.return_value = response
+
+    with LatencyProfiler() as profiler:
+        BotocoreCounter.get('foo')
+
+    get_item = _phases(profiler, 'BotocoreCounter', 'GetItem')
+    assert list(get_item) == ['prepare', 'sign', 'send', 'parse', 'finish', 'total', 'deserialize']
+
+
+def test_profiler__dump():
+    with LatencyProfiler() as profiler:
+        Counter.get('foo')
+    output = io.StringIO()
+    profiler.dump(output)
+    lines = output.getvalue().splitlines()
+    assert lines[0].split() == ['table', 'operation', 'phase', 'samples', 'mean', 'p50', 'p95', 'p99', 'max']
+    assert [line.split()[:4] for line in lines[1:]] == [
+        ['Counter', 'GetItem', 'send', '1'],
+        ['Counter', 'GetItem', 'total', '1'],
+        ['Counter', 'GetItem', 'deserialize', '1'],
+    ]
+
+    profiler.reset()
+    assert profiler.stats() == []
+
+
+def test_enable_replaces_profiler():
+    first = LatencyProfiler()
+    second = LatencyProfiler()
+    first.enable()
+    second.enable()
+    try:
+        assert profiling.profiler is second
+        Counter.get('foo')
+        assert first.stats() == []
+    finally:
+        second.disable()
+    assert not request_hooks
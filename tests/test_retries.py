@@ -0,0 +1,207 @@
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from pynamodb import retries
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.exceptions import GetError, PutError
+from pynamodb.models import Model
+from pynamodb.retries import RetryPolicy, RetryStats, is_throttling_error
+from tests.mock_time import MockTime
+
+
+class MaxRandom():
+    def uniform(self, low, high):
+        return high
+
+
+class Thing(Model):
+    class Meta:
+        table_name = 'Thing'
+        transport = InMemoryTransport()
+
+    id = UnicodeAttribute(hash_key=True)
+    value = NumberAttribute(default=0)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def create_table():
+    Thing.create_table(read_capacity_units=1, write_capacity_units=1)
+    for i in range(3):
+        Thing(str(i)).save()
+
+
+@pytest.fixture
+def mock_time():
+    return MockTime()
+
+
+@pytest.fixture
+def retry_policy(mock_time):
+    policy = RetryPolicy(base_delay_seconds=0.1, max_delay_seconds=2, time_module=mock_time, random_module=MaxRandom())
+    with mock.patch.object(Thing.Meta, 'retry_policy', policy):
+        yield policy
+
+
+def _throttling_error(error_class):
+    cause = ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': ''}}, 'BatchGetItem')
+    return error_class("Throttled", cause)
+
+
+def test_is_throttling_error():
+    assert is_throttling_error(_throttling_error(GetError))
+    assert not is_throttling_error(GetError("Failed"))
+    assert not is_throttling_error(ValueError())
+
+
+def test_retry_policy__decorrelated_jitter(mock_time):
+    with pytest.raises(ValueError):
+        RetryPolicy(base_delay_seconds=0)
+    with pytest.raises(ValueError):
+        RetryPolicy(budget_ratio=-1)
+
+    policy = RetryPolicy(base_delay_seconds=0.1, max_delay_seconds=2, time_module=mock_time, random_module=MaxRandom())
+    backoff = policy.backoff()
+    for _ in range(4):
+        assert backoff.retry()
+    assert mock_time.slept == pytest.approx([0.3, 0.9, 2, 2])
+    assert backoff.retries == 4
+    # only throttling errors are retried
+    assert not backoff.retry(GetError("Failed"))
+    assert backoff.retry(_throttling_error(GetError))
+    assert policy.stats() == RetryStats(
+        calls=1, retries=5, throttled_retries=1, budget_exhausted=0, backoff_seconds=pytest.approx(7.2),
+    )
+
+
+def test_retry_policy__budget(mock_time):
+    policy = RetryPolicy(budget_ratio=0.5, budget_reserve=2, time_module=mock_time)
+    error = _throttling_error(GetError)
+    backoff = policy.backoff()
+    assert backoff.retry(error)
+    assert backoff.retry(error)
+    assert not backoff.retry(error)
+    # resending unprocessed items is not charged to the budget
+    assert backoff.retry()
+    assert len(mock_time.slept) == 3
+
+    # each operation earns half a retry
+    policy.backoff()
+    backoff = policy.backoff()
+    assert backoff.retry(error)
+    assert not backoff.retry(error)
+    assert policy.stats().calls == 3
+    assert policy.stats().retries == 4
+    assert policy.stats().throttled_retries == 3
+    assert policy.stats().budget_exhausted == 2
+
+
+def test_backoff__max_attempts(mock_time):
+    policy = RetryPolicy(base_delay_seconds=0.1, max_delay_seconds=2, time_module=mock_time, random_module=MaxRandom())
+    backoff = policy.backoff(max_attempts=3)
+    assert backoff.retry()
+    assert backoff.retry()
+    assert not backoff.retry()
+    assert not backoff.retry(_throttling_error(GetError))
+    # progress starts the count (and the delays) over
+    backoff.reset()
+    assert backoff.retry()
+    assert mock_time.slept == pytest.approx([0.3, 0.9, 0.3])
+
+
+def test_batch_write__backs_off(retry_policy, mock_time):
+    data = [
+        {'UnprocessedItems': {'Thing': [{'PutRequest': {'Item': {'id': {'S': '1'}, 'value': {'N': '1'}}}}]}},
+        {},
+    ]
+    with mock.patch.object(Thing._get_connection(), 'batch_write_item', side_effect=data) as batch_write_item:
+        with Thing.batch_write() as batch:
+            batch.save(Thing('0', value=1))
+            batch.save(Thing('1', value=1))
+    assert batch_write_item.call_args.kwargs['put_items'] == [{'id': {'S': '1'}, 'value': {'N': '1'}}]
+    assert mock_time.slept == [pytest.approx(0.3)]
+    assert retry_policy.stats().retries == 1
+
+
+def test_batch_write__retries_throttled_requests(retry_policy, mock_time):
+    connection = Thing._get_connection()
+    with mock.patch.object(connection, 'batch_write_item', side_effect=[_throttling_error(PutError), {}]):
+        with Thing.batch_write() as batch:
+            batch.save(Thing('0'))
+    assert retry_policy.stats().throttled_retries == 1
+
+    with mock.patch.object(connection, 'batch_write_item', side_effect=PutError("Failed")) as batch_write_item:
+        with pytest.raises(PutError):
+            with Thing.batch_write() as batch:
+                batch.save(Thing('0'))
+    assert batch_write_item.call_count == 1
+
+
+def test_batch_write__unprocessed_items(retry_policy):
+    # unprocessed items are resent even without a retry budget, up to max_retry_attempts
+    retry_policy.budget_reserve = retry_policy.budget_ratio = 0
+    unprocessed_items = [{'DeleteRequest': {'Key': {'id': {'S': '0'}}}}]
+    data = {'UnprocessedItems': {'Thing': unprocessed_items}}
+    with mock.patch.object(Thing._get_connection(), 'batch_write_item', side_effect=[data, {}]):
+        with Thing.batch_write() as batch:
+            batch.delete(Thing('0'))
+
+    with mock.patch.object(Thing._get_connection(), 'batch_write_item', return_value=data) as batch_write_item:
+        batch = Thing.batch_write()
+        batch.delete(Thing('0'))
+        with pytest.raises(PutError, match='max_retry_attempts exceeded'):
+            batch.commit()
+    assert batch_write_item.call_count == Thing.Meta.max_retry_attempts
+    assert batch.failed_operations == unprocessed_items
+
+
+def test_batch_get__backs_off(retry_policy, mock_time):
+    batch_get_page = Thing._batch_get_page
+    pages = iter([
+        _throttling_error(GetError),
+        ([{'id': {'S': '0'}}], [{'id': {'S': '1'}}, {'id': {'S': '2'}}]),
+        ([], [{'id': {'S': '1'}}, {'id': {'S': '2'}}]),
+    ])
+
+    def fake_batch_get_page(keys_to_get, consistent_read, attributes_to_get):
+        page = next(pages, None)
+        if page is None:
+            return batch_get_page(keys_to_get, consistent_read, attributes_to_get)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    with mock.patch.object(Thing, '_batch_get_page', side_effect=fake_batch_get_page):
+        assert sorted(thing.id for thing in Thing.batch_get(['0', '1', '2'])) == ['0', '1', '2']
+    # a page with items is followed at once, an empty page after a backoff
+    assert mock_time.slept == pytest.approx([0.3, 0.3])
+    assert retry_policy.stats()[:3] == (1, 2, 1)
+
+
+def test_batch_get__unprocessed_keys():
+    # DynamoDB cuts responses short at 16 MB: any number of pages with unprocessed keys is followed
+    keys = [{'id': {'S': str(i)}} for i in range(50)]
+    pages = ([[key], keys[i + 1:]] for i, key in enumerate(keys))
+    with mock.patch.object(Thing, '_batch_get_page', side_effect=lambda *args: next(pages)):
+        assert len(list(Thing.batch_get([str(i) for i in range(50)]))) == 50
+
+
+def test_batch_get__max_retry_attempts(retry_policy):
+    with mock.patch.object(Thing, '_batch_get_page', return_value=([], [{'id': {'S': '0'}}])) as batch_get_page:
+        with pytest.raises(GetError, match='max_retry_attempts exceeded'):
+            list(Thing.batch_get(['0']))
+    assert batch_get_page.call_count == Thing.Meta.max_retry_attempts
+
+
+def test_batch_get__budget_exhausted(retry_policy):
+    retry_policy.budget_reserve = retry_policy.budget_ratio = 0
+    with mock.patch.object(Thing, '_batch_get_page', side_effect=_throttling_error(GetError)) as batch_get_page:
+        with pytest.raises(GetError, match='Throttled'):
+            list(Thing.batch_get(['0']))
+    assert batch_get_page.call_count == 1
+
+
+def test_default_retry_policy():
+    assert Thing._get_retry_policy() is retries.default_retry_policy
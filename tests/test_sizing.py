@@ -0,0 +1,82 @@
+import pytest
+
+from pynamodb.attributes import BinaryAttribute, ListAttribute, MapAttribute, NumberAttribute, UnicodeAttribute
+from pynamodb.models import Model
+from pynamodb.sizing import (
+    attribute_value_size, item_size, operation_size, pack, read_capacity_units, write_capacity_units,
+)
+
+
+class Location(MapAttribute):
+    city = UnicodeAttribute()
+
+
+class Thread(Model):
+    class Meta:
+        table_name = 'Thread'
+
+    forum = UnicodeAttribute(hash_key=True)
+    body = UnicodeAttribute(null=True)
+    views = NumberAttribute(default=0)
+    data = BinaryAttribute(null=True, legacy_encoding=False)
+    tags = ListAttribute(of=UnicodeAttribute, null=True)
+    location = Location(null=True)
+
+
+@pytest.mark.parametrize('value, size', [
+    ({'S': 'héllo'}, 6),
+    ({'N': '0'}, 1),
+    ({'N': '12345'}, 4),
+    ({'N': '-0.00120'}, 2),
+    ({'N': '1.5E+10'}, 2),
+    ({'B': b'abc'}, 3),
+    ({'B': 'YWJj'}, 3),
+    ({'B': 'YQ=='}, 1),
+    ({'SS': ['a', 'bc']}, 3),
+    ({'NS': ['1', '22']}, 4),
+    ({'BS': [b'a', b'bc']}, 3),
+    ({'BOOL': True}, 1),
+    ({'NULL': True}, 1),
+    ({'L': [{'S': 'ab'}, {'N': '1'}]}, 3 + 3 + 3),
+    ({'M': {'key': {'S': 'ab'}}}, 3 + 1 + 3 + 2),
+])
+def test_attribute_value_size(value, size):
+    assert attribute_value_size(value) == size
+
+
+def test_item_size():
+    assert item_size({'forum': {'S': 'a'}, 'views': {'N': '10'}}) == 5 + 1 + 5 + 2
+    assert operation_size({
+        'TableName': 'Thread',
+        'Item': {'forum': {'S': 'a'}},
+        'ConditionExpression': '#0 = :0',
+        'ExpressionAttributeNames': {'#0': 'views'},
+        'ExpressionAttributeValues': {':0': {'N': '1'}},
+    }) == 6 + 6 + 7 + 7 + 4
+
+
+def test_capacity_units():
+    assert read_capacity_units(0) == 0.5
+    assert read_capacity_units(4097, consistent_read=True) == 2
+    assert read_capacity_units(4096, transactional=True) == 2
+    assert write_capacity_units(1024) == 1
+    assert write_capacity_units(1025) == 2
+    assert write_capacity_units(10, transactional=True) == 2
+
+
+def test_pack():
+    assert list(pack([1, 2, 3, 4, 5], lambda n: n, max_count=10, max_bytes=6)) == [[1, 2, 3], [4], [5]]
+    assert list(pack([1, 1, 1], lambda n: n, max_count=2, max_bytes=100)) == [[1, 1], [1]]
+    # entries larger than max_bytes are packed alone
+    assert list(pack([1, 9, 1], lambda n: n, max_count=10, max_bytes=5)) == [[1], [9], [1]]
+    assert list(pack([], lambda n: n, max_count=1, max_bytes=1)) == []
+
+
+def test_model_estimates():
+    thread = Thread('forum', body='x' * 1500, views=3, data=b'12', tags=['a'], location=Location(city='c'))
+    size = (5 + 5) + (4 + 1500) + (5 + 2) + (4 + 2) + (4 + 3 + 1 + 1) + (8 + 3 + 1 + 4 + 1)
+    assert thread.estimate_size() == size
+    assert thread.estimate_write_capacity_units() == 2
+    assert thread.estimate_write_capacity_units(transactional=True) == 4
+    assert thread.estimate_read_capacity_units() == 0.5
+    assert thread.estimate_read_capacity_units(consistent_read=True) == 1
@@ -0,0 +1,147 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from pynamodb import throughput
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+from pynamodb.connection import Connection
+from pynamodb.connection.memory import InMemoryTransport
+from pynamodb.hooks import request_hooks
+from pynamodb.models import Model
+from pynamodb.throughput import ThroughputGovernor, TokenBucket, background
+from tests.mock_time import MockTime
+
+PATCH_METHOD = 'pynamodb.connection.Connection._make_api_call'
+
+
+class Counter(Model):
+    class Meta:
+        table_name = 'Counter'
+        transport = InMemoryTransport()
+
+    name = UnicodeAttribute(hash_key=True)
+    value = NumberAttribute(default=0)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def create_table():
+    Counter.create_table(read_capacity_units=1, write_capacity_units=1)
+
+
+@pytest.fixture
+def mock_time():
+    return MockTime()
+
+
+def test_token_bucket(mock_time):
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    with pytest.raises(ValueError):
+        TokenBucket(1, burst=0)
+
+    bucket = TokenBucket(2, burst=4, time_module=mock_time)
+    assert bucket.tokens == 4
+    bucket.acquire()
+    bucket.charge(6)
+    assert bucket.tokens == -2
+    bucket.acquire()
+    assert sum(mock_time.slept) == 1
+    assert bucket.tokens == 0
+
+    # refills up to the burst
+    mock_time.sleep(10)
+    assert bucket.tokens == 4
+
+    # a reserve is capped to the burst
+    bucket.charge(4)
+    mock_time.slept.clear()
+    bucket.acquire(reserve=100)
+    assert sum(mock_time.slept) == 2
+
+
+def test_token_bucket__async():
+    bucket = TokenBucket(100)
+    bucket.charge(101)
+
+    async def acquire():
+        await bucket.acquire_async()
+
+    asyncio.run(acquire())
+    assert bucket.tokens >= 0
+
+
+def test_governor(mock_time):
+    with pytest.raises(ValueError):
+        ThroughputGovernor(background_reserve=2)
+    governor = ThroughputGovernor(time_module=mock_time)
+    with pytest.raises(ValueError):
+        governor.set_limit('Counter', write_capacity_units=1, burst_seconds=0)
+    governor.set_limit('Counter', read_capacity_units=10, write_capacity_units=1)
+
+    with governor:
+        assert throughput.governor is governor
+        for i in range(5):
+            Counter(str(i)).save()
+        # reads are limited separately
+        Counter.get('0')
+    assert throughput.governor is None
+    assert not request_hooks
+
+    # one unit on credit, then one unit per second
+    assert sum(mock_time.slept) == 3
+    read_budget, write_budget = governor.get_budgets('Counter')
+    assert read_budget.tokens == 9.5
+    assert write_budget.tokens == -1
+
+    # not governed once disabled
+    Counter('5').save()
+    assert write_budget.tokens == -1
+
+    governor.remove_limit('Counter')
+    assert governor.get_budgets('Counter') == (None, None)
+
+
+def test_governor__background(mock_time):
+    governor = ThroughputGovernor(background_reserve=0.5, time_module=mock_time)
+    governor.set_limit('Counter', write_capacity_units=2)
+
+    with governor:
+        with background():
+            Counter('1').save()
+            Counter('2').save()
+            assert sum(mock_time.slept) == 0
+            # leaves half of the burst to the foreground
+            Counter('3').save()
+            assert sum(mock_time.slept) == 0.5
+        # the foreground uses the reserve right away
+        Counter('4').save()
+        assert sum(mock_time.slept) == 0.5
+
+
+@mock.patch(PATCH_METHOD)
+def test_governor__charges_consumed_capacity(mock_req, mock_time):
+    governor = ThroughputGovernor(time_module=mock_time)
+    governor.set_limit('First', read_capacity_units=100, write_capacity_units=100)
+    governor.set_limit('Second', write_capacity_units=100)
+    connection = Connection()
+
+    with governor:
+        mock_req.return_value = {'ConsumedCapacity': [
+            {'TableName': 'First', 'CapacityUnits': 10.0},
+            {'TableName': 'Second', 'CapacityUnits': 20.0, 'WriteCapacityUnits': 20.0},
+        ]}
+        connection.dispatch('BatchWriteItem', {'RequestItems': {'First': [], 'Second': []}})
+        # charged one unit per table without consumed capacity
+        mock_req.return_value = {}
+        connection.dispatch('GetItem', {'TableName': 'First', 'Key': {}, 'ReturnConsumedCapacity': 'NONE'})
+        # not charged on errors
+        mock_req.side_effect = ValueError()
+        with pytest.raises(ValueError):
+            connection.dispatch('PutItem', {'TableName': 'First', 'Item': {}})
+        # control plane operations are not governed
+        mock_req.side_effect = None
+        connection.dispatch('DescribeTable', {'TableName': 'First'})
+
+    assert [budget.tokens if budget else None for budget in governor.get_budgets('First')] == [99, 90]
+    assert [budget.tokens if budget else None for budget in governor.get_budgets('Second')] == [None, 80]
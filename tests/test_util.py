@@ -0,0 +1,49 @@
+import inspect
+import os
+import subprocess
+import sys
+
+from pynamodb._util import get_class_members
+
+
+def test_import_does_not_load_botocore_client():
+    # botocore's client, session and config modules are imported when the first client is created
+    code = (
+        "import sys\n"
+        "import pynamodb.models\n"
+        "print(','.join(m for m in ('botocore.client', 'botocore.session', 'botocore.config') if m in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert output.stdout.strip() == ''
+
+
+def test_get_class_members():
+    class Base:
+        a = 1
+        b = 1
+
+    class Left(Base):
+        b = 2
+        c = 2
+
+    class Right(Base):
+        a = 3
+        c = 3
+        d = 3
+
+    class Child(Left, Right):
+        d = 4
+        e = 'e'
+
+    def is_int(value):
+        return isinstance(value, int)
+
+    # overrides are resolved in method resolution order: Child, Left, Right, Base
+    assert get_class_members(Child, is_int) == inspect.getmembers(Child, is_int)
+    assert get_class_members(Child, is_int) == [('a', 3), ('b', 2), ('c', 2), ('d', 4)]